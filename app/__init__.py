@@ -10,7 +10,8 @@ import click
 from flask import Flask, jsonify
 from werkzeug.middleware.proxy_fix import ProxyFix
 from .config import get_config, validate_production_config
-from .extensions import db, migrate, cors
+from .extensions import db, cors, init_migrate
+from .utils.json_provider import OrjsonProvider
 
 
 def create_app(config_class=None):
@@ -26,6 +27,9 @@ def create_app(config_class=None):
     """
     app = Flask(__name__)
 
+    # JSON odgovori kroz orjson (Decimal/datetime/Enum nativno)
+    app.json = OrjsonProvider(app)
+
     # Ucitaj konfiguraciju
     if config_class is None:
         config_class = get_config()
@@ -67,27 +71,64 @@ def _init_extensions(app):
     """
     Inicijalizuje sve Flask ekstenzije sa app kontekstom.
     """
+    import sys
+    is_cli_command = 'flask' in sys.argv[0] or any(cmd in sys.argv for cmd in ['db', 'shell', 'routes'])
+
     # SQLAlchemy - ORM
     db.init_app(app)
 
-    # Flask-Migrate - migracije
-    migrate.init_app(app, db)
+    # Flask-Migrate - migracije (samo za CLI, alembic se ne učitava u web procesu)
+    if is_cli_command:
+        init_migrate(app)
 
     # CORS - dozvoli cross-origin zahteve
     cors.init_app(app, origins=app.config['CORS_ORIGINS'])
 
+    # Redis - deljeni pool, circuit breaker i health probe za sve servise
+    from .services.redis_service import redis_manager
+    redis_manager.init_app(app)
+
+    # Kompresija odgovora (gzip/brotli) - registruje se pre ostalih after_request
+    # hook-ova jer ih Flask izvršava obrnutim redom (kompresija vidi konačno telo)
+    from .middleware import init_compression
+    init_compression(app)
+
+    # SQL profiler - broj upita, vreme u bazi, N+1 i Server-Timing po request-u
+    # (prvi before_request hook, da meri i upite ostalih hook-ova)
+    from .services.sql_profiler_service import register_sql_profiler
+    register_sql_profiler(app)
+
     # Security Headers - dodaje sigurnosne HTTP headere na sve responses
     from .middleware import init_security_headers
     init_security_headers(app)
 
+    # Static assets - ?v=<hash> na static URL-ovima, immutable keš, Tailwind build
+    from .middleware import init_static_assets
+    init_static_assets(app)
+
     # Public Site Middleware - detektuje subdomen i custom domen za javne stranice
     from .middleware.public_site import setup_public_site_middleware
     setup_public_site_middleware(app)
 
+    # Public Cache - purge keširanih javnih stranica na commit izmena profila/usluga/recenzija
+    from .services.public_cache_service import register_public_cache_invalidation
+    register_public_cache_invalidation(db)
+
+    # API Cache - nova generacija keša tenanta na commit izmena kataloga/lokacija/tima
+    from .services.api_cache_service import register_api_cache_invalidation
+    register_api_cache_invalidation(db)
+
+    # Read replika - @read_replica izveštaji čitaju sa SQLALCHEMY_REPLICA_URL,
+    # read-your-writes posle upisa korisnika
+    from .services.replica_service import register_replica_routing
+    register_replica_routing(db)
+
+    # Write-behind brojači - lokalni akumulator se prazni posle request-a
+    from .services.counter_service import register_counter_flush
+    register_counter_flush(app)
+
     # Background Scheduler - pokrece billing taskove automatski
     # Scheduler: samo na web.1 dyno-u (ako ima vise workera) i ne tokom CLI
-    import sys
-    is_cli_command = 'flask' in sys.argv[0] or any(cmd in sys.argv for cmd in ['db', 'shell', 'routes'])
 
     # DYNO guard: na Heroku pokreni scheduler samo na web.1
     # Lokalno (bez DYNO env) uvek pokreni
@@ -95,9 +136,29 @@ def _init_extensions(app):
     is_primary_dyno = dyno == 'web.1'
 
     if not is_cli_command and is_primary_dyno and app.config.get('SCHEDULER_ENABLED', True):
+        _start_scheduler(app)
+
+
+def _start_scheduler(app):
+    """
+    Pokreće scheduler posle SCHEDULER_START_DELAY sekundi u pozadinskoj niti,
+    da import APScheduler-a i registracija jobova ne kasne prvi request
+    posle restarta dyno-a. Delay 0 = sinhrono (stari način).
+    """
+    def start():
         from .services.scheduler_service import init_scheduler
         init_scheduler(app)
 
+    delay = app.config.get('SCHEDULER_START_DELAY', 5)
+    if not delay:
+        start()
+        return
+
+    import threading
+    timer = threading.Timer(delay, start)
+    timer.daemon = True
+    timer.start()
+
 
 def _register_blueprints(app):
     """
@@ -107,7 +168,34 @@ def _register_blueprints(app):
     - /api/v1/* - B2B API za servise (tenant-scoped)
     - /api/public/* - Javni B2C API (bez auth)
     - /api/admin/* - Platform Admin API
+
+    LAZY_ROUTES: rute iz manifesta, moduli se importuju na prvi request
+    (app/utils/lazy_routes.py). Bez važećeg manifesta - normalna registracija.
     """
+    if app.config.get('LAZY_ROUTES'):
+        from .utils.lazy_routes import register_lazy_routes, write_manifest
+        if not register_lazy_routes(app):
+            app.logger.warning('Route manifest missing or stale - registering routes eagerly')
+            _register_api_blueprints(app)
+            try:
+                write_manifest(app)
+            except (OSError, ValueError) as e:
+                app.logger.warning(f'Route manifest not written: {e}')
+    else:
+        _register_api_blueprints(app)
+
+    # Zdravstvena provera - uvek dostupna
+    @app.route('/health')
+    def health_check():
+        """Endpoint za health check (Heroku, load balancer, itd.)"""
+        return jsonify({
+            'status': 'healthy',
+            'service': 'servishub'
+        })
+
+
+def _register_api_blueprints(app):
+    """Importuje API/frontend module i registruje njihove blueprinte."""
     # V1 API - B2B za servise
     from .api.v1 import bp as api_v1_bp, register_routes as register_v1_routes
     register_v1_routes()
@@ -141,15 +229,6 @@ def _register_blueprints(app):
     from .api.webhooks import bp as webhooks_bp
     app.register_blueprint(webhooks_bp)
 
-    # Zdravstvena provera - uvek dostupna
-    @app.route('/health')
-    def health_check():
-        """Endpoint za health check (Heroku, load balancer, itd.)"""
-        return jsonify({
-            'status': 'healthy',
-            'service': 'servishub'
-        })
-
 
 def _register_error_handlers(app):
     """
@@ -192,6 +271,18 @@ def _register_error_handlers(app):
             'message': str(error.description)
         }), 422
 
+    from .services.password_service import PasswordHasherBusy
+
+    @app.errorhandler(PasswordHasherBusy)
+    def password_hasher_busy(error):
+        # Talas prijava - odbij odmah umesto da zauzme worker thread
+        response = jsonify({
+            'error': 'Service Unavailable',
+            'message': 'Previse prijava u ovom trenutku, pokusajte ponovo za nekoliko sekundi'
+        })
+        response.headers['Retry-After'] = str(error.retry_after)
+        return response, 503
+
     @app.errorhandler(500)
     def internal_error(error):
         # Loguj gresku za debugging
@@ -509,6 +600,20 @@ def _register_cli_commands(app):
         click.echo(f'Gresaka: {errors}')
         click.echo('Gotovo!')
 
-    # Import check-orders iz commands modula
-    from .commands.jobs import check_orders_cmd
+    # Import job komandi iz commands modula
+    from .commands.jobs import (
+        check_orders_cmd, log_retention_cmd, pos_reconcile_cmd, stock_checkpoints_cmd,
+        finance_rollup_cmd, counters_flush_cmd, dlr_process_cmd, ticket_search_reindex_cmd,
+        assets_build_cmd, routes_manifest_cmd, import_profile_cmd
+    )
     app.cli.add_command(check_orders_cmd)
+    app.cli.add_command(log_retention_cmd)
+    app.cli.add_command(pos_reconcile_cmd)
+    app.cli.add_command(stock_checkpoints_cmd)
+    app.cli.add_command(finance_rollup_cmd)
+    app.cli.add_command(counters_flush_cmd)
+    app.cli.add_command(dlr_process_cmd)
+    app.cli.add_command(ticket_search_reindex_cmd)
+    app.cli.add_command(assets_build_cmd)
+    app.cli.add_command(routes_manifest_cmd)
+    app.cli.add_command(import_profile_cmd)
@@ -18,7 +18,7 @@ def register_routes():
     """
     from . import auth, tenants, kyc, dashboard, activity, security, settings, payments, scheduler, threads
     from . import bank_import, bank_transactions, notifications, sms
-    from . import suppliers, credits
+    from . import suppliers, credits, cache, performance
 
     bp.register_blueprint(auth.bp)
     bp.register_blueprint(tenants.bp)
@@ -35,4 +35,4 @@ def register_routes():
     bp.register_blueprint(sms.bp)
     bp.register_blueprint(suppliers.bp)
     bp.register_blueprint(credits.bp)
-    # scheduler rute su direktno na bp, nije sub-blueprint
+    # scheduler, cache i performance rute su direktno na bp, nisu sub-blueprint
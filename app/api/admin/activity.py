@@ -11,6 +11,7 @@ from flask import Blueprint, request, jsonify
 from app.extensions import db
 from app.models.admin_activity import AdminActivityLog, AdminActionType
 from app.api.middleware.auth import platform_admin_required
+from app.utils.pagination import paginate
 
 bp = Blueprint('admin_activity', __name__, url_prefix='/activity')
 
@@ -73,23 +74,15 @@ def list_activities():
             pass
 
     # Sortiranje - najnovije prvo
-    query = query.order_by(AdminActivityLog.created_at.desc())
-
-    # Paginacija
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate(
+        query, (AdminActivityLog.created_at.desc(), AdminActivityLog.id.desc()), page=page, per_page=per_page
+    )
 
     activities_data = [activity.to_dict() for activity in pagination.items]
 
     return jsonify({
         'activities': activities_data,
-        'pagination': {
-            'page': pagination.page,
-            'per_page': pagination.per_page,
-            'total': pagination.total,
-            'pages': pagination.pages,
-            'has_next': pagination.has_next,
-            'has_prev': pagination.has_prev
-        }
+        'pagination': pagination.meta()
     }), 200
 
 
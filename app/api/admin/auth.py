@@ -10,7 +10,8 @@ Podrska za 2FA (TOTP) autentifikaciju.
 import io
 import base64
 from flask import Blueprint, request, jsonify, g, session
-from pydantic import ValidationError, BaseModel
+from pydantic import ValidationError
+from ..schemas.base import Schema
 from typing import Optional
 
 from ..schemas.auth import AdminLoginRequest, RefreshTokenRequest
@@ -26,19 +27,19 @@ bp = Blueprint('admin_auth', __name__, url_prefix='/auth')
 
 
 # Pydantic modeli za 2FA
-class TwoFactorVerifyRequest(BaseModel):
+class TwoFactorVerifyRequest(Schema):
     """Request za verifikaciju 2FA koda."""
     email: str
     code: str
     use_backup: bool = False
 
 
-class TwoFactorSetupRequest(BaseModel):
+class TwoFactorSetupRequest(Schema):
     """Request za setup 2FA."""
     code: str  # Verifikacioni kod
 
 
-class TwoFactorDisableRequest(BaseModel):
+class TwoFactorDisableRequest(Schema):
     """Request za onemogucavanje 2FA."""
     password: str  # Potvrda lozinkom
 
@@ -8,9 +8,10 @@ Endpointi za:
 - Detalji importa sa transakcijama
 """
 
-import hashlib
 from datetime import datetime
+from itertools import islice
 from flask import Blueprint, request, jsonify, g
+from sqlalchemy import insert, select
 from werkzeug.utils import secure_filename
 
 from app.extensions import db
@@ -19,7 +20,7 @@ from app.models.bank_import import (
 )
 from app.models.admin_activity import AdminActivityLog, AdminActionType
 from app.api.middleware.auth import platform_admin_required
-from app.services.bank_parsers import detect_bank_and_parse, get_supported_banks
+from app.services.bank_parsers import HashingReader, get_parser, get_supported_banks, hash_stream, read_head
 from app.services.payment_matcher import PaymentMatcher
 from app.services.reconciliation import reconcile_payment
 
@@ -27,11 +28,96 @@ bp = Blueprint('admin_bank_import', __name__, url_prefix='/bank-import')
 
 ALLOWED_EXTENSIONS = {'csv', 'xml', 'txt'}
 
+IMPORT_CHUNK_SIZE = 500     # transakcija po INSERT-u
+PREVIEW_ROWS = 100          # default broj transakcija u preview-u
+PREVIEW_MAX_ROWS = 1000
+
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def _chunks(iterable, size):
+    """Liste od po `size` elemenata (poslednja kraća)."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _transaction_hash(txn):
+    """Idempotency hash - isti ulaz kao ranije (ISO datum, float iznos)."""
+    return BankTransaction.generate_hash(
+        date=txn.date.isoformat(),
+        amount=float(txn.amount),
+        payer_account=txn.payer_account,
+        reference=txn.reference
+    )
+
+
+def _insert_transactions(bank_import, transactions):
+    """
+    Upisuje transakcije u blokovima od IMPORT_CHUNK_SIZE.
+
+    Po bloku: jedan SELECT postojećih hash-eva i jedan bulk INSERT.
+    Prethodni blokovi su već u bazi, pa duplikat u istom fajlu hvata
+    isti SELECT - memorija ne zavisi od veličine izvoda.
+
+    Returns:
+        dict sa brojem uplata/isplata, sumama i preskočenim duplikatima
+    """
+    stats = {'credits': 0, 'debits': 0, 'total_credit': 0, 'total_debit': 0, 'skipped': 0}
+
+    for chunk in _chunks(transactions, IMPORT_CHUNK_SIZE):
+        hashed = [(_transaction_hash(txn), txn) for txn in chunk]
+        seen = set(db.session.scalars(
+            select(BankTransaction.transaction_hash)
+            .where(BankTransaction.transaction_hash.in_([txn_hash for txn_hash, _ in hashed]))
+        ))
+
+        rows = []
+        for txn_hash, txn in hashed:
+            if txn_hash in seen:
+                stats['skipped'] += 1
+                continue
+            seen.add(txn_hash)
+
+            rows.append({
+                'import_id': bank_import.id,
+                'transaction_hash': txn_hash,
+                'transaction_type': txn.type or TransactionType.CREDIT,
+                'transaction_date': txn.date,
+                'value_date': txn.value_date,
+                'booking_date': txn.booking_date,
+                'amount': txn.amount,
+                'currency': txn.currency or 'RSD',
+                'payer_name': txn.payer_name,
+                'payer_account': txn.payer_account,
+                'payer_address': txn.payer_address,
+                'payment_reference': txn.reference,
+                'payment_reference_model': txn.reference_model,
+                'payment_reference_raw': txn.reference_raw,
+                'purpose': txn.purpose,
+                'purpose_code': txn.purpose_code,
+                'bank_transaction_id': txn.bank_id,
+                'raw_data': txn.raw,
+            })
+
+            if txn.type == TransactionType.DEBIT:
+                stats['debits'] += 1
+                stats['total_debit'] += float(txn.amount)
+            else:
+                stats['credits'] += 1
+                stats['total_credit'] += float(txn.amount)
+
+        if rows:
+            db.session.execute(insert(BankTransaction), rows)
+
+    return stats
+
+
 # ============================================================================
 # LISTA I DETALJI IMPORTA
 # ============================================================================
@@ -172,17 +258,28 @@ def upload_statement():
             'error': f'Nepodržan format fajla. Dozvoljeni: {", ".join(ALLOWED_EXTENSIONS)}'
         }), 400
 
-    # Read file content
-    file_content = file.read()
-    file_size = len(file_content)
-
-    if file_size == 0:
+    # Samo početak fajla za detekciju banke; ostatak se čita u toku parsiranja
+    head = read_head(file.stream)
+    if not head:
         return jsonify({'error': 'Fajl je prazan'}), 400
 
-    # Calculate hash for deduplication
-    file_hash = hashlib.sha256(file_content).hexdigest()
+    # Parse statement date
+    statement_date = request.form.get('statement_date')
+    if statement_date:
+        try:
+            statement_date = datetime.strptime(statement_date, '%Y-%m-%d').date()
+        except ValueError:
+            return jsonify({'error': 'Invalid statement_date format (use YYYY-MM-DD)'}), 400
 
-    # Check for duplicate
+    bank_code = request.form.get('bank_code')
+    try:
+        parser = get_parser(head, file.filename, force_bank=bank_code)
+    except ValueError as e:
+        return jsonify({'error': f'Greška pri parsiranju: {str(e)}'}), 400
+
+    # Check for duplicate - hash je poseban prolaz kroz fajl (samo čitanje),
+    # pa se duplikat odbija pre parsiranja i upisa transakcija
+    file_hash, file_size = hash_stream(file.stream)
     existing = BankStatementImport.query.filter_by(file_hash=file_hash).first()
     if existing:
         return jsonify({
@@ -191,98 +288,43 @@ def upload_statement():
             'imported_at': existing.imported_at.isoformat() if existing.imported_at else None
         }), 409
 
-    # Parse file
-    bank_code = request.form.get('bank_code')
-    try:
-        parse_result = detect_bank_and_parse(
-            file_content,
-            filename=file.filename,
-            force_bank=bank_code
-        )
-    except ValueError as e:
-        return jsonify({'error': f'Greška pri parsiranju: {str(e)}'}), 400
-    except Exception as e:
-        return jsonify({'error': f'Neočekivana greška: {str(e)}'}), 500
-
-    # Parse statement date
-    statement_date = request.form.get('statement_date')
-    if statement_date:
-        try:
-            statement_date = datetime.strptime(statement_date, '%Y-%m-%d').date()
-        except ValueError:
-            return jsonify({'error': 'Invalid statement_date format (use YYYY-MM-DD)'}), 400
-    else:
-        statement_date = parse_result.get('statement_date') or datetime.utcnow().date()
-
     # Create import record
     bank_import = BankStatementImport(
         filename=secure_filename(file.filename),
         file_hash=file_hash,
         file_size=file_size,
-        bank_code=parse_result.get('bank_code', 'UNK'),
-        bank_name=parse_result.get('bank_name'),
-        import_format=parse_result.get('format', 'CSV'),
-        encoding=parse_result.get('encoding', 'UTF-8'),
-        statement_date=statement_date,
-        statement_number=parse_result.get('statement_number'),
+        bank_code=parser.BANK_CODE,
+        bank_name=parser.BANK_NAME,
+        import_format=parser.FORMAT,
+        statement_date=statement_date or datetime.utcnow().date(),
         imported_by_id=g.current_admin.id,
-        status=ImportStatus.PENDING,
-        warnings=parse_result.get('warnings', [])
+        status=ImportStatus.PENDING
     )
     db.session.add(bank_import)
     db.session.flush()  # Get ID
 
-    # Create transactions
-    transactions = parse_result.get('transactions', [])
-    credit_count = 0
-    debit_count = 0
-    total_credit = 0
-    total_debit = 0
-    skipped = 0
+    # Parse + create transactions u blokovima
+    try:
+        stats = _insert_transactions(bank_import, parser.iter_transactions(file.stream, file.filename))
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'error': f'Greška pri parsiranju: {str(e)}'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Neočekivana greška: {str(e)}'}), 500
 
-    for txn_data in transactions:
-        # Generate idempotency hash
-        txn_hash = BankTransaction.generate_hash(
-            date=txn_data.get('date'),
-            amount=txn_data.get('amount'),
-            payer_account=txn_data.get('payer_account'),
-            reference=txn_data.get('reference')
-        )
-
-        # Check for duplicate transaction
-        existing_txn = BankTransaction.query.filter_by(transaction_hash=txn_hash).first()
-        if existing_txn:
-            skipped += 1
-            continue
-
-        txn = BankTransaction(
-            import_id=bank_import.id,
-            transaction_hash=txn_hash,
-            transaction_type=txn_data.get('type', TransactionType.CREDIT),
-            transaction_date=txn_data.get('date'),
-            value_date=txn_data.get('value_date'),
-            booking_date=txn_data.get('booking_date'),
-            amount=txn_data.get('amount', 0),
-            currency=txn_data.get('currency', 'RSD'),
-            payer_name=txn_data.get('payer_name'),
-            payer_account=txn_data.get('payer_account'),
-            payer_address=txn_data.get('payer_address'),
-            payment_reference=txn_data.get('reference'),
-            payment_reference_model=txn_data.get('reference_model'),
-            payment_reference_raw=txn_data.get('reference_raw'),
-            purpose=txn_data.get('purpose'),
-            purpose_code=txn_data.get('purpose_code'),
-            bank_transaction_id=txn_data.get('bank_id'),
-            raw_data=txn_data.get('raw')
-        )
-        db.session.add(txn)
-
-        if txn.transaction_type == TransactionType.CREDIT:
-            credit_count += 1
-            total_credit += float(txn.amount)
-        else:
-            debit_count += 1
-            total_debit += float(txn.amount)
+    # Podaci o izvodu poznati tek posle parsiranja
+    bank_import.encoding = parser.encoding or 'UTF-8'
+    bank_import.statement_number = parser.statement_number
+    bank_import.warnings = parser.warnings
+    if not statement_date and parser.statement_date:
+        bank_import.statement_date = parser.statement_date
+
+    credit_count = stats['credits']
+    debit_count = stats['debits']
+    total_credit = stats['total_credit']
+    total_debit = stats['total_debit']
+    skipped = stats['skipped']
 
     # Update import stats
     bank_import.total_transactions = credit_count + debit_count
@@ -335,9 +377,12 @@ def preview_statement():
     Parsira fajl i vraća preview bez čuvanja u bazu.
 
     Korisnik može pregledati transakcije pre nego što potvrdi import.
+    Parsira se samo prvih `limit` transakcija (summary je za njih);
+    ostatak fajla se čita samo za hash (provera duplikata).
 
     Request: multipart/form-data
         - file: Bank statement file (CSV/XML)
+        - limit: (optional) broj transakcija, default 100, 1-1000
 
     Response:
     {
@@ -366,6 +411,8 @@ def preview_statement():
             "total_credit": 150000.00,
             "total_debit": 5000.00
         },
+        "preview_limit": 100,
+        "truncated": false,
         "warnings": [],
         "is_duplicate": false,
         "existing_import_id": null
@@ -383,32 +430,34 @@ def preview_statement():
             'error': f'Nepodržan format fajla. Dozvoljeni: {", ".join(ALLOWED_EXTENSIONS)}'
         }), 400
 
-    # Read file content
-    file_content = file.read()
-    file_size = len(file_content)
-
-    if file_size == 0:
+    head = read_head(file.stream)
+    if not head:
         return jsonify({'error': 'Fajl je prazan'}), 400
 
-    # Calculate hash for deduplication check
-    file_hash = hashlib.sha256(file_content).hexdigest()
-
-    # Check for duplicate
-    existing = BankStatementImport.query.filter_by(file_hash=file_hash).first()
-    is_duplicate = existing is not None
+    limit = max(1, min(request.form.get('limit', PREVIEW_ROWS, type=int), PREVIEW_MAX_ROWS))
 
-    # Parse file
+    # Parse samo prvih `limit` transakcija
+    reader = HashingReader(file.stream)
     try:
-        parse_result = detect_bank_and_parse(
-            file_content,
-            filename=file.filename,
-            force_bank=None
-        )
+        parser = get_parser(head, file.filename, force_bank=None)
+        parsed = list(islice(parser.iter_transactions(reader, file.filename), limit + 1))
     except ValueError as e:
         return jsonify({'error': f'Greška pri parsiranju: {str(e)}'}), 400
     except Exception as e:
         return jsonify({'error': f'Neočekivana greška: {str(e)}'}), 500
 
+    truncated = len(parsed) > limit
+    parsed = parsed[:limit]
+
+    # Calculate hash for deduplication check (ostatak fajla se samo hešira)
+    reader.drain()
+    file_hash = reader.hexdigest()
+    file_size = reader.size
+
+    # Check for duplicate
+    existing = BankStatementImport.query.filter_by(file_hash=file_hash).first()
+    is_duplicate = existing is not None
+
     # Build transaction list for preview
     transactions_preview = []
     credit_count = 0
@@ -416,20 +465,20 @@ def preview_statement():
     total_credit = 0
     total_debit = 0
 
-    for txn_data in parse_result.get('transactions', []):
-        txn_type = txn_data.get('type', 'CREDIT')
-        amount = float(txn_data.get('amount', 0))
+    for txn in parsed:
+        txn_type = txn.type or 'CREDIT'
+        amount = float(txn.amount)
 
         transactions_preview.append({
             'type': txn_type,
-            'date': txn_data.get('date'),  # Already ISO string from parser
+            'date': txn.date.isoformat(),
             'amount': amount,
-            'currency': txn_data.get('currency', 'RSD'),
-            'payer_name': txn_data.get('payer_name'),
-            'payer_account': txn_data.get('payer_account'),
-            'reference': txn_data.get('reference'),
-            'reference_raw': txn_data.get('reference_raw'),
-            'purpose': txn_data.get('purpose')
+            'currency': txn.currency or 'RSD',
+            'payer_name': txn.payer_name,
+            'payer_account': txn.payer_account,
+            'reference': txn.reference,
+            'reference_raw': txn.reference_raw,
+            'purpose': txn.purpose
         })
 
         if txn_type == 'CREDIT':
@@ -439,19 +488,21 @@ def preview_statement():
             debit_count += 1
             total_debit += amount
 
-    statement_date = parse_result.get('statement_date')  # Already ISO string from parser
+    statement_date = parser.statement_date.isoformat() if parser.statement_date else None
 
     return jsonify({
         'filename': file.filename,
         'file_hash': file_hash,
         'file_size': file_size,
-        'bank_code': parse_result.get('bank_code', 'UNK'),
-        'bank_name': parse_result.get('bank_name', 'Nepoznata banka'),
-        'format': parse_result.get('format', 'CSV'),
-        'encoding': parse_result.get('encoding', 'UTF-8'),
+        'bank_code': parser.BANK_CODE,
+        'bank_name': parser.BANK_NAME,
+        'format': parser.FORMAT,
+        'encoding': parser.encoding or 'UTF-8',
         'statement_date': statement_date,
-        'statement_number': parse_result.get('statement_number'),
+        'statement_number': parser.statement_number,
         'transactions': transactions_preview,
+        'preview_limit': limit,
+        'truncated': truncated,
         'summary': {
             'total_count': credit_count + debit_count,
             'credit_count': credit_count,
@@ -459,7 +510,7 @@ def preview_statement():
             'total_credit': total_credit,
             'total_debit': total_debit
         },
-        'warnings': parse_result.get('warnings', []),
+        'warnings': parser.warnings,
         'is_duplicate': is_duplicate,
         'existing_import_id': existing.id if existing else None,
         'existing_import_date': existing.imported_at.isoformat() if existing else None
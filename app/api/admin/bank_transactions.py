@@ -20,6 +20,7 @@ from app.models.admin_activity import AdminActivityLog, AdminActionType
 from app.api.middleware.auth import platform_admin_required
 from app.services.payment_matcher import PaymentMatcher
 from app.services.reconciliation import reconcile_payment
+from app.utils.pagination import paginate
 
 bp = Blueprint('admin_bank_transactions', __name__, url_prefix='/bank-transactions')
 
@@ -42,6 +43,7 @@ def list_transactions():
         - search: Pretraga po imenu platioca, svrsi, referenci
         - limit: int (default 20)
         - offset: int (default 0)
+        - cursor: keyset paginacija (next_cursor iz prethodnog odgovora)
 
     Response:
     {
@@ -52,7 +54,7 @@ def list_transactions():
     """
     query = BankTransaction.query.filter(
         BankTransaction.transaction_type == TransactionType.CREDIT
-    ).order_by(BankTransaction.transaction_date.desc())
+    )
 
     # Filter by status
     match_status = request.args.get('match_status')
@@ -85,11 +87,12 @@ def list_transactions():
             )
         )
 
-    total = query.count()
-
     limit = request.args.get('limit', 20, type=int)
     offset = request.args.get('offset', 0, type=int)
-    transactions = query.offset(offset).limit(limit).all()
+    pagination = paginate(
+        query, (BankTransaction.transaction_date.desc(), BankTransaction.id.desc()),
+        per_page=limit, offset=offset
+    )
 
     # Get stats
     from sqlalchemy import func
@@ -103,7 +106,7 @@ def list_transactions():
     stats = {str(status): count for status, count in stats_query}
 
     result = []
-    for txn in transactions:
+    for txn in pagination.items:
         txn_dict = txn.to_dict()
         txn_dict['import_filename'] = txn.import_batch.filename if txn.import_batch else None
 
@@ -115,9 +118,10 @@ def list_transactions():
 
     return jsonify({
         'transactions': result,
-        'total': total,
+        'total': pagination.total,
         'limit': limit,
         'offset': offset,
+        'next_cursor': pagination.next_cursor,
         'stats': stats
     })
 
@@ -158,7 +162,7 @@ def list_unmatched():
     query = BankTransaction.query.filter(
         BankTransaction.transaction_type == TransactionType.CREDIT,
         BankTransaction.match_status == MatchStatus.UNMATCHED
-    ).order_by(BankTransaction.transaction_date.desc())
+    )
 
     # Filter by import
     import_id = request.args.get('import_id', type=int)
@@ -195,17 +199,18 @@ def list_unmatched():
             )
         )
 
-    total = query.count()
-
     limit = request.args.get('limit', 100, type=int)
     offset = request.args.get('offset', 0, type=int)
-    transactions = query.offset(offset).limit(limit).all()
+    pagination = paginate(
+        query, (BankTransaction.transaction_date.desc(), BankTransaction.id.desc()),
+        per_page=limit, offset=offset
+    )
 
     include_suggestions = request.args.get('include_suggestions', 'true').lower() == 'true'
     matcher = PaymentMatcher() if include_suggestions else None
 
     result = []
-    for txn in transactions:
+    for txn in pagination.items:
         txn_dict = txn.to_dict()
 
         # Add import info
@@ -219,9 +224,10 @@ def list_unmatched():
 
     return jsonify({
         'transactions': result,
-        'total': total,
+        'total': pagination.total,
         'limit': limit,
-        'offset': offset
+        'offset': offset,
+        'next_cursor': pagination.next_cursor
     })
 
 
@@ -0,0 +1,38 @@
+"""
+Admin API - API cache metrike.
+
+Hit/miss statistika keširanih tenant endpointa (cached_tenant_view).
+"""
+
+from flask import jsonify
+from . import bp
+from app.api.middleware.auth import platform_admin_required
+
+
+@bp.route('/cache/stats', methods=['GET'])
+@platform_admin_required
+def get_api_cache_stats():
+    """
+    Vraca hit/miss po endpointu.
+
+    Response:
+        {
+            "endpoints": {
+                "api_v1.services.get_categories": {
+                    "requests": 120, "hits": 112, "misses": 8, "hit_ratio": 0.933
+                },
+                ...
+            }
+        }
+    """
+    from ...services.api_cache_service import api_cache
+    return jsonify({'endpoints': api_cache.stats()})
+
+
+@bp.route('/cache/stats', methods=['DELETE'])
+@platform_admin_required
+def reset_api_cache_stats():
+    """Resetuje brojace metrika."""
+    from ...services.api_cache_service import api_cache
+    api_cache.reset_stats()
+    return jsonify({'success': True})
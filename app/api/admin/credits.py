@@ -18,6 +18,7 @@ from app.models.credits import (
     OwnerType, CreditTransactionType
 )
 from app.services.credit_service import add_credits, deduct_credits
+from app.utils.pagination import paginate
 
 bp = Blueprint('admin_credits', __name__, url_prefix='/credits')
 
@@ -60,7 +61,8 @@ def get_transactions():
 
     Query params:
         page, per_page, owner_type (TENANT/SUPPLIER/PUBLIC_USER),
-        owner_id, type (transaction_type), start_date, end_date
+        owner_id, type (transaction_type), start_date, end_date,
+        cursor (keyset paginacija - next_cursor iz prethodnog odgovora)
     """
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 50, type=int), 200)
@@ -108,8 +110,10 @@ def get_transactions():
         except ValueError:
             pass
 
-    query = query.order_by(CreditTransaction.created_at.desc())
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate(
+        query, (CreditTransaction.created_at.desc(), CreditTransaction.id.desc()),
+        page=page, per_page=per_page
+    )
 
     transactions = []
     for t in pagination.items:
@@ -131,9 +135,10 @@ def get_transactions():
     return {
         'transactions': transactions,
         'total': pagination.total,
-        'page': page,
+        'page': pagination.page,
         'per_page': per_page,
         'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor,
     }, 200
 
 
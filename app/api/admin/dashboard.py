@@ -16,6 +16,7 @@ from app.models.supplier import Supplier, SupplierStatus
 from app.models.order import PartOrder, OrderStatus
 from app.models.representative import ServiceRepresentative, RepresentativeStatus, SubscriptionPayment
 from app.api.middleware.auth import platform_admin_required
+from app.services.replica_service import read_replica
 
 bp = Blueprint('admin_dashboard', __name__, url_prefix='/dashboard')
 
@@ -93,6 +94,7 @@ def get_dashboard():
 
 @bp.route('/stats', methods=['GET'])
 @platform_admin_required
+@read_replica
 def get_dashboard_stats():
     """
     Glavne statistike platforme za admin dashboard.
@@ -151,7 +153,7 @@ def get_dashboard_stats():
 
     # Prihod od komisija (supplier orders)
     monthly_commission = db.session.query(
-        func.coalesce(func.sum(PartOrder.platform_fee), 0)
+        func.coalesce(func.sum(PartOrder.commission_amount), 0)
     ).filter(
         PartOrder.status == OrderStatus.COMPLETED,
         PartOrder.created_at >= start_of_month
@@ -218,7 +220,7 @@ def get_dashboard_stats():
     # INVENTAR (agregirano preko svih tenanata)
     # =========================================================================
     total_phones = PhoneListing.query.filter(
-        PhoneListing.is_sold == False
+        PhoneListing.sold == False
     ).count()
 
     total_parts = db.session.query(
@@ -267,6 +269,7 @@ def get_dashboard_stats():
 
 @bp.route('/charts/revenue', methods=['GET'])
 @platform_admin_required
+@read_replica
 def get_revenue_chart():
     """
     Podaci za grafikon prihoda po mesecima (poslednjih 12 meseci).
@@ -295,7 +298,7 @@ def get_revenue_chart():
 
         # Prihod od komisija
         commissions = db.session.query(
-            func.coalesce(func.sum(PartOrder.platform_fee), 0)
+            func.coalesce(func.sum(PartOrder.commission_amount), 0)
         ).filter(
             PartOrder.status == OrderStatus.COMPLETED,
             PartOrder.created_at >= month_start,
@@ -317,6 +320,7 @@ def get_revenue_chart():
 
 @bp.route('/charts/tenants', methods=['GET'])
 @platform_admin_required
+@read_replica
 def get_tenants_chart():
     """
     Podaci za grafikon rasta tenanata po mesecima (poslednjih 12 meseci).
@@ -5,7 +5,8 @@ Endpointi za konfigurisanje email/SMS notifikacija i pregled loga.
 """
 
 from flask import Blueprint, request, jsonify, g
-from pydantic import BaseModel, ValidationError, EmailStr
+from pydantic import ValidationError, EmailStr
+from ..schemas.base import Schema
 from typing import Optional, List
 from datetime import datetime
 
@@ -14,12 +15,13 @@ from ...models import AdminNotificationSettings, NotificationLog
 from ...models.admin_activity import AdminActivityLog, AdminActionType
 from ...services.notification_service import notification_service
 from ...extensions import db
+from ...utils.pagination import paginate
 
 
 bp = Blueprint('admin_notifications', __name__, url_prefix='/notifications')
 
 
-class UpdateNotificationSettingsRequest(BaseModel):
+class UpdateNotificationSettingsRequest(Schema):
     """Request za azuriranje notification settings-a."""
     # Primaoci
     email_recipients: Optional[List[str]] = None
@@ -140,6 +142,7 @@ def get_notification_log():
         - type: Filter po tipu notifikacije
         - status: Filter po statusu (sent, failed, pending)
         - tenant_id: Filter po tenant-u
+        - cursor: Keyset paginacija (next_cursor iz prethodnog odgovora)
 
     Returns:
         200: Paginirani log notifikacija
@@ -160,20 +163,20 @@ def get_notification_log():
     if tenant_id:
         query = query.filter(NotificationLog.related_tenant_id == tenant_id)
 
-    # Order by newest first
-    query = query.order_by(NotificationLog.created_at.desc())
-
-    # Paginate
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    # Newest first
+    pagination = paginate(
+        query, (NotificationLog.created_at.desc(), NotificationLog.id.desc()), page=page, per_page=per_page
+    )
 
     return jsonify({
         'items': [item.to_dict() for item in pagination.items],
         'total': pagination.total,
         'pages': pagination.pages,
-        'page': page,
+        'page': pagination.page,
         'per_page': per_page,
         'has_next': pagination.has_next,
-        'has_prev': pagination.has_prev
+        'has_prev': pagination.has_prev,
+        'next_cursor': pagination.next_cursor
     }), 200
 
 
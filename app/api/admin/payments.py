@@ -25,7 +25,7 @@ from app.models.admin_activity import AdminActivityLog, AdminActionType
 from app.api.middleware.auth import platform_admin_required
 from app.services.billing_tasks import get_next_invoice_number
 from app.services.ips_service import IPSService
-from app.services.pdf_service import PDFService
+from app.utils.pagination import paginate
 
 bp = Blueprint('admin_payments', __name__, url_prefix='/payments')
 
@@ -49,6 +49,8 @@ def list_payments():
         - has_proof: true/false - ima dokaz o uplati
         - sort: created_at, due_date, total_amount
         - order: asc, desc
+        - cursor: keyset paginacija (next_cursor iz prethodnog odgovora);
+          due_date može biti NULL pa to sortiranje ostaje na stranicama
     """
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 20, type=int), 100)
@@ -86,14 +88,21 @@ def list_payments():
     elif has_proof == 'false':
         query = query.filter(SubscriptionPayment.payment_proof_url.is_(None))
 
-    # Sorting
-    sort_column = getattr(SubscriptionPayment, sort, SubscriptionPayment.created_at)
+    # Sorting - id kao drugi ključ da bi redosled bio jednoznačan
+    sort_columns = {
+        'created_at': SubscriptionPayment.created_at,
+        'due_date': SubscriptionPayment.due_date,
+        'total_amount': SubscriptionPayment.total_amount,
+    }
+    order_by = (sort_columns.get(sort, SubscriptionPayment.created_at), SubscriptionPayment.id)
     if order == 'desc':
-        sort_column = sort_column.desc()
-    query = query.order_by(sort_column)
+        order_by = tuple(column.desc() for column in order_by)
 
     # Paginate
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    if sort == 'due_date':
+        pagination = query.order_by(*order_by).paginate(page=page, per_page=per_page, error_out=False)
+    else:
+        pagination = paginate(query, order_by, page=page, per_page=per_page)
 
     payments_data = []
     for payment in pagination.items:
@@ -111,7 +120,8 @@ def list_payments():
             'total': pagination.total,
             'pages': pagination.pages,
             'has_next': pagination.has_next,
-            'has_prev': pagination.has_prev
+            'has_prev': pagination.has_prev,
+            'next_cursor': getattr(pagination, 'next_cursor', None)
         }
     })
 
@@ -962,6 +972,7 @@ def download_invoice_pdf(payment_id):
         payment.ips_qr_generated_at = datetime.utcnow()
         db.session.commit()
 
+    from app.services.pdf_service import PDFService  # reportlab tek na prvom PDF-u
     pdf_service = PDFService(settings)
     pdf_bytes = pdf_service.generate_invoice_pdf(payment, tenant, settings)
 
@@ -995,6 +1006,7 @@ def download_uplatnica(payment_id):
         payment.ips_qr_generated_at = datetime.utcnow()
         db.session.commit()
 
+    from app.services.pdf_service import PDFService  # reportlab tek na prvom PDF-u
     pdf_service = PDFService(settings)
     pdf_bytes = pdf_service.generate_uplatnica(payment, tenant, settings)
 
@@ -1175,6 +1187,7 @@ def send_invoice_email(payment_id):
 
     # Prepare attachments
     attachments = []
+    from app.services.pdf_service import PDFService  # reportlab tek na prvom PDF-u
     pdf_service = PDFService(settings)
 
     if include_pdf:
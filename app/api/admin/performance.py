@@ -0,0 +1,73 @@
+"""
+Admin API - performanse endpointa.
+
+p50/p95 trajanja i broja SQL upita po endpointu i sumnjivi N+1
+upiti (sql_profiler, po worker procesu), stanje Redis pool-a i
+circuit breaker-a (redis_manager).
+"""
+
+from flask import jsonify, request
+from . import bp
+from app.api.middleware.auth import platform_admin_required
+
+
+SORT_FIELDS = ('p95_ms', 'p50_ms', 'max_ms', 'db_p95_ms', 'queries_p95', 'queries_max', 'samples')
+
+
+@bp.route('/performance/endpoints', methods=['GET'])
+@platform_admin_required
+def get_endpoint_performance():
+    """
+    Najsporiji endpointi.
+
+    Query params:
+        - sort: p95_ms (default), p50_ms, max_ms, db_p95_ms, queries_p95, queries_max, samples
+        - limit: broj endpointa (default 50, max 500)
+
+    Response:
+        {
+            "endpoints": [
+                {
+                    "endpoint": "GET api_v1.tickets.list_tickets",
+                    "samples": 200, "p50_ms": 38.2, "p95_ms": 121.0, "max_ms": 340.5,
+                    "db_p95_ms": 64.1, "queries_p50": 7, "queries_p95": 9, "queries_max": 31,
+                    "n_plus_one": [{"sql": "SELECT ... WHERE tenant_user.id = ?", "requests": 3}]
+                },
+                ...
+            ]
+        }
+    """
+    from ...services.sql_profiler_service import sql_profiler
+
+    sort = request.args.get('sort', 'p95_ms')
+    if sort not in SORT_FIELDS:
+        return jsonify({'error': 'Bad Request', 'message': f'sort mora biti jedan od: {", ".join(SORT_FIELDS)}'}), 400
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    return jsonify({'endpoints': sql_profiler.stats(sort=sort, limit=limit)})
+
+
+@bp.route('/performance/endpoints', methods=['DELETE'])
+@platform_admin_required
+def reset_endpoint_performance():
+    """Briše sakupljena merenja."""
+    from ...services.sql_profiler_service import sql_profiler
+    sql_profiler.reset()
+    return jsonify({'success': True})
+
+
+@bp.route('/performance/redis', methods=['GET'])
+@platform_admin_required
+def get_redis_health():
+    """
+    Stanje deljenog Redis pool-a i circuit breaker-a (ovaj worker).
+
+    Response:
+        {
+            "state": "closed", "consecutive_failures": 0, "healthy": true,
+            "last_probe_ms": 0.8, "requests": 1520, "short_circuited": 0, "trips": 0,
+            "failures": {"api_cache": 2},
+            "pool": {"max_connections": 20, "created": 3, "in_use": 0, "idle": 3}
+        }
+    """
+    from ...services.redis_service import redis_manager
+    return jsonify(redis_manager.stats())
@@ -42,14 +42,14 @@ def run_job_manually(job_id):
     Samo admini mogu pokretati jobove manuelno.
 
     Args:
-        job_id: ID joba (billing_daily, generate_invoices, send_reminders)
+        job_id: ID joba (billing_daily, generate_invoices, send_reminders, log_retention, pos_reconcile, stock_checkpoints, finance_rollup, counter_flush)
 
     Response:
         {"success": true, "message": "Job billing_daily pokrenut"}
     """
     from ...services.scheduler_service import run_job_now
 
-    valid_jobs = ['billing_daily', 'generate_invoices', 'send_reminders']
+    valid_jobs = ['billing_daily', 'generate_invoices', 'send_reminders', 'log_retention', 'pos_reconcile', 'stock_checkpoints', 'finance_rollup', 'counter_flush', 'dlr_process']
     if job_id not in valid_jobs:
         return jsonify({
             'error': f'Nepoznat job: {job_id}',
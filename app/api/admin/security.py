@@ -13,6 +13,7 @@ from sqlalchemy import func, desc
 from app.extensions import db
 from app.models.security_event import SecurityEvent, SecurityEventType, SecurityEventSeverity
 from app.api.middleware.auth import platform_admin_required
+from app.utils.pagination import paginate
 
 bp = Blueprint('admin_security', __name__, url_prefix='/security')
 
@@ -32,6 +33,7 @@ def list_security_events():
         - user_id: Filter po user ID
         - hours: Filter za poslednjih X sati (default: 24)
         - search: Pretraga po IP, endpoint ili details
+        - cursor: Keyset paginacija (next_cursor iz prethodnog odgovora)
 
     Returns:
         200: Lista eventova sa paginacijom
@@ -86,11 +88,10 @@ def list_security_events():
             )
         )
 
-    # Order by created_at desc
-    query = query.order_by(desc(SecurityEvent.created_at))
-
-    # Paginate
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    # Order by created_at desc, paginate
+    pagination = paginate(
+        query, (SecurityEvent.created_at.desc(), SecurityEvent.id.desc()), page=page, per_page=per_page
+    )
 
     # Dohvati tenant imena za sve evente
     from app.models import Tenant
@@ -109,14 +110,7 @@ def list_security_events():
 
     return jsonify({
         'events': events_with_names,
-        'pagination': {
-            'page': pagination.page,
-            'per_page': pagination.per_page,
-            'total': pagination.total,
-            'pages': pagination.pages,
-            'has_next': pagination.has_next,
-            'has_prev': pagination.has_prev
-        },
+        'pagination': pagination.meta(),
         'filters': {
             'hours': hours,
             'event_type': event_type,
@@ -152,6 +146,37 @@ def get_security_stats():
     }), 200
 
 
+@bp.route('/events/daily', methods=['GET'])
+@platform_admin_required
+def get_security_daily():
+    """
+    Dnevni broj security eventova po tipu.
+
+    Arhivirani dani se citaju iz dnevnih agregata, pa je upit
+    brz i za periode duze od hot prozora (30 dana).
+
+    Query params:
+        - days: Broj dana unazad (default: 30, max: 730)
+        - tenant_id: Filter po tenantu
+
+    Returns:
+        200: Lista {day, bucket, count}
+    """
+    from app.services.log_retention_service import log_retention
+
+    days = min(request.args.get('days', 30, type=int), 730)
+    tenant_id = request.args.get('tenant_id', type=int)
+
+    until = datetime.now(timezone.utc).date()
+    since = until - timedelta(days=days - 1)
+
+    return jsonify({
+        'days': log_retention.daily_counts('security_event', since, until, tenant_id=tenant_id),
+        'since': since.isoformat(),
+        'until': until.isoformat()
+    }), 200
+
+
 @bp.route('/events/types', methods=['GET'])
 @platform_admin_required
 def get_event_types():
@@ -338,3 +363,18 @@ def cleanup_old_events():
         'deleted_count': deleted_count,
         'older_than_days': days
     }), 200
+
+
+@bp.route('/password-hasher', methods=['GET'])
+@platform_admin_required
+def password_hasher_stats():
+    """
+    Metrike bcrypt pool-a ovog procesa.
+
+    Returns:
+        200: broj verify/hash poziva, odbijeni, timeout-i, rehash-ovi,
+             zahtevi u toku i latencija (p50/p95/max u ms)
+    """
+    from app.services.password_service import password_hasher
+
+    return jsonify(password_hasher.stats()), 200
@@ -5,7 +5,8 @@ Endpoint za citanje i izmenu platform settings-a.
 """
 
 from flask import Blueprint, request, jsonify, g
-from pydantic import BaseModel, ValidationError
+from pydantic import ValidationError
+from ..schemas.base import Schema
 from typing import Optional
 from decimal import Decimal
 from datetime import datetime, timezone
@@ -19,7 +20,7 @@ from ...extensions import db
 bp = Blueprint('admin_settings', __name__, url_prefix='/settings')
 
 
-class UpdateSettingsRequest(BaseModel):
+class UpdateSettingsRequest(Schema):
     """Request za azuriranje settings-a."""
     base_price: Optional[float] = None
     location_price: Optional[float] = None
@@ -129,7 +130,7 @@ def get_packages():
     }), 200
 
 
-class UpdatePackagesRequest(BaseModel):
+class UpdatePackagesRequest(Schema):
     """Request za azuriranje paketa sa opcionalnim notify parametrom."""
     base_price: Optional[float] = None
     location_price: Optional[float] = None
@@ -276,7 +277,7 @@ def update_packages():
 # COMPANY DATA ENDPOINTS
 # =============================================================================
 
-class UpdateCompanyRequest(BaseModel):
+class UpdateCompanyRequest(Schema):
     """Request za azuriranje podataka o firmi (ukljucuje i social za landing)."""
     company_name: Optional[str] = None
     company_address: Optional[str] = None
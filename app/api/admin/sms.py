@@ -9,7 +9,8 @@ Endpointi za:
 
 from decimal import Decimal
 from flask import Blueprint, request, jsonify, g
-from pydantic import BaseModel, ValidationError
+from pydantic import ValidationError
+from ..schemas.base import Schema
 from typing import Optional
 from datetime import datetime, timedelta
 from sqlalchemy import func, extract
@@ -23,12 +24,13 @@ from ...models import (
 )
 from ...models.admin_activity import AdminActivityLog, AdminActionType
 from ...models.platform_settings import PlatformSettings
+from ...utils.pagination import paginate
 
 
 bp = Blueprint('admin_sms', __name__, url_prefix='/sms')
 
 
-class UpdateSmsConfigRequest(BaseModel):
+class UpdateSmsConfigRequest(Schema):
     """Request za ažuriranje SMS konfiguracije tenanta."""
     sms_enabled: Optional[bool] = None
     monthly_limit: Optional[int] = None
@@ -321,10 +323,8 @@ def list_tenant_configs():
     if search:
         query = query.filter(Tenant.name.ilike(f'%{search}%'))
 
-    query = query.order_by(Tenant.name)
-
     # Paginate
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate(query, (Tenant.name, Tenant.id), page=page, per_page=per_page)
 
     items = []
     for tenant, config in pagination.items:
@@ -351,10 +351,11 @@ def list_tenant_configs():
         'items': items,
         'total': pagination.total,
         'pages': pagination.pages,
-        'page': page,
+        'page': pagination.page,
         'per_page': per_page,
         'has_next': pagination.has_next,
-        'has_prev': pagination.has_prev
+        'has_prev': pagination.has_prev,
+        'next_cursor': pagination.next_cursor
     }), 200
 
 
@@ -478,6 +479,7 @@ def list_sms_usage():
         - sms_type: Filter po tipu (TICKET_READY, OTP, etc.)
         - status: Filter po statusu (sent, failed)
         - days: Broj dana unazad (default 30)
+        - cursor: Keyset paginacija (next_cursor iz prethodnog odgovora)
 
     Returns:
         200: Paginirana lista SMS poruka
@@ -500,9 +502,9 @@ def list_sms_usage():
     if status:
         query = query.filter(TenantSmsUsage.status == status)
 
-    query = query.order_by(TenantSmsUsage.created_at.desc())
-
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate(
+        query, (TenantSmsUsage.created_at.desc(), TenantSmsUsage.id.desc()), page=page, per_page=per_page
+    )
 
     # Dohvati imena tenanata
     tenant_ids = list(set(u.tenant_id for u in pagination.items))
@@ -518,10 +520,11 @@ def list_sms_usage():
         'items': items,
         'total': pagination.total,
         'pages': pagination.pages,
-        'page': page,
+        'page': pagination.page,
         'per_page': per_page,
         'has_next': pagination.has_next,
-        'has_prev': pagination.has_prev
+        'has_prev': pagination.has_prev,
+        'next_cursor': pagination.next_cursor
     }), 200
 
 
@@ -554,9 +557,10 @@ def get_tenant_usage(tenant_id):
     query = TenantSmsUsage.query.filter(
         TenantSmsUsage.tenant_id == tenant_id,
         TenantSmsUsage.created_at >= since
-    ).order_by(TenantSmsUsage.created_at.desc())
-
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    )
+    pagination = paginate(
+        query, (TenantSmsUsage.created_at.desc(), TenantSmsUsage.id.desc()), page=page, per_page=per_page
+    )
 
     return jsonify({
         'tenant': {
@@ -568,8 +572,9 @@ def get_tenant_usage(tenant_id):
             'items': [u.to_dict() for u in pagination.items],
             'total': pagination.total,
             'pages': pagination.pages,
-            'page': page,
-            'per_page': per_page
+            'page': pagination.page,
+            'per_page': per_page,
+            'next_cursor': pagination.next_cursor
         }
     }), 200
 
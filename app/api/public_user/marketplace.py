@@ -7,6 +7,7 @@ from app.extensions import db
 from app.models import Tenant, ServiceLocation, TenantStatus
 from app.models.tenant_public_profile import TenantPublicProfile
 from app.models.feature_flag import is_feature_enabled
+from app.services.geo_service import geo_service
 from sqlalchemy import or_
 
 bp = Blueprint('public_marketplace', __name__, url_prefix='/services')
@@ -36,11 +37,12 @@ def search_services():
     total = query.count()
     tenants = query.offset((page - 1) * per_page).limit(per_page).all()
 
+    # Primarne lokacije jednim upitom
+    primary_locations = geo_service.primary_locations([t.id for t in tenants])
+
     results = []
     for t in tenants:
-        primary_loc = ServiceLocation.query.filter_by(
-            tenant_id=t.id, is_primary=True
-        ).first()
+        primary_loc = primary_locations.get(t.id)
         results.append({
             'id': t.id,
             'slug': t.slug,
@@ -62,6 +64,43 @@ def search_services():
     }, 200
 
 
+@bp.route('/nearby', methods=['GET'])
+def nearby_services():
+    """Najbliži servisi oko tačke (lat, lon, radius_km, limit)."""
+    if not is_feature_enabled('b2c_marketplace_enabled'):
+        return {'error': 'B2C marketplace nije aktiviran'}, 403
+
+    try:
+        geo = geo_service.parse_args(request.args)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    if not geo:
+        return {'error': 'lat i lon su obavezni'}, 400
+    latitude, longitude, radius_km, limit = geo
+
+    results = geo_service.nearby_tenants(latitude, longitude, radius_km, limit)
+
+    return {
+        'services': [{
+            'id': t.id,
+            'slug': t.slug,
+            'name': t.name,
+            'city': t.grad,
+            'phone': t.telefon,
+            'distance_km': round(distance, 2),
+            'location': {
+                'id': loc.id,
+                'name': loc.name,
+                'address': loc.address,
+                'city': loc.city,
+                'latitude': loc.latitude,
+                'longitude': loc.longitude,
+            },
+        } for t, loc, distance in results],
+        'radius_km': radius_km,
+    }, 200
+
+
 @bp.route('/<string:slug>', methods=['GET'])
 def get_service_profile(slug):
     """Javni profil servisa."""
@@ -14,6 +14,7 @@ from app.models.rating import Rating, RatingType
 from app.models.content_report import ContentReport, ReportReason, ReportStatus
 from app.models.credits import OwnerType, CreditTransactionType
 from app.models.feature_flag import is_feature_enabled
+from app.services.counter_service import counters
 from .auth import public_jwt_required
 
 bp = Blueprint('public_requests', __name__, url_prefix='/requests')
@@ -94,6 +95,7 @@ def list_requests():
     ).order_by(ServiceRequest.created_at.desc())
 
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    stats = counters.merge_pending('service_request', pagination.items, 'bid_count')
 
     return {
         'requests': [{
@@ -102,7 +104,7 @@ def list_requests():
             'title': r.title,
             'status': r.status.value,
             'city': r.city,
-            'bid_count': r.bid_count,
+            'bid_count': stats[r.id]['bid_count'],
             'created_at': r.created_at.isoformat(),
             'expires_at': r.expires_at.isoformat() if r.expires_at else None,
         } for r in pagination.items],
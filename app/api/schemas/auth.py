@@ -6,7 +6,8 @@ endpointima (register, login, itd.) i za formatiranje odgovora.
 """
 
 from typing import Optional
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import EmailStr, Field, field_validator
+from .base import Schema
 import re
 
 
@@ -14,7 +15,7 @@ import re
 # REQUEST SCHEMAS (ulazni podaci)
 # =============================================================================
 
-class RegisterRequest(BaseModel):
+class RegisterRequest(Schema):
     """
     Schema za registraciju novog servisa.
 
@@ -133,25 +134,25 @@ class RegisterRequest(BaseModel):
         return v if v and v.strip() else None
 
 
-class LoginRequest(BaseModel):
+class LoginRequest(Schema):
     """Schema za login korisnika."""
     email: EmailStr = Field(..., description="Email za login")
     password: str = Field(..., min_length=1, description="Lozinka")
 
 
-class TenantLoginRequest(BaseModel):
+class TenantLoginRequest(Schema):
     """Schema za login korisnika unutar specifičnog tenanta."""
     tenant_secret: str = Field(..., min_length=10, description="Tajni kod tenanta iz URL-a")
     identifier: str = Field(..., min_length=1, description="Username ili email korisnika")
     password: str = Field(..., min_length=1, description="Lozinka")
 
 
-class RefreshTokenRequest(BaseModel):
+class RefreshTokenRequest(Schema):
     """Schema za refresh tokena."""
     refresh_token: str = Field(..., description="Refresh token")
 
 
-class ChangePasswordRequest(BaseModel):
+class ChangePasswordRequest(Schema):
     """Schema za promenu lozinke."""
     current_password: str = Field(..., description="Trenutna lozinka")
     new_password: str = Field(..., min_length=8, max_length=100, description="Nova lozinka")
@@ -171,7 +172,7 @@ class ChangePasswordRequest(BaseModel):
 # RESPONSE SCHEMAS (izlazni podaci)
 # =============================================================================
 
-class TokenResponse(BaseModel):
+class TokenResponse(Schema):
     """Schema za odgovor sa tokenima."""
     access_token: str
     refresh_token: str
@@ -179,7 +180,7 @@ class TokenResponse(BaseModel):
     expires_in: int  # Sekunde do isteka access tokena
 
 
-class UserResponse(BaseModel):
+class UserResponse(Schema):
     """Schema za prikaz podataka korisnika."""
     id: int
     email: str
@@ -193,7 +194,7 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
-class TenantResponse(BaseModel):
+class TenantResponse(Schema):
     """Schema za prikaz podataka tenanta."""
     id: int
     slug: str
@@ -205,21 +206,21 @@ class TenantResponse(BaseModel):
         from_attributes = True
 
 
-class LoginResponse(BaseModel):
+class LoginResponse(Schema):
     """Schema za odgovor na uspesni login."""
     user: UserResponse
     tenant: TenantResponse
     tokens: TokenResponse
 
 
-class RegisterResponse(BaseModel):
+class RegisterResponse(Schema):
     """Schema za odgovor na uspesnu registraciju."""
     message: str
     tenant: TenantResponse
     user: UserResponse
 
 
-class MeResponse(BaseModel):
+class MeResponse(Schema):
     """Schema za /auth/me endpoint."""
     user: UserResponse
     tenant: TenantResponse
@@ -230,13 +231,13 @@ class MeResponse(BaseModel):
 # ADMIN SCHEMAS
 # =============================================================================
 
-class AdminLoginRequest(BaseModel):
+class AdminLoginRequest(Schema):
     """Schema za login platform admina."""
     email: EmailStr = Field(..., description="Admin email")
     password: str = Field(..., description="Admin lozinka")
 
 
-class AdminLoginResponse(BaseModel):
+class AdminLoginResponse(Schema):
     """Schema za odgovor na admin login."""
     admin: dict
     tokens: TokenResponse
@@ -0,0 +1,13 @@
+"""
+Bazna šema za Pydantic DTO-ove.
+
+defer_build: validator i serializer se grade pri prvoj validaciji, ne
+pri importu modula - ~50 šema API-ja više ne usporava start aplikacije.
+"""
+from pydantic import BaseModel, ConfigDict
+
+
+class Schema(BaseModel):
+    """BaseModel sa odloženim build-om (koristiti umesto BaseModel)."""
+
+    model_config = ConfigDict(defer_build=True)
@@ -4,7 +4,8 @@ Supplier Authentication API
 from flask import Blueprint, request, g
 from app.extensions import db
 from app.models import Supplier, SupplierUser, SupplierStatus
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import EmailStr, Field
+from app.api.schemas.base import Schema
 from typing import Optional
 from datetime import datetime, timedelta
 import jwt
@@ -22,7 +23,7 @@ JWT_REFRESH_EXPIRES = timedelta(days=30)
 
 # ============== Pydantic Schemas ==============
 
-class SupplierRegister(BaseModel):
+class SupplierRegister(Schema):
     company_name: str = Field(..., min_length=2, max_length=200)
     email: EmailStr
     password: str = Field(..., min_length=6)
@@ -34,7 +35,7 @@ class SupplierRegister(BaseModel):
     prezime: str = Field(..., min_length=2, max_length=50)
 
 
-class SupplierLogin(BaseModel):
+class SupplierLogin(Schema):
     email: EmailStr
     password: str
 
@@ -14,6 +14,7 @@ from app.models.credits import (
     OwnerType, CreditTransactionType
 )
 from app.services.credit_service import get_balance
+from app.utils.pagination import paginate
 
 bp = Blueprint('supplier_credits', __name__, url_prefix='/credits')
 
@@ -68,8 +69,10 @@ def get_transaction_history():
         except ValueError:
             pass
 
-    query = query.order_by(CreditTransaction.created_at.desc())
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate(
+        query, (CreditTransaction.created_at.desc(), CreditTransaction.id.desc()),
+        page=page, per_page=per_page
+    )
 
     transactions = [{
         'id': t.id,
@@ -86,7 +89,8 @@ def get_transaction_history():
     return {
         'transactions': transactions,
         'total': pagination.total,
-        'page': page,
+        'page': pagination.page,
         'per_page': per_page,
         'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor,
     }, 200
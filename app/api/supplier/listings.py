@@ -10,8 +10,10 @@ from app.extensions import db
 from app.models import SupplierListing, Supplier
 from .auth import supplier_jwt_required
 from app.utils.file_security import validate_upload
+from app.utils.pagination import paginate
 from app.constants.brands import get_brand_list, validate_brand
-from pydantic import BaseModel, Field, model_validator
+from pydantic import Field, model_validator
+from app.api.schemas.base import Schema
 from typing import Optional
 from datetime import datetime
 from decimal import Decimal
@@ -151,7 +153,7 @@ COLUMN_MAP = {
 
 # ============== Pydantic Schemas ==============
 
-class ListingCreate(BaseModel):
+class ListingCreate(Schema):
     name: str = Field(..., min_length=2, max_length=200)
     brand: Optional[str] = Field(None, max_length=50)
     model_compatibility: Optional[str] = None
@@ -174,7 +176,7 @@ class ListingCreate(BaseModel):
         return self
 
 
-class ListingUpdate(BaseModel):
+class ListingUpdate(Schema):
     name: Optional[str] = Field(None, min_length=2, max_length=200)
     brand: Optional[str] = Field(None, max_length=50)
     model_compatibility: Optional[str] = None
@@ -192,7 +194,7 @@ class ListingUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
-class BulkStockUpdate(BaseModel):
+class BulkStockUpdate(Schema):
     listing_id: int
     stock_quantity: int = Field(..., ge=0)
 
@@ -264,16 +266,15 @@ def list_listings():
             )
         )
 
-    query = query.order_by(SupplierListing.name)
-    total = query.count()
-    listings = query.offset((page - 1) * per_page).limit(per_page).all()
+    pagination = paginate(query, (SupplierListing.name, SupplierListing.id), page=page, per_page=per_page)
 
     return {
-        'listings': [listing_to_response(l) for l in listings],
-        'total': total,
-        'page': page,
+        'listings': [listing_to_response(l) for l in pagination.items],
+        'total': pagination.total,
+        'page': pagination.page,
         'per_page': per_page,
-        'pages': (total + per_page - 1) // per_page,
+        'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor,
         'eur_rate': get_supplier_eur_rate()
     }
 
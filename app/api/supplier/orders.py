@@ -24,7 +24,9 @@ from app.models import (
     OrderRating, RaterType, OrderRatingType,
 )
 from .auth import supplier_jwt_required
-from pydantic import BaseModel, Field, field_validator
+from app.utils.pagination import paginate
+from pydantic import Field, field_validator
+from app.api.schemas.base import Schema
 from typing import Optional
 from datetime import datetime, timedelta, time
 from decimal import Decimal
@@ -34,17 +36,17 @@ bp = Blueprint('supplier_orders', __name__, url_prefix='/orders')
 
 # ============== Pydantic Schemas ==============
 
-class OrderMessageCreate(BaseModel):
+class OrderMessageCreate(Schema):
     message: str = Field(..., min_length=1, max_length=2000)
 
 
-class ShippingUpdate(BaseModel):
+class ShippingUpdate(Schema):
     tracking_number: Optional[str] = Field(None, max_length=100)
     tracking_url: Optional[str] = Field(None, max_length=500)
     notes: Optional[str] = None
 
 
-class ConfirmAvailabilitySchema(BaseModel):
+class ConfirmAvailabilitySchema(Schema):
     delivery_method: str = Field(..., pattern=r'^(courier|own_delivery|pickup)$')
     courier_service: Optional[str] = Field(None, max_length=50)
     delivery_cost: Optional[Decimal] = Field(None, ge=0)
@@ -64,7 +66,7 @@ class ConfirmAvailabilitySchema(BaseModel):
         return v
 
 
-class RatingCreate(BaseModel):
+class RatingCreate(Schema):
     rating: str = Field(..., pattern=r'^(POSITIVE|NEGATIVE)$')
     comment: Optional[str] = Field(None, max_length=500)
 
@@ -122,12 +124,12 @@ def list_orders():
         except KeyError:
             pass
 
-    query = query.order_by(PartOrder.created_at.desc())
-    total = query.count()
-    orders = query.offset((page - 1) * per_page).limit(per_page).all()
+    pagination = paginate(
+        query, (PartOrder.created_at.desc(), PartOrder.id.desc()), page=page, per_page=per_page
+    )
 
     result = []
-    for order in orders:
+    for order in pagination.items:
         buyer = Tenant.query.get(order.buyer_tenant_id)
         items = PartOrderItem.query.filter_by(order_id=order.id).all()
         items_count = len(items)
@@ -163,10 +165,11 @@ def list_orders():
 
     return {
         'orders': result,
-        'total': total,
-        'page': page,
+        'total': pagination.total,
+        'page': pagination.page,
         'per_page': per_page,
-        'pages': (total + per_page - 1) // per_page
+        'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor
     }
 
 
@@ -15,6 +15,7 @@ from app.models import (
     PartOrder, PartOrderItem, OrderStatus, SellerType, Tenant
 )
 from .auth import supplier_jwt_required
+from app.services.replica_service import read_replica
 from sqlalchemy import func, desc
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -63,6 +64,7 @@ def _base_completed_query(start_date, end_date):
 
 @bp.route('/summary', methods=['GET'])
 @supplier_jwt_required
+@read_replica
 def get_summary():
     """
     Pregled izvestaj: ukupan broj narudzbina, prihod, provizija,
@@ -154,6 +156,7 @@ def get_summary():
 
 @bp.route('/by-article', methods=['GET'])
 @supplier_jwt_required
+@read_replica
 def report_by_article():
     """Analiza prodaje po artiklu."""
     start_date, end_date = _parse_date_range()
@@ -207,6 +210,7 @@ def report_by_article():
 
 @bp.route('/by-tenant', methods=['GET'])
 @supplier_jwt_required
+@read_replica
 def report_by_tenant():
     """Analiza prodaje po kupcu."""
     start_date, end_date = _parse_date_range()
@@ -258,6 +262,7 @@ def report_by_tenant():
 
 @bp.route('/export', methods=['GET'])
 @supplier_jwt_required
+@read_replica
 def export_report():
     """
     Export izvestaja kao CSV ili XLSX.
@@ -27,6 +27,7 @@ from app.services.credit_service import (
     get_balance, validate_promo_code, grant_welcome_credits,
     CREDIT_PACKAGES, EUR_TO_RSD
 )
+from app.utils.pagination import paginate
 
 bp = Blueprint('credits', __name__, url_prefix='/credits')
 
@@ -210,6 +211,7 @@ def get_transaction_history():
     Query params:
         page: int (default 1)
         per_page: int (default 20, max 100)
+        cursor: str (opciono) - keyset paginacija (next_cursor iz prethodnog odgovora)
         type: str (opciono) - filter po transaction_type
     """
     check = _check_credits_enabled()
@@ -237,8 +239,10 @@ def get_transaction_history():
         except ValueError:
             pass
 
-    query = query.order_by(CreditTransaction.created_at.desc())
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate(
+        query, (CreditTransaction.created_at.desc(), CreditTransaction.id.desc()),
+        page=page, per_page=per_page
+    )
 
     transactions = [{
         'id': t.id,
@@ -255,9 +259,10 @@ def get_transaction_history():
     return {
         'transactions': transactions,
         'total': pagination.total,
-        'page': page,
+        'page': pagination.page,
         'per_page': per_page,
         'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor,
     }, 200
 
 
@@ -23,21 +23,25 @@ def get_summary():
 @bp.route('/tickets', methods=['GET'])
 @jwt_required
 def get_tickets():
-    """Promet od servisnih naloga."""
+    """Promet od servisnih naloga (totali + paginirana lista)."""
     days = request.args.get('days', 30, type=int)
     end = date.today()
     start = end - timedelta(days=days)
-    return FinanceService.get_ticket_revenue(g.tenant_id, start, end)
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 50, type=int), 200)
+    return FinanceService.get_ticket_revenue(g.tenant_id, start, end, page=page, per_page=per_page)
 
 
 @bp.route('/phones', methods=['GET'])
 @jwt_required
 def get_phones():
-    """Promet od prodaje telefona."""
+    """Promet od prodaje telefona (totali + paginirana lista)."""
     days = request.args.get('days', 30, type=int)
     end = date.today()
     start = end - timedelta(days=days)
-    return FinanceService.get_phone_sales(g.tenant_id, start, end)
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 50, type=int), 200)
+    return FinanceService.get_phone_sales(g.tenant_id, start, end, page=page, per_page=per_page)
 
 
 @bp.route('/goods', methods=['GET'])
@@ -1,7 +1,8 @@
 """
-Goods API — artikli robe, ulazne fakture, stock korekcije.
+Goods API — artikli robe, ulazne fakture, stock korekcije, istorijsko stanje zaliha.
 """
 
+from datetime import datetime, time
 from flask import Blueprint, request, g
 from app.extensions import db
 from app.models.goods import (
@@ -11,6 +12,8 @@ from app.models.goods import (
 from app.models.feature_flag import is_feature_enabled
 from app.api.middleware.auth import jwt_required
 from app.services.goods_service import GoodsService
+from app.services.stock_ledger_service import stock_ledger
+from app.utils.pagination import paginate
 
 bp = Blueprint('goods', __name__, url_prefix='/goods')
 
@@ -56,14 +59,14 @@ def list_goods():
     if low_stock:
         query = query.filter(GoodsItem.current_stock <= GoodsItem.min_stock_level)
 
-    query = query.order_by(GoodsItem.name)
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate(query, (GoodsItem.name, GoodsItem.id), page=page, per_page=per_page)
 
     return {
         'items': [i.to_dict() for i in pagination.items],
         'total': pagination.total,
-        'page': page,
+        'page': pagination.page,
         'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor,
     }, 200
 
 
@@ -200,8 +203,10 @@ def list_invoices():
     per_page = min(request.args.get('per_page', 20, type=int), 100)
 
     query = PurchaseInvoice.query.filter_by(tenant_id=g.tenant_id)
-    query = query.order_by(PurchaseInvoice.created_at.desc())
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate(
+        query, (PurchaseInvoice.created_at.desc(), PurchaseInvoice.id.desc()),
+        page=page, per_page=per_page
+    )
 
     return {
         'invoices': [{
@@ -214,8 +219,9 @@ def list_invoices():
             'created_at': inv.created_at.isoformat(),
         } for inv in pagination.items],
         'total': pagination.total,
-        'page': page,
+        'page': pagination.page,
         'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor,
     }, 200
 
 
@@ -281,4 +287,73 @@ def receive_invoice(invoice_id):
         return {'message': 'Faktura primljena', 'status': invoice.status.value}, 200
     except ValueError as e:
         db.session.rollback()
-        return {'error': str(e)}, 400
\ No newline at end of file
+        return {'error': str(e)}, 400
+
+
+# ============================================
+# ISTORIJSKO STANJE I VREDNOVANJE ZALIHA
+# ============================================
+
+def _parse_at():
+    """?at=YYYY-MM-DD -> kraj tog dana (default: sada)."""
+    at = request.args.get('at')
+    if not at:
+        return datetime.utcnow()
+    return datetime.combine(datetime.strptime(at, '%Y-%m-%d').date(), time.max)
+
+
+@bp.route('/valuation', methods=['GET'])
+@jwt_required
+def stock_valuation():
+    """Vrednost zaliha na datum (npr. kraj meseca)."""
+    check = _check_pos_enabled()
+    if check:
+        return check
+
+    try:
+        at = _parse_at()
+    except ValueError:
+        return {'error': 'Neispravan datum (YYYY-MM-DD)'}, 400
+
+    return stock_ledger.valuation_at(
+        g.tenant_id, at,
+        location_id=request.args.get('location_id', type=int),
+        include_items=request.args.get('items') == '1',
+    ), 200
+
+
+@bp.route('/<int:item_id>/stock-at', methods=['GET'])
+@jwt_required
+def goods_stock_at(item_id):
+    """Stanje artikla na datum, po lokacijama."""
+    check = _check_pos_enabled()
+    if check:
+        return check
+
+    item = GoodsItem.query.filter_by(id=item_id, tenant_id=g.tenant_id).first()
+    if not item:
+        return {'error': 'Artikal nije pronađen'}, 404
+
+    try:
+        at = _parse_at()
+    except ValueError:
+        return {'error': 'Neispravan datum (YYYY-MM-DD)'}, 400
+
+    result = stock_ledger.stock_at(
+        at, goods_item_id=item.id, location_id=request.args.get('location_id', type=int)
+    )
+    return {'goods_item_id': item.id, 'at': at.isoformat(), **result}, 200
+
+
+@bp.route('/ledger/verify', methods=['GET'])
+@jwt_required
+def verify_ledger():
+    """Provera LocationStock cache-a naspram ledger-a za ceo tenant."""
+    check = _check_pos_enabled()
+    if check:
+        return check
+
+    mismatches = stock_ledger.verify_cache(
+        tenant_id=g.tenant_id, location_id=request.args.get('location_id', type=int)
+    )
+    return {'ok': not mismatches, 'mismatches': mismatches}, 200
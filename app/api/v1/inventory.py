@@ -14,6 +14,8 @@ from ...models import (
     AuditLog, AuditAction
 )
 from ...services.pos_service import POSService
+from ...services.replica_service import read_replica
+from ...utils.pagination import paginate
 
 bp = Blueprint('inventory', __name__, url_prefix='/inventory')
 
@@ -78,15 +80,17 @@ def list_phones():
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 20, type=int), 100)
 
-    query = query.order_by(PhoneListing.created_at.desc())
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate(
+        query, (PhoneListing.created_at.desc(), PhoneListing.id.desc()), page=page, per_page=per_page
+    )
 
     return jsonify({
         'items': [p.to_dict() for p in pagination.items],
         'total': pagination.total,
-        'page': page,
+        'page': pagination.page,
         'per_page': per_page,
-        'pages': pagination.pages
+        'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor
     }), 200
 
 
@@ -457,15 +461,17 @@ def list_parts():
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 20, type=int), 100)
 
-    query = query.order_by(SparePart.updated_at.desc())
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate(
+        query, (SparePart.updated_at.desc(), SparePart.id.desc()), page=page, per_page=per_page
+    )
 
     return jsonify({
         'items': [p.to_dict() for p in pagination.items],
         'total': pagination.total,
-        'page': page,
+        'page': pagination.page,
         'per_page': per_page,
-        'pages': pagination.pages
+        'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor
     }), 200
 
 
@@ -667,6 +673,7 @@ def adjust_part_quantity(part_id):
 @bp.route('/phones/stats/trend', methods=['GET'])
 @jwt_required
 @tenant_required
+@read_replica
 def get_phone_trend():
     """
     Trend statistike telefona za dashboard grafike (30 dana).
@@ -7,7 +7,9 @@ from app.models import ServiceLocation, TenantUser, UserLocation
 from app.models.tenant import LocationStatus
 from app.services.billing_service import can_add_location, calculate_prorate
 from app.api.middleware.auth import jwt_required
-from pydantic import BaseModel, EmailStr, Field
+from app.services.api_cache_service import cached_tenant_view
+from pydantic import EmailStr, Field
+from app.api.schemas.base import Schema
 from typing import Optional
 from datetime import datetime
 
@@ -16,7 +18,7 @@ bp = Blueprint('locations', __name__, url_prefix='/locations')
 
 # ============== Pydantic Schemas ==============
 
-class LocationCreate(BaseModel):
+class LocationCreate(Schema):
     name: str = Field(..., min_length=2, max_length=100)
     address: Optional[str] = Field(None, max_length=300)
     city: Optional[str] = Field(None, max_length=100)
@@ -26,7 +28,7 @@ class LocationCreate(BaseModel):
     is_primary: Optional[bool] = False
 
 
-class LocationUpdate(BaseModel):
+class LocationUpdate(Schema):
     name: Optional[str] = Field(None, min_length=2, max_length=100)
     address: Optional[str] = Field(None, max_length=300)
     city: Optional[str] = Field(None, max_length=100)
@@ -44,6 +46,7 @@ class LocationUpdate(BaseModel):
 
 @bp.route('', methods=['GET'])
 @jwt_required
+@cached_tenant_view()
 def list_locations():
     """List all locations for tenant"""
     include_inactive = request.args.get('include_inactive', 'false').lower() == 'true'
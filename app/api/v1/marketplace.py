@@ -9,6 +9,7 @@ from app.models import (
     Tenant, SupplierReveal
 )
 from app.api.middleware.auth import jwt_required
+from app.utils.json_provider import compact_jsonify
 from sqlalchemy import or_, and_
 from typing import Optional
 
@@ -175,13 +176,13 @@ def search_parts():
     end = start + per_page
     paginated = results[start:end]
 
-    return {
+    return compact_jsonify({
         'parts': paginated,
         'total': len(results),
         'page': page,
         'per_page': per_page,
         'pages': (len(results) + per_page - 1) // per_page
-    }
+    })
 
 
 @bp.route('/parts/<string:source>/<int:part_id>', methods=['GET'])
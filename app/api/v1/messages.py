@@ -13,6 +13,7 @@ from app.extensions import db
 from app.models import Tenant, TenantMessage
 from app.models.tenant_message import MessageCategory, MessagePriority
 from app.api.middleware.auth import jwt_required
+from app.utils.pagination import paginate
 from datetime import datetime
 
 bp = Blueprint('messages', __name__, url_prefix='/messages')
@@ -29,6 +30,7 @@ def get_messages():
         - unread_only: true/false - samo nepročitane
         - limit: broj rezultata (default 20, max 100)
         - offset: offset za paginaciju
+        - cursor: keyset paginacija (next_cursor iz prethodnog odgovora)
     """
     tenant = Tenant.query.get(g.tenant_id)
     if not tenant:
@@ -58,19 +60,16 @@ def get_messages():
         query = query.filter(TenantMessage.is_read == False)
 
     # Order by created_at desc (newest first)
-    query = query.order_by(TenantMessage.created_at.desc())
-
-    # Total count
-    total = query.count()
-
-    # Paginate
-    messages = query.offset(offset).limit(limit).all()
+    pagination = paginate(
+        query, (TenantMessage.created_at.desc(), TenantMessage.id.desc()), per_page=limit, offset=offset
+    )
 
     return {
-        'messages': [m.to_dict() for m in messages],
-        'total': total,
+        'messages': [m.to_dict() for m in pagination.items],
+        'total': pagination.total,
         'limit': limit,
         'offset': offset,
+        'next_cursor': pagination.next_cursor,
         'unread_count': TenantMessage.get_unread_count(tenant.id)
     }
 
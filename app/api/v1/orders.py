@@ -15,7 +15,9 @@ from app.models import (
 from app.models.credits import OwnerType, CreditTransactionType
 from app.api.middleware.auth import jwt_required
 from app.utils.content_filter import filter_contact_info, is_blocked_file_extension
-from pydantic import BaseModel, Field
+from app.utils.pagination import paginate
+from pydantic import Field
+from app.api.schemas.base import Schema
 from typing import Optional, List
 from datetime import datetime
 from decimal import Decimal
@@ -26,20 +28,20 @@ bp = Blueprint('orders', __name__, url_prefix='/orders')
 
 # ============== Pydantic Schemas ==============
 
-class OrderItemCreate(BaseModel):
+class OrderItemCreate(Schema):
     source: str  # 'supplier' or 'tenant'
     listing_id: int
     quantity: int = Field(..., ge=1)
 
 
-class OrderCreate(BaseModel):
+class OrderCreate(Schema):
     items: List[OrderItemCreate]
     location_id: Optional[int] = None
     service_ticket_id: Optional[int] = None
     notes: Optional[str] = None
 
 
-class OrderMessageCreate(BaseModel):
+class OrderMessageCreate(Schema):
     message: str = Field(..., min_length=1, max_length=2000)
 
 
@@ -71,16 +73,16 @@ def list_orders():
         except KeyError:
             pass
 
-    query = query.order_by(PartOrder.created_at.desc())
-    total = query.count()
-    orders = query.offset((page - 1) * per_page).limit(per_page).all()
+    pagination = paginate(
+        query, (PartOrder.created_at.desc(), PartOrder.id.desc()), page=page, per_page=per_page
+    )
 
     # Statuses where seller identity is revealed (after credit deduction)
     REVEALED_STATUSES = {OrderStatus.CONFIRMED, OrderStatus.SHIPPED,
                          OrderStatus.DELIVERED, OrderStatus.COMPLETED}
 
     result = []
-    for order in orders:
+    for order in pagination.items:
         # Hide seller name until confirmed (mutual reveal after credit)
         if order.status in REVEALED_STATUSES:
             seller_name = None
@@ -137,10 +139,11 @@ def list_orders():
 
     return {
         'orders': result,
-        'total': total,
-        'page': page,
+        'total': pagination.total,
+        'page': pagination.page,
         'per_page': per_page,
-        'pages': (total + per_page - 1) // per_page
+        'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor
     }
 
 
@@ -16,6 +16,8 @@ from app.models.pos import (
 from app.models.feature_flag import is_feature_enabled
 from app.api.middleware.auth import jwt_required
 from app.services.pos_service import POSService
+from app.services.replica_service import read_replica
+from app.utils.pagination import paginate
 from app.models.goods import GoodsItem
 from app.models.inventory import PhoneListing, SparePart
 from sqlalchemy import func, or_
@@ -122,17 +124,10 @@ def current_register():
     session = POSService.get_or_create_session(g.tenant_id, int(location_id), g.user_id)
     db.session.commit()
 
-    # Dinamički računaj iz stvarnih računa (pouzdanije od keširanih vrednosti)
-    stats = db.session.query(
-        func.count(Receipt.id),
-        func.coalesce(func.sum(Receipt.total_amount), 0)
-    ).filter(
-        Receipt.session_id == session.id,
-        Receipt.status == ReceiptStatus.ISSUED
-    ).first()
-
-    receipt_count = stats[0] or 0
-    total_revenue = float(stats[1] or 0)
+    # Tekući brojači sesije (ažuriraju se pri svakom izdavanju/storniranju)
+    totals = POSService.get_session_totals(session.id).values()
+    receipt_count = sum(t['receipt_count'] for t in totals)
+    total_revenue = float(sum(t['revenue'] for t in totals))
 
     return {
         'session_id': session.id,
@@ -526,8 +521,9 @@ def list_receipts():
     if session_filter:
         query = query.filter_by(session_id=session_filter)
 
-    query = query.order_by(Receipt.created_at.desc())
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate(
+        query, (Receipt.created_at.desc(), Receipt.id.desc()), page=page, per_page=per_page
+    )
 
     return {
         'receipts': [{
@@ -542,8 +538,9 @@ def list_receipts():
             'created_at': r.created_at.isoformat(),
         } for r in pagination.items],
         'total': pagination.total,
-        'page': page,
+        'page': pagination.page,
         'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor,
     }, 200
 
 
@@ -594,6 +591,7 @@ def daily_report():
 
 @bp.route('/reports/range', methods=['GET'])
 @jwt_required
+@read_replica
 def range_report():
     """Period izveštaj."""
     check = _check_pos_enabled()
@@ -710,19 +708,15 @@ def x_report():
     if not session:
         return {'error': 'Nema otvorene kase'}, 404
 
-    # Sumiraj ISSUED racune sesije
-    receipts = Receipt.query.filter_by(
-        session_id=session.id,
-        status=ReceiptStatus.ISSUED
-    ).all()
+    # Tekući brojači sesije - O(1), bez skeniranja računa
+    by_currency = POSService.get_session_totals(session.id)
 
-    total_revenue = sum(float(r.total_amount or 0) for r in receipts)
-    total_cost = sum(float(r.total_cost or 0) for r in receipts)
+    def _sum(field):
+        return sum(t[field] for t in by_currency.values())
+
+    total_revenue = float(_sum('revenue'))
+    total_cost = float(_sum('cost'))
     total_profit = total_revenue - total_cost
-    total_cash = sum(float(r.cash_received or 0) - float(r.cash_change or 0) for r in receipts if r.payment_method and r.payment_method.value == 'CASH')
-    total_card = sum(float(r.card_amount or 0) for r in receipts if r.card_amount)
-    total_transfer = sum(float(r.transfer_amount or 0) for r in receipts if r.transfer_amount)
-    voided = Receipt.query.filter_by(session_id=session.id, status=ReceiptStatus.VOIDED).count()
 
     return {
         'report_type': 'X',
@@ -734,15 +728,47 @@ def x_report():
         'total_revenue': total_revenue,
         'total_cost': total_cost,
         'total_profit': total_profit,
-        'total_cash': total_cash,
-        'total_card': total_card,
-        'total_transfer': total_transfer,
-        'receipt_count': len(receipts),
-        'voided_count': voided,
+        'total_cash': float(_sum('cash')),
+        'total_card': float(_sum('card')),
+        'total_transfer': float(_sum('transfer')),
+        'receipt_count': _sum('receipt_count'),
+        'voided_count': _sum('voided_count'),
+        'by_currency': {
+            cur: {
+                'revenue': float(t['revenue']),
+                'cash': float(t['cash']),
+                'card': float(t['card']),
+                'transfer': float(t['transfer']),
+                'receipt_count': t['receipt_count'],
+            }
+            for cur, t in by_currency.items()
+        },
         'fiscal_mode': session.fiscal_mode or False,
     }, 200
 
 
+@bp.route('/reports/x/reconcile', methods=['GET'])
+@jwt_required
+def x_report_reconcile():
+    """Uporedi tekuće brojače kase sa punim obračunom računa."""
+    check = _check_pos_enabled()
+    if check:
+        return check
+
+    location_id = request.args.get('location_id') or getattr(g, 'current_location_id', None)
+    session = CashRegisterSession.query.filter_by(
+        tenant_id=g.tenant_id,
+        location_id=location_id,
+        date=date.today(),
+    ).first()
+
+    if not session:
+        return {'error': 'Nema sesije za danas'}, 404
+
+    result = POSService.reconcile_session_totals(session.id)
+    return result, 200
+
+
 @bp.route('/reports/z', methods=['POST'])
 @jwt_required
 def z_report():
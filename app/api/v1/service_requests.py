@@ -14,6 +14,9 @@ from app.models.service_request import (
 from app.models.credits import OwnerType, CreditTransactionType
 from app.models.feature_flag import is_feature_enabled
 from app.api.middleware.auth import jwt_required
+from app.services.geo_service import geo_service
+from app.services.counter_service import counters
+from app.utils.pagination import paginate
 
 bp = Blueprint('service_requests', __name__, url_prefix='/service-requests')
 
@@ -57,8 +60,11 @@ def list_requests():
         )
     )
 
-    query = query.order_by(ServiceRequest.created_at.desc())
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate(
+        query, (ServiceRequest.created_at.desc(), ServiceRequest.id.desc()),
+        page=page, per_page=per_page
+    )
+    stats = counters.merge_pending('service_request', pagination.items, 'bid_count')
 
     return {
         'requests': [{
@@ -73,13 +79,71 @@ def list_requests():
             'budget_min': float(r.budget_min) if r.budget_min else None,
             'budget_max': float(r.budget_max) if r.budget_max else None,
             'urgency': r.urgency,
-            'bid_count': r.bid_count,
+            'bid_count': stats[r.id]['bid_count'],
             'created_at': r.created_at.isoformat(),
             'expires_at': r.expires_at.isoformat() if r.expires_at else None,
         } for r in pagination.items],
         'total': pagination.total,
-        'page': page,
+        'page': pagination.page,
         'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor,
+    }, 200
+
+
+@bp.route('/nearby', methods=['GET'])
+@jwt_required
+def nearby_requests():
+    """
+    Najbliži otvoreni zahtevi.
+
+    Bez lat/lon koristi se lokacija servisa (location_id ili primarna),
+    a podrazumevani radius je coverage_radius_km lokacije.
+    """
+    check = _check_b2c()
+    if check:
+        return check
+
+    location_id = request.args.get('location_id', type=int)
+    location_query = ServiceLocation.query.filter_by(tenant_id=g.tenant_id)
+    if location_id:
+        location = location_query.filter_by(id=location_id).first()
+    else:
+        location = location_query.filter_by(is_primary=True).first()
+
+    default_radius = (location.coverage_radius_km if location else None) or 25
+    origin = (location.latitude, location.longitude) if location else None
+    try:
+        geo = geo_service.parse_args(request.args, default_radius_km=default_radius, default_origin=origin)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    if not geo:
+        return {'error': 'Lokacija servisa nema koordinate - pošaljite lat i lon'}, 400
+    latitude, longitude, radius_km, limit = geo
+
+    results = geo_service.nearby_requests(
+        latitude, longitude, radius_km, limit, category=request.args.get('category')
+    )
+    stats = counters.merge_pending('service_request', [r for r, _ in results], 'bid_count')
+
+    return {
+        'requests': [{
+            'id': r.id,
+            'category': r.category.value,
+            'title': r.title,
+            'device_type': r.device_type,
+            'device_brand': r.device_brand,
+            'device_model': r.device_model,
+            'city': r.city,
+            'distance_km': round(distance, 2),
+            'budget_min': float(r.budget_min) if r.budget_min else None,
+            'budget_max': float(r.budget_max) if r.budget_max else None,
+            'urgency': r.urgency,
+            'bid_count': stats[r.id]['bid_count'],
+            'created_at': r.created_at.isoformat(),
+            'expires_at': r.expires_at.isoformat() if r.expires_at else None,
+        } for r, distance in results],
+        'origin': {'lat': latitude, 'lon': longitude},
+        'radius_km': radius_km,
     }, 200
 
 
@@ -95,6 +159,9 @@ def get_request(request_id):
     if not sr or sr.status not in (ServiceRequestStatus.OPEN, ServiceRequestStatus.IN_BIDDING):
         return {'error': 'Zahtev nije pronađen'}, 404
 
+    counters.incr('service_request', sr.id, 'view_count')
+    stats = counters.merge_pending('service_request', [sr], 'bid_count', 'view_count')[sr.id]
+
     # Korisnik je anoniman
     return {
         'id': sr.id,
@@ -108,8 +175,8 @@ def get_request(request_id):
         'budget_min': float(sr.budget_min) if sr.budget_min else None,
         'budget_max': float(sr.budget_max) if sr.budget_max else None,
         'urgency': sr.urgency,
-        'bid_count': sr.bid_count,
-        'view_count': sr.view_count,
+        'bid_count': stats['bid_count'],
+        'view_count': stats['view_count'],
         'created_at': sr.created_at.isoformat(),
         'expires_at': sr.expires_at.isoformat() if sr.expires_at else None,
     }, 200
@@ -179,13 +246,16 @@ def create_bid(request_id):
     )
     db.session.add(bid)
 
-    # Ažuriraj bid count i status
-    sr.bid_count = (sr.bid_count or 0) + 1
-    if sr.status == ServiceRequestStatus.OPEN:
-        sr.status = ServiceRequestStatus.IN_BIDDING
+    # Status: uslovni UPDATE umesto read-modify-write na popularnom redu
+    ServiceRequest.query.filter_by(
+        id=request_id, status=ServiceRequestStatus.OPEN
+    ).update({'status': ServiceRequestStatus.IN_BIDDING}, synchronize_session=False)
 
     db.session.commit()
 
+    # bid_count ide kroz write-behind brojač tek posle uspešnog commit-a
+    counters.incr('service_request', request_id, 'bid_count')
+
     return {
         'message': 'Ponuda poslata',
         'bid_id': bid.id,
@@ -204,11 +274,10 @@ def my_bids():
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 20, type=int), 100)
 
-    query = ServiceBid.query.filter_by(
-        tenant_id=g.tenant_id
-    ).order_by(ServiceBid.created_at.desc())
-
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    query = ServiceBid.query.filter_by(tenant_id=g.tenant_id)
+    pagination = paginate(
+        query, (ServiceBid.created_at.desc(), ServiceBid.id.desc()), page=page, per_page=per_page
+    )
 
     return {
         'bids': [{
@@ -223,8 +292,9 @@ def my_bids():
             'accepted_at': b.accepted_at.isoformat() if b.accepted_at else None,
         } for b in pagination.items],
         'total': pagination.total,
-        'page': page,
+        'page': pagination.page,
         'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor,
     }, 200
 
 
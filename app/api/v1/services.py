@@ -11,7 +11,9 @@ from sqlalchemy import func
 from app.extensions import db
 from app.models import ServiceItem, DEFAULT_CATEGORIES, TenantUser
 from app.api.middleware.auth import jwt_required
-from pydantic import BaseModel, Field
+from app.services.api_cache_service import cached_tenant_view
+from pydantic import Field
+from app.api.schemas.base import Schema
 from typing import Optional
 from decimal import Decimal
 
@@ -20,7 +22,7 @@ bp = Blueprint('services', __name__, url_prefix='/services')
 
 # ============== Pydantic Schemas ==============
 
-class ServiceCreate(BaseModel):
+class ServiceCreate(Schema):
     name: str = Field(..., min_length=2, max_length=200)
     description: Optional[str] = None
     category: str = Field(default='Ostalo', max_length=100)
@@ -31,7 +33,7 @@ class ServiceCreate(BaseModel):
     is_active: Optional[bool] = True
 
 
-class ServiceUpdate(BaseModel):
+class ServiceUpdate(Schema):
     name: Optional[str] = Field(None, min_length=2, max_length=200)
     description: Optional[str] = None
     category: Optional[str] = Field(None, max_length=100)
@@ -74,6 +76,7 @@ def get_tenant_categories(tenant_id: int) -> list:
 
 @bp.route('', methods=['GET'])
 @jwt_required
+@cached_tenant_view()
 def list_services():
     """
     Lista svih usluga za tenant.
@@ -315,6 +318,7 @@ def reorder_services():
 
 @bp.route('/stats', methods=['GET'])
 @jwt_required
+@cached_tenant_view()
 def get_stats():
     """
     Statistika usluga tenanta.
@@ -346,6 +350,7 @@ def get_stats():
 
 @bp.route('/categories', methods=['GET'])
 @jwt_required
+@cached_tenant_view()
 def get_categories():
     """
     Vraca listu dostupnih kategorija.
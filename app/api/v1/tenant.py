@@ -7,15 +7,17 @@ from sqlalchemy.orm.attributes import flag_modified
 from app.extensions import db
 from app.models import Tenant, ServiceLocation, TenantUser, ServiceRepresentative, TenantPublicProfile, PlatformSettings
 from app.api.middleware.auth import jwt_required
+from app.services.api_cache_service import cached_tenant_view
 from app.services.billing_tasks import get_next_invoice_number
 from app.services.ips_service import IPSService
 from app.middleware.public_site import invalidate_public_site_cache
-from pydantic import BaseModel, EmailStr, Field
+from app.utils.pagination import paginate
+from pydantic import EmailStr, Field
+from app.api.schemas.base import Schema
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta  # v3.05: kalendarski mesec
 import secrets
-import qrcode
 import io
 import base64
 
@@ -24,14 +26,14 @@ bp = Blueprint('tenant', __name__, url_prefix='/tenant')
 
 # ============== Pydantic Schemas ==============
 
-class TenantProfileUpdate(BaseModel):
+class TenantProfileUpdate(Schema):
     name: Optional[str] = Field(None, min_length=2, max_length=200)
     adresa_sedista: Optional[str] = Field(None, max_length=300)
     telefon: Optional[str] = Field(None, max_length=30)
     email: Optional[EmailStr] = None
 
 
-class TenantSettingsUpdate(BaseModel):
+class TenantSettingsUpdate(Schema):
     default_warranty_days: Optional[int] = Field(None, ge=0, le=365)
     default_currency: Optional[str] = Field(None, max_length=3)
     ticket_prefix: Optional[str] = Field(None, max_length=10)
@@ -40,7 +42,7 @@ class TenantSettingsUpdate(BaseModel):
     auto_sms_on_ready: Optional[bool] = None
 
 
-class KYCSubmission(BaseModel):
+class KYCSubmission(Schema):
     ime: str = Field(..., min_length=2, max_length=50)
     prezime: str = Field(..., min_length=2, max_length=50)
     jmbg: Optional[str] = Field(None, max_length=13)
@@ -54,7 +56,7 @@ class KYCSubmission(BaseModel):
     lk_back_url: Optional[str] = Field(None, max_length=500)
 
 
-class PublicProfileUpdate(BaseModel):
+class PublicProfileUpdate(Schema):
     """Schema za ažuriranje public profile-a."""
     is_public: Optional[bool] = None
 
@@ -135,7 +137,7 @@ class PublicProfileUpdate(BaseModel):
     hero_style: Optional[str] = Field(None, max_length=20)
 
 
-class CustomDomainSetup(BaseModel):
+class CustomDomainSetup(Schema):
     """Schema za podešavanje custom domena."""
     domain: str = Field(..., min_length=4, max_length=255)
 
@@ -658,6 +660,7 @@ def get_subscription_payments():
         - status: filter po statusu (PENDING, PAID, OVERDUE)
         - limit: broj rezultata (default 20)
         - offset: offset za paginaciju
+        - cursor: keyset paginacija (next_cursor iz prethodnog odgovora)
     """
     from app.models import SubscriptionPayment
 
@@ -677,19 +680,17 @@ def get_subscription_payments():
         query = query.filter(SubscriptionPayment.status == status)
 
     # Order by created_at desc
-    query = query.order_by(SubscriptionPayment.created_at.desc())
-
-    # Total count
-    total = query.count()
-
-    # Paginate
-    payments = query.offset(offset).limit(limit).all()
+    pagination = paginate(
+        query, (SubscriptionPayment.created_at.desc(), SubscriptionPayment.id.desc()),
+        per_page=limit, offset=offset
+    )
 
     return {
-        'payments': [p.to_dict() for p in payments],
-        'total': total,
+        'payments': [p.to_dict() for p in pagination.items],
+        'total': pagination.total,
         'limit': limit,
-        'offset': offset
+        'offset': offset,
+        'next_cursor': pagination.next_cursor
     }
 
 
@@ -1658,6 +1659,7 @@ def get_public_profile_qrcode():
         url = f'https://{tenant.slug}.shub.rs'
 
     # Generiši QR kod
+    import qrcode
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
@@ -1735,6 +1737,7 @@ def get_public_profile_preview():
 
 @bp.route('/features', methods=['GET'])
 @jwt_required
+@cached_tenant_view()
 def get_features():
     """Vrati aktivne feature flagove za tenant."""
     from app.models.feature_flag import is_feature_enabled
@@ -2143,6 +2146,7 @@ def get_sms_history():
         - per_page: broj po stranici (default 20, max 100)
         - status: filter po statusu (sent, failed, pending)
         - sms_type: filter po tipu (TICKET_READY, PICKUP_REMINDER_10, etc.)
+        - cursor: keyset paginacija (next_cursor iz prethodnog odgovora)
     """
     from app.models import TenantSmsUsage
 
@@ -2163,10 +2167,10 @@ def get_sms_history():
     if sms_type:
         query = query.filter(TenantSmsUsage.sms_type == sms_type)
 
-    query = query.order_by(TenantSmsUsage.created_at.desc())
-
     # Paginate
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = paginate(
+        query, (TenantSmsUsage.created_at.desc(), TenantSmsUsage.id.desc()), page=page, per_page=per_page
+    )
 
     return {
         'items': [{
@@ -2182,7 +2186,8 @@ def get_sms_history():
         'total': pagination.total,
         'page': pagination.page,
         'per_page': pagination.per_page,
-        'pages': pagination.pages
+        'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor
     }
 
 
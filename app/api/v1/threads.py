@@ -285,15 +285,17 @@ def get_thread_messages(thread_id):
     if after_id:
         query = query.filter(Message.id > after_id)
 
-    # Order by created_at
+    # Redosled po id-u, istom ključu kao before_id/after_id (index thread_id, id)
     if after_id:
         # Za polling - najstarije prvo
-        query = query.order_by(Message.created_at.asc())
+        query = query.order_by(Message.id.asc())
     else:
         # Za scroll - najnovije prvo
-        query = query.order_by(Message.created_at.desc())
+        query = query.order_by(Message.id.desc())
 
-    messages = query.limit(limit).all()
+    messages = query.limit(limit + 1).all()
+    has_more = len(messages) > limit
+    messages = messages[:limit]
 
     # Reverse za prikaz (najstarije prvo)
     if not after_id:
@@ -302,7 +304,7 @@ def get_thread_messages(thread_id):
     return jsonify({
         'messages': [message_to_dict(m) for m in messages],
         'thread_id': thread_id,
-        'has_more': len(messages) == limit
+        'has_more': has_more
     })
 
 
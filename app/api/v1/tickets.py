@@ -6,10 +6,9 @@ servisnim nalozima unutar tenanta.
 """
 
 from flask import Blueprint, request, jsonify, g
-from datetime import datetime
+from datetime import datetime, timedelta
 import io
 import base64
-import qrcode
 
 from ..middleware.auth import jwt_required, tenant_required, location_access_required
 from ...extensions import db
@@ -20,8 +19,12 @@ from ...models import (
     PartOrder, PartOrderItem, OrderStatus, SellerType, Supplier,
 )
 from ...services.pos_service import POSService
+from ...services.replica_service import read_replica
 from ...services.sms_service import sms_service
+from ...services.ticket_search_service import ticket_search
 from ...models.feature_flag import is_feature_enabled
+from ...utils.pagination import paginate
+from ...utils.json_provider import compact_jsonify
 from datetime import timezone as tz
 import json
 
@@ -38,9 +41,12 @@ def list_tickets():
     Query params:
         - status: filter po statusu (RECEIVED, IN_PROGRESS, itd.)
         - location_id: filter po lokaciji
-        - search: pretraga po imenu kupca, broju naloga, IMEI
+        - search: pretraga po kupcu, telefonu (bilo koji format), uredjaju,
+          IMEI i broju naloga; rezultati po relevantnosti, uz 'highlight'
         - page: broj stranice (default 1)
         - per_page: broj po stranici (default 20, max 100)
+        - cursor: keyset paginacija (next_cursor iz prethodnog odgovora);
+          ne važi uz search
 
     Returns:
         Paginirana lista naloga
@@ -48,9 +54,10 @@ def list_tickets():
     user = g.current_user
     tenant = g.current_tenant
 
-    # Osnovni query - samo nalozi iz dozvoljenih lokacija
+    # Osnovni query - samo nalozi iz dozvoljenih lokacija; relacije iz
+    # to_dict() se učitavaju za celu stranicu odjednom
     allowed_locations = user.get_accessible_location_ids()
-    query = ServiceTicket.query.filter(
+    query = ServiceTicket.query.options(*ServiceTicket.list_loader_options()).filter(
         ServiceTicket.tenant_id == tenant.id,
         ServiceTicket.location_id.in_(allowed_locations)
     )
@@ -68,34 +75,40 @@ def list_tickets():
     if location_id and location_id in allowed_locations:
         query = query.filter(ServiceTicket.location_id == location_id)
 
-    search = request.args.get('search', '').strip()
-    if search:
-        search_filter = f'%{search}%'
-        query = query.filter(
-            db.or_(
-                ServiceTicket.customer_name.ilike(search_filter),
-                ServiceTicket.imei.ilike(search_filter),
-                ServiceTicket.customer_phone.ilike(search_filter),
-                db.cast(ServiceTicket.ticket_number, db.String).ilike(search_filter)
-            )
-        )
-
     # Paginacija
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 20, type=int), 100)
 
-    # Sortiranje - najnoviji prvo
-    query = query.order_by(ServiceTicket.created_at.desc())
+    search = request.args.get('search', '').strip()
+    if search:
+        # Sortiranje po relevantnosti - rang nije keyset ključ, klasične stranice
+        query = ticket_search.apply(query, search)
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        items = ServiceTicket.serialize_many(pagination.items)
+        for t, item in zip(pagination.items, items):
+            item['highlight'] = ticket_search.highlight(t, search)
+        return compact_jsonify({
+            'items': items,
+            'total': pagination.total,
+            'page': page,
+            'per_page': per_page,
+            'pages': pagination.pages,
+            'next_cursor': None
+        }), 200
 
-    # Izvrsi query
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    # Sortiranje - najnoviji prvo
+    pagination = paginate(
+        query, (ServiceTicket.created_at.desc(), ServiceTicket.id.desc()),
+        page=page, per_page=per_page
+    )
 
-    return jsonify({
-        'items': [t.to_dict() for t in pagination.items],
+    return compact_jsonify({
+        'items': ServiceTicket.serialize_many(pagination.items),
         'total': pagination.total,
-        'page': page,
+        'page': pagination.page,
         'per_page': per_page,
-        'pages': pagination.pages
+        'pages': pagination.pages,
+        'next_cursor': pagination.next_cursor
     }), 200
 
 
@@ -587,6 +600,18 @@ def get_ticket_history(ticket_id):
         entity_id=ticket_id
     ).order_by(AuditLog.created_at.desc()).limit(50).all()
 
+    # Stariji nalozi: dopuni iz arhive, ograniceno od kreiranja naloga
+    # (PostgreSQL cita samo particije od ticket.created_at nadalje)
+    from ...services.log_retention_service import log_retention
+    if len(logs) < 50 and ticket.created_at and \
+            ticket.created_at < log_retention.hot_boundary('audit_log'):
+        logs += log_retention.fetch_archived(
+            'audit_log',
+            since=ticket.created_at - timedelta(days=1),
+            filters={'tenant_id': tenant.id, 'entity_type': 'ticket', 'entity_id': ticket_id},
+            limit=50 - len(logs)
+        )
+
     # Dohvati imena korisnika
     user_ids = [log.user_id for log in logs if log.user_id]
     user_names = {}
@@ -699,8 +724,8 @@ def notify_customer(ticket_id):
             'days_until_can_notify': days_left
         }), 400
 
-    # Kreiraj log notifikacije
-    notification_log = TicketNotificationLog(
+    # Kreiraj log notifikacije (ažurira i sažetak na nalogu)
+    notification_log = TicketNotificationLog.log(
         ticket_id=ticket.id,
         user_id=user.id,
         comment=data.get('comment'),
@@ -708,8 +733,6 @@ def notify_customer(ticket_id):
         contact_successful=data.get('contact_successful', False)
     )
 
-    db.session.add(notification_log)
-
     # Audit log
     AuditLog.log(
         entity_type='ticket',
@@ -718,7 +741,7 @@ def notify_customer(ticket_id):
         changes={
             'notification': {
                 'type': notification_log.notification_type,
-                'count': ticket.notification_count + 1,
+                'count': ticket.notification_count,
                 'contact_successful': notification_log.contact_successful
             }
         },
@@ -736,6 +759,45 @@ def notify_customer(ticket_id):
     }), 200
 
 
+@bp.route('/sms/pickup-reminders', methods=['POST'])
+@jwt_required
+@tenant_required
+def send_pickup_reminders():
+    """
+    Masovno slanje SMS podsetnika za preuzimanje.
+
+    Request body:
+        - days: 10 ili 30
+        - ticket_ids: Lista naloga (opciono - default svi READY nalozi
+          koji cekaju bar `days` dana bez podsetnika)
+
+    Returns:
+        200: Rezultat kampanje (sent, failed, refunded, skipped po razlogu)
+        400: Neispravan days ili ticket_ids
+    """
+    from ...services.sms_campaign_service import sms_campaigns
+
+    user = g.current_user
+    tenant = g.current_tenant
+    data = request.get_json() or {}
+
+    days = data.get('days')
+    if days not in (10, 30):
+        return jsonify({'error': 'Validation Error', 'message': 'days mora biti 10 ili 30'}), 400
+
+    location_ids = user.get_accessible_location_ids()
+    ticket_ids = data.get('ticket_ids')
+    if ticket_ids is None:
+        ticket_ids = sms_campaigns.due_pickup_reminders(tenant.id, days, location_ids)
+    elif not isinstance(ticket_ids, list) or not all(isinstance(i, int) for i in ticket_ids):
+        return jsonify({'error': 'Validation Error', 'message': 'ticket_ids mora biti lista ID-jeva'}), 400
+
+    result = sms_campaigns.send_pickup_reminders(
+        tenant.id, ticket_ids, days, location_ids=location_ids, user_id=user.id
+    )
+    return jsonify(result), 200
+
+
 @bp.route('/<int:ticket_id>/notifications', methods=['GET'])
 @jwt_required
 @tenant_required
@@ -1083,6 +1145,7 @@ def get_ticket_print_data(ticket_id):
         # Kreiraj pun URL za tracking
         track_url = f"{request.host_url.rstrip('/')}/track/{ticket.access_token}"
 
+        import qrcode
         qr = qrcode.QRCode(
             version=1,
             error_correction=qrcode.constants.ERROR_CORRECT_M,
@@ -1125,6 +1188,7 @@ def get_ticket_print_data(ticket_id):
 @bp.route('/stats', methods=['GET'])
 @jwt_required
 @tenant_required
+@read_replica
 def get_ticket_stats():
     """
     KPI statistike za dashboard (Dolce Vita stil).
@@ -1270,19 +1334,12 @@ def get_warranty_tickets():
     # Pretraga
     search = request.args.get('search', '').strip()
     if search:
-        search_pattern = f'%{search}%'
-        query = query.filter(
-            db.or_(
-                ServiceTicket.customer_name.ilike(search_pattern),
-                ServiceTicket.customer_phone.ilike(search_pattern),
-                ServiceTicket.brand.ilike(search_pattern),
-                ServiceTicket.model.ilike(search_pattern),
-                ServiceTicket.ticket_number.ilike(search_pattern)
-            )
-        )
+        query = ticket_search.apply(query, search, rank=False)
 
     # Dohvati sve i filtriraj u Pythonu (posto warranty_expires_at je property)
-    all_tickets = query.order_by(ServiceTicket.created_at.desc()).all()
+    all_tickets = query.options(*ServiceTicket.list_loader_options()).order_by(
+        ServiceTicket.created_at.desc()
+    ).all()
 
     # Filter po statusu garancije (samo za DELIVERED)
     warranty_filter = request.args.get('warranty_status', 'all')
@@ -1349,13 +1406,13 @@ def get_warranty_tickets():
             return 'expiring'
         return 'expired'
 
-    return jsonify({
+    return compact_jsonify({
         'tickets': [
             {
-                **t.to_dict(),
+                **data,
                 'warranty_status': get_warranty_status(t)
             }
-            for t in paginated
+            for t, data in zip(paginated, ServiceTicket.serialize_many(paginated))
         ],
         'stats': stats,
         'total': len(filtered_tickets),
@@ -1368,6 +1425,7 @@ def get_warranty_tickets():
 @bp.route('/stats/trend', methods=['GET'])
 @jwt_required
 @tenant_required
+@read_replica
 def get_ticket_trend():
     """
     Trend statistike za dashboard grafike (30 dana).
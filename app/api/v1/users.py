@@ -5,7 +5,9 @@ from flask import Blueprint, request, g
 from app.extensions import db
 from app.models import TenantUser, UserRole, UserLocation, ServiceLocation, TipUgovora, TipPlate
 from app.api.middleware.auth import jwt_required
-from pydantic import BaseModel, EmailStr, Field
+from app.services.api_cache_service import cached_tenant_view
+from pydantic import EmailStr, Field
+from app.api.schemas.base import Schema
 from typing import Optional, List
 from datetime import datetime, date
 from decimal import Decimal
@@ -15,7 +17,7 @@ bp = Blueprint('users', __name__, url_prefix='/users')
 
 # ============== Pydantic Schemas ==============
 
-class UserCreate(BaseModel):
+class UserCreate(Schema):
     # Login podaci
     username: str = Field(..., min_length=3, max_length=50)
     password: str = Field(..., min_length=6)
@@ -47,7 +49,7 @@ class UserCreate(BaseModel):
     location_ids: Optional[List[int]] = None
 
 
-class UserUpdate(BaseModel):
+class UserUpdate(Schema):
     # Osnovni podaci
     ime: Optional[str] = Field(None, min_length=2, max_length=50)
     prezime: Optional[str] = Field(None, min_length=2, max_length=50)
@@ -76,12 +78,12 @@ class UserUpdate(BaseModel):
     location_ids: Optional[List[int]] = None
 
 
-class PasswordChange(BaseModel):
+class PasswordChange(Schema):
     current_password: str
     new_password: str = Field(..., min_length=6)
 
 
-class PasswordReset(BaseModel):
+class PasswordReset(Schema):
     new_password: str = Field(..., min_length=6)
 
 
@@ -89,6 +91,7 @@ class PasswordReset(BaseModel):
 
 @bp.route('', methods=['GET'])
 @jwt_required
+@cached_tenant_view(vary_on_user=True)
 def list_users():
     """List all users for tenant (admin only)"""
     # Check if current user is admin
@@ -121,20 +124,26 @@ def list_users():
         ).all()]
         users = [u for u in users if u.id in user_ids]
 
+    # Lokacije svih korisnika jednim upitom
+    locations_by_user = {}
+    if users:
+        rows = db.session.query(UserLocation, ServiceLocation).join(
+            ServiceLocation, ServiceLocation.id == UserLocation.location_id
+        ).filter(
+            UserLocation.user_id.in_([u.id for u in users]),
+            UserLocation.is_active == True
+        ).order_by(UserLocation.location_id).all()
+        for ul, loc in rows:
+            locations_by_user.setdefault(ul.user_id, []).append({
+                'id': loc.id,
+                'name': loc.name,
+                'is_primary': ul.is_primary,
+                'can_manage': ul.can_manage
+            })
+
     result = []
     for user in users:
-        # Get user locations
-        user_locs = UserLocation.query.filter_by(user_id=user.id, is_active=True).all()
-        locations = []
-        for ul in user_locs:
-            loc = ServiceLocation.query.get(ul.location_id)
-            if loc:
-                locations.append({
-                    'id': loc.id,
-                    'name': loc.name,
-                    'is_primary': ul.is_primary,
-                    'can_manage': ul.can_manage
-                })
+        locations = locations_by_user.get(user.id, [])
 
         result.append({
             'id': user.id,
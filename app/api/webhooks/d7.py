@@ -11,6 +11,9 @@ Sigurnosne mere:
 2. Replay protection (max 5 min stara poruka)
 3. Idempotency (DlrLog sprečava duplu obradu)
 
+Webhook ne dira tenant_sms_usage - payload ide u red (Redis stream ili
+sms_dlr_log), a status i refund primenjuje dlr_service u batch-evima.
+
 Konfiguracija:
 - D7 Dashboard: podesiti webhook URL https://app.shub.rs/webhooks/d7/dlr
 - Heroku: dodati D7_WEBHOOK_SECRET environment varijablu
@@ -19,15 +22,12 @@ Konfiguracija:
 import os
 import hmac
 import hashlib
-import json
 from datetime import datetime, timedelta
 
 from flask import request, jsonify
 
 from . import bp
-from ...extensions import db
-from ...models.sms_management import TenantSmsUsage, SmsDlrLog
-from ...services.sms_billing_service import SmsBillingService
+from ...services.dlr_service import dlr_service
 
 
 @bp.route('/d7/dlr', methods=['POST'])
@@ -44,7 +44,7 @@ def d7_delivery_report():
     }
 
     Response:
-    - 200: OK, DLR processed
+    - 200: OK, DLR primljen (obrada u batch-u, vidi dlr_service)
     - 400: Bad request (missing fields, replay detected)
     - 401: Unauthorized (invalid signature)
     """
@@ -64,7 +64,6 @@ def d7_delivery_report():
     message_id = data.get('message_id')
     status = data.get('status')
     timestamp = data.get('timestamp')
-    error_code = data.get('error_code')
 
     if not message_id or not status:
         return jsonify({'error': 'Missing message_id or status'}), 400
@@ -85,43 +84,12 @@ def d7_delivery_report():
             print(f"[DLR] Invalid timestamp format: {e}")
             # Ne odbijaj poruku zbog lošeg timestamp formata
 
-    # 3. IDEMPOTENCY CHECK
-    existing_dlr = SmsDlrLog.query.filter_by(message_id=message_id).first()
-    if existing_dlr:
-        print(f"[DLR] Already processed: {message_id}")
+    # 3. ENQUEUE - status i refund primenjuje batch obrada (dlr_service)
+    if dlr_service.enqueue(data) == 'duplicate':
+        print(f"[DLR] Already received: {message_id}")
         return jsonify({'status': 'already_processed'}), 200
 
-    # 4. FIND SMS LOG AND UPDATE
-    sms_log = TenantSmsUsage.query.filter_by(
-        provider_message_id=message_id
-    ).first()
-
-    if sms_log:
-        # Update delivery status
-        sms_log.delivery_status = status
-        sms_log.delivery_status_at = datetime.utcnow()
-        if error_code:
-            sms_log.delivery_error_code = error_code
-
-        print(f"[DLR] Updated SMS {sms_log.id}: {status}")
-
-        # 5. AUTO-REFUND FOR FAILED/EXPIRED
-        if status in ('failed', 'expired'):
-            _process_refund(sms_log, status, error_code)
-    else:
-        print(f"[DLR] SMS not found for message_id: {message_id}")
-
-    # 6. LOG DLR FOR IDEMPOTENCY
-    dlr_log = SmsDlrLog(
-        message_id=message_id,
-        status=status,
-        raw_payload=json.dumps(data),
-        error_code=error_code
-    )
-    db.session.add(dlr_log)
-    db.session.commit()
-
-    return jsonify({'status': 'ok'}), 200
+    return jsonify({'status': 'queued'}), 200
 
 
 def _verify_signature(payload: bytes, signature: str) -> bool:
@@ -154,48 +122,6 @@ def _verify_signature(payload: bytes, signature: str) -> bool:
     return hmac.compare_digest(expected, signature)
 
 
-def _process_refund(sms_log: TenantSmsUsage, status: str, error_code: str = None):
-    """
-    Automatski refund kredita za neuspešan SMS.
-
-    Pronalazi originalnu transakciju preko reference_id i vraća kredit.
-    """
-    from ...models import CreditTransaction, CreditTransactionType
-
-    try:
-        # Pronađi originalnu SMS transakciju
-        original_transaction = CreditTransaction.query.filter_by(
-            reference_type='sms_usage',
-            reference_id=sms_log.id,
-            transaction_type=CreditTransactionType.SMS_NOTIFICATION
-        ).first()
-
-        if not original_transaction:
-            # Pokušaj pronaći preko ticket ID ako je reference_id ticket
-            if sms_log.reference_type == 'ticket' and sms_log.reference_id:
-                original_transaction = CreditTransaction.query.filter(
-                    CreditTransaction.reference_type == 'sms_usage',
-                    CreditTransaction.transaction_type == CreditTransactionType.SMS_NOTIFICATION,
-                    CreditTransaction.description.like(f'%SRV-%')
-                ).order_by(CreditTransaction.created_at.desc()).first()
-
-        if original_transaction:
-            reason = f"DLR {status}"
-            if error_code:
-                reason += f" (code: {error_code})"
-
-            success, msg = SmsBillingService.refund_sms(original_transaction.id, reason)
-            if success:
-                print(f"[DLR] Refund successful for SMS {sms_log.id}: {msg}")
-            else:
-                print(f"[DLR] Refund failed for SMS {sms_log.id}: {msg}")
-        else:
-            print(f"[DLR] No transaction found for SMS {sms_log.id}")
-
-    except Exception as e:
-        print(f"[DLR] Refund error: {e}")
-
-
 @bp.route('/d7/test', methods=['GET'])
 def d7_test():
     """
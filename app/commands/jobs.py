@@ -3,6 +3,7 @@ Background jobs za ServisHub - poziva se via Heroku Scheduler.
 
 Komande:
 - flask check-orders: Auto-expire isteklih narudzbina + reminder supplier-ima (svaka 10 min)
+- flask log-retention: Rotacija audit/security logova u arhivu + dnevni agregati (dnevno)
 """
 import click
 from datetime import datetime, timedelta
@@ -96,3 +97,218 @@ def send_pending_reminders():
             pass
 
     return count
+
+
+@click.command('log-retention')
+@click.option('--source', 'sources', multiple=True,
+              help='Tabela za rotaciju (audit_log, security_event, ...). Default: sve.')
+@with_appcontext
+def log_retention_cmd(sources):
+    """
+    Premesta stare log redove u arhivu i brise istekle arhivske particije.
+    Scheduler ga pokrece svaki dan u 03:30 UTC, komanda je za rucno pokretanje.
+    """
+    from app.services.log_retention_service import log_retention, LOG_POLICIES
+
+    for source in sources:
+        if source not in LOG_POLICIES:
+            raise click.BadParameter(f'Nepoznat izvor: {source}. Dozvoljeno: {", ".join(LOG_POLICIES)}')
+
+    stats = log_retention.run(sources=list(sources) or None)
+    for source, result in stats['sources'].items():
+        click.echo(f'{source}: days={result["days"]}, archived={result["archived"]}, expired={result["expired"]}')
+    for err in stats['errors']:
+        click.echo(f'  Greska: {err}')
+
+
+@click.command('pos-reconcile')
+@click.option('--date', 'day', default=None, help='Datum sesija (YYYY-MM-DD). Default: juce.')
+@click.option('--fix/--no-fix', default=False, help='Prepisi brojace punim obracunom ako se razlikuju.')
+@with_appcontext
+def pos_reconcile_cmd(day, fix):
+    """
+    Uporedjuje tekuce brojace kase (cash_register_totals) sa punim obracunom racuna.
+    Scheduler ga pokrece svaki dan u 04:15 UTC sa --fix.
+    """
+    from datetime import date, datetime, timedelta
+    from app.extensions import db
+    from app.services.pos_service import POSService
+
+    target = datetime.strptime(day, '%Y-%m-%d').date() if day else date.today() - timedelta(days=1)
+
+    mismatched = POSService.reconcile_sessions_for_date(target, fix=fix)
+    db.session.commit()
+
+    for result in mismatched:
+        click.echo(f'Sesija {result["session_id"]}: {result["differences"]}')
+    click.echo(f'{target}: sesija sa razlikama: {len(mismatched)}' + (' (ispravljeno)' if fix and mismatched else ''))
+
+
+@click.command('stock-checkpoints')
+@click.option('--cutoff', default=None, help='Granica checkpoint-a (YYYY-MM-DD). Default: danasnja ponoc UTC.')
+@click.option('--verify', is_flag=True, help='Posle checkpoint-a proveri LocationStock cache naspram ledger-a.')
+@with_appcontext
+def stock_checkpoints_cmd(cutoff, verify):
+    """
+    Upisuje checkpoint-e stanja zaliha (StockBalanceSnapshot).
+    Scheduler ga pokrece svaki dan u 02:45 UTC.
+    """
+    from datetime import datetime
+    from app.extensions import db
+    from app.services.stock_ledger_service import stock_ledger
+
+    cutoff_dt = datetime.strptime(cutoff, '%Y-%m-%d') if cutoff else None
+    result = stock_ledger.write_checkpoints(cutoff=cutoff_dt)
+    db.session.commit()
+    click.echo(f'cutoff={result["cutoff"]}, upisano={result["written"]}')
+
+    if verify:
+        mismatches = stock_ledger.verify_cache()
+        for m in mismatches:
+            click.echo(f'  Razlika: {m}')
+        click.echo(f'Razlika cache/ledger: {len(mismatches)}')
+
+
+@click.command('finance-rollup')
+@click.option('--days', default=2, type=int, help='Broj dana unazad (od juce). Npr. --days 400 da i stariji periodi citaju agregate.')
+@with_appcontext
+def finance_rollup_cmd(days):
+    """
+    Preracunava daily_revenue_fact za poslednjih N dana (bez danasnjeg).
+    Scheduler ga pokrece svaki dan u 02:15 UTC za juce i prekjuce.
+    """
+    from datetime import date, timedelta
+    from app.extensions import db
+    from app.services.finance_service import FinanceService
+
+    end = date.today() - timedelta(days=1)
+    start = end - timedelta(days=max(days, 1) - 1)
+
+    result = FinanceService.rollup_days(start, end)
+    db.session.commit()
+    click.echo(f'{result["start"]}..{result["end"]}: upisano redova={result["rows"]}')
+
+
+@click.command('counters-flush')
+@with_appcontext
+def counters_flush_cmd():
+    """
+    Upisuje pending write-behind brojace (view_count, bid_count) u bazu.
+    Scheduler ga pokrece svaki minut.
+    """
+    from app.services.counter_service import counters
+
+    updated = counters.flush()
+    click.echo(f'Upisano brojaca: {updated}')
+
+
+@click.command('dlr-process')
+@with_appcontext
+def dlr_process_cmd():
+    """
+    Primenjuje primljene D7 delivery report-ove (status + refund) u batch-evima.
+    Scheduler ga pokrece svakih 15 sekundi.
+    """
+    from app.services.dlr_service import dlr_service
+
+    result = dlr_service.process()
+    click.echo(
+        f'Primljeno={result["received"]} obradjeno={result["processed"]} '
+        f'azurirano={result["updated"]} refund={result["refunded"]}'
+    )
+
+
+@click.command('ticket-search-reindex')
+@click.option('--tenant-id', default=None, type=int, help='Samo nalozi jednog tenanta.')
+@with_appcontext
+def ticket_search_reindex_cmd(tenant_id):
+    """
+    Ponovo racuna search_text naloga (posle izmene normalizacije pretrage).
+    Na SQLite-u trigeri osvezavaju i FTS tabelu.
+    """
+    from app.services.ticket_search_service import ticket_search
+
+    changed = ticket_search.reindex(tenant_id=tenant_id)
+    click.echo(f'Reindeksirano naloga: {changed}')
+
+
+@click.command('assets-build')
+@click.option('--tailwind-bin', default='npx tailwindcss', help='Tailwind CLI (npx ili standalone binarni fajl).')
+@with_appcontext
+def assets_build_cmd(tailwind_bin):
+    """
+    Prekompajlira Tailwind CSS u app/static/css/tailwind.css.
+    Kada fajl postoji, layout-i ga ucitavaju umesto Tailwind CDN skripte.
+    """
+    import os
+    import shlex
+    import subprocess
+    from flask import current_app
+
+    root = os.path.dirname(current_app.root_path)
+    css_dir = os.path.join(current_app.static_folder, 'css')
+    command = shlex.split(tailwind_bin) + [
+        '-c', os.path.join(root, 'tailwind.config.js'),
+        '-i', os.path.join(css_dir, 'tailwind.input.css'),
+        '-o', os.path.join(css_dir, 'tailwind.css'),
+        '--minify',
+    ]
+    try:
+        subprocess.run(command, cwd=root, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise click.ClickException(f'Tailwind build nije uspeo: {e}')
+
+    size = os.path.getsize(os.path.join(css_dir, 'tailwind.css'))
+    click.echo(f'Tailwind CSS: {size / 1024:.1f} KB')
+
+
+@click.command('routes-manifest')
+@with_appcontext
+def routes_manifest_cmd():
+    """
+    Zapisuje app/route_manifest.json za LAZY_ROUTES mod.
+    Pokreće se u build-u (bin/post_compile) posle svake izmene ruta.
+    """
+    from flask import current_app
+    from app.utils.lazy_routes import MANIFEST_PATH, is_lazy, load_manifest, write_manifest
+
+    # Lazy aplikacija je već učitala važeći manifest
+    if is_lazy(current_app):
+        click.echo(f'{len(load_manifest()["routes"])} ruta, manifest je aktuelan')
+        return
+    try:
+        manifest = write_manifest(current_app)
+    except (OSError, ValueError) as e:
+        raise click.ClickException(f'Manifest nije zapisan: {e}')
+    click.echo(f'{len(manifest["routes"])} ruta -> {MANIFEST_PATH}')
+
+
+@click.command('import-profile')
+@click.option('--top', default=20, help='Broj najsporijih modula/paketa u izveštaju.')
+@click.option('--budget-ms', type=float, default=None, help='Greška ako ukupan import traje duže.')
+@with_appcontext
+def import_profile_cmd(top, budget_ms):
+    """
+    Import profil boot-a (python -X importtime nad create_app()).
+    Prikazuje najsporije module i zbir po paketu.
+    """
+    import os
+    from flask import current_app
+    from app.utils.import_profile import profile_imports, summarize
+
+    try:
+        entries = profile_imports(cwd=os.path.dirname(current_app.root_path))
+    except RuntimeError as e:
+        raise click.ClickException(f'Boot nije uspeo: {e}')
+    report = summarize(entries, top=top)
+
+    click.echo(f'Ukupno: {report["total_ms"]} ms, {report["modules"]} modula')
+    click.echo('\nNajsporiji moduli (cumulative ms):')
+    for module, ms in report['slowest']:
+        click.echo(f'  {ms:>8.1f}  {module}')
+    click.echo('\nPo paketu (self ms):')
+    for package, ms in report['packages']:
+        click.echo(f'  {ms:>8.1f}  {package}')
+
+    if budget_ms is not None and report['total_ms'] > budget_ms:
+        raise click.ClickException(f'Import {report["total_ms"]} ms > budžet {budget_ms} ms')
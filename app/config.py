@@ -40,6 +40,16 @@ class Config:
         'pool_recycle': 300,    # Recikliraj konekcije nakon 5 min
     }
 
+    # Read replika (app/services/replica_service.py) - izveštaji i liste
+    # označeni sa @read_replica čitaju sa nje; bez URL-a sve ide na primarnu.
+    # - REPLICA_MAX_LAG_SECONDS: veće kašnjenje replike -> čitanje sa primarne
+    # - REPLICA_READ_YOUR_WRITES_SECONDS: posle upisa korisnik toliko čita sa primarne
+    SQLALCHEMY_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL') or None
+    if SQLALCHEMY_REPLICA_URL and SQLALCHEMY_REPLICA_URL.startswith('postgres://'):
+        SQLALCHEMY_REPLICA_URL = SQLALCHEMY_REPLICA_URL.replace('postgres://', 'postgresql://', 1)
+    REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', '10'))
+    REPLICA_READ_YOUR_WRITES_SECONDS = int(os.getenv('REPLICA_READ_YOUR_WRITES_SECONDS', '15'))
+
     # JWT Authentication
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(
@@ -55,6 +65,16 @@ class Config:
     # Redis (za cache i Celery)
     REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
 
+    # Redis pool i circuit breaker (app/services/redis_service.py)
+    # - REDIS_MAX_CONNECTIONS: konekcija po procesu (gunicorn threads + scheduler)
+    # - REDIS_BREAKER_FAILURES: uzastopnih grešaka do otvaranja prekidača
+    # - REDIS_HEALTH_PROBE_SECONDS: PING iz pozadinske niti (0 = isključen)
+    REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', '20'))
+    REDIS_SOCKET_TIMEOUT = float(os.getenv('REDIS_SOCKET_TIMEOUT', '2'))
+    REDIS_BREAKER_FAILURES = int(os.getenv('REDIS_BREAKER_FAILURES', '3'))
+    REDIS_BREAKER_RESET_SECONDS = int(os.getenv('REDIS_BREAKER_RESET_SECONDS', '30'))
+    REDIS_HEALTH_PROBE_SECONDS = int(os.getenv('REDIS_HEALTH_PROBE_SECONDS', '15'))
+
     # Celery
     CELERY_BROKER_URL = REDIS_URL
     CELERY_RESULT_BACKEND = REDIS_URL
@@ -78,6 +98,27 @@ class Config:
     # Warranty defaults (mogu se override-ovati per-tenant)
     DEFAULT_WARRANTY_DAYS = 45
 
+    # SMS kampanje - broj paralelnih D7 zahteva (po 100 poruka)
+    SMS_CAMPAIGN_CONCURRENCY = int(os.getenv('SMS_CAMPAIGN_CONCURRENCY', '4'))
+
+    # SQL profiler (app/services/sql_profiler_service.py) - metrike po request-u,
+    # izveštaj na /api/admin/performance/endpoints
+    SQL_PROFILER_ENABLED = os.getenv('SQL_PROFILER_ENABLED', 'true').lower() == 'true'
+    SQL_PROFILER_SERVER_TIMING = os.getenv('SQL_PROFILER_SERVER_TIMING', 'true').lower() == 'true'
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv('SQL_N_PLUS_ONE_THRESHOLD', '10'))
+
+    # Kompresija odgovora (app/middleware/compression.py)
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+    COMPRESS_CACHE_SIZE = int(os.getenv('COMPRESS_CACHE_SIZE', '64'))
+
+    # Cold start (app/utils/lazy_routes.py)
+    # - LAZY_ROUTES: rute iz app/route_manifest.json, modul view-a se
+    #   importuje na prvi request (`flask routes-manifest` pravi manifest)
+    # - SCHEDULER_START_DELAY: sekundi posle boot-a do starta scheduler-a
+    LAZY_ROUTES = os.getenv('LAZY_ROUTES', 'false').lower() == 'true'
+    SCHEDULER_START_DELAY = float(os.getenv('SCHEDULER_START_DELAY', '5'))
+
     # CORS
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
 
@@ -96,6 +137,15 @@ class Config:
     # - Default: True
     TOKEN_BLACKLIST_ENABLED = os.getenv('TOKEN_BLACKLIST_ENABLED', 'true').lower() == 'true'
 
+    # PASSWORD HASHING (app/services/password_service.py)
+    # - BCRYPT_ROUNDS: cost za nove hash-eve; stari se preracunavaju pri prijavi
+    # - PASSWORD_POOL_WORKERS: procesi za bcrypt (0 = u request thread-u)
+    # - PASSWORD_POOL_MAX_PENDING: preko ovoliko zahteva u redu -> 503
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+    PASSWORD_POOL_WORKERS = int(os.getenv('PASSWORD_POOL_WORKERS', '2'))
+    PASSWORD_POOL_MAX_PENDING = int(os.getenv('PASSWORD_POOL_MAX_PENDING', '16'))
+    PASSWORD_VERIFY_TIMEOUT = int(os.getenv('PASSWORD_VERIFY_TIMEOUT', '5'))
+
     # Insecure defaults - lista vrednosti koje nikad ne smeju biti u produkciji
     INSECURE_SECRETS = [
         'jwt-secret-key-change-in-production',
@@ -121,6 +171,8 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(seconds=5)
+    BCRYPT_ROUNDS = 4
+    PASSWORD_POOL_WORKERS = 0
 
 
 def _get_production_cors_origins() -> list:
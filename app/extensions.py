@@ -4,47 +4,37 @@ Ekstenzije se inicijalizuju ovde, a povezuju sa app-om u __init__.py.
 """
 
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_cors import CORS
 
+from .utils.db_routing import RoutingSession
+
 # SQLAlchemy - ORM za rad sa bazom podataka
 # Koristi se za sve modele (Tenant, User, ServiceTicket, itd.)
-db = SQLAlchemy()
-
-# Flask-Migrate - Alembic wrapper za migracije baze
-# Komande: flask db migrate, flask db upgrade
-migrate = Migrate()
+# RoutingSession: SELECT-ovi u @read_replica kodu idu na read repliku
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Flask-CORS - Cross-Origin Resource Sharing
 # Potrebno za frontend koji se hostuje na drugom domenu
 cors = CORS()
 
 
-# Redis klijent - inicijalizuje se lazy loading-om
-_redis_client = None
+def init_migrate(app):
+    """
+    Flask-Migrate - Alembic wrapper za migracije baze.
+    Komande: flask db migrate, flask db upgrade
+
+    Alembic je spor za import, a potreban je samo CLI-ju - web proces
+    ga ne učitava.
+    """
+    from flask_migrate import Migrate
+    return Migrate(app, db)
 
 
 def get_redis():
     """
-    Vraca Redis klijent (lazy loading).
-    Koristi se za cache i kao Celery broker.
+    Vraca Redis klijent nad deljenim connection pool-om.
+    Servisi ga uzimaju kroz redis_manager.client() (circuit breaker,
+    app/services/redis_service.py).
     """
-    global _redis_client
-    if _redis_client is None:
-        import redis
-        import ssl
-        from flask import current_app
-        redis_url = current_app.config['REDIS_URL']
-        # Heroku Redis koristi self-signed certifikate
-        if redis_url.startswith('rediss://'):
-            _redis_client = redis.from_url(
-                redis_url,
-                decode_responses=True,
-                ssl_cert_reqs=None  # Disable SSL verification for Heroku
-            )
-        else:
-            _redis_client = redis.from_url(
-                redis_url,
-                decode_responses=True
-            )
-    return _redis_client
+    from .services.redis_service import redis_manager
+    return redis_manager.connection()
@@ -6,11 +6,13 @@ Ove stranice ne zahtevaju autentifikaciju.
 
 from flask import render_template, g
 from . import bp
+from app.services.public_cache_service import cached_public_page
 
 
 # ============== Landing ==============
 
 @bp.route('/')
+@cached_public_page()
 def landing():
     """
     Landing stranica ili javna stranica tenanta.
@@ -12,11 +12,16 @@ Security:
 - All routes require is_public flag on profile
 - Rate limiting on API endpoints (60 req/min)
 - No sensitive data exposed in public responses
+
+Performance:
+- Stranice i API odgovori keširani u Redis-u (cached_public_page),
+  purge po tenantu na promenu profila, usluga ili recenzija
 """
 
 from flask import Blueprint, render_template, g, abort, jsonify
 from app.models import ServiceItem, TenantGoogleIntegration, TenantGoogleReview
 from app.utils.security import rate_limit, get_client_ip
+from app.services.public_cache_service import cached_public_page
 
 
 bp = Blueprint('tenant_public', __name__)
@@ -28,7 +33,7 @@ def require_public_site(f):
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not g.get('is_public_site') or not g.get('public_tenant'):
+        if not g.get('is_public_site') or not g.get('public_tenant_id'):
             abort(404)
         return f(*args, **kwargs)
     return decorated_function
@@ -43,6 +48,7 @@ def require_public_site(f):
 
 @bp.route('/cenovnik')
 @require_public_site
+@cached_public_page()
 def cenovnik():
     """Stranica sa cenovnikom."""
     tenant = g.public_tenant
@@ -75,6 +81,7 @@ def cenovnik():
 
 @bp.route('/kontakt')
 @require_public_site
+@cached_public_page()
 def kontakt():
     """Kontakt stranica."""
     tenant = g.public_tenant
@@ -89,6 +96,7 @@ def kontakt():
 
 @bp.route('/o-nama')
 @require_public_site
+@cached_public_page()
 def o_nama():
     """O nama stranica."""
     tenant = g.public_tenant
@@ -103,6 +111,7 @@ def o_nama():
 
 @bp.route('/politika-privatnosti')
 @require_public_site
+@cached_public_page()
 def politika_privatnosti():
     """Politika privatnosti stranica."""
     tenant = g.public_tenant
@@ -121,6 +130,7 @@ def politika_privatnosti():
 @bp.route('/api/info')
 @require_public_site
 @rate_limit(limit=60, window=60)  # 60 requests per minute
+@cached_public_page()
 def api_info():
     """
     JSON podaci o tenantu za javnu stranicu.
@@ -138,6 +148,7 @@ def api_info():
 @bp.route('/api/services')
 @require_public_site
 @rate_limit(limit=60, window=60)  # 60 requests per minute
+@cached_public_page()
 def api_services():
     """
     JSON lista usluga.
@@ -166,6 +177,7 @@ def api_services():
 @bp.route('/api/reviews')
 @require_public_site
 @rate_limit(limit=60, window=60)
+@cached_public_page()
 def api_reviews():
     """
     JSON lista Google recenzija.
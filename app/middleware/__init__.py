@@ -2,8 +2,12 @@
 Middleware moduli za ServisHub.
 
 - security_headers: Dodaje sigurnosne HTTP headers na sve responses
+- compression: gzip/brotli kompresija HTML/JSON/CSS/JS odgovora
+- static_assets: fingerprint statičkih fajlova i immutable keš
 """
 
 from .security_headers import init_security_headers, get_security_headers
+from .compression import init_compression
+from .static_assets import init_static_assets
 
-__all__ = ['init_security_headers', 'get_security_headers']
\ No newline at end of file
+__all__ = ['init_security_headers', 'get_security_headers', 'init_compression', 'init_static_assets']
\ No newline at end of file
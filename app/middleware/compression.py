@@ -0,0 +1,148 @@
+"""
+Compression Middleware - gzip/brotli za HTML, JSON, CSS i JS odgovore.
+
+Stranice tenanta (lista naloga, podešavanja) su 200+ KB HTML-a, a na
+sporoj vezi servisa to je najveći deo čekanja. Kompresija se radi u
+after_request:
+
+- Accept-Encoding pregovaranje: br (ako je instaliran `brotli`), pa gzip
+- samo tekstualni tipovi iznad COMPRESS_MIN_SIZE bajtova
+- HTML/CSS/JS (render template-a, statika) su isti bajtovi za sve
+  korisnike - kompresovana varijanta se kešira po hash-u sadržaja
+  (LRU, COMPRESS_CACHE_SIZE), jači nivo jer se radi jednom
+- JSON se razlikuje po request-u - brz nivo, bez keša
+- streaming odgovori, Range (206), 304 i već kodirani se preskaču
+
+ETag postaje weak (isti resurs, drugo kodiranje) - If-None-Match i dalje
+vraća 304.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import Flask, request
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+
+COMPRESSIBLE_TYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/javascript', 'application/javascript',
+    'application/json', 'application/xml', 'image/svg+xml',
+}
+# Tipovi čiji se render ponavlja - kompresovana varijanta se kešira
+CACHEABLE_TYPES = {'text/html', 'text/css', 'text/javascript', 'application/javascript', 'image/svg+xml'}
+
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_CACHE_SIZE = 64
+
+# (kešira se, jednokratno) - nivo
+GZIP_LEVEL = {True: 9, False: 5}
+BROTLI_QUALITY = {True: 9, False: 4}
+
+
+def choose_encoding(accept_encodings) -> str:
+    """Najbolje podržano kodiranje iz Accept-Encoding ili None."""
+    if BROTLI_AVAILABLE and accept_encodings.quality('br') > 0:
+        return 'br'
+    if accept_encodings.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+
+def compress(data: bytes, encoding: str, cacheable: bool = False) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY[cacheable])
+    return gzip.compress(data, compresslevel=GZIP_LEVEL[cacheable], mtime=0)
+
+
+class CompressionCache:
+    """LRU kompresovanih varijanti po (hash sadržaja, kodiranje)."""
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compress(self, data: bytes, encoding: str) -> bytes:
+        key = (hashlib.sha1(data).digest(), encoding)
+        with self._lock:
+            cached = self._items.get(key)
+            if cached is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        compressed = compress(data, encoding, cacheable=True)
+        with self._lock:
+            self.misses += 1
+            self._items[key] = compressed
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return compressed
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+
+# Singleton instance
+compression_cache = CompressionCache()
+
+
+def init_compression(app: Flask) -> None:
+    """
+    Inicijalizuje kompresiju odgovora (COMPRESS_ENABLED).
+
+    Registrovati pre ostalih after_request hook-ova - Flask ih izvršava
+    obrnutim redom, pa kompresija vidi konačno telo odgovora.
+    """
+    if not app.config.get('COMPRESS_ENABLED', True):
+        return
+
+    min_size = app.config.get('COMPRESS_MIN_SIZE', DEFAULT_MIN_SIZE)
+    compression_cache.max_entries = app.config.get('COMPRESS_CACHE_SIZE', DEFAULT_CACHE_SIZE)
+
+    @app.after_request
+    def compress_response(response):
+        if response.mimetype not in COMPRESSIBLE_TYPES:
+            return response
+        if (response.status_code < 200 or response.status_code in (204, 206, 304)
+                or 'Content-Encoding' in response.headers):
+            return response
+        if response.is_streamed and not response.direct_passthrough:
+            return response  # generator (npr. export) - ne baferujemo ga ovde
+
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        # send_file odgovor (statika) - pročitaj fajl u memoriju
+        response.direct_passthrough = False
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        if response.mimetype in CACHEABLE_TYPES:
+            body = compression_cache.get_or_compress(data, encoding)
+        else:
+            body = compress(data, encoding)
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    app.logger.info(f'Response compression initialized (brotli={BROTLI_AVAILABLE})')
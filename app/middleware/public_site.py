@@ -13,76 +13,92 @@ Security:
 - Only profiles with is_public=True are served
 
 Performance:
-- Simple in-memory cache for tenant/profile lookups
-- Cache invalidated on profile updates
+- Host -> (tenant_id, profile_id, is_public) lookup cached in Redis (shared across workers)
+- Cache invalidated on profile updates (tag purge per tenant)
 - TTL: 5 minutes for performance, short enough for quick updates
+- g.public_tenant / g.public_profile se učitavaju iz baze tek pri prvom
+  pristupu - HIT iz keša stranica (cached_public_page) ne radi nijedan upit
 """
 
 from flask import request, g
+from werkzeug.local import LocalProxy
+from app.extensions import db
 from app.models import Tenant, TenantPublicProfile
-from datetime import datetime, timedelta
-from threading import Lock
+from app.services.public_cache_service import public_cache
 
 
 # ============================================
 # CACHING LAYER
 # ============================================
 
-# Simple in-memory cache for tenant lookups
-_cache = {}
-_cache_lock = Lock()
-_cache_ttl = 300  # 5 minutes
-
-
-def _get_cached(key: str):
-    """Get value from cache if not expired."""
-    with _cache_lock:
-        if key in _cache:
-            value, expires_at = _cache[key]
-            if datetime.utcnow() < expires_at:
-                return value
-            else:
-                del _cache[key]
-    return None
-
-
-def _set_cached(key: str, value):
-    """Set value in cache with TTL."""
-    with _cache_lock:
-        _cache[key] = (value, datetime.utcnow() + timedelta(seconds=_cache_ttl))
-
-
 def invalidate_public_site_cache(tenant_id: int = None, slug: str = None, domain: str = None):
     """
     Invalidate cache entries for a tenant.
 
-    Call this when updating TenantPublicProfile.
+    Call this when updating TenantPublicProfile. Keš je u Redis-u
+    (public_cache), pa invalidacija važi za sve worker-e, a purge po
+    tenant_id briše i keširane javne stranice.
 
     Args:
         tenant_id: Tenant ID to invalidate
         slug: Tenant slug to invalidate
         domain: Custom domain to invalidate
     """
-    with _cache_lock:
-        to_remove = []
-        if tenant_id:
-            for key, (value, _) in list(_cache.items()):
-                if isinstance(value, tuple) and len(value) == 2:
-                    tenant, profile = value
-                    if tenant and tenant.id == tenant_id:
-                        to_remove.append(key)
-        if slug:
-            key = f'subdomain:{slug}'
-            if key in _cache:
-                to_remove.append(key)
-        if domain:
-            key = f'custom_domain:{domain}'
-            if key in _cache:
-                to_remove.append(key)
-
-        for key in set(to_remove):
-            if key in _cache:
-                del _cache[key]
+    if tenant_id:
+        public_cache.purge_tenant(tenant_id)
+    if slug:
+        public_cache.forget_site('subdomain', slug)
+    if domain:
+        public_cache.forget_site('custom_domain', domain)
+
+
+def _site_entry(tenant, profile) -> dict:
+    """Lookup unos za keš: samo ID-evi i is_public (bez ORM objekata)."""
+    return {
+        'tenant_id': tenant.id if tenant else None,
+        'profile_id': profile.id if profile else None,
+        'is_public': bool(profile and profile.is_public),
+    }
+
+
+def _lookup_site(kind: str, value: str) -> dict:
+    """
+    Lookup hosta: keš, pa baza (rezultat se kešira, i kad tenant ne postoji).
+
+    Ako je lookup došao iz baze, učitani objekti se ostavljaju na g za
+    _public_objects() - isti request ih ne učitava ponovo.
+
+    Returns:
+        dict {'tenant_id', 'profile_id', 'is_public'}
+    """
+    cached = public_cache.get_site(kind, value)
+    if cached is not None and 'is_public' in cached:
+        return cached
+
+    if kind == 'subdomain':
+        tenant = Tenant.query.filter_by(slug=value).first()
+        profile = TenantPublicProfile.query.filter_by(tenant_id=tenant.id).first() if tenant else None
+    else:
+        profile = TenantPublicProfile.query.filter_by(
+            custom_domain=value,
+            custom_domain_verified=True
+        ).first()
+        tenant = profile.tenant if profile else None
+
+    site = _site_entry(tenant, profile)
+    public_cache.set_site(kind, value, **site)
+    g._public_site_objects = (tenant, profile)
+    return site
+
+
+def _public_objects() -> tuple:
+    """(Tenant, TenantPublicProfile) javne stranice, učitani pri prvom pristupu."""
+    objects = g.get('_public_site_objects')
+    if objects is None:
+        tenant = db.session.get(Tenant, g.public_tenant_id)
+        profile = db.session.get(TenantPublicProfile, g.public_profile_id)
+        objects = g._public_site_objects = (tenant, profile)
+    return objects
 
 
 # ============================================
@@ -160,64 +176,20 @@ def extract_custom_domain(host: str) -> str | None:
 # TENANT LOOKUP
 # ============================================
 
-def find_tenant_by_subdomain(subdomain: str) -> tuple:
-    """
-    Pronalazi tenant po subdomenu (slug).
-
-    Uses caching for performance.
-
-    Returns:
-        Tuple (Tenant, TenantPublicProfile) ili (None, None)
-    """
-    cache_key = f'subdomain:{subdomain}'
-
-    # Check cache first
-    cached = _get_cached(cache_key)
-    if cached is not None:
-        return cached
-
-    # Query database
-    tenant = Tenant.query.filter_by(slug=subdomain).first()
-    if not tenant:
-        _set_cached(cache_key, (None, None))
-        return None, None
-
-    profile = TenantPublicProfile.query.filter_by(tenant_id=tenant.id).first()
-    result = (tenant, profile)
-
-    _set_cached(cache_key, result)
-    return result
-
-
-def find_tenant_by_custom_domain(domain: str) -> tuple:
+def find_public_site(kind: str, value: str) -> dict | None:
     """
-    Pronalazi tenant po custom domenu.
+    Javna stranica za subdomen ('subdomain') ili custom domen ('custom_domain').
 
-    Uses caching for performance.
+    Uses caching for performance - keširan lookup ne dira bazu.
 
     Returns:
-        Tuple (Tenant, TenantPublicProfile) ili (None, None)
+        dict {'tenant_id', 'profile_id', 'is_public'} ili None ako
+        tenant/profil ne postoji
     """
-    cache_key = f'custom_domain:{domain}'
-
-    # Check cache first
-    cached = _get_cached(cache_key)
-    if cached is not None:
-        return cached
-
-    # Query database
-    profile = TenantPublicProfile.query.filter_by(
-        custom_domain=domain,
-        custom_domain_verified=True
-    ).first()
-
-    if not profile:
-        _set_cached(cache_key, (None, None))
-        return None, None
-
-    result = (profile.tenant, profile)
-    _set_cached(cache_key, result)
-    return result
+    site = _lookup_site(kind, value)
+    if not site['tenant_id'] or not site['profile_id']:
+        return None
+    return site
 
 
 # ============================================
@@ -230,9 +202,13 @@ def setup_public_site_middleware(app):
 
     Middleware postavlja:
     - g.is_public_site: bool - da li je request za javnu stranicu
-    - g.public_tenant: Tenant - tenant čija je javna stranica
-    - g.public_profile: TenantPublicProfile - profil javne stranice
+    - g.public_tenant_id / g.public_profile_id: ID-evi iz keširanog lookup-a
+    - g.public_tenant: Tenant - tenant čija je javna stranica (lazy)
+    - g.public_profile: TenantPublicProfile - profil javne stranice (lazy)
     - g.public_domain_type: str - 'subdomain' ili 'custom_domain'
+
+    Provere pre view-a (require_public_site, cached_public_page) koriste
+    g.public_tenant_id - g.public_tenant bi učitao objekat iz baze.
     """
 
     @app.before_request
@@ -242,31 +218,26 @@ def setup_public_site_middleware(app):
         g.is_public_site = False
         g.public_tenant = None
         g.public_profile = None
+        g.public_tenant_id = None
+        g.public_profile_id = None
         g.public_domain_type = None
 
         # Dohvati host
         host = request.host.lower()
 
-        # Prvo probaj custom domen
-        custom_domain = extract_custom_domain(host)
-        if custom_domain:
-            tenant, profile = find_tenant_by_custom_domain(custom_domain)
-            if tenant and profile and profile.is_public:
-                g.is_public_site = True
-                g.public_tenant = tenant
-                g.public_profile = profile
-                g.public_domain_type = 'custom_domain'
-                return
-
-        # Zatim probaj subdomenu
-        subdomain = extract_subdomain(host)
-        if subdomain:
-            tenant, profile = find_tenant_by_subdomain(subdomain)
-            if tenant and profile and profile.is_public:
+        # Prvo custom domen, zatim subdomena
+        for kind, value in (('custom_domain', extract_custom_domain(host)),
+                            ('subdomain', extract_subdomain(host))):
+            if not value:
+                continue
+            site = find_public_site(kind, value)
+            if site and site['is_public']:
                 g.is_public_site = True
-                g.public_tenant = tenant
-                g.public_profile = profile
-                g.public_domain_type = 'subdomain'
+                g.public_tenant_id = site['tenant_id']
+                g.public_profile_id = site['profile_id']
+                g.public_tenant = LocalProxy(lambda: _public_objects()[0])
+                g.public_profile = LocalProxy(lambda: _public_objects()[1])
+                g.public_domain_type = kind
                 return
 
 
@@ -167,7 +167,9 @@ def init_security_headers(app: Flask) -> None:
 
         # Cache control - sprecava kesirane osetljivih stranica
         # Vazno za stranice sa podacima (dashboard, nalozi, itd.)
-        if request.path.startswith('/api/') or request.path.startswith('/admin/') or request.path.startswith('/dashboard'):
+        # Javne stranice tenanta (cached_public_page) imaju sopstveni public Cache-Control
+        is_public_cached = 'Surrogate-Key' in response.headers
+        if not is_public_cached and (request.path.startswith('/api/') or request.path.startswith('/admin/') or request.path.startswith('/dashboard')):
             response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, private'
             response.headers['Pragma'] = 'no-cache'
             response.headers['Expires'] = '0'
@@ -0,0 +1,95 @@
+"""
+Static Assets Middleware - fingerprint statičkih fajlova i dugačak keš.
+
+Svaki url_for('static', filename=...) dobija ?v=<hash sadržaja>, bez
+izmene template-a. Odgovor sa ispravnim v je nepromenljiv:
+
+    Cache-Control: public, max-age=31536000, immutable
+
+pa ga browser više ne traži dok se fajl ne promeni (novi hash = nov URL).
+Zastareo v (stara stranica iz keša) dobija kratak keš, ne immutable.
+
+Tailwind: ako postoji prekompajliran app/static/css/tailwind.css
+(`flask assets-build`), layout-i ga učitavaju umesto CDN skripte koja
+generiše CSS u browseru pri svakom učitavanju.
+"""
+
+import hashlib
+import os
+import threading
+
+from flask import Flask, request, url_for
+
+
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+STALE_CACHE = 'public, max-age=300'
+TAILWIND_CSS = 'css/tailwind.css'
+
+
+class AssetFingerprints:
+    """Hash sadržaja po statičkom fajlu (keširan, osvežava se po mtime)."""
+
+    def __init__(self, static_folder, check_mtime=False):
+        self.static_folder = static_folder
+        self.check_mtime = check_mtime
+        self._hashes = {}   # filename -> (mtime, hash)
+        self._lock = threading.Lock()
+
+    def get(self, filename):
+        """Hash fajla ili None ako ne postoji."""
+        cached = self._hashes.get(filename)
+        if cached is not None and not self.check_mtime:
+            return cached[1]
+
+        path = os.path.join(self.static_folder, filename)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, 'rb') as f:
+            digest = hashlib.md5(f.read()).hexdigest()[:10]
+        with self._lock:
+            self._hashes[filename] = (mtime, digest)
+        return digest
+
+
+def init_static_assets(app: Flask) -> None:
+    """Fingerprint za static URL-ove, immutable keš i Tailwind build."""
+    if not app.static_folder:
+        return
+
+    # U debug modu izmena fajla odmah menja hash
+    fingerprints = AssetFingerprints(
+        app.static_folder, check_mtime=app.config.get('ASSET_FINGERPRINT_CHECK_MTIME', app.debug)
+    )
+    app.extensions['asset_fingerprints'] = fingerprints
+
+    @app.url_defaults
+    def fingerprint_static_url(endpoint, values):
+        if endpoint == 'static' and 'v' not in values and values.get('filename'):
+            digest = fingerprints.get(values['filename'])
+            if digest:
+                values['v'] = digest
+
+    @app.after_request
+    def cache_static_assets(response):
+        if request.endpoint != 'static' or response.status_code not in (200, 304):
+            return response
+        version = request.args.get('v')
+        if not version:
+            return response
+        filename = (request.view_args or {}).get('filename')
+        if filename and version == fingerprints.get(filename):
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE
+        else:
+            response.headers['Cache-Control'] = STALE_CACHE
+        return response
+
+    @app.context_processor
+    def tailwind_context():
+        if fingerprints.get(TAILWIND_CSS) is None:
+            return {'tailwind_css_url': None}
+        return {'tailwind_css_url': url_for('static', filename=TAILWIND_CSS)}
@@ -40,7 +40,7 @@ from .service_request import (
 from .rating import Rating, RatingType
 from .content_report import ContentReport, ReportReason, ReportStatus
 from .pos import (
-    CashRegisterSession, Receipt, ReceiptItem, DailyReport,
+    CashRegisterSession, CashRegisterTotals, Receipt, ReceiptItem, DailyReport,
     PaymentMethod, ReceiptStatus, ReceiptType, CashRegisterStatus, SaleItemType
 )
 from .credits import (
@@ -72,8 +72,8 @@ from .sms_management import (
 )
 # FAZA 5: StockMovement ledger
 from .stock_movement import (
-    StockMovement, LocationStock, MovementType,
-    create_stock_movement, get_stock_card, get_stock_by_location,
+    StockMovement, LocationStock, MovementType, StockBalanceSnapshot,
+    create_stock_movement, create_stock_movements_bulk, get_stock_card, get_stock_by_location,
     get_total_stock, validate_stock_balance
 )
 # FAZA 9: Transfer između lokacija
@@ -98,6 +98,10 @@ from .marketplace import (
     # Dostava
     SupplierDeliveryOption,
 )
+# Log retention - arhiva i dnevni agregati za append-only logove
+from .log_retention import LogDailyRollup, ARCHIVE_TABLES
+# Finansije - dnevni agregati prometa
+from .revenue_fact import DailyRevenueFact, RevenueRollupDay
 
 __all__ = [
     # Tenant modeli
@@ -210,6 +214,7 @@ __all__ = [
     'ReportStatus',
     # POS/Kasa modeli
     'CashRegisterSession',
+    'CashRegisterTotals',
     'Receipt',
     'ReceiptItem',
     'DailyReport',
@@ -275,8 +280,10 @@ __all__ = [
     # StockMovement Ledger (FAZA 5)
     'StockMovement',
     'LocationStock',
+    'StockBalanceSnapshot',
     'MovementType',
     'create_stock_movement',
+    'create_stock_movements_bulk',
     'get_stock_card',
     'get_stock_by_location',
     'get_total_stock',
@@ -297,4 +304,10 @@ __all__ = [
     'MarketplaceRating',
     'TenantFavoriteSupplier',
     'SupplierDeliveryOption',
+    # Log Retention
+    'LogDailyRollup',
+    'ARCHIVE_TABLES',
+    # Finansije
+    'DailyRevenueFact',
+    'RevenueRollupDay',
 ]
@@ -79,17 +79,15 @@ class PlatformAdmin(db.Model):
         """
         Hashira i postavlja lozinku admina.
         """
-        password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password_bytes, salt).decode('utf-8')
+        from ..services.password_service import password_hasher
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
         """
-        Proverava da li je lozinka ispravna.
+        Proverava da li je lozinka ispravna (uz rehash ako se cost promenio).
         """
-        password_bytes = password.encode('utf-8')
-        hash_bytes = self.password_hash.encode('utf-8')
-        return bcrypt.checkpw(password_bytes, hash_bytes)
+        from ..services.password_service import password_hasher
+        return password_hasher.check_and_upgrade(self, password)
 
     def update_last_login(self):
         """Azurira vreme poslednjeg logina."""
@@ -94,7 +94,8 @@ class AuditLog(db.Model):
 
     # Indeksi za brze pretrage
     __table_args__ = (
-        db.Index('ix_audit_tenant_entity', 'tenant_id', 'entity_type', 'entity_id'),
+        # created_at na kraju - istorija entiteta se cita direktno iz indeksa (ORDER BY + LIMIT)
+        db.Index('ix_audit_tenant_entity_created', 'tenant_id', 'entity_type', 'entity_id', 'created_at'),
         db.Index('ix_audit_tenant_created', 'tenant_id', 'created_at'),
         db.Index('ix_audit_user_created', 'user_id', 'created_at'),
     )
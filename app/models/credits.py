@@ -175,6 +175,7 @@ class CreditTransaction(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint('idempotency_key', name='uq_transaction_idempotency'),
+        db.Index('ix_credit_txn_balance_created_id', 'credit_balance_id', 'created_at', 'id'),  # keyset lista
     )
 
     def __repr__(self):
@@ -120,6 +120,7 @@ class PhoneListing(db.Model):
     __table_args__ = (
         db.Index('ix_phone_tenant_sold', 'tenant_id', 'sold'),
         db.Index('ix_phone_location_sold', 'location_id', 'sold'),
+        db.Index('ix_phone_tenant_sold_at', 'tenant_id', 'sold_at'),
     )
 
     def __repr__(self):
@@ -396,7 +397,7 @@ class SparePartLog(db.Model):
     reference_type = db.Column(db.String(50))  # 'ticket', 'pos_receipt', etc.
     reference_id = db.Column(db.BigInteger)
     user_id = db.Column(db.Integer, db.ForeignKey('tenant_user.id'))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
 
     # Relacije
     spare_part = db.relationship('SparePart', backref='stock_logs')
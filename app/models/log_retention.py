@@ -0,0 +1,108 @@
+"""
+Log Retention - arhivske tabele i dnevni agregati za append-only logove.
+
+AuditLog, SecurityEvent, PosAuditLog, SparePartLog i TenantSmsUsage rastu
+sa svakim zahtevom. Stari redovi se periodicno premestaju iz "hot" tabele
+u arhivsku tabelu (na PostgreSQL-u particionisanu po mesecu preko
+created_at), a pre premestanja se sabijaju u dnevne agregate
+(LogDailyRollup). Istekle arhivske particije se brisu u celosti.
+
+Na SQLite-u (testovi) arhivske tabele su obicne tabele - rotacija
+radi isto, samo bez particija.
+"""
+
+from datetime import datetime
+from ..extensions import db
+from .audit import AuditLog
+from .security_event import SecurityEvent
+from .goods import PosAuditLog
+from .inventory import SparePartLog
+from .sms_management import TenantSmsUsage
+
+
+def _archive_table(source_model):
+    """
+    Kreira arhivsku tabelu sa istim kolonama kao izvorna tabela.
+
+    Bez FK-ova i default-a: arhiva cuva redove kakvi su bili, a id se
+    prepisuje iz hot tabele. PK je (id, created_at) jer PostgreSQL
+    zahteva da kljuc particionisanja bude deo primarnog kljuca.
+    """
+    source = source_model.__table__
+    name = f'{source.name}_archive'
+    columns = [
+        db.Column(
+            col.name,
+            col.type.copy(),
+            primary_key=col.name in ('id', 'created_at'),
+            autoincrement=False,
+            nullable=col.nullable if col.name not in ('id', 'created_at') else False,
+        )
+        for col in source.columns
+    ]
+    indexes = []
+    if 'tenant_id' in source.columns:
+        indexes.append(db.Index(f'ix_{name}_tenant_created', 'tenant_id', 'created_at'))
+    return db.Table(name, db.metadata, *columns, *indexes)
+
+
+audit_log_archive = _archive_table(AuditLog)
+security_event_archive = _archive_table(SecurityEvent)
+pos_audit_log_archive = _archive_table(PosAuditLog)
+spare_part_log_archive = _archive_table(SparePartLog)
+tenant_sms_usage_archive = _archive_table(TenantSmsUsage)
+
+# Mapiranje hot tabela -> arhivska tabela
+ARCHIVE_TABLES = {
+    'audit_log': audit_log_archive,
+    'security_event': security_event_archive,
+    'pos_audit_log': pos_audit_log_archive,
+    'spare_part_log': spare_part_log_archive,
+    'tenant_sms_usage': tenant_sms_usage_archive,
+}
+
+
+class LogDailyRollup(db.Model):
+    """
+    Dnevni agregat za arhivirane log redove.
+
+    Jedan red = (izvor, dan, tenant, bucket) sa brojem dogadjaja i
+    opcionim zbirom (npr. cena SMS-a, promena kolicine). Agregati se
+    cuvaju trajno, i nakon sto se arhivske particije obrisu.
+    """
+    __tablename__ = 'log_daily_rollup'
+
+    id = db.Column(db.BigInteger, primary_key=True)
+
+    # Izvorna tabela ('audit_log', 'security_event', ...)
+    source = db.Column(db.String(40), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+
+    # Tenant (bez FK - agregat prezivljava brisanje tenanta)
+    tenant_id = db.Column(db.Integer, nullable=True)
+
+    # Kljuc grupisanja, npr. "ticket:UPDATE" ili "login_failed"
+    bucket = db.Column(db.String(100), nullable=False)
+
+    event_count = db.Column(db.Integer, nullable=False, default=0)
+    amount = db.Column(db.Numeric(14, 4), nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_log_rollup_source_day', 'source', 'day'),
+        db.Index('ix_log_rollup_tenant_source_day', 'tenant_id', 'source', 'day'),
+    )
+
+    def __repr__(self):
+        return f'<LogDailyRollup {self.source} {self.day} {self.bucket}: {self.event_count}>'
+
+    def to_dict(self):
+        return {
+            'source': self.source,
+            'day': self.day.isoformat() if self.day else None,
+            'tenant_id': self.tenant_id,
+            'bucket': self.bucket,
+            'count': self.event_count,
+            'amount': float(self.amount) if self.amount is not None else None,
+        }
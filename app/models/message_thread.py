@@ -318,6 +318,10 @@ class Message(db.Model):
     sender_user = db.relationship('TenantUser', backref='sent_messages')
     sender_admin = db.relationship('PlatformAdmin', backref='sent_messages')
 
+    __table_args__ = (
+        db.Index('ix_message_thread_id_id', 'thread_id', 'id'),  # before_id/after_id scroll
+    )
+
     def edit(self, new_body: str, edited_by_id: int, edited_by_type: HiddenByType):
         """
         Edit poruke sa audit trail-om.
@@ -2,6 +2,7 @@
 POS/Kasa modeli - sistem za prodaju i račune.
 
 CashRegisterSession - dnevna kasa po lokaciji
+CashRegisterTotals - tekući brojači sesije po valuti
 Receipt - račun (prodaja/refund)
 ReceiptItem - stavka računa
 DailyReport - arhivirani dnevni izveštaj
@@ -141,6 +142,52 @@ class CashRegisterSession(db.Model):
         return f'<CashRegisterSession {self.id}: {self.date} location={self.location_id}>'
 
 
+class CashRegisterTotals(db.Model):
+    """
+    Tekući brojači sesije po valuti.
+
+    Ažuriraju se atomičnim UPDATE ... SET x = x + :delta pri izdavanju,
+    storniranju i refundu računa (POSService._apply_receipt_totals), tako da
+    X/Z izveštaji ne moraju da skeniraju račune. Pun obračun iz računa
+    služi samo za proveru (POSService.reconcile_session_totals).
+    """
+    __tablename__ = 'cash_register_totals'
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    session_id = db.Column(
+        db.Integer,
+        db.ForeignKey('cash_register_session.id', ondelete='CASCADE'),
+        nullable=False
+    )
+    currency = db.Column(db.String(3), default='RSD', nullable=False)
+
+    # Finansije (samo ISSUED računi, refund računi ulaze sa negativnim iznosom)
+    revenue = db.Column(db.Numeric(12, 2), default=0, nullable=False)
+    cost = db.Column(db.Numeric(12, 2), default=0, nullable=False)
+    profit = db.Column(db.Numeric(12, 2), default=0, nullable=False)
+    cash = db.Column(db.Numeric(12, 2), default=0, nullable=False)
+    card = db.Column(db.Numeric(12, 2), default=0, nullable=False)
+    transfer = db.Column(db.Numeric(12, 2), default=0, nullable=False)
+
+    # Brojači
+    receipt_count = db.Column(db.Integer, default=0, nullable=False)
+    voided_count = db.Column(db.Integer, default=0, nullable=False)
+    items_sold = db.Column(db.Integer, default=0, nullable=False)
+    phones_sold = db.Column(db.Integer, default=0, nullable=False)
+    parts_sold = db.Column(db.Integer, default=0, nullable=False)
+    services_sold = db.Column(db.Integer, default=0, nullable=False)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('session_id', 'currency', name='uq_register_totals_session_currency'),
+    )
+
+    def __repr__(self):
+        return f'<CashRegisterTotals session={self.session_id} {self.currency}: {self.revenue}>'
+
+
 class Receipt(db.Model):
     """Račun - prodaja ili refund."""
     __tablename__ = 'receipt'
@@ -231,6 +278,7 @@ class Receipt(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint('tenant_id', 'receipt_number', name='uq_receipt_tenant_number'),
+        db.Index('ix_receipt_tenant_created_id', 'tenant_id', 'created_at', 'id'),  # keyset lista
     )
 
     def transition_fiscal(self, new_status):
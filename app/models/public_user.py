@@ -4,7 +4,6 @@ PublicUser model - fizičko lice (krajnji korisnik) u B2C marketplace-u.
 
 import enum
 from datetime import datetime
-import bcrypt
 from ..extensions import db
 
 
@@ -67,13 +66,11 @@ class PublicUser(db.Model):
         return f'{self.ime} {self.prezime}'
 
     def set_password(self, password):
-        password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password_bytes, salt).decode('utf-8')
+        from ..services.password_service import password_hasher
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
         if not self.password_hash:
             return False
-        password_bytes = password.encode('utf-8')
-        hash_bytes = self.password_hash.encode('utf-8')
-        return bcrypt.checkpw(password_bytes, hash_bytes)
\ No newline at end of file
+        from ..services.password_service import password_hasher
+        return password_hasher.check_and_upgrade(self, password)
\ No newline at end of file
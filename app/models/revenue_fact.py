@@ -0,0 +1,69 @@
+"""
+DailyRevenueFact - dnevni agregat prometa po tenantu, lokaciji i izvoru.
+
+Izvori: 'tickets' (naplaćeni servisni nalozi), 'phones' (prodati telefoni),
+'goods' (roba kroz POS), 'pos' (dnevni Z-izveštaji kase).
+
+Puni ga noćni rollup (FinanceService.rollup_days) - dan se uvek
+preračunava u celosti (DELETE + INSERT), pa je rollup idempotentan.
+RevenueRollupDay beleži koje (dan, izvor) parove je rollup pokrio;
+finansijski pregledi čitaju agregate samo za te dane, a sve ostale
+(današnji, dani pre inicijalnog punjenja, propušteni rollup) računaju
+SQL agregatom iz izvornih tabela.
+"""
+
+from datetime import datetime
+from ..extensions import db
+
+
+class DailyRevenueFact(db.Model):
+    """Jedan red = (tenant, lokacija, dan, izvor)."""
+    __tablename__ = 'daily_revenue_fact'
+
+    id = db.Column(db.BigInteger, primary_key=True)
+
+    tenant_id = db.Column(
+        db.Integer,
+        db.ForeignKey('tenant.id', ondelete='CASCADE'),
+        nullable=False
+    )
+    # Bez FK - agregat ostaje i ako se lokacija obriše
+    location_id = db.Column(db.Integer, nullable=True)
+
+    day = db.Column(db.Date, nullable=False)
+    source = db.Column(db.String(20), nullable=False)  # tickets, phones, goods, pos
+
+    count = db.Column(db.Integer, default=0, nullable=False)
+    revenue = db.Column(db.Numeric(14, 2), default=0, nullable=False)
+    cost = db.Column(db.Numeric(14, 2), default=0, nullable=False)
+    profit = db.Column(db.Numeric(14, 2), default=0, nullable=False)
+
+    # Samo za 'pos' (iz DailyReport)
+    cash = db.Column(db.Numeric(14, 2), default=0, nullable=False)
+    card = db.Column(db.Numeric(14, 2), default=0, nullable=False)
+    transfer = db.Column(db.Numeric(14, 2), default=0, nullable=False)
+    revenue_eur = db.Column(db.Numeric(14, 2), default=0, nullable=False)
+    cash_eur = db.Column(db.Numeric(14, 2), default=0, nullable=False)
+    card_eur = db.Column(db.Numeric(14, 2), default=0, nullable=False)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_revenue_fact_tenant_source_day', 'tenant_id', 'source', 'day'),
+        db.Index('ix_revenue_fact_day', 'day'),
+    )
+
+    def __repr__(self):
+        return f'<DailyRevenueFact {self.tenant_id} {self.day} {self.source}: {self.revenue}>'
+
+
+class RevenueRollupDay(db.Model):
+    """(dan, izvor) koji je rollup preračunao za sve tenante."""
+    __tablename__ = 'revenue_rollup_day'
+
+    day = db.Column(db.Date, primary_key=True)
+    source = db.Column(db.String(20), primary_key=True)
+    rolled_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<RevenueRollupDay {self.day} {self.source}>'
@@ -4,7 +4,9 @@ ServiceRequest i ServiceBid modeli - B2C marketplace zahtevi i ponude.
 
 import enum
 from datetime import datetime
+from sqlalchemy import event
 from ..extensions import db
+from ..utils.geo import sync_geohash
 
 
 class ServiceRequestStatus(enum.Enum):
@@ -68,6 +70,7 @@ class ServiceRequest(db.Model):
     city = db.Column(db.String(100), index=True)
     latitude = db.Column(db.Float)
     longitude = db.Column(db.Float)
+    geohash = db.Column(db.String(12), index=True)  # Iz lat/lon, za pretragu po blizini
 
     # Budžet
     budget_min = db.Column(db.Numeric(10, 2))
@@ -150,4 +153,9 @@ class ServiceBid(db.Model):
     )
 
     def __repr__(self):
-        return f'<ServiceBid {self.id}: request={self.service_request_id} tenant={self.tenant_id}>'
\ No newline at end of file
+        return f'<ServiceBid {self.id}: request={self.service_request_id} tenant={self.tenant_id}>'
+
+
+# Event listener: geohash prati koordinate zahteva (pretraga zahteva po blizini)
+event.listen(ServiceRequest, 'before_insert', sync_geohash)
+event.listen(ServiceRequest, 'before_update', sync_geohash)
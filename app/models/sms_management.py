@@ -194,7 +194,7 @@ class TenantSmsUsage(db.Model):
 
     # Indeksi
     __table_args__ = (
-        db.Index('ix_sms_usage_tenant_created', 'tenant_id', 'created_at'),
+        db.Index('ix_sms_usage_tenant_created_id', 'tenant_id', 'created_at', 'id'),  # keyset lista
         db.Index('ix_sms_usage_type_status', 'sms_type', 'status'),
     )
 
@@ -314,6 +314,8 @@ class SmsDlrLog(db.Model):
 
     # Timestamps
     received_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # NULL dok batch obrada (dlr_service) ne primeni status i refund
+    processed_at = db.Column(db.DateTime, index=True)
 
     def __repr__(self):
         return f'<SmsDlrLog {self.message_id}: {self.status}>'
@@ -15,6 +15,8 @@ Tipovi pokreta:
 - DAMAGE: Oštećenje/otpis
 - TRANSFER_OUT: Izlaz za transfer (između lokacija)
 - TRANSFER_IN: Ulaz od transfera
+
+StockBalanceSnapshot - periodični checkpoint-i stanja za istorijske upite.
 """
 
 import enum
@@ -196,6 +198,7 @@ class StockMovement(db.Model):
         db.CheckConstraint('balance_after >= 0', name='ck_movement_balance_positive'),
         # Indeksi za brze upite
         db.Index('ix_movement_location_created', 'location_id', 'created_at'),
+        db.Index('ix_movement_tenant_created', 'tenant_id', 'created_at'),
         db.Index('ix_movement_goods_created', 'goods_item_id', 'created_at'),
         db.Index('ix_movement_spare_created', 'spare_part_id', 'created_at'),
         db.Index('ix_movement_reference', 'reference_type', 'reference_id'),
@@ -225,6 +228,52 @@ class StockMovement(db.Model):
         }
 
 
+class StockBalanceSnapshot(db.Model):
+    """
+    Checkpoint stanja artikla po lokaciji u trenutku snapshot_at.
+
+    Piše ga noćni job (StockLedgerService.write_checkpoints) samo za
+    (lokacija, artikal) parove koji su imali pokrete od prethodnog
+    checkpoint-a. Stanje na proizvoljan datum = najbliži checkpoint +
+    kratak rep pokreta posle njega.
+    """
+    __tablename__ = 'stock_balance_snapshot'
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    tenant_id = db.Column(
+        db.Integer,
+        db.ForeignKey('tenant.id', ondelete='CASCADE'),
+        nullable=False
+    )
+    location_id = db.Column(
+        db.Integer,
+        db.ForeignKey('service_location.id', ondelete='CASCADE'),
+        nullable=False
+    )
+    goods_item_id = db.Column(db.Integer, nullable=True)
+    spare_part_id = db.Column(db.BigInteger, nullable=True)
+
+    # Granica checkpoint-a - uključuje sve pokrete sa created_at <= snapshot_at
+    snapshot_at = db.Column(db.DateTime, nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+
+    # Poslednja poznata nabavna cena (za vrednovanje zaliha)
+    unit_cost = db.Column(db.Numeric(10, 2), nullable=True)
+
+    last_movement_id = db.Column(db.BigInteger, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_stock_snapshot_tenant_at', 'tenant_id', 'snapshot_at'),
+        db.Index('ix_stock_snapshot_goods_at', 'goods_item_id', 'location_id', 'snapshot_at'),
+        db.Index('ix_stock_snapshot_spare_at', 'spare_part_id', 'location_id', 'snapshot_at'),
+    )
+
+    def __repr__(self):
+        item = f"goods:{self.goods_item_id}" if self.goods_item_id else f"part:{self.spare_part_id}"
+        return f'<StockBalanceSnapshot {self.location_id}: {item} qty={self.quantity} @ {self.snapshot_at}>'
+
+
 # ============================================
 # HELPER FUNKCIJE ZA KREIRANJE MOVEMENT-A
 # ============================================
@@ -352,6 +401,160 @@ def create_stock_movement(
     return movement
 
 
+def create_stock_movements_bulk(
+    tenant_id: int,
+    user_id: int,
+    lines: list,
+    reference_type: str = None,
+    reference_id: int = None,
+    reference_number: str = None,
+) -> list:
+    """
+    Kreira više StockMovement-a odjednom (faktura, višestavkasti račun, transfer).
+
+    Ista pravila i ista balance_before/balance_after semantika kao
+    create_stock_movement(), ali bez N round-tripova:
+    1. nedostajući LocationStock redovi - jedan INSERT ... ON CONFLICT DO NOTHING
+    2. svi pogođeni redovi - jedan SELECT ... FOR UPDATE sortiran po id-u
+       (uvek isti redosled zaključavanja, nema deadlock-a između paralelnih dokumenata)
+    3. svi pokreti - jedan executemany INSERT ... RETURNING
+    4. cache u LocationStock - jedan executemany UPDATE pri flush-u
+
+    Više linija za isti artikal/lokaciju se primenjuje redom kojim su zadate.
+
+    MORA se koristiti unutar transakcije!
+
+    Args:
+        tenant_id: ID tenanta
+        user_id: ID korisnika koji radi akciju
+        lines: Lista dict-ova sa ključevima create_stock_movement() argumenata
+            (location_id, movement_type, quantity, goods_item_id | spare_part_id,
+            unit_cost, unit_price, reason, notes, target_location_id)
+        reference_type/reference_id/reference_number: Zajednička referenca
+            (linija je može pregaziti)
+
+    Returns:
+        Lista kreiranih StockMovement-a, istim redosledom kao lines
+
+    Raises:
+        ValueError: Nevalidna linija ili nedovoljno stanja (ništa nije upisano)
+    """
+    from sqlalchemy import and_, or_, insert
+
+    if not lines:
+        return []
+
+    # Validacija - ista pravila kao create_stock_movement()
+    keys = []
+    for line in lines:
+        location_id = line.get('location_id')
+        goods_item_id = line.get('goods_item_id')
+        spare_part_id = line.get('spare_part_id')
+        movement_type = line['movement_type']
+        if not location_id:
+            raise ValueError("location_id je obavezan")
+        if not goods_item_id and not spare_part_id:
+            raise ValueError("Mora biti goods_item_id ili spare_part_id")
+        if goods_item_id and spare_part_id:
+            raise ValueError("Ne može biti oba: goods_item_id i spare_part_id")
+        if movement_type in (MovementType.ADJUST, MovementType.DAMAGE, MovementType.INITIAL_BALANCE) \
+                and not line.get('reason'):
+            raise ValueError(f"{movement_type.value} zahteva reason")
+        keys.append((location_id, goods_item_id, spare_part_id))
+
+    unique_keys = sorted(set(keys), key=lambda k: (k[0], k[1] or 0, k[2] or 0))
+
+    # 1. Nedostajući cache redovi (postojeći se preskaču bez zaključavanja)
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        db.session.execute(
+            dialect_insert(LocationStock.__table__).on_conflict_do_nothing(),
+            [{'location_id': loc, 'goods_item_id': goods, 'spare_part_id': part, 'quantity': 0}
+             for loc, goods, part in unique_keys]
+        )
+
+    # 2. Zaključaj sve pogođene redove jednim upitom, deterministički redosled
+    by_location = {}
+    for loc, goods, part in unique_keys:
+        entry = by_location.setdefault(loc, ([], []))
+        if goods:
+            entry[0].append(goods)
+        else:
+            entry[1].append(part)
+
+    conditions = []
+    for loc, (goods_ids, part_ids) in by_location.items():
+        item_filters = []
+        if goods_ids:
+            item_filters.append(LocationStock.goods_item_id.in_(goods_ids))
+        if part_ids:
+            item_filters.append(LocationStock.spare_part_id.in_(part_ids))
+        conditions.append(and_(LocationStock.location_id == loc, or_(*item_filters)))
+
+    stocks = db.session.query(LocationStock).with_for_update().populate_existing().filter(
+        or_(*conditions)
+    ).order_by(LocationStock.id).all()
+    stock_map = {(s.location_id, s.goods_item_id, s.spare_part_id): s for s in stocks}
+
+    # Ostali dijalekti: dodaj nedostajuće kroz ORM
+    missing = [k for k in unique_keys if k not in stock_map]
+    if missing:
+        for loc, goods, part in missing:
+            loc_stock = LocationStock(location_id=loc, goods_item_id=goods, spare_part_id=part, quantity=0)
+            db.session.add(loc_stock)
+            stock_map[(loc, goods, part)] = loc_stock
+        db.session.flush()
+
+    # 3. Balance pre/posle redom linija
+    balances = {k: stock_map[k].quantity for k in unique_keys}
+    rows = []
+    for line, key in zip(lines, keys):
+        balance_before = balances[key]
+        balance_after = balance_before + line['quantity']
+        if balance_after < 0:
+            raise ValueError(
+                f"Nedovoljno stanja na lokaciji: {balance_before} + ({line['quantity']}) = {balance_after}"
+            )
+        balances[key] = balance_after
+        rows.append({
+            'tenant_id': tenant_id,
+            'location_id': key[0],
+            'target_location_id': line.get('target_location_id'),
+            'goods_item_id': key[1],
+            'spare_part_id': key[2],
+            'movement_type': line['movement_type'],
+            'quantity': line['quantity'],
+            'balance_before': balance_before,
+            'balance_after': balance_after,
+            'unit_cost': line.get('unit_cost'),
+            'unit_price': line.get('unit_price'),
+            'reference_type': line.get('reference_type', reference_type),
+            'reference_id': line.get('reference_id', reference_id),
+            'reference_number': line.get('reference_number', reference_number),
+            'user_id': user_id,
+            'reason': line.get('reason'),
+            'notes': line.get('notes'),
+        })
+
+    movements = db.session.scalars(
+        insert(StockMovement).returning(StockMovement, sort_by_parameter_order=True),
+        rows
+    ).all()
+
+    # 4. Ažuriraj cache - poslednji pokret po ključu
+    for movement, key in zip(movements, keys):
+        loc_stock = stock_map[key]
+        loc_stock.quantity = movement.balance_after
+        loc_stock.last_movement_id = movement.id
+    db.session.flush()
+
+    return movements
+
+
 def get_stock_card(
     goods_item_id: int = None,
     spare_part_id: int = None,
@@ -8,7 +8,6 @@ SupplierUser - korisnici dobavljaca
 
 import enum
 from datetime import datetime
-import bcrypt
 from ..extensions import db
 
 
@@ -306,11 +305,9 @@ class SupplierUser(db.Model):
         return f'{self.ime} {self.prezime}'
 
     def set_password(self, password):
-        password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password_bytes, salt).decode('utf-8')
+        from ..services.password_service import password_hasher
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        password_bytes = password.encode('utf-8')
-        hash_bytes = self.password_hash.encode('utf-8')
-        return bcrypt.checkpw(password_bytes, hash_bytes)
+        from ..services.password_service import password_hasher
+        return password_hasher.check_and_upgrade(self, password)
@@ -11,6 +11,7 @@ from dateutil.relativedelta import relativedelta  # v3.05: kalendarski mesec
 from sqlalchemy import event
 from slugify import slugify
 from ..extensions import db
+from ..utils.geo import sync_geohash
 
 
 class LocationStatus(enum.Enum):
@@ -429,6 +430,7 @@ class ServiceLocation(db.Model):
     # Geografija (za B2C matching po regionu)
     latitude = db.Column(db.Float)                     # Geografska sirina
     longitude = db.Column(db.Float)                    # Geografska duzina
+    geohash = db.Column(db.String(12), index=True)     # Iz lat/lon, za pretragu po blizini
     coverage_radius_km = db.Column(db.Integer)         # Radius pokrivenosti u km
 
     # Subscription podesavanja
@@ -482,3 +484,8 @@ def generate_tenant_defaults(mapper, connection, target):
     # Generiši login_secret (tajni URL za prijavu zaposlenih)
     if not target.login_secret:
         target.login_secret = sec.token_urlsafe(16)  # 22 karaktera
+
+
+# Event listener: geohash prati koordinate lokacije (B2C pretraga po blizini)
+event.listen(ServiceLocation, 'before_insert', sync_geohash)
+event.listen(ServiceLocation, 'before_update', sync_geohash)
@@ -14,7 +14,10 @@ Implementira isti workflow kao Dolce Vita program:
 import enum
 import secrets
 from datetime import datetime, timedelta, timezone
+from sqlalchemy import DDL, event, func, update
+from sqlalchemy.orm import selectinload
 from ..extensions import db
+from ..utils.search import sync_search_text
 
 
 class TicketStatus(enum.Enum):
@@ -98,6 +101,9 @@ class ServiceTicket(db.Model):
     device_condition = db.Column(db.Text)      # Stanje pri prijemu (ostecenja, itd.)
     device_password = db.Column(db.String(50)) # Sifra uredjaja (enkriptovati u produkciji)
 
+    # Pretraga - normalizovan kupac/telefon/uredjaj/IMEI/broj (app.utils.search)
+    search_text = db.Column(db.Text)
+
     # Kategorija servisa (Dolce Vita stil)
     service_section = db.Column(db.String(50))  # Telefoni, Tableti, Racunari, Konzole, Ostalo
 
@@ -171,6 +177,11 @@ class ServiceTicket(db.Model):
         nullable=True
     )
 
+    # Sažetak notifikacija - održava TicketNotificationLog.log (liste bez
+    # upita po nalogu za can_notify / can_write_off)
+    notification_count = db.Column(db.Integer, default=0, nullable=False, server_default='0')
+    last_notified_at = db.Column(db.DateTime(timezone=True))
+
     # SMS notifikacije flagovi
     sms_notification_completed = db.Column(db.Boolean, default=False)
     sms_notification_10_days = db.Column(db.Boolean, default=False)
@@ -225,7 +236,8 @@ class ServiceTicket(db.Model):
     __table_args__ = (
         db.UniqueConstraint('tenant_id', 'ticket_number', name='uq_tenant_ticket_number'),
         db.Index('ix_ticket_tenant_status', 'tenant_id', 'status'),
-        db.Index('ix_ticket_tenant_created', 'tenant_id', 'created_at'),
+        db.Index('ix_ticket_tenant_created_id', 'tenant_id', 'created_at', 'id'),  # keyset lista
+        db.Index('ix_ticket_tenant_paid_at', 'tenant_id', 'paid_at'),
         db.Index('ix_ticket_location_status', 'location_id', 'status'),
     )
 
@@ -234,11 +246,24 @@ class ServiceTicket(db.Model):
 
     @property
     def parts_cost(self):
-        """Ukupna nabavna cena utrošenih delova."""
+        """Ukupna nabavna cena utrošenih delova (preload_parts_cost za liste)."""
+        if '_parts_cost' in self.__dict__:
+            return self.__dict__['_parts_cost']
+        return self.parts_cost_by_ticket([self.id]).get(self.id, 0)
+
+    @staticmethod
+    def parts_cost_by_ticket(ticket_ids) -> dict:
+        """{ticket_id: trošak delova} jednim GROUP BY upitom."""
         from .inventory import SparePartUsage
-        usages = SparePartUsage.query.filter_by(service_ticket_id=self.id).all()
-        total = sum((u.unit_price or 0) * (u.quantity_used or 0) for u in usages)
-        return total
+        if not ticket_ids:
+            return {}
+        rows = db.session.query(
+            SparePartUsage.service_ticket_id,
+            func.sum(func.coalesce(SparePartUsage.unit_price, 0) * func.coalesce(SparePartUsage.quantity_used, 0))
+        ).filter(
+            SparePartUsage.service_ticket_id.in_(ticket_ids)
+        ).group_by(SparePartUsage.service_ticket_id).all()
+        return {ticket_id: total or 0 for ticket_id, total in rows}
 
     @property
     def ticket_number_formatted(self):
@@ -271,11 +296,6 @@ class ServiceTicket(db.Model):
         """Da li je uredjaj preuzet od strane kupca."""
         return self.owner_collect is not None or self.status == TicketStatus.DELIVERED
 
-    @property
-    def notification_count(self):
-        """Broj svih notifikacija/poziva za ovaj nalog."""
-        return self.notification_logs.count() if self.notification_logs else 0
-
     @property
     def last_notification(self):
         """Poslednja notifikacija/poziv kupcu."""
@@ -293,19 +313,15 @@ class ServiceTicket(db.Model):
         """
         if self.is_collected or self.is_written_off:
             return False
-        if self.notification_count == 0:
+        if not self.notification_count or self.last_notified_at is None:
             return True  # Prva notifikacija uvek dozvoljena
-        last = self.last_notification
-        if last:
-            days_since = (datetime.now(timezone.utc) - last.timestamp).days
-            return days_since >= 15
-        return True
+        return self._days_since_notified() >= 15
 
     @property
     def can_write_off(self):
         """Da li moze write-off (min 5 notifikacija)."""
         return (
-            self.notification_count >= 5 and
+            (self.notification_count or 0) >= 5 and
             not self.is_written_off and
             not self.is_collected
         )
@@ -313,13 +329,15 @@ class ServiceTicket(db.Model):
     @property
     def days_until_can_notify(self):
         """Koliko dana do sledece moguce notifikacije."""
-        if self.can_notify:
+        if self.can_notify or self.last_notified_at is None:
             return 0
-        last = self.last_notification
-        if last:
-            days_since = (datetime.now(timezone.utc) - last.timestamp).days
-            return max(0, 15 - days_since)
-        return 0
+        return max(0, 15 - self._days_since_notified())
+
+    def _days_since_notified(self):
+        last = self.last_notified_at
+        if last.tzinfo is None:
+            last = last.replace(tzinfo=timezone.utc)  # SQLite vraća naivan datetime
+        return (datetime.now(timezone.utc) - last).days
 
     @property
     def duration_display(self):
@@ -446,6 +464,38 @@ class ServiceTicket(db.Model):
 
         return data
 
+    @classmethod
+    def list_loader_options(cls):
+        """Relacije iz to_dict() - jedan upit po relaciji za celu stranicu."""
+        return (
+            selectinload(cls.assigned_technician),
+            selectinload(cls.created_by),
+            selectinload(cls.location),
+        )
+
+    @classmethod
+    def preload_parts_cost(cls, tickets):
+        """Popuni parts_cost za listu naloga jednim upitom."""
+        costs = cls.parts_cost_by_ticket([t.id for t in tickets])
+        for ticket in tickets:
+            ticket.__dict__['_parts_cost'] = costs.get(ticket.id, 0)
+
+    @classmethod
+    def serialize_many(cls, tickets, include_sensitive=False) -> list:
+        """
+        to_dict() za listu naloga sa fiksnim brojem upita.
+
+        Upit stranice treba da nosi list_loader_options(); notifikacioni
+        flagovi se računaju iz kolona sažetka, parts_cost jednim GROUP BY.
+        """
+        cls.preload_parts_cost(tickets)
+        result = []
+        for ticket in tickets:
+            data = ticket.to_dict(include_sensitive=include_sensitive)
+            data['parts_cost'] = float(ticket.parts_cost or 0)
+            result.append(data)
+        return result
+
 
 def get_next_ticket_number(tenant_id):
     """
@@ -529,9 +579,10 @@ class TicketNotificationLog(db.Model):
     @classmethod
     def log(cls, ticket_id: int, notification_type: str, recipient: str = None,
             status: str = None, message: str = None, user_id: int = None,
-            contact_successful: bool = False):
+            contact_successful: bool = False, comment: str = None):
         """
-        Kreira log notifikacije za nalog.
+        Kreira log notifikacije za nalog i ažurira sažetak na nalogu
+        (notification_count, last_notified_at) istim atomskim UPDATE-om.
 
         Args:
             ticket_id: ID naloga
@@ -541,18 +592,33 @@ class TicketNotificationLog(db.Model):
             message: Poruka ili greška
             user_id: ID korisnika koji je inicirao (opciono)
             contact_successful: Da li je kontakt uspešan
+            comment: Napomena (podrazumevano message)
         """
+        now = datetime.now(timezone.utc)
         log_entry = cls(
             ticket_id=ticket_id,
+            timestamp=now,
             notification_type=notification_type,
             recipient=recipient,
             status=status,
-            comment=message,
+            comment=comment if comment is not None else message,
             message=message,
             user_id=user_id,
             contact_successful=contact_successful
         )
         db.session.add(log_entry)
+
+        # Inkrement u SQL-u (bez lost update-a); nalog u sesiji se sinhronizuje
+        db.session.execute(
+            update(ServiceTicket)
+            .where(ServiceTicket.id == ticket_id)
+            .values(
+                notification_count=func.coalesce(ServiceTicket.notification_count, 0) + 1,
+                last_notified_at=now,
+                updated_at=ServiceTicket.updated_at,   # notifikacija nije izmena naloga
+            )
+            .execution_options(synchronize_session='fetch')
+        )
         return log_entry
 
     def to_dict(self):
@@ -574,3 +640,28 @@ class TicketNotificationLog(db.Model):
             data['user_name'] = self.user.full_name
 
         return data
+
+
+# Pretraga naloga: search_text prati kupca/uređaj pri svakom upisu
+event.listen(ServiceTicket, 'before_insert', sync_search_text)
+event.listen(ServiceTicket, 'before_update', sync_search_text)
+
+# SQLite: FTS5 trigram shadow tabela (rowid = id naloga) koju održavaju
+# trigeri; na PostgreSQL-u GIN trigram index iz migracije v587
+TICKET_FTS_SQLITE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS service_ticket_fts "
+    "USING fts5(search_text, tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS service_ticket_fts_ai AFTER INSERT ON service_ticket BEGIN "
+    "INSERT INTO service_ticket_fts(rowid, search_text) VALUES (new.id, new.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS service_ticket_fts_au AFTER UPDATE OF search_text ON service_ticket BEGIN "
+    "DELETE FROM service_ticket_fts WHERE rowid = old.id; "
+    "INSERT INTO service_ticket_fts(rowid, search_text) VALUES (new.id, new.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS service_ticket_fts_ad AFTER DELETE ON service_ticket BEGIN "
+    "DELETE FROM service_ticket_fts WHERE rowid = old.id; END",
+)
+for _statement in TICKET_FTS_SQLITE:
+    event.listen(ServiceTicket.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(
+    ServiceTicket.__table__, 'before_drop',
+    DDL('DROP TABLE IF EXISTS service_ticket_fts').execute_if(dialect='sqlite')
+)
@@ -7,7 +7,6 @@ jednoj ili vise lokacija (ServiceLocation).
 
 import enum
 from datetime import datetime
-import bcrypt
 from ..extensions import db
 
 
@@ -159,20 +158,19 @@ class TenantUser(db.Model):
     def set_password(self, password):
         """
         Hashira i postavlja lozinku korisnika.
-        Koristi bcrypt za siguran hash.
+        Koristi bcrypt za siguran hash (password_hasher, van request thread-a).
         """
-        password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password_bytes, salt).decode('utf-8')
+        from ..services.password_service import password_hasher
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
         """
         Proverava da li je lozinka ispravna.
         Vraca True ako je ispravna, False inace.
+        Ako je BCRYPT_ROUNDS promenjen, hash se preracunava (commit radi pozivalac).
         """
-        password_bytes = password.encode('utf-8')
-        hash_bytes = self.password_hash.encode('utf-8')
-        return bcrypt.checkpw(password_bytes, hash_bytes)
+        from ..services.password_service import password_hasher
+        return password_hasher.check_and_upgrade(self, password)
 
     def has_location_access(self, location_id):
         """
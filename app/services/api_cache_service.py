@@ -0,0 +1,251 @@
+"""
+API Cache Service - keš JSON odgovora read-mostly tenant endpointa.
+
+Endpoint se uključuje jednim decorator-om:
+
+    @bp.route('/categories', methods=['GET'])
+    @jwt_required
+    @cached_tenant_view()
+    def get_categories(): ...
+
+Ključ: endpoint + tenant (+ korisnik ako vary_on_user) + normalizovani
+query args. Uz odgovor se čuvaju generacije tenanta i globalna generacija;
+unos važi samo dok se generacije poklapaju. Generacija tenanta se povećava
+na after_commit kad se promeni neki od modela iz INVALIDATING_MODELS
+(globalna za FeatureFlag bez tenanta) - nema brisanja po ključevima.
+
+Hit je jedan MGET (odgovor + obe generacije) u istom pipeline-u sa
+brojačem zahteva; miss upisuje odgovor i brojač promašaja. Metrike po
+endpointu: stats().
+
+Ako Redis nije dostupan, view se izvršava direktno (fail-open).
+"""
+
+import hashlib
+import json
+import logging
+from functools import wraps
+
+from flask import request, g, current_app
+
+from .redis_service import redis_manager
+
+logger = logging.getLogger(__name__)
+
+
+KEY_PREFIX = 'apicache:v1'
+DEFAULT_TTL = 300
+
+# Modeli čija promena menja keširane odgovore tenanta
+INVALIDATING_MODELS = (
+    'Tenant', 'ServiceItem', 'ServiceLocation', 'TenantUser', 'UserLocation', 'FeatureFlag',
+)
+
+
+class ApiCacheService:
+    """Generacioni keš tenant API odgovora u Redis-u."""
+
+    @staticmethod
+    def _gen_key(tenant_id=None):
+        return f'{KEY_PREFIX}:gen:tenant:{tenant_id}' if tenant_id else f'{KEY_PREFIX}:gen:global'
+
+    @staticmethod
+    def _metrics_key():
+        return f'{KEY_PREFIX}:metrics'
+
+    @staticmethod
+    def build_key(endpoint, tenant_id, user_id, args):
+        """Ključ odgovora - query args sortirani, redosled u URL-u nije bitan."""
+        normalized = '&'.join(f'{k}={v}' for k, v in sorted(args.items(multi=True)))
+        digest = hashlib.sha1(normalized.encode()).hexdigest()[:16]
+        return f'{KEY_PREFIX}:resp:{endpoint}:{tenant_id}:{user_id or "-"}:{digest}'
+
+    # ============================================
+    # ČITANJE / UPIS
+    # ============================================
+
+    def lookup(self, endpoint, tenant_id, key):
+        """
+        Returns:
+            (entry ili None, generacije) - generacije se čuvaju uz novi unos
+        """
+        client = redis_manager.client()
+        if client is None:
+            return None, None
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.mget(key, self._gen_key(tenant_id), self._gen_key())
+            pipe.hincrby(self._metrics_key(), f'{endpoint}:requests', 1)
+            (raw, tenant_gen, global_gen), _ = pipe.execute()
+        except Exception as e:
+            redis_manager.record_failure(e, 'api_cache')
+            return None, None
+
+        generations = [int(tenant_gen or 0), int(global_gen or 0)]
+        if raw:
+            entry = json.loads(raw)
+            if entry['gen'] == generations:
+                return entry, generations
+        return None, generations
+
+    def store(self, endpoint, key, body, generations, ttl):
+        client = redis_manager.client()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.set(key, json.dumps({'body': body, 'gen': generations}), ex=ttl)
+            pipe.hincrby(self._metrics_key(), f'{endpoint}:misses', 1)
+            pipe.execute()
+        except Exception as e:
+            redis_manager.record_failure(e, 'api_cache')
+
+    # ============================================
+    # INVALIDACIJA
+    # ============================================
+
+    def bump(self, tenant_ids=(), global_=False):
+        """Povećaj generacije - svi postojeći unosi tih tenanta postaju nevažeći."""
+        client = redis_manager.client()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for tenant_id in tenant_ids:
+                pipe.incr(self._gen_key(tenant_id))
+            if global_:
+                pipe.incr(self._gen_key())
+            pipe.execute()
+        except Exception as e:
+            redis_manager.record_failure(e, 'api_cache')
+
+    # ============================================
+    # METRIKE
+    # ============================================
+
+    def stats(self):
+        """Hit/miss po endpointu (zbirno za sve worker-e)."""
+        client = redis_manager.client()
+        raw = {}
+        if client is not None:
+            try:
+                raw = client.hgetall(self._metrics_key()) or {}
+            except Exception as e:
+                redis_manager.record_failure(e, 'api_cache')
+
+        endpoints = {}
+        for field, value in raw.items():
+            endpoint, kind = field.rsplit(':', 1)
+            endpoints.setdefault(endpoint, {'requests': 0, 'misses': 0})[kind] = int(value)
+
+        result = {}
+        for endpoint, counts in sorted(endpoints.items()):
+            hits = max(counts['requests'] - counts['misses'], 0)
+            result[endpoint] = {
+                'requests': counts['requests'],
+                'hits': hits,
+                'misses': counts['misses'],
+                'hit_ratio': round(hits / counts['requests'], 3) if counts['requests'] else None,
+            }
+        return result
+
+    def reset_stats(self):
+        client = redis_manager.client()
+        if client is not None:
+            try:
+                client.delete(self._metrics_key())
+            except Exception as e:
+                redis_manager.record_failure(e, 'api_cache')
+
+
+# Singleton instance
+api_cache = ApiCacheService()
+
+
+def cached_tenant_view(ttl=DEFAULT_TTL, vary_on_user=False):
+    """
+    Decorator za keširanje GET odgovora tenant endpointa.
+
+    Ide ispod @jwt_required (potreban g.tenant_id). Kešira samo 200
+    odgovore. vary_on_user=True kad odgovor zavisi od korisnika
+    (npr. provera uloge u samom view-u).
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            tenant_id = g.get('tenant_id')
+            if (request.method != 'GET' or not tenant_id
+                    or not current_app.config.get('API_CACHE_ENABLED', True)):
+                return f(*args, **kwargs)
+
+            endpoint = request.endpoint
+            key = api_cache.build_key(
+                endpoint, tenant_id, g.get('user_id') if vary_on_user else None, request.args
+            )
+            entry, generations = api_cache.lookup(endpoint, tenant_id, key)
+            if entry:
+                response = current_app.response_class(entry['body'], mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = current_app.make_response(f(*args, **kwargs))
+            if generations is not None and response.status_code == 200 and response.is_json:
+                api_cache.store(endpoint, key, response.get_data(as_text=True), generations, ttl)
+                response.headers['X-Cache'] = 'MISS'
+            return response
+        return decorated_function
+    return decorator
+
+
+def _tenant_of(session, obj):
+    """tenant_id izmenjenog objekta (None za globalne FeatureFlag-ove)."""
+    name = type(obj).__name__
+    if name == 'Tenant':
+        return obj.id
+    if name == 'UserLocation':
+        from sqlalchemy import select
+        from ..models import ServiceLocation
+        return session.connection().execute(
+            select(ServiceLocation.tenant_id).where(ServiceLocation.id == obj.location_id)
+        ).scalar()
+    return getattr(obj, 'tenant_id', None)
+
+
+_invalidation_registered = False
+
+
+def register_api_cache_invalidation(db):
+    """
+    Na flush skuplja tenant_id-eve izmenjenih modela iz INVALIDATING_MODELS,
+    a na after_commit povećava njihove generacije.
+
+    Listener-i se kače na Session klasu, pa se registruju jednom po procesu.
+    """
+    global _invalidation_registered
+    if _invalidation_registered:
+        return
+    _invalidation_registered = True
+
+    from sqlalchemy import event
+
+    @event.listens_for(db.session, 'after_flush')
+    def _collect(session, flush_context):
+        pending = session.info.setdefault('api_cache_bump', {'tenants': set(), 'global': False})
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            if type(obj).__name__ not in INVALIDATING_MODELS:
+                continue
+            tenant_id = _tenant_of(session, obj)
+            if tenant_id:
+                pending['tenants'].add(tenant_id)
+            elif type(obj).__name__ == 'FeatureFlag':
+                pending['global'] = True
+
+    @event.listens_for(db.session, 'after_commit')
+    def _bump(session):
+        pending = session.info.pop('api_cache_bump', None)
+        if pending and (pending['tenants'] or pending['global']):
+            api_cache.bump(pending['tenants'], global_=pending['global'])
+
+    @event.listens_for(db.session, 'after_rollback')
+    def _discard(session):
+        session.info.pop('api_cache_bump', None)
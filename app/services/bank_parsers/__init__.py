@@ -1,12 +1,17 @@
 """
 Bank Parser Registry.
 
-Auto-detektuje banku iz fajla i koristi odgovarajući parser.
+Auto-detektuje banku iz početka fajla i koristi odgovarajući parser.
+
+Import velikih izvoda ide kroz get_parser() + iter_transactions() nad
+fajl-objektom (transakcija po transakcija); detect_bank_and_parse()
+parsira ceo fajl iz bajtova.
 """
 from typing import Dict, Type, Optional
 
-from .base import BaseBankParser, ParseResult
+from .base import BaseBankParser, ParseResult, ParsedTransaction
 from .alta import AltaBankParser
+from .stream import SNIFF_BYTES, HashingReader, hash_stream, read_head
 
 
 # Registry svih parsera
@@ -21,38 +26,35 @@ PARSERS: Dict[str, Type[BaseBankParser]] = {
 }
 
 
-def detect_bank_and_parse(
-    content: bytes,
+def get_parser(
+    head: bytes,
     filename: str,
     force_bank: Optional[str] = None
-) -> dict:
+) -> BaseBankParser:
     """
-    Detektuje banku i parsira izvod.
+    Parser za izvod, detektovan iz početka fajla.
 
     Args:
-        content: Raw file bytes
+        head: Prvih SNIFF_BYTES bajtova fajla (read_head)
         filename: Original filename
         force_bank: Force specific bank code (skip detection)
 
     Returns:
-        ParseResult.to_dict()
+        Nova instanca parsera (drži podatke o izvodu tokom parsiranja)
 
     Raises:
-        ValueError: If bank cannot be detected or parsed
+        ValueError: If bank cannot be detected
     """
     if force_bank:
         if force_bank not in PARSERS:
             raise ValueError(f'Unknown bank code: {force_bank}')
-        parser = PARSERS[force_bank]()
-        result = parser.parse(content, filename)
-        return result.to_dict()
+        return PARSERS[force_bank]()
 
     # Auto-detect
     for bank_code, parser_class in PARSERS.items():
         parser = parser_class()
-        if parser.can_parse(content, filename):
-            result = parser.parse(content, filename)
-            return result.to_dict()
+        if parser.can_parse(head, filename):
+            return parser
 
     raise ValueError(
         'Could not detect bank from file. '
@@ -60,6 +62,29 @@ def detect_bank_and_parse(
     )
 
 
+def detect_bank_and_parse(
+    content: bytes,
+    filename: str,
+    force_bank: Optional[str] = None
+) -> dict:
+    """
+    Detektuje banku i parsira ceo izvod.
+
+    Args:
+        content: Raw file bytes
+        filename: Original filename
+        force_bank: Force specific bank code (skip detection)
+
+    Returns:
+        ParseResult.to_dict()
+
+    Raises:
+        ValueError: If bank cannot be detected or parsed
+    """
+    parser = get_parser(content[:SNIFF_BYTES], filename, force_bank)
+    return parser.parse(content, filename).to_dict()
+
+
 def get_supported_banks() -> list:
     """Vraća listu podržanih banaka."""
     return [
@@ -68,4 +93,4 @@ def get_supported_banks() -> list:
             'name': parser_class.BANK_NAME
         }
         for code, parser_class in PARSERS.items()
-    ]
\ No newline at end of file
+    ]
@@ -7,9 +7,9 @@ Format je specifičan za Alta banku iBanking sistem.
 import xml.etree.ElementTree as ET
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional, List
+from typing import Optional, BinaryIO, Iterator
 
-from .base import BaseBankParser, ParseResult, ParsedTransaction
+from .base import BaseBankParser, ParsedTransaction
 
 
 class AltaBankParser(BaseBankParser):
@@ -55,89 +55,81 @@ class AltaBankParser(BaseBankParser):
 
     BANK_CODE = 'ALTA'
     BANK_NAME = 'Alta Banka'
+    FORMAT = 'XML'
 
     # Alta banka ima bank ID 190
     ALTA_BANK_ID = '190'
 
-    def can_parse(self, content: bytes, filename: str) -> bool:
-        """Proverava da li je Alta Banka XML format."""
+    def can_parse(self, head: bytes, filename: str) -> bool:
+        """Proverava da li je Alta Banka XML format (iz početka fajla)."""
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        depth = 0
         try:
-            # Probaj da parsiraš kao XML
-            text = content.decode('utf-8')
-            root = ET.fromstring(text)
-
-            # Proveri za pmtnotification root element
-            if root.tag == 'pmtnotification':
-                # Proveri za Alta-specifične markere
-                acctid = root.find('acctid')
-                if acctid is not None and acctid.text:
-                    # Alta računi počinju sa 190-
-                    if acctid.text.startswith(self.ALTA_BANK_ID):
+            parser.feed(head)
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    # Proveri za pmtnotification root element
+                    if depth == 0 and elem.tag != 'pmtnotification':
+                        return False
+                    depth += 1
+                    continue
+
+                depth -= 1
+                # Alta računi počinju sa 190-
+                if elem.tag == 'acctid' and depth == 1:
+                    if (elem.text or '').startswith(self.ALTA_BANK_ID):
                         return True
-
-                # Alternativno, proveri bankname u transakcijama
-                trnlist = root.find('trnlist')
-                if trnlist is not None:
-                    stmttrn = trnlist.find('stmttrn')
-                    if stmttrn is not None:
-                        bankname = stmttrn.find('.//bankname')
-                        if bankname is not None and 'ALTA' in (bankname.text or '').upper():
-                            return True
-
-            return False
-        except Exception:
-            return False
-
-    def parse(self, content: bytes, filename: str) -> ParseResult:
-        """Parsira Alta Banka XML izvod."""
-        text = content.decode('utf-8')
-        root = ET.fromstring(text)
-
-        transactions: List[ParsedTransaction] = []
-        warnings: List[str] = []
-
-        # Statement info
-        statement_number = None
-        statement_date = None
-
-        stmtnum_elem = root.find('stmtnumber')
-        if stmtnum_elem is not None:
-            statement_number = stmtnum_elem.text
-
-        # Datum izvoda iz ledgerbal/dtasof
-        ledgerbal = root.find('ledgerbal')
-        if ledgerbal is not None:
-            dtasof = ledgerbal.find('dtasof')
-            if dtasof is not None:
-                statement_date = self._parse_datetime(dtasof.text)
-
-        # Parse transactions from trnlist
-        trnlist = root.find('trnlist')
-        if trnlist is not None:
-            for stmttrn in trnlist.findall('stmttrn'):
+                # Alternativno, proveri bankname u prvoj transakciji
+                elif elem.tag == 'bankname' and 'ALTA' in (elem.text or '').upper():
+                    return True
+                elif elem.tag == 'stmttrn':
+                    return False
+        except ET.ParseError:
+            # Početak je odsečen usred elementa - odluka iz pročitanog dela
+            pass
+        return False
+
+    def iter_transactions(self, stream: BinaryIO, filename: str) -> Iterator[ParsedTransaction]:
+        """
+        Parsira Alta Banka XML izvod (iterparse).
+
+        Svaka stmttrn se posle obrade uklanja iz stabla, pa memorija
+        ne raste sa brojem transakcija.
+        """
+        self.encoding = 'utf-8'
+        path = []  # otvoreni elementi od root-a
+
+        for event, elem in ET.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                path.append(elem)
+                # Parse rejected transactions (opciono, za informaciju)
+                if elem.tag == 'rejected' and len(path) == 2:
+                    rejected_count = elem.get('count', '0')
+                    if rejected_count and int(rejected_count) > 0:
+                        self.warnings.append(f'Izvod sadrži {rejected_count} odbijenih transakcija')
+                continue
+
+            path.pop()
+            parent = path[-1] if path else None
+            tag = elem.tag
+
+            if tag == 'stmttrn' and parent is not None and parent.tag == 'trnlist':
                 try:
-                    txn = self._parse_transaction(stmttrn)
-                    transactions.append(txn)
+                    txn = self._parse_transaction(elem)
                 except Exception as e:
-                    warnings.append(f'Failed to parse transaction: {str(e)}')
-
-        # Parse rejected transactions (opciono, za informaciju)
-        rejected = root.find('rejected')
-        if rejected is not None:
-            rejected_count = rejected.get('count', '0')
-            if rejected_count and int(rejected_count) > 0:
-                warnings.append(f'Izvod sadrži {rejected_count} odbijenih transakcija')
-
-        return ParseResult(
-            bank_code=self.BANK_CODE,
-            bank_name=self.BANK_NAME,
-            format='XML',
-            encoding='utf-8',
-            statement_date=statement_date,
-            statement_number=statement_number,
-            transactions=transactions,
-            warnings=warnings
-        )
+                    txn = None
+                    self.warnings.append(f'Failed to parse transaction: {str(e)}')
+                parent.remove(elem)
+                if txn is not None:
+                    yield txn
+
+            # Statement info
+            elif tag == 'stmtnumber' and len(path) == 1:
+                self.statement_number = elem.text
+
+            # Datum izvoda iz ledgerbal/dtasof
+            elif tag == 'dtasof' and parent is not None and parent.tag == 'ledgerbal' and len(path) == 2:
+                self.statement_date = self._parse_datetime(elem.text)
 
     def _parse_transaction(self, elem: ET.Element) -> ParsedTransaction:
         """Parsira pojedinačnu transakciju iz stmttrn elementa."""
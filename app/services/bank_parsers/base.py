@@ -1,13 +1,22 @@
 """
 Base class za sve bank parsere.
+
+Parseri rade nad fajl-objektom: iter_transactions() vraća transakcije
+jednu po jednu, pa i godišnji izvod sa hiljadama stavki ne završava
+ceo u memoriji. Podaci o izvodu (datum, broj, encoding, upozorenja)
+su na parseru, kompletni kad se iteracija završi.
 """
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, BinaryIO, Iterator
+import codecs
+import io
 import re
 
+from .stream import SNIFF_BYTES
+
 
 @dataclass
 class ParsedTransaction:
@@ -95,18 +104,26 @@ class BaseBankParser(ABC):
 
     BANK_CODE: str = 'UNK'
     BANK_NAME: str = 'Unknown Bank'
+    FORMAT: str = 'CSV'
 
     # Reference pattern: Model + broj
     # Npr: "97 000123 000001" ili "97000123000001"
     REFERENCE_PATTERN = re.compile(r'(\d{2})\s*(\d{6,18})')
 
+    def __init__(self):
+        self.encoding: Optional[str] = None
+        self.statement_date: Optional[date] = None
+        self.statement_number: Optional[str] = None
+        self.warnings: List[str] = []
+
     @abstractmethod
-    def can_parse(self, content: bytes, filename: str) -> bool:
+    def can_parse(self, head: bytes, filename: str) -> bool:
         """
         Proverava da li ovaj parser može da parsira dati fajl.
 
         Args:
-            content: Raw file bytes
+            head: Početak fajla (do SNIFF_BYTES bajtova, može biti odsečen
+                  usred reda ili XML elementa)
             filename: Original filename
 
         Returns:
@@ -115,19 +132,37 @@ class BaseBankParser(ABC):
         pass
 
     @abstractmethod
-    def parse(self, content: bytes, filename: str) -> ParseResult:
+    def iter_transactions(self, stream: BinaryIO, filename: str) -> Iterator[ParsedTransaction]:
         """
-        Parsira bank statement.
+        Parsira izvod iz binarnog fajl-objekta, transakciju po transakciju.
 
         Args:
-            content: Raw file bytes
+            stream: Binary file-like object (čita se jednom, od početka)
             filename: Original filename
 
-        Returns:
-            ParseResult with transactions
+        Yields:
+            ParsedTransaction
         """
         pass
 
+    def parse(self, content: bytes, filename: str) -> ParseResult:
+        """Parsira ceo izvod iz bajtova (mali fajlovi, testovi)."""
+        transactions = list(self.iter_transactions(io.BytesIO(content), filename))
+        return self.result(transactions)
+
+    def result(self, transactions: List[ParsedTransaction]) -> ParseResult:
+        """ParseResult sa podacima o izvodu prikupljenim tokom parsiranja."""
+        return ParseResult(
+            bank_code=self.BANK_CODE,
+            bank_name=self.BANK_NAME,
+            format=self.FORMAT,
+            encoding=self.encoding or 'utf-8',
+            statement_date=self.statement_date,
+            statement_number=self.statement_number,
+            transactions=transactions,
+            warnings=self.warnings
+        )
+
     def normalize_reference(self, raw_reference: str) -> tuple:
         """
         Normalizuje poziv na broj u standardni format.
@@ -206,20 +241,28 @@ class BaseBankParser(ABC):
         return None
 
     def detect_encoding(self, content: bytes) -> str:
-        """Detektuje encoding fajla."""
-        # Probaj UTF-8 prvo
-        try:
-            content.decode('utf-8')
-            return 'utf-8'
-        except UnicodeDecodeError:
-            pass
-
-        # Probaj CP1250 (Windows Central European)
-        try:
-            content.decode('cp1250')
-            return 'cp1250'
-        except UnicodeDecodeError:
-            pass
+        """
+        Detektuje encoding fajla iz prvih SNIFF_BYTES bajtova.
+
+        Početak može biti odsečen usred UTF-8 znaka, pa se dekodira
+        inkrementalno (nezavršena sekvenca na kraju nije greška).
+        """
+        head = content[:SNIFF_BYTES]
+        if head.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+
+        # Probaj UTF-8 prvo, pa CP1250 (Windows Central European)
+        for encoding in ('utf-8', 'cp1250'):
+            try:
+                codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+                return encoding
+            except UnicodeDecodeError:
+                continue
 
         # Fallback na latin-1
-        return 'latin-1'
\ No newline at end of file
+        return 'latin-1'
+
+    def open_text(self, stream: BinaryIO, head: bytes) -> io.TextIOWrapper:
+        """Tekstualni stream za CSV/TXT izvode (encoding iz početka fajla)."""
+        self.encoding = self.detect_encoding(head)
+        return io.TextIOWrapper(stream, encoding=self.encoding, errors='replace', newline='')
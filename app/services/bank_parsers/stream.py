@@ -0,0 +1,64 @@
+"""
+Čitanje izvoda iz fajl-objekta bez učitavanja celog fajla u memoriju.
+
+- read_head: prvih N bajtova za detekciju banke i encoding-a
+- hash_stream: SHA-256 i veličina jednim prolazom, bez parsiranja
+- HashingReader: SHA-256 fajla se računa dok ga parser čita
+"""
+import hashlib
+import io
+
+
+# Dovoljno za XML deklaraciju, zaglavlje izvoda i prvih nekoliko redova
+SNIFF_BYTES = 64 * 1024
+READ_CHUNK = 64 * 1024
+
+
+def read_head(stream, size: int = SNIFF_BYTES) -> bytes:
+    """Prvih `size` bajtova; stream se vraća na početak (mora biti seekable)."""
+    position = stream.tell()
+    head = stream.read(size)
+    stream.seek(position)
+    return head
+
+
+def hash_stream(stream) -> tuple:
+    """(sha256 hex, veličina) fajla; stream se vraća na početak (mora biti seekable)."""
+    position = stream.tell()
+    reader = HashingReader(stream)
+    reader.drain()
+    stream.seek(position)
+    return reader.hexdigest(), reader.size
+
+
+class HashingReader(io.RawIOBase):
+    """
+    Read-only omotač koji računa hash i veličinu pročitanih bajtova.
+
+    Parser čita kroz omotač; posle parsiranja drain() dočita ostatak
+    (npr. kraj XML-a posle poslednje transakcije) da hash pokrije ceo fajl.
+    """
+
+    def __init__(self, raw, algorithm: str = 'sha256'):
+        self._raw = raw
+        self._hash = hashlib.new(algorithm)
+        self.size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._raw.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        self._hash.update(data)
+        self.size += n
+        return n
+
+    def drain(self):
+        """Dočita ostatak fajla (samo hash, bez parsiranja)."""
+        while self.read(READ_CHUNK):
+            pass
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
@@ -335,7 +335,7 @@ class BillingTasksService:
         ).all()
 
         # Dohvati platformske cene
-        settings = PlatformSettings.get_settings()
+        settings = PlatformSettings.get_settings().to_dict()
         base_price = Decimal(str(settings.get('base_price', 2990)))
         location_price = Decimal(str(settings.get('location_price', 990)))
 
@@ -0,0 +1,306 @@
+"""
+Counter Service - write-behind brojači (view_count, bid_count, ...).
+
+Inkrement ne dira red u bazi: ide atomskim HINCRBY u Redis hash
+`counters:pending:{entity}` (polje `{id}:{field}`). Job counter_flush
+periodično prebacuje delte u bazu batch UPDATE-om `field = field + delta`,
+pa popularni redovi nemaju lock contention ni izgubljene inkremente.
+
+Čitanje spaja vrednost iz baze i delte koje još nisu upisane
+(merge_pending) - i pending hash i hash koji flush upravo upisuje.
+Jedini izuzetak je kratak prozor između commit-a flush-a i brisanja
+`counters:flushing:{entity}`, kad se ta delta vidi dvaput.
+
+Flush drži lock (`counters:flush_lock`) i RENAME-uje pending u fiksni
+`counters:flushing:{entity}` bez TTL-a. Ako proces padne pre commit-a
+ili upis u bazu ne uspe, ključ ostaje i sledeći flush ga prvo upisuje -
+inkrementi se ne gube (pad baš između commit-a i DEL-a upisuje te delte
+dvaput; bira se ponavljanje umesto gubitka).
+
+Ako Redis nije dostupan, delte se skupljaju u lokalnom akumulatoru
+(shardovan po id-u, lock po shard-u); svaki proces ga prazni posle
+request-a kada je stariji od LOCAL_FLUSH_SECONDS.
+
+Upis ide kroz zasebnu konekciju (db.engine.begin()), nezavisno od
+db.session-a request-a.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from sqlalchemy import update, bindparam
+
+from ..extensions import db
+from ..models.service_request import ServiceRequest
+from .redis_service import redis_manager
+
+logger = logging.getLogger(__name__)
+
+
+# Registrovani brojači: entity -> (model, dozvoljena polja)
+COUNTERS = {
+    'service_request': (ServiceRequest, ('view_count', 'bid_count')),
+}
+
+KEY_PREFIX = 'counters'
+LOCAL_SHARDS = 16
+LOCAL_FLUSH_SECONDS = 60        # lokalni akumulator se prazni najkasnije posle ovoliko
+FLUSH_LOCK_SECONDS = 300        # duže od svakog flush-a; posle pada procesa lock ističe
+
+
+class CounterService:
+    """Atomski inkrementi sa odloženim upisom u bazu."""
+
+    def __init__(self):
+        self._shards = [dict() for _ in range(LOCAL_SHARDS)]
+        self._locks = [threading.Lock() for _ in range(LOCAL_SHARDS)]
+        self._local_since = None
+
+    # ============================================
+    # REDIS
+    # ============================================
+
+    @staticmethod
+    def _pending_key(entity):
+        return f'{KEY_PREFIX}:pending:{entity}'
+
+    @staticmethod
+    def _flushing_key(entity):
+        return f'{KEY_PREFIX}:flushing:{entity}'
+
+    @staticmethod
+    def _check(entity, field):
+        if entity not in COUNTERS or field not in COUNTERS[entity][1]:
+            raise ValueError(f"Nepoznat brojač: {entity}.{field}")
+
+    # ============================================
+    # INKREMENT
+    # ============================================
+
+    def incr(self, entity, entity_id, field, delta=1):
+        """Atomski inkrement brojača (bez pristupa bazi)."""
+        self._check(entity, field)
+        client = redis_manager.client()
+        if client is not None:
+            try:
+                client.hincrby(self._pending_key(entity), f'{entity_id}:{field}', delta)
+                return
+            except Exception as e:
+                redis_manager.record_failure(e, 'counters')
+
+        shard = entity_id % LOCAL_SHARDS
+        with self._locks[shard]:
+            key = (entity, entity_id, field)
+            self._shards[shard][key] = self._shards[shard].get(key, 0) + delta
+        if self._local_since is None:
+            self._local_since = time.monotonic()
+
+    # ============================================
+    # ČITANJE
+    # ============================================
+
+    def pending(self, entity, entity_ids, field):
+        """Delte koje još nisu upisane u bazu: {id: delta}."""
+        self._check(entity, field)
+        entity_ids = list(entity_ids)
+        result = defaultdict(int)
+        if not entity_ids:
+            return result
+
+        client = redis_manager.client()
+        if client is not None:
+            members = [f'{i}:{field}' for i in entity_ids]
+            try:
+                # flushing hash: delte koje flush upravo upisuje (ili zaostale posle pada)
+                for key in (self._pending_key(entity), self._flushing_key(entity)):
+                    for entity_id, value in zip(entity_ids, client.hmget(key, members)):
+                        if value:
+                            result[entity_id] += int(value)
+            except Exception as e:
+                redis_manager.record_failure(e, 'counters')
+
+        for entity_id in entity_ids:
+            shard = entity_id % LOCAL_SHARDS
+            with self._locks[shard]:
+                result[entity_id] += self._shards[shard].get((entity, entity_id, field), 0)
+        return result
+
+    def merge_pending(self, entity, objects, *fields):
+        """
+        Tačne vrednosti brojača za listu objekata (baza + pending delte).
+
+        Returns:
+            {id: {field: vrednost}}
+        """
+        ids = [obj.id for obj in objects]
+        values = {obj.id: {f: getattr(obj, f) or 0 for f in fields} for obj in objects}
+        for field in fields:
+            for entity_id, delta in self.pending(entity, ids, field).items():
+                values[entity_id][field] += delta
+        return values
+
+    # ============================================
+    # FLUSH
+    # ============================================
+
+    def _drain_local(self):
+        """Isprazni lokalni akumulator: {(entity, id, field): delta}."""
+        drained = {}
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                drained.update(shard)
+                shard.clear()
+        self._local_since = None
+        return drained
+
+    def _drain_redis(self, client):
+        """
+        Preuzmi delte iz Redis-a (pozivalac drži flush lock).
+
+        Postojeći flushing hash je ostatak flush-a koji nije stigao do
+        kraja - upisuje se on, a novi pending čeka sledeći flush. Inače
+        RENAME (atomski) prebacuje pending u flushing; inkrementi posle
+        njega idu u novi pending hash. Flushing ključevi se brišu tek
+        posle commit-a (vidi flush).
+        """
+        deltas = {}
+        processing = []
+        for entity in COUNTERS:
+            flushing_key = self._flushing_key(entity)
+            if client.exists(flushing_key):
+                logger.warning(f"Counters: upisujem zaostale delte iz {flushing_key}")
+            else:
+                try:
+                    client.rename(self._pending_key(entity), flushing_key)
+                except Exception:
+                    continue  # nema pending delti
+            processing.append(flushing_key)
+            for member, value in client.hgetall(flushing_key).items():
+                entity_id, field = member.split(':', 1)
+                key = (entity, int(entity_id), field)
+                deltas[key] = deltas.get(key, 0) + int(value)
+        return deltas, processing
+
+    @staticmethod
+    def _apply(conn, deltas):
+        """Batch UPDATE field = field + delta, jedan executemany po polju."""
+        by_field = defaultdict(list)
+        for (entity, entity_id, field), delta in deltas.items():
+            if delta:
+                by_field[(entity, field)].append({'row_id': entity_id, 'delta': delta})
+
+        for (entity, field), rows in by_field.items():
+            table = COUNTERS[entity][0].__table__
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam('row_id'))
+                .values({field: db.func.coalesce(table.c[field], 0) + bindparam('delta')})
+            )
+            conn.execute(stmt, rows)
+        return sum(len(rows) for rows in by_field.values())
+
+    def _write(self, deltas, local_deltas=None, processing=(), client=None):
+        """
+        Upis delti u zasebnoj transakciji (ne dira db.session pozivaoca).
+
+        Ako upis ne uspe, lokalne delte se vraćaju u akumulator, a
+        flushing hash-evi ostaju u Redis-u za sledeći flush.
+        """
+        try:
+            with db.engine.begin() as conn:
+                updated = self._apply(conn, deltas)
+        except Exception:
+            for (entity, entity_id, field), delta in (local_deltas or {}).items():
+                self.incr(entity, entity_id, field, delta)
+            raise
+
+        if client is not None and processing:
+            try:
+                client.delete(*processing)
+            except Exception as e:
+                redis_manager.record_failure(e, 'counters')
+        return updated
+
+    def flush(self):
+        """
+        Upiši sve pending delte (Redis + lokalni akumulator) u bazu.
+
+        Returns:
+            Broj ažuriranih (red, polje) parova
+        """
+        deltas = {}
+        processing = []
+
+        client = redis_manager.client()
+        lock = self._acquire_flush_lock(client) if client is not None else None
+        try:
+            if lock is not None:
+                try:
+                    deltas, processing = self._drain_redis(client)
+                except Exception as e:
+                    redis_manager.record_failure(e, 'counters')
+
+            local_deltas = self._drain_local()
+            for key, delta in local_deltas.items():
+                deltas[key] = deltas.get(key, 0) + delta
+
+            if not deltas:
+                return 0
+
+            updated = self._write(deltas, local_deltas, processing, client)
+        finally:
+            if lock is not None:
+                self._release_flush_lock(client, lock)
+        logger.info(f"Counters: flush {updated} brojača")
+        return updated
+
+    @staticmethod
+    def _acquire_flush_lock(client):
+        """Token lock-a ili None (drugi flush je u toku / Redis nedostupan)."""
+        token = uuid.uuid4().hex
+        try:
+            if client.set(f'{KEY_PREFIX}:flush_lock', token, nx=True, ex=FLUSH_LOCK_SECONDS):
+                return token
+        except Exception as e:
+            redis_manager.record_failure(e, 'counters')
+        return None
+
+    @staticmethod
+    def _release_flush_lock(client, token):
+        key = f'{KEY_PREFIX}:flush_lock'
+        try:
+            if client.get(key) == token:
+                client.delete(key)
+        except Exception as e:
+            redis_manager.record_failure(e, 'counters')
+
+    def flush_local_if_due(self):
+        """
+        Upiši lokalni akumulator ako je stariji od LOCAL_FLUSH_SECONDS.
+
+        Poziva se posle svakog request-a - lokalne delte postoje samo u
+        procesu koji ih je skupio, a scheduler radi samo na web.1.
+        """
+        if self._local_since is None or time.monotonic() - self._local_since < LOCAL_FLUSH_SECONDS:
+            return 0
+        deltas = self._drain_local()
+        return self._write(deltas, deltas) if deltas else 0
+
+
+# Singleton instance
+counters = CounterService()
+
+
+def register_counter_flush(app):
+    """after_request hook za pražnjenje lokalnog akumulatora."""
+
+    @app.after_request
+    def _flush_local_counters(response):
+        try:
+            counters.flush_local_if_due()
+        except Exception as e:
+            logger.error(f"Counters: lokalni flush nije uspeo: {e}")
+        return response
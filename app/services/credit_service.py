@@ -7,10 +7,17 @@ Sve operacije sa kreditima prolaze kroz ovaj servis:
 - welcome credits
 
 Princip: 1 kredit = 1 EUR (~117.5 RSD)
+
+Balance se menja atomskim uslovnim UPDATE-om
+(`SET balance = balance - :x WHERE balance >= :x RETURNING`), bez
+SELECT ... FOR UPDATE i read-modify-write. Idempotency garantuje unique
+index na credit_transaction.idempotency_key: upis ide u SAVEPOINT, a
+IntegrityError vraća postojeću transakciju (nema pre-read-a).
 """
 
 from decimal import Decimal
 from datetime import datetime
+from sqlalchemy import case, update
 from sqlalchemy.exc import IntegrityError
 
 from ..extensions import db
@@ -75,6 +82,68 @@ def get_or_create_balance(owner_type, owner_id):
     return balance
 
 
+def apply_debit(amount, balance_id=None, owner_type=None, owner_id=None):
+    """
+    Atomski skini `amount` sa balance-a ako ga ima dovoljno.
+
+    Jedan uslovni UPDATE ... RETURNING - bez prethodnog čitanja i bez
+    FOR UPDATE; paralelna oduzimanja se ne serijalizuju na SELECT-u.
+    Balance se bira po id-u ili po vlasniku.
+
+    Returns:
+        (balance_id, balance_after) ili None ako nema dovoljno kredita
+    """
+    stmt = update(CreditBalance).where(CreditBalance.balance >= amount)
+    if balance_id is not None:
+        stmt = stmt.where(CreditBalance.id == balance_id)
+    else:
+        stmt = stmt.where(CreditBalance.owner_type == owner_type, _owner_id_filter(owner_type, owner_id))
+    row = db.session.execute(
+        stmt.values(
+            balance=CreditBalance.balance - amount,
+            total_spent=CreditBalance.total_spent + amount,
+            updated_at=datetime.utcnow(),
+        ).returning(CreditBalance.id, CreditBalance.balance)
+    ).first()
+    return (row.id, row.balance) if row else None
+
+
+def apply_credit(balance_id, amount, total_column=None, spent_delta=None):
+    """
+    Atomski dodaj `amount` na balance.
+
+    Args:
+        total_column: Opciona kolona statistike koja raste za amount
+            (total_purchased, total_received_free)
+        spent_delta: Opciono umanjenje total_spent (refund)
+
+    Returns:
+        balance_after
+    """
+    values = {
+        'balance': CreditBalance.balance + amount,
+        'updated_at': datetime.utcnow(),
+        # Reset low balance alert
+        'low_balance_alert_sent': case(
+            (CreditBalance.low_balance_threshold.isnot(None)
+             & (CreditBalance.balance + amount >= CreditBalance.low_balance_threshold), False),
+            else_=CreditBalance.low_balance_alert_sent,
+        ),
+    }
+    if total_column:
+        values[total_column] = getattr(CreditBalance, total_column) + amount
+    if spent_delta:
+        values['total_spent'] = CreditBalance.total_spent - spent_delta
+    return db.session.execute(
+        update(CreditBalance).where(CreditBalance.id == balance_id)
+        .values(values).returning(CreditBalance.balance)
+    ).scalar_one()
+
+
+def _existing_transaction(idempotency_key):
+    return CreditTransaction.query.filter_by(idempotency_key=idempotency_key).first()
+
+
 def add_credits(owner_type, owner_id, amount, transaction_type,
                 description=None, ref_type=None, ref_id=None,
                 promo_code_id=None, idempotency_key=None):
@@ -93,46 +162,39 @@ def add_credits(owner_type, owner_id, amount, transaction_type,
         idempotency_key: Ključ za sprečavanje duplih transakcija
 
     Returns:
-        CreditTransaction instanca
+        CreditTransaction instanca (postojeća ako je idempotency_key već upotrebljen)
     """
     amount = Decimal(str(amount))
     if amount <= 0:
         raise ValueError("Amount must be positive for add_credits")
 
-    # Idempotency check
-    if idempotency_key:
-        existing = CreditTransaction.query.filter_by(
-            idempotency_key=idempotency_key
-        ).first()
-        if existing:
-            return existing
-
-    balance = get_or_create_balance(owner_type, owner_id)
-    balance_before = balance.balance
-
-    balance.balance = balance.balance + amount
+    total_column = None
     if transaction_type == CreditTransactionType.PURCHASE:
-        balance.total_purchased = balance.total_purchased + amount
+        total_column = 'total_purchased'
     elif transaction_type in (CreditTransactionType.WELCOME, CreditTransactionType.PROMO):
-        balance.total_received_free = balance.total_received_free + amount
-
-    # Reset low balance alert
-    if balance.low_balance_threshold and balance.balance >= balance.low_balance_threshold:
-        balance.low_balance_alert_sent = False
+        total_column = 'total_received_free'
 
-    txn = CreditTransaction(
-        credit_balance_id=balance.id,
-        transaction_type=transaction_type,
-        amount=amount,
-        balance_before=balance_before,
-        balance_after=balance.balance,
-        description=description,
-        reference_type=ref_type,
-        reference_id=ref_id,
-        idempotency_key=idempotency_key,
-    )
-    db.session.add(txn)
-    db.session.flush()
+    balance = get_or_create_balance(owner_type, owner_id)
+    try:
+        with db.session.begin_nested():
+            balance_after = apply_credit(balance.id, amount, total_column)
+            txn = CreditTransaction(
+                credit_balance_id=balance.id,
+                transaction_type=transaction_type,
+                amount=amount,
+                balance_before=balance_after - amount,
+                balance_after=balance_after,
+                description=description,
+                reference_type=ref_type,
+                reference_id=ref_id,
+                idempotency_key=idempotency_key,
+            )
+            db.session.add(txn)
+            db.session.flush()
+    except IntegrityError:
+        if idempotency_key:
+            return _existing_transaction(idempotency_key)
+        raise
     return txn
 
 
@@ -146,43 +208,43 @@ def deduct_credits(owner_type, owner_id, amount, transaction_type,
         amount: Decimal iznos (pozitivan - biće zapisan kao negativan u transakciji)
 
     Returns:
-        CreditTransaction ako uspešno, False ako nema dovoljno kredita
+        CreditTransaction ako uspešno (postojeća ako je idempotency_key već
+        upotrebljen), False ako nema dovoljno kredita
     """
     amount = Decimal(str(amount))
     if amount <= 0:
         raise ValueError("Amount must be positive for deduct_credits")
 
-    # Idempotency check
-    if idempotency_key:
-        existing = CreditTransaction.query.filter_by(
-            idempotency_key=idempotency_key
-        ).first()
-        if existing:
-            return existing
-
-    balance = get_or_create_balance(owner_type, owner_id)
-
-    # Provera pre pokušaja (ne oslanjamo se samo na DB constraint)
-    if balance.balance < amount:
+    try:
+        with db.session.begin_nested():
+            debited = apply_debit(amount, owner_type=owner_type, owner_id=owner_id)
+            if debited is None:
+                txn = None
+            else:
+                balance_id, balance_after = debited
+                txn = CreditTransaction(
+                    credit_balance_id=balance_id,
+                    transaction_type=transaction_type,
+                    amount=-amount,  # Negativan iznos za oduzimanje
+                    balance_before=balance_after + amount,
+                    balance_after=balance_after,
+                    description=description,
+                    reference_type=ref_type,
+                    reference_id=ref_id,
+                    idempotency_key=idempotency_key,
+                )
+                db.session.add(txn)
+                db.session.flush()
+    except IntegrityError:
+        if idempotency_key:
+            return _existing_transaction(idempotency_key)
+        raise
+
+    if txn is None:
+        # Ponovljen zahtev posle iscrpljenog balance-a i dalje vraća original
+        if idempotency_key:
+            return _existing_transaction(idempotency_key) or False
         return False
-
-    balance_before = balance.balance
-    balance.balance = balance.balance - amount
-    balance.total_spent = balance.total_spent + amount
-
-    txn = CreditTransaction(
-        credit_balance_id=balance.id,
-        transaction_type=transaction_type,
-        amount=-amount,  # Negativan iznos za oduzimanje
-        balance_before=balance_before,
-        balance_after=balance.balance,
-        description=description,
-        reference_type=ref_type,
-        reference_id=ref_id,
-        idempotency_key=idempotency_key,
-    )
-    db.session.add(txn)
-    db.session.flush()
     return txn
 
 
@@ -0,0 +1,265 @@
+"""
+DLR Service - prijem i batch obrada D7 delivery report-ova.
+
+Kad se završi masovno slanje podsetnika, D7 šalje DLR-ove u naletima.
+Webhook zato samo verifikuje zahtev i ubacuje payload u Redis stream
+(`sms:dlr:stream`), pa odmah vraća 200.
+
+Obrada (job dlr_process, CLI `dlr-process`) ide u dva koraka:
+
+1. Stream -> sms_dlr_log: novi message_id-evi se upisuju sa
+   processed_at = NULL (duplikati se preskaču), pa se unosi brišu iz
+   stream-a tek posle commit-a. sms_dlr_log je trajni red čekanja; ako
+   Redis nije dostupan, webhook upisuje direktno u njega.
+2. sms_dlr_log (processed_at IS NULL) -> tenant_sms_usage: statusi se
+   primenjuju jednim UPDATE ... FROM (VALUES ...) po batch-u, a refund-ovi
+   za failed/expired idu kroz SmsBillingService.refund_sms_bulk u istoj
+   transakciji.
+"""
+
+import json
+import logging
+from datetime import datetime
+
+from sqlalchemy import column, update, values, bindparam, String
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models.sms_management import TenantSmsUsage, SmsDlrLog
+from .redis_service import redis_manager
+
+logger = logging.getLogger(__name__)
+
+
+STREAM_KEY = 'sms:dlr:stream'
+STREAM_MAXLEN = 100000
+BATCH_SIZE = 500
+MAX_BATCHES = 20                 # gornja granica po pokretanju jedne obrade
+REFUND_STATUSES = ('failed', 'expired')
+
+
+class DlrService:
+    """Brzi prijem DLR-ova i njihova batch obrada."""
+
+    # ============================================
+    # PRIJEM (webhook)
+    # ============================================
+
+    def enqueue(self, payload: dict) -> str:
+        """
+        Primi validiran DLR payload.
+
+        Returns:
+            'queued' - u stream-u ili u sms_dlr_log čeka obradu
+            'duplicate' - message_id je već primljen (samo fallback put)
+        """
+        client = redis_manager.client()
+        if client is not None:
+            try:
+                client.xadd(STREAM_KEY, {'payload': json.dumps(payload)},
+                            maxlen=STREAM_MAXLEN, approximate=True)
+                return 'queued'
+            except Exception as e:
+                redis_manager.record_failure(e, 'dlr')
+
+        db.session.add(self._log_row(payload))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return 'duplicate'
+        return 'queued'
+
+    @staticmethod
+    def _log_row(payload):
+        return SmsDlrLog(
+            message_id=payload['message_id'],
+            status=payload['status'],
+            raw_payload=json.dumps(payload),
+            error_code=payload.get('error_code')
+        )
+
+    # ============================================
+    # OBRADA
+    # ============================================
+
+    def process(self) -> dict:
+        """
+        Prebaci stream u sms_dlr_log i primeni sve neobrađene DLR-ove.
+
+        Returns:
+            {'received': novih iz stream-a, 'processed': primenjenih,
+             'updated': ažuriranih SMS-ova, 'refunded': refund-ova}
+        """
+        result = {'received': self._drain_stream(), 'processed': 0, 'updated': 0, 'refunded': 0}
+        for _ in range(MAX_BATCHES):
+            batch = self._apply_batch()
+            if not batch['processed']:
+                break
+            for key, value in batch.items():
+                result[key] += value
+
+        if result['processed']:
+            logger.info(f"DLR: {result}")
+        return result
+
+    def _drain_stream(self) -> int:
+        """Korak 1: stream -> sms_dlr_log (idempotentno po message_id)."""
+        client = redis_manager.client()
+        if client is None:
+            return 0
+
+        received = 0
+        for _ in range(MAX_BATCHES):
+            try:
+                entries = client.xrange(STREAM_KEY, count=BATCH_SIZE)
+            except Exception as e:
+                redis_manager.record_failure(e, 'dlr')
+                break
+            if not entries:
+                break
+
+            payloads = {}
+            for _, fields in entries:
+                payload = json.loads(fields['payload'])
+                payloads.setdefault(payload['message_id'], payload)  # prvi DLR važi
+
+            existing = {
+                message_id for (message_id,) in db.session.query(SmsDlrLog.message_id).filter(
+                    SmsDlrLog.message_id.in_(payloads)
+                )
+            }
+            new_rows = [self._log_row(p) for m, p in payloads.items() if m not in existing]
+            db.session.add_all(new_rows)
+            db.session.commit()
+            received += len(new_rows)
+
+            # Tek posle commit-a - ako proces padne, unosi se ponovo čitaju
+            try:
+                client.xdel(STREAM_KEY, *[entry_id for entry_id, _ in entries])
+            except Exception as e:
+                redis_manager.record_failure(e, 'dlr')
+                break
+        return received
+
+    def _apply_batch(self) -> dict:
+        """Korak 2: primeni jedan batch neobrađenih DLR-ova."""
+        logs = SmsDlrLog.query.filter(
+            SmsDlrLog.processed_at.is_(None)
+        ).order_by(SmsDlrLog.id).limit(BATCH_SIZE).with_for_update(skip_locked=True).all()
+        if not logs:
+            return {'processed': 0, 'updated': 0, 'refunded': 0}
+
+        now = datetime.utcnow()
+        updated = self._update_usage(logs, now)
+        refunded = self._refund_failed([log for log in logs if log.status in REFUND_STATUSES])
+
+        db.session.execute(
+            update(SmsDlrLog.__table__)
+            .where(SmsDlrLog.__table__.c.id.in_([log.id for log in logs]))
+            .values(processed_at=now)
+        )
+        db.session.commit()
+        return {'processed': len(logs), 'updated': updated, 'refunded': refunded}
+
+    @staticmethod
+    def _update_usage(logs, now) -> int:
+        """Statusi isporuke - jedan UPDATE za ceo batch."""
+        table = TenantSmsUsage.__table__
+        rows = [
+            {'dlr_message_id': log.message_id, 'dlr_status': log.status, 'dlr_error_code': log.error_code}
+            for log in logs
+        ]
+
+        if db.session.get_bind().dialect.name == 'postgresql':
+            dlr = values(
+                column('message_id', String), column('status', String), column('error_code', String),
+                name='dlr'
+            ).data([tuple(r.values()) for r in rows])
+            result = db.session.execute(
+                update(table)
+                .where(table.c.provider_message_id == dlr.c.message_id)
+                .values(
+                    delivery_status=dlr.c.status,
+                    delivery_status_at=now,
+                    delivery_error_code=db.func.coalesce(dlr.c.error_code, table.c.delivery_error_code),
+                )
+            )
+            return result.rowcount
+
+        # SQLite i ostali: executemany (UPDATE ... FROM VALUES nije podržan)
+        result = db.session.execute(
+            update(table)
+            .where(table.c.provider_message_id == bindparam('dlr_message_id'))
+            .values(
+                delivery_status=bindparam('dlr_status'),
+                delivery_status_at=now,
+                delivery_error_code=db.func.coalesce(bindparam('dlr_error_code'), table.c.delivery_error_code),
+            ),
+            rows
+        )
+        return result.rowcount
+
+    @staticmethod
+    def _refund_failed(logs) -> int:
+        """Refund kredita za failed/expired SMS-ove, bez commit-a."""
+        if not logs:
+            return 0
+
+        from ..models import CreditBalance, CreditTransaction, CreditTransactionType
+        from .sms_billing_service import SmsBillingService
+
+        by_message = {log.message_id: log for log in logs}
+        usages = TenantSmsUsage.query.filter(
+            TenantSmsUsage.provider_message_id.in_(by_message)
+        ).all()
+        if not usages:
+            return 0
+
+        # Naplata nosi reference_type='sms_usage'; reference_id je id usage
+        # reda ili (za naloge) id naloga - kandidati jednim upitom
+        reference_ids = {u.id for u in usages} | {
+            u.reference_id for u in usages if u.reference_type == 'ticket' and u.reference_id
+        }
+        candidates = db.session.query(CreditTransaction, CreditBalance.tenant_id).join(
+            CreditBalance, CreditBalance.id == CreditTransaction.credit_balance_id
+        ).filter(
+            CreditTransaction.reference_type == 'sms_usage',
+            CreditTransaction.transaction_type == CreditTransactionType.SMS_NOTIFICATION,
+            CreditTransaction.reference_id.in_(reference_ids)
+        ).order_by(CreditTransaction.created_at.desc()).all()
+
+        refunds = []
+        for usage in usages:
+            original = _match_transaction(usage, candidates)
+            if original is None:
+                logger.warning(f"DLR: nema transakcije za SMS {usage.id}")
+                continue
+            log = by_message[usage.provider_message_id]
+            reason = f"DLR {log.status}"
+            if log.error_code:
+                reason += f" (code: {log.error_code})"
+            refunds.append((original.id, reason))
+
+        results = SmsBillingService.refund_sms_bulk(refunds, commit=False)
+        for transaction_id, (success, msg) in results.items():
+            if not success:
+                logger.warning(f"DLR: refund transakcije {transaction_id} nije uspeo: {msg}")
+        return sum(1 for _, msg in results.values() if msg == "Refund uspešan")
+
+
+def _match_transaction(usage, candidates):
+    """Naplata za dati usage red: direktna veza, pa poslednja za nalog pre slanja."""
+    for transaction, tenant_id in candidates:
+        if tenant_id == usage.tenant_id and transaction.reference_id == usage.id:
+            return transaction
+    if usage.reference_type == 'ticket' and usage.reference_id:
+        for transaction, tenant_id in candidates:
+            if (tenant_id == usage.tenant_id and transaction.reference_id == usage.reference_id
+                    and transaction.created_at <= usage.created_at):
+                return transaction
+    return None
+
+
+# Singleton instance
+dlr_service = DlrService()
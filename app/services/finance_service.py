@@ -2,36 +2,335 @@
 Finance Service - izveštaji o prometu i profitu.
 
 Servisni nalozi, prodaja telefona, prodaja robe, dnevni prometi po kasi.
+
+Sumarni pregledi čitaju DailyRevenueFact (noćni rollup) - broj redova
+zavisi od broja dana i lokacija, ne od broja naloga/računa. Samo dani
+koje je rollup pokrio (RevenueRollupDay) se čitaju iz agregata; ostali
+(današnji, stariji od inicijalnog punjenja) se računaju SQL agregatom.
+Pojedinačni redovi su dostupni samo kroz paginirane detalje.
+
+Izveštajne metode (get_*) čitaju sa read replike kad je podešena.
 """
 
 from datetime import date, datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import func, insert
+
 from ..extensions import db
 from ..models.ticket import ServiceTicket, TicketStatus
 from ..models.inventory import PhoneListing
-from ..models.pos import Receipt, ReceiptItem, DailyReport, ReceiptStatus, SaleItemType
+from ..models.pos import (
+    Receipt, ReceiptItem, DailyReport, CashRegisterSession, ReceiptStatus, SaleItemType
+)
+from ..models.revenue_fact import DailyRevenueFact, RevenueRollupDay
+from .replica_service import read_replica
+
+
+FACT_SOURCES = ('tickets', 'phones', 'goods', 'pos')
+
+# Numeričke kolone DailyRevenueFact
+FACT_AMOUNTS = ('revenue', 'cost', 'profit', 'cash', 'card', 'transfer', 'revenue_eur', 'cash_eur', 'card_eur')
+
+
+def _as_date(value):
+    """func.date() vraća string na SQLite-u, date na PostgreSQL-u."""
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def _uncovered_ranges(start_date, end_date, covered):
+    """Uzastopni [od, do] periodi dana iz [start_date, end_date] kojih nema u `covered`."""
+    ranges = []
+    day = start_date
+    while day <= end_date:
+        if day in covered:
+            day += timedelta(days=1)
+            continue
+        range_start = day
+        while day <= end_date and day not in covered:
+            day += timedelta(days=1)
+        ranges.append((range_start, day - timedelta(days=1)))
+    return ranges
 
 
 class FinanceService:
     """Static metode za finansijske izveštaje."""
 
+    # ============================================
+    # AGREGATI IZ IZVORNIH TABELA
+    # ============================================
+
     @staticmethod
-    def get_ticket_revenue(tenant_id: int, start_date: date, end_date: date):
-        """Naplaćeni servisni nalozi u periodu."""
+    def _aggregate_source(source, start_date, end_date, tenant_id=None):
+        """
+        SQL agregat jednog izvora po (tenant, lokacija, dan) za period.
+
+        Returns:
+            Lista dict-ova sa kolonama DailyRevenueFact
+        """
         start_dt = datetime.combine(start_date, datetime.min.time())
         end_dt = datetime.combine(end_date, datetime.max.time())
 
-        tickets = ServiceTicket.query.filter(
+        if source == 'tickets':
+            day = func.date(ServiceTicket.paid_at)
+            query = db.session.query(
+                ServiceTicket.tenant_id, ServiceTicket.location_id, day,
+                func.count(ServiceTicket.id),
+                func.coalesce(func.sum(ServiceTicket.final_price), 0),
+            ).filter(
+                ServiceTicket.status == TicketStatus.DELIVERED,
+                ServiceTicket.is_paid == True,
+                ServiceTicket.paid_at >= start_dt,
+                ServiceTicket.paid_at <= end_dt
+            )
+            if tenant_id:
+                query = query.filter(ServiceTicket.tenant_id == tenant_id)
+            query = query.group_by(ServiceTicket.tenant_id, ServiceTicket.location_id, day)
+            # Servisni nalozi: samo promet (nabavna cena delova nije deo naloga)
+            return [{
+                'tenant_id': t, 'location_id': loc, 'day': _as_date(d), 'source': source,
+                'count': cnt, 'revenue': Decimal(str(rev)),
+            } for t, loc, d, cnt, rev in query.all()]
+
+        if source == 'phones':
+            day = func.date(PhoneListing.sold_at)
+            query = db.session.query(
+                PhoneListing.tenant_id, PhoneListing.location_id, day,
+                func.count(PhoneListing.id),
+                func.coalesce(func.sum(PhoneListing.sales_price), 0),
+                func.coalesce(func.sum(PhoneListing.purchase_price), 0),
+            ).filter(
+                PhoneListing.sold == True,
+                PhoneListing.sold_at >= start_dt,
+                PhoneListing.sold_at <= end_dt
+            )
+            if tenant_id:
+                query = query.filter(PhoneListing.tenant_id == tenant_id)
+            query = query.group_by(PhoneListing.tenant_id, PhoneListing.location_id, day)
+            return [{
+                'tenant_id': t, 'location_id': loc, 'day': _as_date(d), 'source': source,
+                'count': cnt, 'revenue': Decimal(str(rev)), 'cost': Decimal(str(cost)),
+                'profit': Decimal(str(rev)) - Decimal(str(cost)),
+            } for t, loc, d, cnt, rev, cost in query.all()]
+
+        if source == 'goods':
+            day = func.date(Receipt.issued_at)
+            query = db.session.query(
+                Receipt.tenant_id, CashRegisterSession.location_id, day,
+                func.count(ReceiptItem.id),
+                func.coalesce(func.sum(ReceiptItem.line_total), 0),
+                func.coalesce(func.sum(ReceiptItem.line_cost), 0),
+            ).select_from(ReceiptItem).join(
+                Receipt, Receipt.id == ReceiptItem.receipt_id
+            ).outerjoin(
+                CashRegisterSession, CashRegisterSession.id == Receipt.session_id
+            ).filter(
+                Receipt.status == ReceiptStatus.ISSUED,
+                ReceiptItem.item_type == SaleItemType.GOODS,
+                Receipt.issued_at >= start_dt,
+                Receipt.issued_at <= end_dt
+            )
+            if tenant_id:
+                query = query.filter(Receipt.tenant_id == tenant_id)
+            query = query.group_by(Receipt.tenant_id, CashRegisterSession.location_id, day)
+            return [{
+                'tenant_id': t, 'location_id': loc, 'day': _as_date(d), 'source': source,
+                'count': cnt, 'revenue': Decimal(str(rev)), 'cost': Decimal(str(cost)),
+                'profit': Decimal(str(rev)) - Decimal(str(cost)),
+            } for t, loc, d, cnt, rev, cost in query.all()]
+
+        if source == 'pos':
+            query = db.session.query(
+                DailyReport.tenant_id, DailyReport.location_id, DailyReport.date,
+                func.sum(DailyReport.receipt_count),
+                func.sum(DailyReport.total_revenue), func.sum(DailyReport.total_cost),
+                func.sum(DailyReport.total_profit), func.sum(DailyReport.total_cash),
+                func.sum(DailyReport.total_card), func.sum(DailyReport.total_transfer),
+                func.sum(DailyReport.total_revenue_eur), func.sum(DailyReport.total_cash_eur),
+                func.sum(DailyReport.total_card_eur),
+            ).filter(
+                DailyReport.date >= start_date,
+                DailyReport.date <= end_date
+            )
+            if tenant_id:
+                query = query.filter(DailyReport.tenant_id == tenant_id)
+            query = query.group_by(DailyReport.tenant_id, DailyReport.location_id, DailyReport.date)
+            return [{
+                'tenant_id': t, 'location_id': loc, 'day': _as_date(d), 'source': source,
+                'count': int(cnt or 0),
+                **{field: Decimal(str(value or 0)) for field, value in zip(FACT_AMOUNTS, amounts)},
+            } for t, loc, d, cnt, *amounts in query.all()]
+
+        raise ValueError(f'Nepoznat izvor: {source}')
+
+    # ============================================
+    # ROLLUP
+    # ============================================
+
+    @staticmethod
+    def rollup_days(start_date, end_date, sources=FACT_SOURCES):
+        """
+        Preračunaj DailyRevenueFact za dane [start_date, end_date], svi tenanti.
+
+        Dan se briše i upisuje ponovo, pa je ponovni poziv bezbedan
+        (npr. kasno storniran račun ili ponovljen Z-izveštaj).
+
+        Returns:
+            {'start', 'end', 'rows'}
+        """
+        for model in (DailyRevenueFact, RevenueRollupDay):
+            model.query.filter(
+                model.day >= start_date,
+                model.day <= end_date,
+                model.source.in_(sources)
+            ).delete(synchronize_session=False)
+
+        rows = []
+        for source in sources:
+            for row in FinanceService._aggregate_source(source, start_date, end_date):
+                rows.append({**{field: Decimal('0') for field in FACT_AMOUNTS}, **row})
+
+        if rows:
+            db.session.execute(insert(DailyRevenueFact), rows)
+
+        days = [start_date + timedelta(days=n) for n in range((end_date - start_date).days + 1)]
+        if days:
+            db.session.execute(insert(RevenueRollupDay), [
+                {'day': day, 'source': source} for day in days for source in sources
+            ])
+        db.session.flush()
+        return {'start': start_date.isoformat(), 'end': end_date.isoformat(), 'rows': len(rows)}
+
+    @staticmethod
+    def covered_days(start_date, end_date, sources=FACT_SOURCES):
+        """{izvor: set(dana)} iz [start_date, end_date] koje je rollup pokrio."""
+        covered = {source: set() for source in sources}
+        for day, source in db.session.query(RevenueRollupDay.day, RevenueRollupDay.source).filter(
+            RevenueRollupDay.day >= start_date,
+            RevenueRollupDay.day <= end_date,
+            RevenueRollupDay.source.in_(sources)
+        ).all():
+            covered[source].add(day)
+        return covered
+
+    @staticmethod
+    def _period_rows(tenant_id, start_date, end_date, sources=FACT_SOURCES):
+        """
+        Redovi po (izvor, lokacija, dan) za period: rollup za pokrivene
+        dane + SQL agregat za sve ostale.
+        """
+        covered = FinanceService.covered_days(start_date, end_date, sources)
+        rows = []
+
+        if any(covered.values()):
+            facts = DailyRevenueFact.query.filter(
+                DailyRevenueFact.tenant_id == tenant_id,
+                DailyRevenueFact.source.in_(sources),
+                DailyRevenueFact.day >= start_date,
+                DailyRevenueFact.day <= end_date
+            ).all()
+            rows.extend({
+                'location_id': f.location_id, 'day': f.day, 'source': f.source, 'count': f.count,
+                **{field: getattr(f, field) or Decimal('0') for field in FACT_AMOUNTS},
+            } for f in facts if f.day in covered[f.source])
+
+        for source in sources:
+            for live_start, live_end in _uncovered_ranges(start_date, end_date, covered[source]):
+                rows.extend(FinanceService._aggregate_source(source, live_start, live_end, tenant_id))
+
+        return rows
+
+    @staticmethod
+    def _sum_rows(rows, source, field):
+        return float(sum((r.get(field) or 0) for r in rows if r['source'] == source))
+
+    # ============================================
+    # PREGLEDI
+    # ============================================
+
+    @staticmethod
+    def _ticket_totals(rows):
+        return {
+            'total': FinanceService._sum_rows(rows, 'tickets', 'revenue'),
+            'count': int(FinanceService._sum_rows(rows, 'tickets', 'count')),
+        }
+
+    @staticmethod
+    def _sales_totals(rows, source):
+        total = FinanceService._sum_rows(rows, source, 'revenue')
+        cost = FinanceService._sum_rows(rows, source, 'cost')
+        return {
+            'total': total,
+            'profit': total - cost,
+            'count': int(FinanceService._sum_rows(rows, source, 'count')),
+        }
+
+    @staticmethod
+    def _pos_totals(rows):
+        from ..models.tenant import ServiceLocation
+
+        pos_rows = sorted(
+            (r for r in rows if r['source'] == 'pos'),
+            key=lambda r: (r['day'], r['location_id'] or 0), reverse=True
+        )
+        location_ids = {r['location_id'] for r in pos_rows if r['location_id']}
+        names = dict(db.session.query(ServiceLocation.id, ServiceLocation.name).filter(
+            ServiceLocation.id.in_(location_ids)
+        ).all()) if location_ids else {}
+
+        def _sum(field):
+            return FinanceService._sum_rows(pos_rows, 'pos', field)
+
+        total_revenue = _sum('revenue')
+        total_profit = _sum('profit')
+        return {
+            # RSD totali
+            'total_cash': _sum('cash'),
+            'total_card': _sum('card'),
+            'total_transfer': _sum('transfer'),
+            'total': total_revenue,
+            'total_cost': _sum('cost'),
+            'total_profit': total_profit,
+            'profit_margin_pct': round(total_profit / total_revenue * 100, 1) if total_revenue else 0,
+            'total_receipts': int(_sum('count')),
+            # EUR totali (za internu kasu)
+            'total_cash_eur': _sum('cash_eur'),
+            'total_card_eur': _sum('card_eur'),
+            'total_eur': _sum('revenue_eur'),
+            'days': [{
+                'date': r['day'].strftime('%Y-%m-%d'),
+                'location': names.get(r['location_id'], 'N/A'),
+                'location_id': r['location_id'],
+                'cash': float(r.get('cash') or 0),
+                'card': float(r.get('card') or 0),
+                'transfer': float(r.get('transfer') or 0),
+                'total': float(r.get('revenue') or 0),
+                'profit': float(r.get('profit') or 0),
+                'margin_pct': round(float(r['profit']) / float(r['revenue']) * 100, 2) if r.get('revenue') else 0,
+                'cash_eur': float(r.get('cash_eur') or 0),
+                'card_eur': float(r.get('card_eur') or 0),
+                'total_eur': float(r.get('revenue_eur') or 0),
+                'receipt_count': r['count'] or 0
+            } for r in pos_rows]
+        }
+
+    @staticmethod
+    @read_replica
+    def get_ticket_revenue(tenant_id: int, start_date: date, end_date: date, page: int = 1, per_page: int = 50):
+        """Naplaćeni servisni nalozi u periodu - totali + paginirana lista."""
+        rows = FinanceService._period_rows(tenant_id, start_date, end_date, sources=('tickets',))
+
+        pagination = ServiceTicket.query.filter(
             ServiceTicket.tenant_id == tenant_id,
             ServiceTicket.status == TicketStatus.DELIVERED,
             ServiceTicket.is_paid == True,
-            ServiceTicket.paid_at >= start_dt,
-            ServiceTicket.paid_at <= end_dt
-        ).all()
+            ServiceTicket.paid_at >= datetime.combine(start_date, datetime.min.time()),
+            ServiceTicket.paid_at <= datetime.combine(end_date, datetime.max.time())
+        ).order_by(ServiceTicket.paid_at.desc()).paginate(page=page, per_page=per_page, error_out=False)
 
-        total = sum(float(t.final_price or 0) for t in tickets)
         return {
-            'total': total,
-            'count': len(tickets),
+            **FinanceService._ticket_totals(rows),
             'items': [{
                 'id': t.id,
                 'ticket_number': t.ticket_number,
@@ -39,28 +338,27 @@ class FinanceService:
                 'device': f"{t.brand} {t.model}" if t.brand else '',
                 'price': float(t.final_price or 0),
                 'date': t.paid_at.strftime('%Y-%m-%d') if t.paid_at else ''
-            } for t in tickets]
+            } for t in pagination.items],
+            'page': pagination.page,
+            'per_page': pagination.per_page,
+            'pages': pagination.pages,
         }
 
     @staticmethod
-    def get_phone_sales(tenant_id: int, start_date: date, end_date: date):
-        """Prodati telefoni u periodu."""
-        start_dt = datetime.combine(start_date, datetime.min.time())
-        end_dt = datetime.combine(end_date, datetime.max.time())
+    @read_replica
+    def get_phone_sales(tenant_id: int, start_date: date, end_date: date, page: int = 1, per_page: int = 50):
+        """Prodati telefoni u periodu - totali + paginirana lista."""
+        rows = FinanceService._period_rows(tenant_id, start_date, end_date, sources=('phones',))
 
-        phones = PhoneListing.query.filter(
+        pagination = PhoneListing.query.filter(
             PhoneListing.tenant_id == tenant_id,
             PhoneListing.sold == True,
-            PhoneListing.sold_at >= start_dt,
-            PhoneListing.sold_at <= end_dt
-        ).all()
+            PhoneListing.sold_at >= datetime.combine(start_date, datetime.min.time()),
+            PhoneListing.sold_at <= datetime.combine(end_date, datetime.max.time())
+        ).order_by(PhoneListing.sold_at.desc()).paginate(page=page, per_page=per_page, error_out=False)
 
-        total = sum(float(p.sales_price or 0) for p in phones)
-        cost = sum(float(p.purchase_price or 0) for p in phones)
         return {
-            'total': total,
-            'profit': total - cost,
-            'count': len(phones),
+            **FinanceService._sales_totals(rows, 'phones'),
             'items': [{
                 'id': p.id,
                 'model': f"{p.brand} {p.model}",
@@ -68,89 +366,45 @@ class FinanceService:
                 'cost': float(p.purchase_price or 0),
                 'profit': float((p.sales_price or 0) - (p.purchase_price or 0)),
                 'date': p.sold_at.strftime('%Y-%m-%d') if p.sold_at else ''
-            } for p in phones]
+            } for p in pagination.items],
+            'page': pagination.page,
+            'per_page': pagination.per_page,
+            'pages': pagination.pages,
         }
 
     @staticmethod
+    @read_replica
     def get_goods_sales(tenant_id: int, start_date: date, end_date: date):
         """Prodaja robe kroz POS u periodu."""
-        start_dt = datetime.combine(start_date, datetime.min.time())
-        end_dt = datetime.combine(end_date, datetime.max.time())
-
-        items = db.session.query(ReceiptItem).join(Receipt).filter(
-            Receipt.tenant_id == tenant_id,
-            Receipt.status == ReceiptStatus.ISSUED,
-            ReceiptItem.item_type == SaleItemType.GOODS,
-            Receipt.issued_at >= start_dt,
-            Receipt.issued_at <= end_dt
-        ).all()
-
-        total = sum(float(i.line_total or 0) for i in items)
-        cost = sum(float(i.line_cost or 0) for i in items)
-        return {
-            'total': total,
-            'profit': total - cost,
-            'count': len(items)
-        }
+        rows = FinanceService._period_rows(tenant_id, start_date, end_date, sources=('goods',))
+        return FinanceService._sales_totals(rows, 'goods')
 
     @staticmethod
+    @read_replica
     def get_pos_daily(tenant_id: int, start_date: date, end_date: date):
         """Dnevni Z-izveštaji u periodu."""
-        reports = DailyReport.query.filter(
-            DailyReport.tenant_id == tenant_id,
-            DailyReport.date >= start_date,
-            DailyReport.date <= end_date
-        ).order_by(DailyReport.date.desc()).all()
-
-        total_revenue = sum(float(r.total_revenue or 0) for r in reports)
-        total_cost = sum(float(r.total_cost or 0) for r in reports)
-        total_profit = sum(float(r.total_profit or 0) for r in reports)
-
-        return {
-            # RSD totali
-            'total_cash': sum(float(r.total_cash or 0) for r in reports),
-            'total_card': sum(float(r.total_card or 0) for r in reports),
-            'total_transfer': sum(float(r.total_transfer or 0) for r in reports),
-            'total': total_revenue,
-            'total_cost': total_cost,
-            'total_profit': total_profit,
-            'profit_margin_pct': round(total_profit / total_revenue * 100, 1) if total_revenue else 0,
-            'total_receipts': sum(r.receipt_count or 0 for r in reports),
-            # EUR totali (za internu kasu)
-            'total_cash_eur': sum(float(r.total_cash_eur or 0) for r in reports),
-            'total_card_eur': sum(float(r.total_card_eur or 0) for r in reports),
-            'total_eur': sum(float(r.total_revenue_eur or 0) for r in reports),
-            'days': [{
-                'date': r.date.strftime('%Y-%m-%d'),
-                'location': r.location.name if r.location else 'N/A',
-                'location_id': r.location_id,
-                'cash': float(r.total_cash or 0),
-                'card': float(r.total_card or 0),
-                'transfer': float(r.total_transfer or 0),
-                'total': float(r.total_revenue or 0),
-                'profit': float(r.total_profit or 0),
-                'margin_pct': float(r.profit_margin_pct or 0),
-                'cash_eur': float(r.total_cash_eur or 0) if r.total_cash_eur else 0,
-                'card_eur': float(r.total_card_eur or 0) if r.total_card_eur else 0,
-                'total_eur': float(r.total_revenue_eur or 0) if r.total_revenue_eur else 0,
-                'receipt_count': r.receipt_count or 0
-            } for r in reports]
-        }
+        rows = FinanceService._period_rows(tenant_id, start_date, end_date, sources=('pos',))
+        return FinanceService._pos_totals(rows)
 
     @staticmethod
+    @read_replica
     def get_summary(tenant_id: int, days: int = 30):
-        """Sumarni pregled svih tipova prometa."""
+        """Sumarni pregled svih tipova prometa (samo agregati)."""
         end = date.today()
         start = end - timedelta(days=days)
 
+        rows = FinanceService._period_rows(tenant_id, start, end)
+        pos = FinanceService._pos_totals(rows)
+        pos.pop('days')
+
         return {
             'period': {
                 'start': start.isoformat(),
                 'end': end.isoformat(),
                 'days': days
             },
-            'tickets': FinanceService.get_ticket_revenue(tenant_id, start, end),
-            'phones': FinanceService.get_phone_sales(tenant_id, start, end),
-            'goods': FinanceService.get_goods_sales(tenant_id, start, end),
-            'pos': FinanceService.get_pos_daily(tenant_id, start, end)
+            'tickets': FinanceService._ticket_totals(rows),
+            'phones': FinanceService._sales_totals(rows, 'phones'),
+            'goods': FinanceService._sales_totals(rows, 'goods'),
+            'pos': pos
         }
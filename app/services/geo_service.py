@@ -0,0 +1,134 @@
+"""
+Geo Service - pretraga po blizini za B2C marketplace.
+
+Oba smera koriste isti indeks (geohash kolona + bounding box):
+- korisnik traži servise: najbliže aktivne lokacije -> tenanti
+- servis traži zahteve: najbliži otvoreni ServiceRequest-ovi
+
+Vidi app/utils/geo.py za opis indeksa.
+"""
+
+from datetime import datetime
+
+from ..extensions import db
+from ..models import Tenant, ServiceLocation, TenantStatus
+from ..models.service_request import ServiceRequest, ServiceRequestStatus
+from ..utils.geo import geohash_filter, bounding_box, haversine_km
+
+
+DEFAULT_RADIUS_KM = 25
+MAX_RADIUS_KM = 500
+MAX_RESULTS = 100
+
+
+class GeoService:
+    """Upiti "najbližih N u krugu R km"."""
+
+    @staticmethod
+    def parse_args(args, default_radius_km=DEFAULT_RADIUS_KM, default_origin=None):
+        """
+        lat/lon/radius_km/limit iz query string-a.
+
+        Args:
+            default_origin: (lat, lon) ako lat/lon nisu u query string-u
+
+        Returns:
+            (latitude, longitude, radius_km, limit) ili None ako nema tačke
+
+        Raises:
+            ValueError: Koordinate van opsega
+        """
+        latitude = args.get('lat', type=float)
+        longitude = args.get('lon', type=float)
+        if (latitude is None or longitude is None) and default_origin:
+            latitude, longitude = default_origin
+        if latitude is None or longitude is None:
+            return None
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError('Neispravne koordinate')
+        radius_km = min(max(args.get('radius_km', default_radius_km, type=float), 0.1), MAX_RADIUS_KM)
+        limit = min(max(args.get('limit', 20, type=int), 1), MAX_RESULTS)
+        return latitude, longitude, radius_km, limit
+
+    @staticmethod
+    def _nearest(query, model, latitude, longitude, radius_km, limit):
+        """
+        Prefilter po geohash ćelijama i bounding box-u, pa tačna distanca.
+
+        Returns:
+            Lista (objekat, distance_km) sortirana po udaljenosti
+        """
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        candidates = query.filter(
+            geohash_filter(model.geohash, latitude, longitude, radius_km),
+            model.latitude.between(min_lat, max_lat),
+            model.longitude.between(min_lon, max_lon),
+        ).all()
+
+        ranked = []
+        for obj in candidates:
+            distance = haversine_km(latitude, longitude, obj.latitude, obj.longitude)
+            if distance <= radius_km:
+                ranked.append((obj, distance))
+        ranked.sort(key=lambda item: item[1])
+        return ranked[:limit]
+
+    @staticmethod
+    def nearby_tenants(latitude, longitude, radius_km=DEFAULT_RADIUS_KM, limit=20):
+        """
+        Najbliži aktivni servisi (po najbližoj aktivnoj lokaciji).
+
+        Returns:
+            Lista (Tenant, ServiceLocation, distance_km)
+        """
+        query = ServiceLocation.query.join(Tenant, Tenant.id == ServiceLocation.tenant_id).filter(
+            ServiceLocation.is_active.is_(True),
+            Tenant.status.in_([TenantStatus.ACTIVE, TenantStatus.PROMO]),
+        )
+        # Više lokacija istog tenanta - zadržava se najbliža
+        ranked = GeoService._nearest(query, ServiceLocation, latitude, longitude, radius_km, limit=None)
+
+        nearest = {}
+        for location, distance in ranked:
+            nearest.setdefault(location.tenant_id, (location, distance))
+        top = list(nearest.items())[:limit]
+
+        tenants = {t.id: t for t in Tenant.query.filter(Tenant.id.in_([tid for tid, _ in top])).all()} if top else {}
+        return [(tenants[tid], location, distance) for tid, (location, distance) in top]
+
+    @staticmethod
+    def nearby_requests(latitude, longitude, radius_km=DEFAULT_RADIUS_KM, limit=20, category=None):
+        """
+        Najbliži otvoreni (neistekli) servisni zahtevi.
+
+        Returns:
+            Lista (ServiceRequest, distance_km)
+        """
+        query = ServiceRequest.query.filter(
+            ServiceRequest.status.in_([ServiceRequestStatus.OPEN, ServiceRequestStatus.IN_BIDDING]),
+            db.or_(
+                ServiceRequest.expires_at.is_(None),
+                ServiceRequest.expires_at > datetime.utcnow()
+            ),
+        )
+        if category:
+            query = query.filter(ServiceRequest.category == category)
+        return GeoService._nearest(query, ServiceRequest, latitude, longitude, radius_km, limit)
+
+    @staticmethod
+    def primary_locations(tenant_ids):
+        """Primarne lokacije za listu tenanta - jedan upit umesto jednog po tenantu."""
+        if not tenant_ids:
+            return {}
+        locations = ServiceLocation.query.filter(
+            ServiceLocation.tenant_id.in_(tenant_ids),
+            ServiceLocation.is_primary.is_(True),
+        ).order_by(ServiceLocation.id).all()
+        result = {}
+        for location in locations:
+            result.setdefault(location.tenant_id, location)
+        return result
+
+
+# Singleton instance
+geo_service = GeoService()
@@ -153,7 +153,13 @@ class GoodsService:
         Za svaku stavku:
         - Ako ima goods_item_id → ažuriraj GoodsItem stanje i cene
         - Ako ima spare_part_id → ažuriraj SparePart stanje i cene
+
+        Artikli se učitavaju jednim upitom po tipu, a RECEIVE pokreti u
+        ledger (ako faktura ima lokaciju) idu kroz create_stock_movements_bulk.
         """
+        from ..models.inventory import SparePart
+        from ..models.stock_movement import MovementType, create_stock_movements_bulk
+
         invoice = PurchaseInvoice.query.filter_by(
             id=invoice_id, tenant_id=tenant_id
         ).first()
@@ -166,9 +172,22 @@ class GoodsService:
         if not items:
             raise ValueError('Faktura nema stavki')
 
+        goods_ids = {item.goods_item_id for item in items if item.goods_item_id}
+        part_ids = {item.spare_part_id for item in items if not item.goods_item_id and item.spare_part_id}
+        goods_map = {g.id: g for g in GoodsItem.query.filter(GoodsItem.id.in_(goods_ids)).all()} if goods_ids else {}
+        parts_map = {p.id: p for p in SparePart.query.filter(SparePart.id.in_(part_ids)).all()} if part_ids else {}
+
+        movement_lines = []
         for item in items:
+            line = {
+                'location_id': invoice.location_id,
+                'movement_type': MovementType.RECEIVE,
+                'quantity': item.quantity,
+                'unit_cost': item.purchase_price,
+                'unit_price': item.selling_price,
+            }
             if item.goods_item_id:
-                goods = GoodsItem.query.get(item.goods_item_id)
+                goods = goods_map.get(item.goods_item_id)
                 if goods:
                     goods.current_stock += item.quantity
                     goods.purchase_price = item.purchase_price
@@ -176,15 +195,26 @@ class GoodsService:
                         goods.selling_price = item.selling_price
                     if item.margin_pct is not None:
                         goods.default_margin_pct = item.margin_pct
+                    movement_lines.append(dict(line, goods_item_id=goods.id))
 
             elif item.spare_part_id:
-                from ..models.inventory import SparePart
-                part = SparePart.query.get(item.spare_part_id)
+                part = parts_map.get(item.spare_part_id)
                 if part:
                     part.quantity += item.quantity
                     part.purchase_price = item.purchase_price
                     if item.selling_price:
                         part.selling_price = item.selling_price
+                    movement_lines.append(dict(line, spare_part_id=part.id))
+
+        # Ledger pokreti - jedan batch za celu fakturu
+        if invoice.location_id and user_id:
+            create_stock_movements_bulk(
+                tenant_id, user_id,
+                [line for line in movement_lines if line['quantity']],
+                reference_type='purchase_invoice',
+                reference_id=invoice.id,
+                reference_number=invoice.invoice_number,
+            )
 
         invoice.status = InvoiceStatus.RECEIVED
         invoice.received_date = date.today()
@@ -6,8 +6,6 @@ REFERENCE: https://ips.nbs.rs
 Koristi se za generisanje IPS QR kodova na uplatnicama
 koji se mogu skenirati u mBanking aplikacijama.
 """
-import qrcode
-from qrcode.constants import ERROR_CORRECT_M
 from io import BytesIO
 from decimal import Decimal
 from typing import Optional
@@ -283,6 +281,10 @@ class IPSService:
         border: int = 4
     ) -> bytes:
         """Generiše QR kod sliku kao PNG."""
+        # qrcode/PIL se učitavaju tek pri prvom QR kodu, ne pri startu aplikacije
+        import qrcode
+        from qrcode.constants import ERROR_CORRECT_M
+
         qr = qrcode.QRCode(
             version=None,
             error_correction=ERROR_CORRECT_M,
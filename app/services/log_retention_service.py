@@ -0,0 +1,450 @@
+"""
+Log Retention Service - rotacija, agregacija i brisanje starih logova.
+
+Tok po tabeli (scheduler, jednom dnevno):
+1. Redovi stariji od hot_days se, dan po dan, sabijaju u LogDailyRollup
+2. Isti redovi se premestaju u <tabela>_archive (INSERT ... SELECT + DELETE)
+   u istoj transakciji - agregat i arhiva su uvek uskladjeni
+3. Arhivski podaci stariji od retention_months se brisu
+   (na PostgreSQL-u DROP cele mesecne particije, bez DELETE-a)
+
+Query helperi uvek ogranicavaju created_at, tako da PostgreSQL
+preskace particije koje ne mogu sadrzati trazene redove.
+
+Komande:
+    flask log-retention                    # Sve tabele
+    flask log-retention --source audit_log # Samo jedna tabela
+"""
+
+from datetime import datetime, date, time, timedelta, timezone
+from decimal import Decimal
+from dateutil.relativedelta import relativedelta
+from flask import current_app
+from sqlalchemy import func, select, text, literal
+
+from ..extensions import db
+from ..models.audit import AuditLog
+from ..models.security_event import SecurityEvent
+from ..models.goods import PosAuditLog
+from ..models.inventory import SparePartLog
+from ..models.sms_management import TenantSmsUsage
+from ..models.log_retention import LogDailyRollup, ARCHIVE_TABLES
+
+
+# Politike zadrzavanja po tabeli:
+# - hot_days: koliko dana redovi ostaju u glavnoj tabeli
+# - retention_months: koliko meseci arhiva cuva redove (None = zauvek)
+# - group_by: kolone koje cine bucket dnevnog agregata
+# - amount: kolona koja se sabira u agregatu (opciono)
+LOG_POLICIES = {
+    'audit_log': {
+        'model': AuditLog,
+        'hot_days': 90,
+        'retention_months': 36,
+        'group_by': ('entity_type', 'action'),
+        'amount': None,
+    },
+    'security_event': {
+        'model': SecurityEvent,
+        'hot_days': 30,
+        'retention_months': 12,
+        'group_by': ('event_type',),
+        'amount': None,
+    },
+    'pos_audit_log': {
+        'model': PosAuditLog,
+        'hot_days': 90,
+        'retention_months': 60,
+        'group_by': ('action',),
+        'amount': None,
+    },
+    'spare_part_log': {
+        'model': SparePartLog,
+        'hot_days': 180,
+        'retention_months': 36,
+        'group_by': ('action_type',),
+        'amount': 'quantity_change',
+    },
+    'tenant_sms_usage': {
+        'model': TenantSmsUsage,
+        'hot_days': 90,
+        'retention_months': 24,
+        'group_by': ('sms_type', 'status'),
+        'amount': 'cost',
+    },
+}
+
+
+def _bucket_part(value):
+    """Pretvara vrednost grupisanja u string za bucket."""
+    if value is None:
+        return '-'
+    if hasattr(value, 'value'):
+        return str(value.value)
+    return str(value)
+
+
+class LogRetentionService:
+    """
+    Servis za rotaciju append-only log tabela.
+    """
+
+    # =========================================================================
+    # HELPERS
+    # =========================================================================
+
+    @staticmethod
+    def _policy(source):
+        if source not in LOG_POLICIES:
+            raise ValueError(f'Nepoznat log izvor: {source}')
+        return LOG_POLICIES[source]
+
+    @staticmethod
+    def _is_postgres():
+        return db.engine.dialect.name == 'postgresql'
+
+    @staticmethod
+    def _ts(source, value):
+        """
+        Normalizuje datetime za poredjenje sa created_at kolonom izvora.
+
+        SecurityEvent koristi timezone-aware kolonu, ostale tabele naivni UTC.
+        """
+        table = LOG_POLICIES[source]['model'].__table__
+        if getattr(table.c.created_at.type, 'timezone', False):
+            return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+        if value.tzinfo:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @staticmethod
+    def hot_boundary(source, now=None):
+        """
+        Vraca trenutak pre kog su redovi izvora premesteni u arhivu.
+
+        Granica je uvek ponoc (UTC), tako da se dani ne dele izmedju
+        hot tabele i arhive.
+        """
+        policy = LogRetentionService._policy(source)
+        now = now or datetime.utcnow()
+        day = (now - timedelta(days=policy['hot_days'])).date()
+        return datetime.combine(day, time.min)
+
+    @staticmethod
+    def created_between(query, column, since, until=None):
+        """
+        Ogranicava query na [since, until) po created_at koloni.
+
+        Donja granica je obavezna - bez nje PostgreSQL mora da
+        skenira sve particije/ceo indeks.
+        """
+        query = query.filter(column >= since)
+        if until is not None:
+            query = query.filter(column < until)
+        return query
+
+    # =========================================================================
+    # ROTACIJA
+    # =========================================================================
+
+    @staticmethod
+    def ensure_partition(source, day):
+        """
+        Kreira mesecnu particiju arhive za dati dan (samo PostgreSQL).
+
+        Returns:
+            Ime particije ili None na drugim bazama
+        """
+        if not LogRetentionService._is_postgres():
+            return None
+
+        archive = ARCHIVE_TABLES[source]
+        month_start = date(day.year, day.month, 1)
+        month_end = month_start + relativedelta(months=1)
+        name = f'{archive.name}_p{month_start:%Y%m}'
+
+        db.session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {archive.name} "
+            f"FOR VALUES FROM ('{month_start.isoformat()}') TO ('{month_end.isoformat()}')"
+        ))
+        return name
+
+    @staticmethod
+    def _rollup_window(source, start, end):
+        """
+        Dodaje agregate hot redova iz [start, end) u LogDailyRollup.
+
+        Agregat je aditivan: ako je dan vec delimicno arhiviran,
+        novi brojevi se dodaju na postojece.
+        """
+        policy = LOG_POLICIES[source]
+        table = policy['model'].__table__
+        group_cols = [table.c[name] for name in policy['group_by']]
+        amount_col = (
+            func.sum(table.c[policy['amount']]) if policy['amount'] else literal(None)
+        )
+
+        rows = db.session.execute(
+            select(table.c.tenant_id, *group_cols, func.count(), amount_col)
+            .where(
+                table.c.created_at >= LogRetentionService._ts(source, start),
+                table.c.created_at < LogRetentionService._ts(source, end),
+            )
+            .group_by(table.c.tenant_id, *group_cols)
+        ).all()
+
+        if not rows:
+            return 0
+
+        existing = {
+            (r.tenant_id, r.bucket): r
+            for r in LogDailyRollup.query.filter_by(source=source, day=start.date()).all()
+        }
+
+        for row in rows:
+            tenant_id = row[0]
+            bucket = ':'.join(_bucket_part(v) for v in row[1:1 + len(group_cols)])[:100]
+            count = row[-2]
+            amount = Decimal(str(row[-1])) if row[-1] is not None else None
+
+            rollup = existing.get((tenant_id, bucket))
+            if rollup:
+                rollup.event_count += count
+                if amount is not None:
+                    rollup.amount = (rollup.amount or Decimal('0')) + amount
+            else:
+                db.session.add(LogDailyRollup(
+                    source=source,
+                    day=start.date(),
+                    tenant_id=tenant_id,
+                    bucket=bucket,
+                    event_count=count,
+                    amount=amount,
+                ))
+
+        return len(rows)
+
+    @staticmethod
+    def rotate(source, now=None, max_days=62):
+        """
+        Premesta redove starije od hot_days u arhivu, dan po dan.
+
+        Svaki dan je zasebna transakcija (agregat + INSERT + DELETE),
+        pa prekinut job moze bezbedno da se ponovi.
+
+        Args:
+            source: Ime tabele iz LOG_POLICIES
+            now: Referentno vreme (default: utcnow)
+            max_days: Maksimalan broj dana po pokretanju
+
+        Returns:
+            dict sa brojem obradjenih dana i premestenih redova
+        """
+        policy = LogRetentionService._policy(source)
+        table = policy['model'].__table__
+        archive = ARCHIVE_TABLES[source]
+        boundary = LogRetentionService._ts(source, LogRetentionService.hot_boundary(source, now))
+        columns = [c.name for c in table.columns]
+
+        stats = {'days': 0, 'archived': 0}
+
+        while stats['days'] < max_days:
+            oldest = db.session.query(func.min(table.c.created_at)).filter(
+                table.c.created_at < boundary
+            ).scalar()
+            if oldest is None:
+                break
+
+            start = datetime.combine(oldest.date(), time.min)
+            end = start + timedelta(days=1)
+            window = (
+                table.c.created_at >= LogRetentionService._ts(source, start),
+                table.c.created_at < LogRetentionService._ts(source, end),
+            )
+
+            LogRetentionService.ensure_partition(source, start.date())
+            LogRetentionService._rollup_window(source, start, end)
+
+            db.session.execute(
+                archive.insert().from_select(
+                    columns, select(*[table.c[c] for c in columns]).where(*window)
+                )
+            )
+            result = db.session.execute(table.delete().where(*window))
+            db.session.commit()
+
+            stats['days'] += 1
+            stats['archived'] += result.rowcount or 0
+
+        return stats
+
+    @staticmethod
+    def expire(source, now=None):
+        """
+        Brise arhivske podatke starije od retention_months.
+
+        Na PostgreSQL-u se brisu cele mesecne particije (DROP TABLE),
+        na ostalim bazama obican DELETE.
+
+        Returns:
+            Broj obrisanih particija (PG) ili redova (ostalo)
+        """
+        policy = LogRetentionService._policy(source)
+        if policy['retention_months'] is None:
+            return 0
+
+        now = now or datetime.utcnow()
+        cutoff_month = date(now.year, now.month, 1) - relativedelta(months=policy['retention_months'])
+        archive = ARCHIVE_TABLES[source]
+
+        if LogRetentionService._is_postgres():
+            partitions = db.session.execute(text("""
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                JOIN pg_class p ON p.oid = i.inhparent
+                WHERE p.relname = :parent
+            """), {'parent': archive.name}).scalars().all()
+
+            dropped = 0
+            prefix = f'{archive.name}_p'
+            for name in partitions:
+                suffix = name[len(prefix):] if name.startswith(prefix) else ''
+                if len(suffix) != 6 or not suffix.isdigit():
+                    continue
+                month = date(int(suffix[:4]), int(suffix[4:]), 1)
+                if month < cutoff_month:
+                    db.session.execute(text(f'DROP TABLE IF EXISTS {name}'))
+                    dropped += 1
+            db.session.commit()
+            return dropped
+
+        cutoff = LogRetentionService._ts(source, datetime.combine(cutoff_month, time.min))
+        result = db.session.execute(archive.delete().where(archive.c.created_at < cutoff))
+        db.session.commit()
+        return result.rowcount or 0
+
+    @staticmethod
+    def run(sources=None, now=None):
+        """
+        Pokrece rotaciju i brisanje za sve (ili izabrane) log tabele.
+
+        Returns:
+            dict sa statistikama po tabeli i listom gresaka
+        """
+        stats = {'sources': {}, 'errors': []}
+
+        for source in sources or LOG_POLICIES.keys():
+            try:
+                result = LogRetentionService.rotate(source, now=now)
+                result['expired'] = LogRetentionService.expire(source, now=now)
+                stats['sources'][source] = result
+            except Exception as e:
+                db.session.rollback()
+                stats['errors'].append(f'{source}: {e}')
+                current_app.logger.error(f'[LOG_RETENTION] {source} failed: {e}')
+
+        return stats
+
+    # =========================================================================
+    # QUERY HELPERS
+    # =========================================================================
+
+    @staticmethod
+    def fetch_archived(source, since, until=None, filters=None, limit=None):
+        """
+        Cita redove iz arhive, ograniceno na [since, until).
+
+        Args:
+            source: Ime tabele iz LOG_POLICIES
+            since: Donja granica created_at (obavezna - prune particija)
+            until: Gornja granica (default: hot granica)
+            filters: dict {kolona: vrednost} za jednakost
+            limit: Maksimalan broj redova
+
+        Returns:
+            Lista Row objekata, najnoviji prvi
+        """
+        LogRetentionService._policy(source)
+        archive = ARCHIVE_TABLES[source]
+        until = until or LogRetentionService.hot_boundary(source)
+
+        stmt = select(archive).where(
+            archive.c.created_at >= LogRetentionService._ts(source, since),
+            archive.c.created_at < LogRetentionService._ts(source, until),
+        )
+        for column, value in (filters or {}).items():
+            stmt = stmt.where(archive.c[column] == value)
+
+        stmt = stmt.order_by(archive.c.created_at.desc(), archive.c.id.desc())
+        if limit:
+            stmt = stmt.limit(limit)
+
+        return db.session.execute(stmt).all()
+
+    @staticmethod
+    def daily_counts(source, since, until=None, tenant_id=None):
+        """
+        Dnevni broj dogadjaja po bucket-u za period.
+
+        Arhivirani dani dolaze iz LogDailyRollup, a dani koji su jos
+        u hot tabeli se agregiraju direktno - bez preklapanja, jer se
+        redovi agregiraju i premestaju u istoj transakciji.
+
+        Args:
+            source: Ime tabele iz LOG_POLICIES
+            since: Prvi dan (date)
+            until: Poslednji dan, ukljucivo (default: danas)
+            tenant_id: Opcioni filter po tenantu
+
+        Returns:
+            Lista {'day', 'bucket', 'count', 'amount'} sortirana po danu
+        """
+        policy = LogRetentionService._policy(source)
+        table = policy['model'].__table__
+        until = until or datetime.utcnow().date()
+        totals = {}
+
+        def _add(day, bucket, count, amount):
+            key = (day.isoformat() if hasattr(day, 'isoformat') else str(day), bucket)
+            entry = totals.setdefault(key, {'count': 0, 'amount': None})
+            entry['count'] += count
+            if amount is not None:
+                entry['amount'] = (entry['amount'] or 0) + float(amount)
+
+        rollup_query = LogDailyRollup.query.filter(
+            LogDailyRollup.source == source,
+            LogDailyRollup.day >= since,
+            LogDailyRollup.day <= until,
+        )
+        if tenant_id is not None:
+            rollup_query = rollup_query.filter(LogDailyRollup.tenant_id == tenant_id)
+        for r in rollup_query.all():
+            _add(r.day, r.bucket, r.event_count, r.amount)
+
+        group_cols = [table.c[name] for name in policy['group_by']]
+        amount_col = (
+            func.sum(table.c[policy['amount']]) if policy['amount'] else literal(None)
+        )
+        day_col = func.date(table.c.created_at)
+        stmt = select(day_col, *group_cols, func.count(), amount_col).where(
+            table.c.created_at >= LogRetentionService._ts(source, datetime.combine(since, time.min)),
+            table.c.created_at < LogRetentionService._ts(
+                source, datetime.combine(until + timedelta(days=1), time.min)
+            ),
+        )
+        if tenant_id is not None:
+            stmt = stmt.where(table.c.tenant_id == tenant_id)
+        stmt = stmt.group_by(day_col, *group_cols)
+
+        for row in db.session.execute(stmt).all():
+            bucket = ':'.join(_bucket_part(v) for v in row[1:1 + len(group_cols)])[:100]
+            _add(row[0], bucket, row[-2], row[-1])
+
+        return [
+            {'day': day, 'bucket': bucket, 'count': v['count'], 'amount': v['amount']}
+            for (day, bucket), v in sorted(totals.items())
+        ]
+
+
+log_retention = LogRetentionService()
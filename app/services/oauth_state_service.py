@@ -23,6 +23,8 @@ from typing import Optional, Tuple
 
 from flask import current_app
 
+from .redis_service import redis_manager
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,55 +37,10 @@ class OAuthStateService:
     """
     Redis-based OAuth state storage.
 
-    Koristi istu Redis konekciju kao TokenBlacklistService.
+    Koristi deljeni Redis pool (redis_manager), kao TokenBlacklistService.
     Failover na Flask session ako Redis nije dostupan.
     """
 
-    def __init__(self):
-        self._redis = None
-        self._redis_available = None
-
-    @property
-    def redis(self):
-        """Lazy Redis connection (isti pattern kao TokenBlacklistService)."""
-        if self._redis is None:
-            try:
-                import redis
-                redis_url = current_app.config.get('REDIS_URL', 'redis://localhost:6379/0')
-
-                # Heroku Redis koristi self-signed sertifikat
-                if redis_url.startswith('rediss://'):
-                    self._redis = redis.from_url(
-                        redis_url,
-                        decode_responses=True,
-                        ssl_cert_reqs=None  # Prihvati self-signed cert
-                    )
-                else:
-                    self._redis = redis.from_url(redis_url, decode_responses=True)
-
-                # Test connection
-                self._redis.ping()
-                self._redis_available = True
-                logger.info("OAuth state service: Redis connected")
-
-            except Exception as e:
-                logger.warning(f"OAuth state service: Redis unavailable, using session fallback: {e}")
-                self._redis = None
-                self._redis_available = False
-
-        return self._redis
-
-    def _check_redis(self) -> bool:
-        """Proveri da li je Redis dostupan."""
-        try:
-            if self.redis is None:
-                return False
-            self.redis.ping()
-            return True
-        except Exception:
-            self._redis_available = False
-            return False
-
     def _is_strict_mode(self) -> bool:
         """Proveri da li je SECURITY_STRICT ukljucen (FAIL-CLOSED mode)."""
         try:
@@ -111,7 +68,8 @@ class OAuthStateService:
         """
         state = secrets.token_urlsafe(32)
 
-        if self._check_redis():
+        client = redis_manager.client()
+        if client is not None:
             try:
                 key = f"oauth:state:{state}"
                 data = json.dumps({
@@ -119,10 +77,12 @@ class OAuthStateService:
                     'nonce': nonce
                 })
                 # TTL: 5 minuta - OAuth flow mora da se zavrsi u tom roku
-                self.redis.setex(key, 300, data)
+                client.setex(key, 300, data)
+                redis_manager.record_success()
                 logger.debug(f"OAuth state stored in Redis: {state[:8]}...")
                 return state
             except Exception as e:
+                redis_manager.record_failure(e, 'oauth_state')
                 logger.error(f"Failed to store OAuth state in Redis: {e}")
                 # Fall through to FAIL-MODE check
 
@@ -151,15 +111,17 @@ class OAuthStateService:
         if not state:
             return None
 
-        if self._check_redis():
+        client = redis_manager.client()
+        if client is not None:
             try:
                 key = f"oauth:state:{state}"
 
                 # Atomic get and delete
-                pipe = self.redis.pipeline()
+                pipe = client.pipeline()
                 pipe.get(key)
                 pipe.delete(key)
                 result, _ = pipe.execute()
+                redis_manager.record_success()
 
                 if result:
                     data = json.loads(result)
@@ -167,6 +129,7 @@ class OAuthStateService:
                     return (data.get('code_verifier'), data.get('nonce'))
 
             except Exception as e:
+                redis_manager.record_failure(e, 'oauth_state')
                 logger.error(f"Failed to retrieve OAuth state from Redis: {e}")
 
         # Nije pronadjen u Redis-u
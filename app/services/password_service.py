@@ -0,0 +1,207 @@
+"""
+Password Service - bcrypt hash/verify van request thread-a.
+
+bcrypt verify (~250ms CPU na cost 12) u request thread-u blokira gunicorn
+worker. Ovde se radi u ograničenom process pool-u:
+
+- PASSWORD_POOL_WORKERS procesa (0 = inline, npr. u testovima)
+- najviše PASSWORD_POOL_MAX_PENDING zahteva u redu; preko toga odmah
+  PasswordHasherBusy (HTTP 503 + Retry-After) umesto gomilanja
+- PASSWORD_VERIFY_TIMEOUT sekundi čekanja na rezultat
+
+Ostali request-ovi (POS, nalozi) ne čekaju na bcrypt jer ga nema u
+njihovim thread-ovima. Kad se BCRYPT_ROUNDS poveća, hash se posle
+uspešne prijave transparentno preračunava (needs_rehash); smanjenje
+cost-a ne slabi postojeće hash-eve.
+
+Metrike: stats() - broj, latencija (p50/p95/max), odbijeni, u toku.
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_ROUNDS = 12
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 16
+DEFAULT_TIMEOUT = 5
+LATENCY_SAMPLES = 500
+
+
+class PasswordHasherBusy(Exception):
+    """Pool je zasićen - zahtev se odbija odmah."""
+    retry_after = 2
+
+
+def _hashpw(password: bytes, rounds: int) -> str:
+    """Izvršava se u worker procesu."""
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    """Izvršava se u worker procesu."""
+    return bcrypt.checkpw(password, hashed)
+
+
+class PasswordService:
+    """bcrypt u ograničenom process pool-u sa metrikama."""
+
+    def __init__(self):
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._slots = None
+        self._samples = deque(maxlen=LATENCY_SAMPLES)
+        self._stats_lock = threading.Lock()
+        self._counts = {'verify': 0, 'hash': 0, 'rejected': 0, 'timeouts': 0, 'rehashed': 0}
+        self._in_flight = 0
+
+    # ============================================
+    # KONFIGURACIJA
+    # ============================================
+
+    @staticmethod
+    def _config(key, default):
+        try:
+            from flask import current_app
+            return current_app.config.get(key, default)
+        except RuntimeError:
+            return default  # van app context-a (skripte)
+
+    @property
+    def rounds(self):
+        return self._config('BCRYPT_ROUNDS', DEFAULT_ROUNDS)
+
+    def _get_pool(self):
+        """Lazy pool - spawn, jer je gunicorn proces višenitni."""
+        workers = self._config('PASSWORD_POOL_WORKERS', DEFAULT_WORKERS)
+        if not workers:
+            return None
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    max_pending = self._config('PASSWORD_POOL_MAX_PENDING', DEFAULT_MAX_PENDING)
+                    self._slots = threading.BoundedSemaphore(max_pending)
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+                    )
+        return self._pool
+
+    # ============================================
+    # IZVRŠAVANJE
+    # ============================================
+
+    def _release_slot(self):
+        self._slots.release()
+        with self._stats_lock:
+            self._in_flight -= 1
+
+    def _run(self, kind, fn, *args):
+        """Izvrši fn u pool-u (ili inline) uz merenje latencije."""
+        pool = self._get_pool()
+        started = time.perf_counter()
+
+        if pool is None:
+            result = fn(*args)
+        else:
+            if not self._slots.acquire(blocking=False):
+                with self._stats_lock:
+                    self._counts['rejected'] += 1
+                logger.warning("PasswordService: pool zasićen, zahtev odbijen")
+                raise PasswordHasherBusy()
+            with self._stats_lock:
+                self._in_flight += 1
+            try:
+                future = pool.submit(fn, *args)
+            except Exception:
+                self._release_slot()
+                raise
+            # Slot se oslobađa tek kad worker završi (i posle timeout-a)
+            future.add_done_callback(lambda _: self._release_slot())
+            try:
+                result = future.result(timeout=self._config('PASSWORD_VERIFY_TIMEOUT', DEFAULT_TIMEOUT))
+            except FutureTimeout:
+                with self._stats_lock:
+                    self._counts['timeouts'] += 1
+                raise PasswordHasherBusy()
+
+        with self._stats_lock:
+            self._counts[kind] += 1
+            self._samples.append((time.perf_counter() - started) * 1000)
+        return result
+
+    def hash(self, password: str) -> str:
+        """bcrypt hash sa trenutnim BCRYPT_ROUNDS."""
+        return self._run('hash', _hashpw, password.encode('utf-8'), self.rounds)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        """Proveri lozinku. Raises PasswordHasherBusy ako je pool zasićen."""
+        if not hashed:
+            return False
+        return self._run('verify', _checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Da li je hash napravljen sa manjim cost parametrom ($2b$<cost>$...)."""
+        try:
+            return int(hashed.split('$')[2]) < self.rounds
+        except (AttributeError, IndexError, ValueError):
+            return False
+
+    def check_and_upgrade(self, obj, password: str) -> bool:
+        """
+        Proveri lozinku modela (password_hash) i po potrebi preračunaj hash.
+
+        Novi hash se upisuje na objekat - commit radi pozivalac (login
+        ionako commit-uje last_login).
+        """
+        if not self.verify(password, obj.password_hash):
+            return False
+        if self.needs_rehash(obj.password_hash):
+            try:
+                obj.password_hash = self.hash(password)
+            except PasswordHasherBusy:
+                return True  # lozinka je ispravna, rehash pri sledećoj prijavi
+            with self._stats_lock:
+                self._counts['rehashed'] += 1
+        return True
+
+    # ============================================
+    # METRIKE
+    # ============================================
+
+    def stats(self):
+        """Metrike ovog procesa."""
+        with self._stats_lock:
+            samples = sorted(self._samples)
+            counts = dict(self._counts)
+            in_flight = self._in_flight
+
+        def _percentile(p):
+            if not samples:
+                return None
+            return round(samples[min(int(len(samples) * p), len(samples) - 1)], 1)
+
+        return {
+            **counts,
+            'in_flight': in_flight,
+            'workers': self._config('PASSWORD_POOL_WORKERS', DEFAULT_WORKERS),
+            'max_pending': self._config('PASSWORD_POOL_MAX_PENDING', DEFAULT_MAX_PENDING),
+            'rounds': self.rounds,
+            'latency_ms': {
+                'p50': _percentile(0.5),
+                'p95': _percentile(0.95),
+                'max': round(samples[-1], 1) if samples else None,
+                'samples': len(samples),
+            },
+        }
+
+
+# Singleton instance
+password_hasher = PasswordService()
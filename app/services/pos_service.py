@@ -3,15 +3,20 @@ POS Service - biznis logika za kasu.
 
 Operacije: otvaranje/zatvaranje kase, kreiranje/izdavanje/storno/refund računa,
 dodavanje/brisanje stavki, dnevni izveštaji.
+
+Totali sesije se vode inkrementalno u CashRegisterTotals (po valuti) -
+svaka operacija koja menja skup ISSUED računa ažurira brojače atomično.
+X/Z izveštaji i dnevno zatvaranje čitaju samo brojače.
 """
 
 import re
 from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import text, func
+from sqlalchemy import text, func, select, and_
+from sqlalchemy.exc import IntegrityError
 from ..extensions import db
 from ..models.pos import (
-    CashRegisterSession, Receipt, ReceiptItem, DailyReport,
+    CashRegisterSession, CashRegisterTotals, Receipt, ReceiptItem, DailyReport,
     PaymentMethod, ReceiptStatus, ReceiptType, CashRegisterStatus, SaleItemType
 )
 from ..models.inventory import PhoneListing, SparePart
@@ -23,6 +28,14 @@ from ..models.goods import GoodsItem, PosAuditLog
 from ..models.user import TenantUser, PosRole
 
 
+# Polja CashRegisterTotals
+TOTALS_MONEY_FIELDS = ('revenue', 'cost', 'profit', 'cash', 'card', 'transfer')
+TOTALS_COUNT_FIELDS = (
+    'receipt_count', 'voided_count',
+    'items_sold', 'phones_sold', 'parts_sold', 'services_sold',
+)
+
+
 class POSService:
     """Static metode za POS operacije."""
 
@@ -220,9 +233,8 @@ class POSService:
         if session.fiscal_mode:
             receipt.fiscal_status = 'pending'
 
-        # Ažuriraj session stats
-        session.receipt_count = (session.receipt_count or 0) + 1
-        session.total_revenue = (session.total_revenue or Decimal('0')) + (receipt.total_amount or Decimal('0'))
+        # Ažuriraj tekuće brojače sesije
+        POSService._apply_receipt_totals(receipt, sign=1)
 
         AuditLog.log(
             entity_type='receipt',
@@ -266,64 +278,11 @@ class POSService:
             date=session.date,
         ).first()
 
-        receipts = Receipt.query.filter_by(
-            session_id=session_id,
-            status=ReceiptStatus.ISSUED
-        ).all()
-
-        # RSD računi (fiskalna kasa ili interna sa RSD)
-        rsd_receipts = [r for r in receipts if (r.currency or 'RSD') == 'RSD']
-        total_revenue = sum(r.total_amount or 0 for r in rsd_receipts)
-        total_cost = sum(r.total_cost or 0 for r in rsd_receipts)
-        total_profit = sum(r.profit or 0 for r in rsd_receipts)
-        total_cash = sum(r.cash_received - (r.cash_change or 0) for r in rsd_receipts if r.payment_method == PaymentMethod.CASH and r.cash_received)
-        total_card = sum(r.card_amount or 0 for r in rsd_receipts if r.card_amount)
-        total_transfer = sum(r.transfer_amount or 0 for r in rsd_receipts if r.transfer_amount)
-
-        # EUR računi (samo interna kasa)
-        eur_receipts = [r for r in receipts if r.currency == 'EUR']
-        total_revenue_eur = sum(r.total_amount or 0 for r in eur_receipts)
-        total_cash_eur = sum(r.cash_received - (r.cash_change or 0) for r in eur_receipts if r.payment_method == PaymentMethod.CASH and r.cash_received)
-        total_card_eur = sum(r.card_amount or 0 for r in eur_receipts if r.card_amount)
-        total_transfer_eur = sum(r.transfer_amount or 0 for r in eur_receipts if r.transfer_amount)
-
-        receipt_count = len(receipts)
-        voided_count = Receipt.query.filter_by(session_id=session_id, status=ReceiptStatus.VOIDED).count()
-
-        items_query = db.session.query(
-            func.sum(ReceiptItem.quantity).label('total'),
-            func.sum(db.case((ReceiptItem.item_type == SaleItemType.PHONE, ReceiptItem.quantity), else_=0)).label('phones'),
-            func.sum(db.case((ReceiptItem.item_type == SaleItemType.SPARE_PART, ReceiptItem.quantity), else_=0)).label('parts'),
-            func.sum(db.case((ReceiptItem.item_type == SaleItemType.SERVICE, ReceiptItem.quantity), else_=0)).label('services'),
-        ).join(Receipt).filter(
-            Receipt.session_id == session_id,
-            Receipt.status == ReceiptStatus.ISSUED
-        ).first()
-
-        profit_margin = (float(total_profit) / float(total_revenue) * 100) if total_revenue else 0
-
-        report_data = dict(
-            total_revenue=total_revenue,
-            total_cost=total_cost,
-            total_profit=total_profit,
-            profit_margin_pct=Decimal(str(round(profit_margin, 2))),
-            total_cash=total_cash,
-            total_card=total_card,
-            total_transfer=total_transfer,
-            # EUR totali (interna kasa)
-            total_revenue_eur=total_revenue_eur,
-            total_cash_eur=total_cash_eur,
-            total_card_eur=total_card_eur,
-            total_transfer_eur=total_transfer_eur,
+        report_data = POSService._report_data_from_totals(session)
+        report_data.update(
             opening_cash=session.opening_cash,
-            closing_cash=total_cash,
+            closing_cash=report_data['total_cash'],
             cash_difference=Decimal('0'),
-            receipt_count=receipt_count,
-            voided_count=voided_count,
-            items_sold=items_query.total or 0 if items_query else 0,
-            phones_sold=items_query.phones or 0 if items_query else 0,
-            parts_sold=items_query.parts or 0 if items_query else 0,
-            services_sold=items_query.services or 0 if items_query else 0,
         )
 
         if existing_report:
@@ -340,15 +299,7 @@ class POSService:
             )
             db.session.add(report)
 
-        # Ažuriraj session totale
-        session.total_revenue = total_revenue
-        session.total_cost = total_cost
-        session.total_profit = total_profit
-        session.total_cash = total_cash
-        session.total_card = total_card
-        session.total_transfer = total_transfer
-        session.receipt_count = receipt_count
-        session.voided_count = voided_count
+        POSService._copy_totals_to_session(session, report_data)
 
         db.session.flush()
         return report
@@ -589,6 +540,7 @@ class POSService:
         )
 
         db.session.flush()
+        POSService._apply_receipt_totals(receipt, sign=1)
         return receipt
 
     @staticmethod
@@ -627,6 +579,9 @@ class POSService:
         receipt.voided_at = datetime.utcnow()
         receipt.void_reason = reason
 
+        # Račun izlazi iz ISSUED skupa sesije
+        POSService._apply_receipt_totals(receipt, sign=-1, voided=True)
+
         AuditLog.log(
             entity_type='receipt',
             entity_id=receipt.id,
@@ -712,6 +667,11 @@ class POSService:
 
         original.status = ReceiptStatus.REFUNDED
 
+        # Original izlazi iz ISSUED skupa, refund (negativne stavke) ulazi
+        db.session.flush()
+        POSService._apply_receipt_totals(original, sign=-1)
+        POSService._apply_receipt_totals(refund, sign=1)
+
         AuditLog.log(
             entity_type='receipt',
             entity_id=refund.id,
@@ -822,6 +782,7 @@ class POSService:
         )
 
         db.session.flush()
+        POSService._apply_receipt_totals(receipt, sign=1)
         return receipt
 
     @staticmethod
@@ -959,6 +920,7 @@ class POSService:
         )
 
         db.session.flush()
+        POSService._apply_receipt_totals(receipt, sign=1)
         return receipt
 
     @staticmethod
@@ -970,32 +932,10 @@ class POSService:
 
         closing_cash = Decimal(str(closing_cash))
 
-        # Sumiraj sve ISSUED račune
-        receipts = Receipt.query.filter_by(
-            session_id=session_id,
-            status=ReceiptStatus.ISSUED
-        ).all()
+        # Totali iz tekućih brojača (bez skeniranja računa)
+        report_data = POSService._report_data_from_totals(session)
 
-        # RSD računi (fiskalna kasa ili interna sa RSD)
-        rsd_receipts = [r for r in receipts if (r.currency or 'RSD') == 'RSD']
-        total_revenue = sum(r.total_amount or 0 for r in rsd_receipts)
-        total_cost = sum(r.total_cost or 0 for r in rsd_receipts)
-        total_profit = sum(r.profit or 0 for r in rsd_receipts)
-        total_cash = sum(r.cash_received - (r.cash_change or 0) for r in rsd_receipts if r.payment_method == PaymentMethod.CASH and r.cash_received)
-        total_card = sum(r.card_amount or 0 for r in rsd_receipts if r.card_amount)
-        total_transfer = sum(r.transfer_amount or 0 for r in rsd_receipts if r.transfer_amount)
-
-        # EUR računi (samo interna kasa)
-        eur_receipts = [r for r in receipts if r.currency == 'EUR']
-        total_revenue_eur = sum(r.total_amount or 0 for r in eur_receipts)
-        total_cash_eur = sum(r.cash_received - (r.cash_change or 0) for r in eur_receipts if r.payment_method == PaymentMethod.CASH and r.cash_received)
-        total_card_eur = sum(r.card_amount or 0 for r in eur_receipts if r.card_amount)
-        total_transfer_eur = sum(r.transfer_amount or 0 for r in eur_receipts if r.transfer_amount)
-
-        receipt_count = len(receipts)
-        voided_count = Receipt.query.filter_by(session_id=session_id, status=ReceiptStatus.VOIDED).count()
-
-        expected_cash = session.opening_cash + total_cash
+        expected_cash = (session.opening_cash or Decimal('0')) + report_data['total_cash']
         cash_difference = closing_cash - expected_cash
 
         # Update session
@@ -1005,55 +945,17 @@ class POSService:
         session.expected_cash = expected_cash
         session.cash_difference = cash_difference
         session.status = CashRegisterStatus.CLOSED
-        session.total_revenue = total_revenue
-        session.total_cost = total_cost
-        session.total_profit = total_profit
-        session.total_cash = total_cash
-        session.total_card = total_card
-        session.total_transfer = total_transfer
-        session.receipt_count = receipt_count
-        session.voided_count = voided_count
-
-        # Kreiraj DailyReport
-        # Prebroj prodane artikle
-        items_query = db.session.query(
-            func.sum(ReceiptItem.quantity).label('total'),
-            func.sum(db.case((ReceiptItem.item_type == SaleItemType.PHONE, ReceiptItem.quantity), else_=0)).label('phones'),
-            func.sum(db.case((ReceiptItem.item_type == SaleItemType.SPARE_PART, ReceiptItem.quantity), else_=0)).label('parts'),
-            func.sum(db.case((ReceiptItem.item_type == SaleItemType.SERVICE, ReceiptItem.quantity), else_=0)).label('services'),
-        ).join(Receipt).filter(
-            Receipt.session_id == session_id,
-            Receipt.status == ReceiptStatus.ISSUED
-        ).first()
-
-        profit_margin = (float(total_profit) / float(total_revenue) * 100) if total_revenue else 0
+        POSService._copy_totals_to_session(session, report_data)
 
         report = DailyReport(
             tenant_id=session.tenant_id,
             location_id=session.location_id,
             session_id=session_id,
             date=session.date,
-            total_revenue=total_revenue,
-            total_cost=total_cost,
-            total_profit=total_profit,
-            profit_margin_pct=Decimal(str(round(profit_margin, 2))),
-            total_cash=total_cash,
-            total_card=total_card,
-            total_transfer=total_transfer,
-            # EUR totali (interna kasa)
-            total_revenue_eur=total_revenue_eur,
-            total_cash_eur=total_cash_eur,
-            total_card_eur=total_card_eur,
-            total_transfer_eur=total_transfer_eur,
             opening_cash=session.opening_cash,
             closing_cash=closing_cash,
             cash_difference=cash_difference,
-            receipt_count=receipt_count,
-            voided_count=voided_count,
-            items_sold=items_query.total or 0 if items_query else 0,
-            phones_sold=items_query.phones or 0 if items_query else 0,
-            parts_sold=items_query.parts or 0 if items_query else 0,
-            services_sold=items_query.services or 0 if items_query else 0,
+            **report_data,
         )
         db.session.add(report)
 
@@ -1069,6 +971,258 @@ class POSService:
         db.session.flush()
         return session, report
 
+    # ============================================
+    # TEKUĆI BROJAČI SESIJE
+    # ============================================
+
+    @staticmethod
+    def _receipt_totals_delta(receipt, sign):
+        """Doprinos jednog računa brojačima sesije.
+
+        Ista pravila kao pun obračun: iznosi ISSUED računa, keš = primljeno - kusur
+        (samo CASH), kartica/prenos po iznosu, broj stavki po tipu.
+
+        Args:
+            sign: +1 kada račun postaje ISSUED, -1 kada prestaje da bude ISSUED
+        """
+        cash = Decimal('0')
+        if receipt.payment_method == PaymentMethod.CASH and receipt.cash_received:
+            cash = Decimal(str(receipt.cash_received)) - Decimal(str(receipt.cash_change or 0))
+
+        quantities = dict(
+            db.session.query(ReceiptItem.item_type, func.sum(ReceiptItem.quantity))
+            .filter(ReceiptItem.receipt_id == receipt.id)
+            .group_by(ReceiptItem.item_type)
+            .all()
+        )
+
+        return {
+            'revenue': sign * Decimal(str(receipt.total_amount or 0)),
+            'cost': sign * Decimal(str(receipt.total_cost or 0)),
+            'profit': sign * Decimal(str(receipt.profit or 0)),
+            'cash': sign * cash,
+            'card': sign * Decimal(str(receipt.card_amount or 0)),
+            'transfer': sign * Decimal(str(receipt.transfer_amount or 0)),
+            'receipt_count': sign,
+            'items_sold': sign * sum(int(q or 0) for q in quantities.values()),
+            'phones_sold': sign * int(quantities.get(SaleItemType.PHONE) or 0),
+            'parts_sold': sign * int(quantities.get(SaleItemType.SPARE_PART) or 0),
+            'services_sold': sign * int(quantities.get(SaleItemType.SERVICE) or 0),
+        }
+
+    @staticmethod
+    def _apply_receipt_totals(receipt, sign, voided=False):
+        """Dodaj (sign=1) ili oduzmi (sign=-1) račun iz brojača njegove sesije.
+
+        Stavke računa moraju biti flush-ovane pre poziva.
+        """
+        if not receipt.session_id:
+            return
+        delta = POSService._receipt_totals_delta(receipt, sign)
+        if voided:
+            delta['voided_count'] = 1
+        POSService._increment_session_totals(receipt.session_id, receipt.currency or 'RSD', delta)
+
+    @staticmethod
+    def _increment_session_totals(session_id, currency, delta):
+        """Atomično UPDATE ... SET x = x + :delta, uz INSERT reda ako ne postoji."""
+        table = CashRegisterTotals.__table__
+        values = {name: table.c[name] + value for name, value in delta.items() if value}
+        values['updated_at'] = datetime.utcnow()
+        where = and_(table.c.session_id == session_id, table.c.currency == currency)
+
+        result = db.session.execute(table.update().where(where).values(values))
+        if result.rowcount:
+            return
+
+        try:
+            with db.session.begin_nested():
+                db.session.execute(table.insert().values(
+                    session_id=session_id,
+                    currency=currency,
+                    updated_at=datetime.utcnow(),
+                    **delta,
+                ))
+        except IntegrityError:
+            # Paralelni zahtev je upravo kreirao red - inkrementiraj njega
+            db.session.execute(table.update().where(where).values(values))
+
+    @staticmethod
+    def get_session_totals(session_id):
+        """Tekući brojači sesije: {currency: {polje: vrednost}}."""
+        table = CashRegisterTotals.__table__
+        rows = db.session.execute(
+            select(table).where(table.c.session_id == session_id)
+        ).mappings().all()
+
+        return {
+            row['currency']: {
+                **{f: Decimal(str(row[f] or 0)) for f in TOTALS_MONEY_FIELDS},
+                **{f: int(row[f] or 0) for f in TOTALS_COUNT_FIELDS},
+            }
+            for row in rows
+        }
+
+    @staticmethod
+    def recompute_session_totals(session_id):
+        """Pun obračun brojača iz računa sesije (SQL agregati, za proveru)."""
+        currency = func.coalesce(Receipt.currency, 'RSD')
+        cash_expr = db.case(
+            (and_(Receipt.payment_method == PaymentMethod.CASH, Receipt.cash_received.isnot(None)),
+             Receipt.cash_received - func.coalesce(Receipt.cash_change, 0)),
+            else_=0
+        )
+        issued = and_(Receipt.session_id == session_id, Receipt.status == ReceiptStatus.ISSUED)
+
+        totals = {}
+
+        def _row(cur):
+            return totals.setdefault(cur, {
+                **{f: Decimal('0') for f in TOTALS_MONEY_FIELDS},
+                **{f: 0 for f in TOTALS_COUNT_FIELDS},
+            })
+
+        money = db.session.query(
+            currency,
+            func.sum(Receipt.total_amount), func.sum(Receipt.total_cost), func.sum(Receipt.profit),
+            func.sum(cash_expr),
+            func.sum(func.coalesce(Receipt.card_amount, 0)),
+            func.sum(func.coalesce(Receipt.transfer_amount, 0)),
+            func.count(Receipt.id),
+        ).filter(issued).group_by(currency).all()
+
+        for cur, revenue, cost, profit, cash, card, transfer, count in money:
+            row = _row(cur)
+            for field, value in zip(TOTALS_MONEY_FIELDS, (revenue, cost, profit, cash, card, transfer)):
+                row[field] = Decimal(str(value or 0))
+            row['receipt_count'] = count
+
+        voided = db.session.query(currency, func.count(Receipt.id)).filter(
+            Receipt.session_id == session_id,
+            Receipt.status == ReceiptStatus.VOIDED
+        ).group_by(currency).all()
+        for cur, count in voided:
+            _row(cur)['voided_count'] = count
+
+        items = db.session.query(
+            currency, ReceiptItem.item_type, func.sum(ReceiptItem.quantity)
+        ).join(Receipt).filter(issued).group_by(currency, ReceiptItem.item_type).all()
+        type_fields = {
+            SaleItemType.PHONE: 'phones_sold',
+            SaleItemType.SPARE_PART: 'parts_sold',
+            SaleItemType.SERVICE: 'services_sold',
+        }
+        for cur, item_type, qty in items:
+            row = _row(cur)
+            row['items_sold'] += int(qty or 0)
+            if item_type in type_fields:
+                row[type_fields[item_type]] += int(qty or 0)
+
+        return totals
+
+    @staticmethod
+    def reconcile_session_totals(session_id, fix=False):
+        """Uporedi tekuće brojače sa punim obračunom.
+
+        Args:
+            fix: Ako True, brojači se prepisuju punim obračunom kada se razlikuju
+
+        Returns:
+            {'session_id', 'ok', 'differences': {currency: {polje: {stored, computed}}}}
+        """
+        stored = POSService.get_session_totals(session_id)
+        computed = POSService.recompute_session_totals(session_id)
+        cent = Decimal('0.01')
+
+        differences = {}
+        for cur in set(stored) | set(computed):
+            for field in TOTALS_MONEY_FIELDS + TOTALS_COUNT_FIELDS:
+                s_val = Decimal(str(stored.get(cur, {}).get(field, 0))).quantize(cent)
+                c_val = Decimal(str(computed.get(cur, {}).get(field, 0))).quantize(cent)
+                if s_val != c_val:
+                    differences.setdefault(cur, {})[field] = {
+                        'stored': float(s_val), 'computed': float(c_val)
+                    }
+
+        if differences and fix:
+            table = CashRegisterTotals.__table__
+            db.session.execute(table.delete().where(table.c.session_id == session_id))
+            for cur, values in computed.items():
+                db.session.execute(table.insert().values(
+                    session_id=session_id, currency=cur, updated_at=datetime.utcnow(), **values
+                ))
+            db.session.flush()
+
+        return {'session_id': session_id, 'ok': not differences, 'differences': differences}
+
+    @staticmethod
+    def reconcile_sessions_for_date(day, fix=True):
+        """Proveri brojače svih sesija za dan (noćni job, van radnog vremena).
+
+        Returns:
+            Lista rezultata za sesije sa razlikama
+        """
+        session_ids = [sid for (sid,) in db.session.query(CashRegisterSession.id).filter(
+            CashRegisterSession.date == day
+        ).all()]
+
+        mismatched = []
+        for session_id in session_ids:
+            result = POSService.reconcile_session_totals(session_id, fix=fix)
+            if not result['ok']:
+                mismatched.append(result)
+        return mismatched
+
+    @staticmethod
+    def _report_data_from_totals(session):
+        """Polja DailyReport-a iz tekućih brojača (RSD + EUR)."""
+        totals = POSService.get_session_totals(session.id)
+        zero = {
+            **{f: Decimal('0') for f in TOTALS_MONEY_FIELDS},
+            **{f: 0 for f in TOTALS_COUNT_FIELDS},
+        }
+        rsd = totals.get('RSD', zero)
+        eur = totals.get('EUR', zero)
+
+        def _count(field):
+            return sum(t[field] for t in totals.values())
+
+        total_revenue = rsd['revenue']
+        profit_margin = (float(rsd['profit']) / float(total_revenue) * 100) if total_revenue else 0
+
+        return dict(
+            total_revenue=total_revenue,
+            total_cost=rsd['cost'],
+            total_profit=rsd['profit'],
+            profit_margin_pct=Decimal(str(round(profit_margin, 2))),
+            total_cash=rsd['cash'],
+            total_card=rsd['card'],
+            total_transfer=rsd['transfer'],
+            # EUR totali (interna kasa)
+            total_revenue_eur=eur['revenue'],
+            total_cash_eur=eur['cash'],
+            total_card_eur=eur['card'],
+            total_transfer_eur=eur['transfer'],
+            receipt_count=_count('receipt_count'),
+            voided_count=_count('voided_count'),
+            items_sold=_count('items_sold'),
+            phones_sold=_count('phones_sold'),
+            parts_sold=_count('parts_sold'),
+            services_sold=_count('services_sold'),
+        )
+
+    @staticmethod
+    def _copy_totals_to_session(session, report_data):
+        """Prepiši RSD totale na CashRegisterSession (kompatibilnost sa starim prikazima)."""
+        session.total_revenue = report_data['total_revenue']
+        session.total_cost = report_data['total_cost']
+        session.total_profit = report_data['total_profit']
+        session.total_cash = report_data['total_cash']
+        session.total_card = report_data['total_card']
+        session.total_transfer = report_data['total_transfer']
+        session.receipt_count = report_data['receipt_count']
+        session.voided_count = report_data['voided_count']
+
     # ============================================
     # HELPER METODE
     # ============================================
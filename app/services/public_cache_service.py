@@ -0,0 +1,255 @@
+"""
+Public Cache Service - deljeni Redis keš za javne stranice tenanta.
+
+Dva sloja, oba u Redis-u (deljeno između svih worker-a i dyno-a):
+
+1. Lookup host -> (tenant_id, profile_id, is_public) za public_site
+   middleware (zamena za nekadašnji per-process dict sa detached ORM
+   objektima) - keširan HIT stranice ne dira bazu.
+2. Full-page keš odgovora javnih stranica, ključ (host, path, query).
+
+Svaki upis se taguje po tenantu (Redis SET `pubcache:tag:tenant:{id}`),
+pa se promena profila, usluga ili recenzija čisti jednim purge_tenant()
+pozivom - automatski, na after_commit (vidi register_public_cache_invalidation).
+
+Stale-while-revalidate: unos je svež `ttl` sekundi, a u Redis-u živi još
+`swr` sekundi. Zastareo unos se servira odmah; samo jedan request (SET NX
+lock) renderuje novu verziju.
+
+Ako Redis nije dostupan, keš se preskače (fail-open); circuit breaker
+redis_manager-a određuje kada se ponovo pokušava.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from functools import wraps
+
+from flask import request, g, make_response, current_app
+
+from .redis_service import redis_manager
+
+logger = logging.getLogger(__name__)
+
+
+KEY_PREFIX = 'pubcache:v1'
+LOOKUP_TTL = 300            # host -> tenant lookup
+PAGE_TTL = 300              # svež odgovor (s-maxage)
+PAGE_SWR = 600              # dodatno vreme za stale-while-revalidate
+BROWSER_MAX_AGE = 60        # max-age za browser
+REVALIDATE_LOCK_TTL = 30
+
+
+class PublicCacheService:
+    """Redis keš za javne stranice tenanta."""
+
+    # ============================================
+    # REDIS
+    # ============================================
+
+    def _call(self, fn):
+        """Izvrši Redis operaciju; None ako Redis nije dostupan."""
+        return redis_manager.call(fn, 'public_cache')
+
+    @staticmethod
+    def _tag_key(tenant_id):
+        return f'{KEY_PREFIX}:tag:tenant:{tenant_id}'
+
+    @staticmethod
+    def _lookup_key(kind, value):
+        return f'{KEY_PREFIX}:site:{kind}:{value}'
+
+    @staticmethod
+    def _page_key(host, path, query):
+        digest = hashlib.sha1(f'{host}|{path}|{query}'.encode()).hexdigest()
+        return f'{KEY_PREFIX}:page:{digest}'
+
+    def _store(self, key, payload, ttl, tenant_id=None):
+        """SET sa TTL-om + dodavanje u tag tenanta (jedan round-trip)."""
+        def _do(client):
+            pipe = client.pipeline(transaction=False)
+            pipe.set(key, json.dumps(payload), ex=ttl)
+            if tenant_id:
+                tag = self._tag_key(tenant_id)
+                pipe.sadd(tag, key)
+                pipe.expire(tag, LOOKUP_TTL + PAGE_TTL + PAGE_SWR)
+            pipe.execute()
+        self._call(_do)
+
+    def _load(self, key):
+        raw = self._call(lambda client: client.get(key))
+        return json.loads(raw) if raw else None
+
+    # ============================================
+    # LOOKUP TENANTA (middleware)
+    # ============================================
+
+    def get_site(self, kind, value):
+        """
+        Keširan lookup za 'subdomain' ili 'custom_domain'.
+
+        Returns:
+            dict {'tenant_id', 'profile_id', 'is_public'} (prazne vrednosti
+            = ne postoji) ili None ako nema u kešu
+        """
+        return self._load(self._lookup_key(kind, value))
+
+    def set_site(self, kind, value, tenant_id, profile_id, is_public=False):
+        self._store(
+            self._lookup_key(kind, value),
+            {'tenant_id': tenant_id, 'profile_id': profile_id, 'is_public': is_public},
+            LOOKUP_TTL,
+            tenant_id=tenant_id,
+        )
+
+    def forget_site(self, kind, value):
+        self._call(lambda client: client.delete(self._lookup_key(kind, value)))
+
+    # ============================================
+    # FULL-PAGE KEŠ
+    # ============================================
+
+    def purge_tenant(self, tenant_id):
+        """Obriši sve keširane stranice i lookup-e tenanta (tag purge)."""
+        def _do(client):
+            tag = self._tag_key(tenant_id)
+            keys = list(client.smembers(tag) or [])
+            client.delete(tag, *keys)
+            return len(keys)
+        purged = self._call(_do) or 0
+        logger.info(f"Public cache: purge tenant={tenant_id}, keys={purged}")
+        return purged
+
+    def get_page(self, host, path, query):
+        """Keširan odgovor ili None. Vraća (entry, is_stale)."""
+        entry = self._load(self._page_key(host, path, query))
+        if not entry:
+            return None, False
+        return entry, time.time() > entry['fresh_until']
+
+    def set_page(self, host, path, query, tenant_id, response, ttl=PAGE_TTL, swr=PAGE_SWR):
+        body = response.get_data(as_text=True)
+        entry = {
+            'body': body,
+            'status': response.status_code,
+            'content_type': response.content_type,
+            'etag': hashlib.sha1(body.encode()).hexdigest()[:32],
+            'fresh_until': time.time() + ttl,
+            'tenant_id': tenant_id,
+        }
+        self._store(self._page_key(host, path, query), entry, ttl + swr, tenant_id=tenant_id)
+        return entry
+
+    def try_revalidate_lock(self, host, path, query):
+        """Samo jedan request osvežava zastareo unos."""
+        key = self._page_key(host, path, query) + ':lock'
+        acquired = self._call(lambda client: client.set(key, '1', nx=True, ex=REVALIDATE_LOCK_TTL))
+        return bool(acquired)
+
+
+# Singleton instance
+public_cache = PublicCacheService()
+
+
+def _cache_headers(response, entry, cache_state, ttl, swr):
+    response.headers['ETag'] = f'"{entry["etag"]}"'
+    response.headers['Cache-Control'] = (
+        f'public, max-age={BROWSER_MAX_AGE}, s-maxage={ttl}, stale-while-revalidate={swr}'
+    )
+    # Fastly/Cloudflare Enterprise purge po tagu
+    response.headers['Surrogate-Key'] = f'tenant-{entry["tenant_id"]}'
+    response.headers['X-Cache'] = cache_state
+    response.vary.add('Host')
+    return response
+
+
+def _response_from_entry(entry, cache_state, ttl, swr):
+    if request.if_none_match and request.if_none_match.contains(entry['etag']):
+        response = make_response('', 304)
+    else:
+        response = make_response(entry['body'], entry['status'])
+        response.content_type = entry['content_type']
+    return _cache_headers(response, entry, cache_state, ttl, swr)
+
+
+def cached_public_page(ttl=PAGE_TTL, swr=PAGE_SWR):
+    """
+    Decorator za full-page keš javne stranice tenanta.
+
+    Kešira samo anonimne GET 200 odgovore na javnim stranicama
+    (g.is_public_site). Ostali zahtevi prolaze direktno do view-a.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if (request.method != 'GET' or not g.get('is_public_site')
+                    or not g.get('public_tenant_id') or request.headers.get('Authorization')
+                    or not current_app.config.get('PUBLIC_PAGE_CACHE_ENABLED', True)):
+                return f(*args, **kwargs)
+
+            host = request.host.lower()
+            query = request.query_string.decode()
+            entry, stale = public_cache.get_page(host, request.path, query)
+
+            if entry and not stale:
+                return _response_from_entry(entry, 'HIT', ttl, swr)
+            if entry and stale and not public_cache.try_revalidate_lock(host, request.path, query):
+                return _response_from_entry(entry, 'STALE', ttl, swr)
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200 or response.headers.get('Set-Cookie'):
+                return response
+
+            entry = public_cache.set_page(host, request.path, query, g.public_tenant_id, response, ttl, swr)
+            return _cache_headers(response, entry, 'MISS', ttl, swr)
+        return decorated_function
+    return decorator
+
+
+# ============================================
+# AUTOMATSKA INVALIDACIJA
+# ============================================
+
+# Modeli čija promena menja sadržaj javne stranice
+_INVALIDATING_MODELS = (
+    'Tenant', 'TenantPublicProfile', 'ServiceItem',
+    'TenantGoogleIntegration', 'TenantGoogleReview',
+)
+
+_invalidation_registered = False
+
+
+def register_public_cache_invalidation(db):
+    """
+    Na flush skuplja tenant_id-eve izmenjenih profila/usluga/recenzija,
+    a na after_commit radi purge_tenant() za svaki.
+
+    Listener-i se kače na Session klasu, pa se registruju jednom po procesu.
+    """
+    global _invalidation_registered
+    if _invalidation_registered:
+        return
+    _invalidation_registered = True
+
+    from sqlalchemy import event
+
+    @event.listens_for(db.session, 'after_flush')
+    def _collect(session, flush_context):
+        tenants = session.info.setdefault('public_cache_tenants', set())
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            name = type(obj).__name__
+            if name not in _INVALIDATING_MODELS:
+                continue
+            tenant_id = obj.id if name == 'Tenant' else getattr(obj, 'tenant_id', None)
+            if tenant_id:
+                tenants.add(tenant_id)
+
+    @event.listens_for(db.session, 'after_commit')
+    def _purge(session):
+        for tenant_id in session.info.pop('public_cache_tenants', set()):
+            public_cache.purge_tenant(tenant_id)
+
+    @event.listens_for(db.session, 'after_rollback')
+    def _discard(session):
+        session.info.pop('public_cache_tenants', None)
@@ -0,0 +1,287 @@
+"""
+Redis Service - jedna konekcija (pool) i circuit breaker za sve servise.
+
+Svi Redis korisnici (keševi, brojači, DLR, blacklist, OAuth state, SMS
+limiter) uzimaju klijent odavde:
+
+    client = redis_manager.client()     # None dok je prekidač otvoren
+    if client is None:
+        return fallback()
+    try:
+        ...
+    except Exception as e:
+        redis_manager.record_failure(e, 'api_cache')
+
+ili kraće redis_manager.call(lambda r: r.get(key), 'api_cache').
+
+- Jedan ConnectionPool po procesu (REDIS_MAX_CONNECTIONS) - broj
+  konekcija ne raste sa brojem servisa, samo sa brojem dyno-a
+- Circuit breaker: posle REDIS_BREAKER_FAILURES uzastopnih grešaka
+  konekcije (ConnectionError, timeout) Redis se preskače
+  REDIS_BREAKER_RESET_SECONDS, zatim half-open - samo jedan pozivalac
+  client()-a dobija probni PING (uspeh zatvara prekidač, greška ga
+  ponovo otvara), ostali se preskaču dok proba ne završi. Greške
+  komandi (npr. WRONGTYPE) se broje u metrikama, ali ne isključuju
+  Redis ostalim servisima
+- Pozadinska nit šalje PING na REDIS_HEALTH_PROBE_SECONDS i vodi
+  zdravlje - request-i više ne šalju PING pre svake provere
+- Metrike (stats()): stanje, greške po izvoru, preskočeni pozivi, pool;
+  /api/admin/performance/redis
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+DEFAULTS = {
+    'REDIS_MAX_CONNECTIONS': 20,
+    'REDIS_SOCKET_TIMEOUT': 2.0,
+    'REDIS_BREAKER_FAILURES': 3,
+    'REDIS_BREAKER_RESET_SECONDS': 30,
+}
+
+
+def _is_outage(error) -> bool:
+    """Greška konekcije/timeout (Redis nedostupan), a ne greška komande."""
+    if isinstance(error, (OSError, TimeoutError)):
+        return True
+    try:
+        from redis.exceptions import ConnectionError, TimeoutError as RedisTimeout
+    except ImportError:
+        return False
+    return isinstance(error, (ConnectionError, RedisTimeout))
+
+
+class RedisManager:
+    """Deljeni Redis pool sa circuit breaker-om i health probe-om."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._url = None
+        self._settings = dict(DEFAULTS)
+        self._pool = None
+        self._connection = None
+        self._probe_thread = None
+        self._probe_stop = threading.Event()
+        self.reset()
+
+    def init_app(self, app):
+        """Podešavanja iz config-a i start health probe-a (van testova)."""
+        self._url = app.config.get('REDIS_URL')
+        self._settings = {key: app.config.get(key, default) for key, default in DEFAULTS.items()}
+        app.extensions['redis_manager'] = self
+
+        interval = app.config.get('REDIS_HEALTH_PROBE_SECONDS', 15)
+        if interval and not app.testing:
+            self.start_probe(interval)
+
+    def reset(self):
+        """Zatvoren prekidač i prazne metrike (pool ostaje)."""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._last_failure_at = 0
+            self._open_until = 0
+            self._last_error = None
+            self._healthy = None
+            self._last_probe_ms = None
+            self._metrics = {'requests': 0, 'short_circuited': 0, 'trips': 0, 'probes': 0}
+            self._failures_by_source = defaultdict(int)
+
+    # ============================================
+    # KONEKCIJA
+    # ============================================
+
+    def connection(self):
+        """redis.Redis nad deljenim pool-om (ne proverava dostupnost)."""
+        if self._connection is None:
+            with self._lock:
+                if self._connection is None:
+                    import redis
+                    url = self._url or os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+                    options = {
+                        'decode_responses': True,
+                        'max_connections': self._settings['REDIS_MAX_CONNECTIONS'],
+                        'socket_timeout': self._settings['REDIS_SOCKET_TIMEOUT'],
+                        'socket_connect_timeout': self._settings['REDIS_SOCKET_TIMEOUT'],
+                    }
+                    # Heroku Redis koristi self-signed certifikate
+                    if url.startswith('rediss://'):
+                        options['ssl_cert_reqs'] = None
+                    self._pool = redis.ConnectionPool.from_url(url, **options)
+                    self._connection = redis.Redis(connection_pool=self._pool)
+        return self._connection
+
+    def client(self):
+        """
+        Redis klijent ili None ako je prekidač otvoren.
+
+        Greške pri izvršavanju komandi prijavljuje pozivalac
+        (record_failure) - klijent se ne testira PING-om, osim jednom
+        posle pauze: prvi pozivalac u half-open stanju šalje probni PING
+        koji odlučuje o prekidaču, a ostali za to vreme dobijaju None.
+        """
+        trial = False
+        with self._lock:
+            self._metrics['requests'] += 1
+            if self._state == OPEN and time.monotonic() >= self._open_until:
+                self._state = HALF_OPEN
+                trial = True
+            elif self._state != CLOSED:
+                self._metrics['short_circuited'] += 1
+                return None
+        try:
+            from ..extensions import get_redis
+            client = get_redis()
+            if trial:
+                client.ping()
+        except Exception as e:
+            self.record_failure(e, 'half_open' if trial else 'connect')
+            if trial:
+                self._reopen()  # i kad greška nije "outage" - proba nije uspela
+            return None
+        if trial:
+            self.record_success()
+        return client
+
+    def call(self, fn, source='redis', default=None):
+        """fn(client) sa prijavom uspeha/greške; default ako Redis nije dostupan."""
+        client = self.client()
+        if client is None:
+            return default
+        try:
+            result = fn(client)
+        except Exception as e:
+            self.record_failure(e, source)
+            return default
+        self.record_success()
+        return result
+
+    # ============================================
+    # CIRCUIT BREAKER
+    # ============================================
+
+    @property
+    def available(self) -> bool:
+        """False dok je prekidač otvoren ili proba u half-open stanju traje."""
+        if self._state == OPEN:
+            return time.monotonic() >= self._open_until
+        return self._state == CLOSED
+
+    def record_success(self):
+        if self._state == CLOSED and not self._failures:
+            return
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                logger.info("Redis: dostupan, prekidač zatvoren")
+                self._state = CLOSED
+
+    def record_failure(self, error, source='redis'):
+        now = time.monotonic()
+        reset_seconds = self._settings['REDIS_BREAKER_RESET_SECONDS']
+        with self._lock:
+            self._failures_by_source[source] += 1
+            self._last_error = f'{source}: {error}'
+            if not _is_outage(error):
+                return
+            # Greške razdvojene dužim periodom nisu "uzastopne"
+            if now - self._last_failure_at > reset_seconds:
+                self._failures = 0
+            self._failures += 1
+            self._last_failure_at = now
+
+            if self._state == OPEN:
+                return
+            if self._state == HALF_OPEN or self._failures >= self._settings['REDIS_BREAKER_FAILURES']:
+                self._trip(now)
+
+    def _trip(self, now):
+        """Otvori prekidač (pozivalac drži _lock)."""
+        reset_seconds = self._settings['REDIS_BREAKER_RESET_SECONDS']
+        self._state = OPEN
+        self._open_until = now + reset_seconds
+        self._metrics['trips'] += 1
+        logger.warning(f"Redis: nije dostupan ({self._last_error}), preskače se {reset_seconds}s")
+
+    def _reopen(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._trip(time.monotonic())
+
+    # ============================================
+    # HEALTH PROBE
+    # ============================================
+
+    def probe(self) -> bool:
+        """Jedan PING - osvežava zdravlje i stanje prekidača."""
+        started = time.perf_counter()
+        try:
+            self.connection().ping()
+        except Exception as e:
+            self._healthy = False
+            self.record_failure(e, 'probe')
+            return False
+        finally:
+            self._metrics['probes'] += 1
+        self._healthy = True
+        self._last_probe_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.record_success()
+        return True
+
+    def start_probe(self, interval):
+        """Pozadinska nit koja poziva probe() na `interval` sekundi."""
+        if self._probe_thread is not None and self._probe_thread.is_alive():
+            return
+        self._probe_stop.clear()
+
+        def run():
+            while not self._probe_stop.is_set():
+                self.probe()
+                self._probe_stop.wait(interval)
+
+        self._probe_thread = threading.Thread(target=run, name='redis-health-probe', daemon=True)
+        self._probe_thread.start()
+
+    def stop_probe(self):
+        self._probe_stop.set()
+
+    # ============================================
+    # METRIKE
+    # ============================================
+
+    def stats(self) -> dict:
+        pool = self._pool
+        in_use = len(getattr(pool, '_in_use_connections', ())) if pool else 0
+        state = self._state
+        if state == OPEN and self.available:
+            state = HALF_OPEN  # sledeći poziv je probni
+        return {
+            'state': state,
+            'consecutive_failures': self._failures,
+            'open_for_s': round(max(0, self._open_until - time.monotonic()), 1) if not self.available else 0,
+            'healthy': self._healthy,
+            'last_probe_ms': self._last_probe_ms,
+            'last_error': self._last_error,
+            **self._metrics,
+            'failures': dict(self._failures_by_source),
+            'pool': {
+                'max_connections': self._settings['REDIS_MAX_CONNECTIONS'],
+                'created': getattr(pool, '_created_connections', 0) if pool else 0,
+                'in_use': in_use,
+                'idle': len(getattr(pool, '_available_connections', ())) if pool else 0,
+            },
+        }
+
+
+# Singleton instance
+redis_manager = RedisManager()
@@ -0,0 +1,253 @@
+"""
+Replica Service - izveštaji i liste čitaju sa read replike.
+
+Endpoint ili servisna metoda se označava decorator-om:
+
+    @bp.route('/reports/range', methods=['GET'])
+    @jwt_required
+    @read_replica
+    def range_report(): ...
+
+Unutar označenog poziva SELECT-ovi db.session-a idu na
+SQLALCHEMY_REPLICA_URL (app/utils/db_routing.py), pa teški izveštaji ne
+opterećuju primarnu bazu na kojoj su POS upisi. Čita se sa primarne ako:
+
+- replika nije podešena (bez URL-a decorator ne radi ništa)
+- isti korisnik je upisivao u poslednjih REPLICA_READ_YOUR_WRITES_SECONDS
+  (read-your-writes; oznaka u Redis-u, lokalno ako Redis nije dostupan)
+- replika kasni više od REPLICA_MAX_LAG_SECONDS (PostgreSQL: replay
+  lag, proverava se najviše na REPLICA_CHECK_SECONDS)
+- replika nije dostupna - pauza REPLICA_RETRY_SECONDS; poziv koji je
+  pao na replici ponavlja se jednom na primarnoj
+
+Testira se sa dve lokalne baze (dva SQLite fajla ili dve Postgres baze).
+"""
+
+import logging
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from ..extensions import db
+from ..utils.db_routing import WRITES_KEY, current_replica, route_reads_to
+from .redis_service import redis_manager
+
+logger = logging.getLogger(__name__)
+
+
+KEY_PREFIX = 'replica'
+REPLICA_RETRY_SECONDS = 30
+REPLICA_CHECK_SECONDS = 5
+
+# Kašnjenje replike u sekundama; 0 kad je sav primljeni WAL primenjen
+PG_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def _current_writer():
+    """Ključ korisnika tekućeg request-a (tenant korisnik, admin, dobavljač)."""
+    if not has_request_context():
+        return None
+    if getattr(g, 'supplier_user_id', None):
+        return f'supplier:{g.supplier_user_id}'
+    user_id = getattr(g, 'current_user_id', None)
+    if user_id:
+        return f'{"admin" if getattr(g, "is_admin", False) else "user"}:{user_id}'
+    return None
+
+
+class ReplicaService:
+    """Izbor baze za čitanje: replika kad je dovoljno sveža, inače primarna."""
+
+    def __init__(self):
+        self._replica_down_until = 0
+        self._lag_checked_at = 0
+        self._lag = 0.0
+        self._local_writes = {}  # writer -> monotonic kraj prozora
+        self._lock = threading.Lock()
+
+    # ============================================
+    # ENGINE REPLIKE
+    # ============================================
+
+    def engine(self, app=None):
+        """Engine replike aplikacije ili None ako replika nije podešena."""
+        app = app or current_app
+        url = app.config.get('SQLALCHEMY_REPLICA_URL')
+        if not url:
+            return None
+
+        cached = app.extensions.get('replica_engine')
+        if cached is not None and cached[0] == url:
+            return cached[1]
+        with self._lock:
+            cached = app.extensions.get('replica_engine')
+            if cached is None or cached[0] != url:
+                options = {} if url.startswith('sqlite') else dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+                cached = (url, create_engine(url, **options))
+                app.extensions['replica_engine'] = cached
+        return cached[1]
+
+    def reset(self, app=None):
+        """Zatvara engine replike i briše stanje (izmena URL-a, testovi)."""
+        app = app or current_app
+        cached = app.extensions.pop('replica_engine', None)
+        if cached is not None:
+            cached[1].dispose()
+        self._replica_down_until = 0
+        self._lag_checked_at = 0
+        self._lag = 0.0
+        self._local_writes.clear()
+
+    def mark_replica_down(self, error):
+        logger.warning(f"Replica: nije dostupna ({error}), čitanje sa primarne {REPLICA_RETRY_SECONDS}s")
+        self._replica_down_until = time.monotonic() + REPLICA_RETRY_SECONDS
+
+    def lag_seconds(self, engine):
+        """
+        Kašnjenje replike (keširano REPLICA_CHECK_SECONDS).
+
+        Returns:
+            Sekunde ili None ako replika nije dostupna
+        """
+        now = time.monotonic()
+        if now < self._replica_down_until:
+            return None
+        if now - self._lag_checked_at < REPLICA_CHECK_SECONDS:
+            return self._lag
+
+        try:
+            with engine.connect() as conn:
+                sql = PG_LAG_SQL if engine.dialect.name == 'postgresql' else text('SELECT 0')
+                lag = float(conn.execute(sql).scalar() or 0)
+        except Exception as e:
+            self.mark_replica_down(e)
+            return None
+        self._lag, self._lag_checked_at = lag, now
+        return lag
+
+    # ============================================
+    # READ-YOUR-WRITES
+    # ============================================
+
+    def note_write(self, writer, window):
+        """Korisnik je upisao - narednih `window` sekundi čita sa primarne."""
+        with self._lock:
+            self._local_writes[writer] = time.monotonic() + window
+        client = redis_manager.client()
+        if client is None:
+            return
+        try:
+            client.set(f'{KEY_PREFIX}:write:{writer}', '1', ex=window)
+        except Exception as e:
+            redis_manager.record_failure(e, 'replica')
+
+    def wrote_recently(self, writer):
+        until = self._local_writes.get(writer)
+        if until is not None:
+            if time.monotonic() < until:
+                return True
+            with self._lock:
+                self._local_writes.pop(writer, None)
+
+        client = redis_manager.client()
+        if client is None:
+            return False
+        try:
+            return bool(client.exists(f'{KEY_PREFIX}:write:{writer}'))
+        except Exception as e:
+            redis_manager.record_failure(e, 'replica')
+            return False
+
+    # ============================================
+    # IZBOR
+    # ============================================
+
+    def choose_engine(self):
+        """Engine replike za tekuće čitanje ili None (primarna baza)."""
+        if not has_app_context():
+            return None
+        engine = self.engine()
+        if engine is None:
+            return None
+
+        writer = _current_writer()
+        if writer and self.wrote_recently(writer):
+            return None
+
+        lag = self.lag_seconds(engine)
+        if lag is None:
+            return None
+        if lag > current_app.config.get('REPLICA_MAX_LAG_SECONDS', 10):
+            logger.info(f"Replica: kašnjenje {lag:.1f}s, čitanje sa primarne")
+            return None
+        return engine
+
+
+# Singleton instance
+replica_service = ReplicaService()
+
+
+def read_replica(func):
+    """
+    SELECT-ovi unutar poziva idu na read repliku (ako je podešena i sveža).
+
+    Samo za kod koji ne upisuje - poziv koji padne na replici izvršava
+    se ponovo na primarnoj bazi.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if current_replica() is not None:
+            return func(*args, **kwargs)  # već smo u @read_replica pozivu
+
+        engine = replica_service.choose_engine()
+        if engine is None:
+            return func(*args, **kwargs)
+        try:
+            with route_reads_to(engine):
+                return func(*args, **kwargs)
+        except (OperationalError, InterfaceError) as e:
+            replica_service.mark_replica_down(e)
+            db.session.rollback()
+            return func(*args, **kwargs)
+    return wrapper
+
+
+_routing_registered = False
+
+
+def register_replica_routing(db):
+    """
+    Prati upise sesije: posle flush-a transakcija čita sa primarne, a
+    commit označava korisnika za read-your-writes.
+
+    Listener-i se kače na Session klasu, pa se registruju jednom po procesu.
+    """
+    global _routing_registered
+    if _routing_registered:
+        return
+    _routing_registered = True
+
+    @event.listens_for(db.session, 'after_flush')
+    def _mark_writes(session, flush_context):
+        session.info[WRITES_KEY] = True
+
+    @event.listens_for(db.session, 'after_commit')
+    def _note_write(session):
+        if not session.info.pop(WRITES_KEY, False):
+            return
+        if not has_app_context() or not current_app.config.get('SQLALCHEMY_REPLICA_URL'):
+            return
+        writer = _current_writer()
+        if writer:
+            replica_service.note_write(writer, current_app.config.get('REPLICA_READ_YOUR_WRITES_SECONDS', 15))
+
+    @event.listens_for(db.session, 'after_rollback')
+    def _discard(session):
+        session.info.pop(WRITES_KEY, None)
@@ -8,6 +8,11 @@ Taskovi:
 - billing_daily: Svaki dan u 06:00 UTC
 - generate_invoices: 1. u mesecu u 00:00 UTC
 - send_reminders: Svaki dan u 10:00 UTC
+- log_retention: Svaki dan u 03:30 UTC
+- pos_reconcile: Svaki dan u 04:15 UTC
+- stock_checkpoints: Svaki dan u 02:45 UTC
+- finance_rollup: Svaki dan u 02:15 UTC
+- counter_flush: Svaki minut
 """
 
 import atexit
@@ -196,9 +201,147 @@ def init_scheduler(app):
         replace_existing=True
     )
 
+    # =========================================================================
+    # JOB 7: Rotacija logova - svaki dan u 03:30 UTC
+    # =========================================================================
+    @run_with_context
+    def log_retention_job():
+        from .log_retention_service import log_retention
+        app.logger.info("[SCHEDULER] Starting log_retention_job...")
+
+        stats = log_retention.run()
+        for source, result in stats['sources'].items():
+            app.logger.info(
+                f"[SCHEDULER] log_retention {source}: days={result['days']}, "
+                f"archived={result['archived']}, expired={result['expired']}"
+            )
+        if stats['errors']:
+            app.logger.error(f"[SCHEDULER] log_retention errors: {stats['errors']}")
+
+    scheduler.add_job(
+        func=log_retention_job,
+        trigger=CronTrigger(hour=3, minute=30),  # 03:30 UTC - najmanji saobracaj
+        id='log_retention',
+        name='Rotacija i agregacija logova',
+        replace_existing=True
+    )
+
+    # =========================================================================
+    # JOB 8: Provera POS brojača za jučerašnje sesije - svaki dan u 04:15 UTC
+    # =========================================================================
+    @run_with_context
+    def pos_reconcile_job():
+        from datetime import date, timedelta
+        from .pos_service import POSService
+        from ..extensions import db
+        app.logger.info("[SCHEDULER] Starting pos_reconcile_job...")
+
+        mismatched = POSService.reconcile_sessions_for_date(date.today() - timedelta(days=1), fix=True)
+        db.session.commit()
+
+        for result in mismatched:
+            app.logger.warning(
+                f"[SCHEDULER] pos_reconcile session={result['session_id']} "
+                f"differences={result['differences']}"
+            )
+        app.logger.info(f"[SCHEDULER] pos_reconcile: fixed={len(mismatched)} sessions")
+
+    scheduler.add_job(
+        func=pos_reconcile_job,
+        trigger=CronTrigger(hour=4, minute=15),  # 04:15 UTC - posle rotacije logova
+        id='pos_reconcile',
+        name='Provera POS brojača',
+        replace_existing=True
+    )
+
+    # =========================================================================
+    # JOB 9: Checkpoint-i stanja zaliha - svaki dan u 02:45 UTC
+    # =========================================================================
+    @run_with_context
+    def stock_checkpoints_job():
+        from .stock_ledger_service import stock_ledger
+        from ..extensions import db
+        app.logger.info("[SCHEDULER] Starting stock_checkpoints_job...")
+
+        result = stock_ledger.write_checkpoints()
+        db.session.commit()
+
+        app.logger.info(
+            f"[SCHEDULER] stock_checkpoints: cutoff={result['cutoff']}, written={result['written']}"
+        )
+
+    scheduler.add_job(
+        func=stock_checkpoints_job,
+        trigger=CronTrigger(hour=2, minute=45),  # 02:45 UTC - checkpoint za prethodni dan
+        id='stock_checkpoints',
+        name='Checkpoint-i stanja zaliha',
+        replace_existing=True
+    )
+
+    # =========================================================================
+    # JOB 10: Dnevni agregati prometa - svaki dan u 02:15 UTC
+    # =========================================================================
+    @run_with_context
+    def finance_rollup_job():
+        from datetime import date, timedelta
+        from .finance_service import FinanceService
+        from ..extensions import db
+        app.logger.info("[SCHEDULER] Starting finance_rollup_job...")
+
+        # Juče + prekjuče (kasni storno, ponovljen Z-izveštaj)
+        yesterday = date.today() - timedelta(days=1)
+        result = FinanceService.rollup_days(yesterday - timedelta(days=1), yesterday)
+        db.session.commit()
+
+        app.logger.info(f"[SCHEDULER] finance_rollup: {result['start']}..{result['end']}, rows={result['rows']}")
+
+    scheduler.add_job(
+        func=finance_rollup_job,
+        trigger=CronTrigger(hour=2, minute=15),  # 02:15 UTC - posle ponoći po lokalnom vremenu
+        id='finance_rollup',
+        name='Dnevni agregati prometa',
+        replace_existing=True
+    )
+
+    # =========================================================================
+    # JOB 11: Write-behind brojači - svaki minut
+    # =========================================================================
+    @run_with_context
+    def counter_flush_job():
+        from .counter_service import counters
+        updated = counters.flush()
+        if updated:
+            app.logger.info(f"[SCHEDULER] counter_flush: {updated} brojača")
+
+    scheduler.add_job(
+        func=counter_flush_job,
+        trigger=CronTrigger(minute='*'),
+        id='counter_flush',
+        name='Upis brojača (view/bid count)',
+        replace_existing=True
+    )
+
+    # =========================================================================
+    # JOB 12: D7 delivery report-ovi - svakih 15 sekundi
+    # =========================================================================
+    @run_with_context
+    def dlr_process_job():
+        from .dlr_service import dlr_service
+        result = dlr_service.process()
+        if result['processed']:
+            app.logger.info(f"[SCHEDULER] dlr_process: {result}")
+
+    scheduler.add_job(
+        func=dlr_process_job,
+        trigger=CronTrigger(second='*/15'),
+        id='dlr_process',
+        name='Obrada SMS delivery report-ova',
+        replace_existing=True
+    )
+
     # Pokreni scheduler
     scheduler.start()
-    app.logger.info("[SCHEDULER] Started with 6 jobs: billing_daily, generate_invoices, send_reminders, pos_daily_close, notification_daily_summary, notification_weekly_report")
+    app.logger.info("[SCHEDULER] Started with 12 jobs: billing_daily, generate_invoices, send_reminders, pos_daily_close, notification_daily_summary, notification_weekly_report, log_retention, pos_reconcile, stock_checkpoints, finance_rollup, counter_flush, dlr_process")
 
     # Zaustavi scheduler kada se app ugasi
     atexit.register(lambda: scheduler.shutdown(wait=False))
@@ -12,13 +12,14 @@ from decimal import Decimal
 from datetime import datetime
 from typing import Tuple, Optional
 
-from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from ..extensions import db
 from ..models import (
     Tenant, CreditBalance, CreditTransaction, CreditTransactionType,
     OwnerType, TenantSmsUsage
 )
+from .credit_service import apply_debit, apply_credit, deduct_credits
 
 
 # Default vrednost (koristi se ako PlatformSettings nije dostupan)
@@ -134,60 +135,129 @@ class SmsBillingService:
         # Kreiraj idempotency key
         idempotency_key = f"sms:{tenant_id}:{sms_type}:{reference_id}:{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
 
-        # Proveri da li je već naplaćeno (idempotency)
-        existing = CreditTransaction.query.filter_by(
-            idempotency_key=idempotency_key
-        ).first()
-        if existing:
-            return True, existing.id, "Već naplaćeno"
+        if not description:
+            description = f"SMS notifikacija - {sms_type}"
 
         # ================================================================
-        # ATOMIC CHARGING: SELECT FOR UPDATE
-        # Zaključava red u bazi dok traje transakcija
-        # Sprečava race condition kod paralelnih SMS-ova
+        # ATOMIC CHARGING: uslovni UPDATE ... WHERE balance >= cena
+        # Bez FOR UPDATE - paralelni SMS-ovi i ponude ne čekaju na lock;
+        # dupli idempotency_key odbija unique index (vraća se postojeća)
         # ================================================================
-        stmt = select(CreditBalance).where(
-            CreditBalance.owner_type == OwnerType.TENANT,
-            CreditBalance.tenant_id == tenant_id
-        ).with_for_update(nowait=False)  # Čekaj ako je zaključano
+        transaction = deduct_credits(
+            owner_type=OwnerType.TENANT,
+            owner_id=tenant_id,
+            amount=sms_cost,
+            transaction_type=CreditTransactionType.SMS_NOTIFICATION,
+            description=description,
+            ref_type='sms_usage',
+            ref_id=reference_id,
+            idempotency_key=idempotency_key
+        )
 
-        result = db.session.execute(stmt)
-        credit_balance = result.scalar_one_or_none()
+        if transaction is False:
+            db.session.rollback()
+            credit_balance = CreditBalance.query.filter_by(
+                owner_type=OwnerType.TENANT,
+                tenant_id=tenant_id
+            ).first()
+            if not credit_balance:
+                return False, None, "Nema kredit račun"
+            return False, None, f"Nedovoljno kredita (potrebno: {sms_cost}, stanje: {credit_balance.balance})"
 
-        if not credit_balance:
-            return False, None, "Nema kredit račun"
+        db.session.commit()
 
-        # Proveri balance SA LOCK-om (atomski)
-        balance_before = credit_balance.balance
-        balance_after = balance_before - sms_cost
+        return True, transaction.id, "Uspešno naplaćeno"
 
-        if balance_after < 0:
-            return False, None, f"Nedovoljno kredita (potrebno: {sms_cost}, stanje: {balance_before})"
+    @staticmethod
+    def charge_for_sms_batch(tenant_id: int, items) -> Tuple[list, str]:
+        """
+        Naplaćuje kredit za više SMS-ova jednim rezervisanim blokom.
 
-        # Kreiraj transakciju
-        if not description:
-            description = f"SMS notifikacija - {sms_type}"
+        Ceo iznos se skida jednim uslovnim UPDATE-om (apply_debit), a svaki
+        SMS dobija svoju CreditTransaction (refund i DLR obrada rade po
+        poruci). Ako kredit ne pokriva sve, naplaćuje se koliko staje - redom.
 
-        transaction = CreditTransaction(
-            credit_balance_id=credit_balance.id,
-            transaction_type=CreditTransactionType.SMS_NOTIFICATION,
-            amount=-sms_cost,  # Negativno jer oduzimamo
-            balance_before=balance_before,
-            balance_after=balance_after,
-            description=description,
-            reference_type='sms_usage',
-            reference_id=reference_id,
-            idempotency_key=idempotency_key
-        )
+        Args:
+            tenant_id: ID tenanta
+            items: Lista (sms_type, reference_id, description)
 
-        # Ažuriraj balance (još uvek pod lock-om)
-        credit_balance.balance = balance_after
-        credit_balance.total_spent += sms_cost
+        Returns:
+            Tuple (transaction_ids, message) - id-evi poravnati sa items,
+            None za stavke koje nisu naplaćene
+        """
+        transaction_ids = [None] * len(items)
+        if not items:
+            return transaction_ids, "Nema stavki"
 
-        db.session.add(transaction)
-        db.session.commit()  # Commit oslobađa lock
+        tenant = Tenant.query.get(tenant_id)
+        if not tenant:
+            return transaction_ids, "Servis nije pronađen"
 
-        return True, transaction.id, "Uspešno naplaćeno"
+        if not tenant.sms_notifications_enabled:
+            return transaction_ids, "SMS notifikacije nisu uključene"
+
+        if not tenant.sms_notifications_consent_given:
+            return transaction_ids, "Nije data saglasnost za SMS notifikacije"
+
+        sms_cost = get_sms_price()
+        stamp = datetime.utcnow().strftime('%Y%m%d%H%M%S')
+
+        credit_balance = CreditBalance.query.filter_by(
+            owner_type=OwnerType.TENANT,
+            tenant_id=tenant_id
+        ).first()
+        if not credit_balance:
+            return transaction_ids, "Nema kredit račun"
+
+        # Rezerviši ceo blok jednim uslovnim UPDATE-om; ako je paralelno
+        # oduzimanje promenilo stanje, preračunaj koliko staje i pokušaj ponovo
+        def _affordable():
+            if sms_cost <= 0:
+                return len(items)
+            return min(len(items), int(credit_balance.balance // sms_cost))
+
+        count, debited = _affordable(), None
+        while count and debited is None:
+            debited = apply_debit(count * sms_cost, balance_id=credit_balance.id)
+            if debited is None:
+                db.session.refresh(credit_balance)
+                count = _affordable()
+
+        if debited is None:
+            db.session.rollback()
+            return transaction_ids, f"Nedovoljno kredita (potrebno: {sms_cost}, stanje: {credit_balance.balance})"
+
+        balance_after = debited[1] + count * sms_cost
+        transactions = []
+        for index, (sms_type, reference_id, description) in enumerate(items[:count]):
+            balance_before, balance_after = balance_after, balance_after - sms_cost
+            transaction = CreditTransaction(
+                credit_balance_id=credit_balance.id,
+                transaction_type=CreditTransactionType.SMS_NOTIFICATION,
+                amount=-sms_cost,
+                balance_before=balance_before,
+                balance_after=balance_after,
+                description=description or f"SMS notifikacija - {sms_type}",
+                reference_type='sms_usage',
+                reference_id=reference_id,
+                idempotency_key=f"sms:{tenant_id}:{sms_type}:{reference_id}:{stamp}"
+            )
+            db.session.add(transaction)
+            transactions.append((index, transaction))
+
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Ista stavka naplaćena u istoj sekundi - ništa od bloka nije upisano
+            db.session.rollback()
+            return transaction_ids, "Već naplaćeno"
+
+        for index, transaction in transactions:
+            transaction_ids[index] = transaction.id
+        charged = len(transactions)
+        if charged < len(items):
+            return transaction_ids, f"Naplaćeno {charged} od {len(items)} (nedovoljno kredita)"
+        return transaction_ids, "Uspešno naplaćeno"
 
     @staticmethod
     def refund_sms(transaction_id: int, reason: str = "SMS slanje neuspešno") -> Tuple[bool, str]:
@@ -201,53 +271,88 @@ class SmsBillingService:
         Returns:
             Tuple (success, message)
         """
-        original = CreditTransaction.query.get(transaction_id)
-        if not original:
-            return False, "Transakcija nije pronađena"
-
-        if original.transaction_type != CreditTransactionType.SMS_NOTIFICATION:
-            return False, "Nije SMS transakcija"
+        return SmsBillingService.refund_sms_bulk([(transaction_id, reason)])[transaction_id]
 
-        # Proveri da li je već refund-ovan
-        refund_key = f"refund:{transaction_id}"
-        existing_refund = CreditTransaction.query.filter_by(
-            idempotency_key=refund_key
-        ).first()
-        if existing_refund:
-            return True, "Već refund-ovano"
+    @staticmethod
+    def refund_sms_bulk(refunds, commit: bool = True) -> dict:
+        """
+        Vraća kredit za više neuspešnih SMS-ova odjednom.
 
-        # Dohvati balance
-        credit_balance = CreditBalance.query.get(original.credit_balance_id)
-        if not credit_balance:
-            return False, "Kredit račun nije pronađen"
-
-        # Izračunaj refund amount (apsolutna vrednost originalnog iznosa)
-        refund_amount = abs(original.amount)
-
-        # Kreiraj refund transakciju
-        balance_before = credit_balance.balance
-        balance_after = balance_before + refund_amount
-
-        refund_transaction = CreditTransaction(
-            credit_balance_id=credit_balance.id,
-            transaction_type=CreditTransactionType.REFUND,
-            amount=refund_amount,  # Pozitivno jer vraćamo
-            balance_before=balance_before,
-            balance_after=balance_after,
-            description=f"Refund: {reason}",
-            reference_type='sms_refund',
-            reference_id=original.id,
-            idempotency_key=refund_key
-        )
+        Originalne transakcije, postojeći refund-ovi i kredit računi se
+        učitavaju sa po jednim upitom; svaki račun dobija jedan atomski
+        UPDATE za ukupan iznos (apply_credit), u rastućem redosledu id-a.
 
-        # Ažuriraj balance
-        credit_balance.balance = balance_after
-        credit_balance.total_spent -= refund_amount  # Smanjujemo total_spent
+        Args:
+            refunds: Lista (transaction_id, reason)
+            commit: False kada pozivalac commit-uje zajedno sa svojim izmenama
 
-        db.session.add(refund_transaction)
-        db.session.commit()
+        Returns:
+            {transaction_id: (success, message)}
+        """
+        reasons = {}
+        for transaction_id, reason in refunds:
+            reasons.setdefault(transaction_id, reason)
+        if not reasons:
+            return {}
+
+        results = {tid: (False, "Transakcija nije pronađena") for tid in reasons}
+        originals = CreditTransaction.query.filter(CreditTransaction.id.in_(reasons)).all()
+
+        refund_keys = {f"refund:{t.id}": t for t in originals}
+        already = {
+            key for (key,) in db.session.query(CreditTransaction.idempotency_key).filter(
+                CreditTransaction.idempotency_key.in_(refund_keys)
+            )
+        }
 
-        return True, "Refund uspešan"
+        to_refund = []
+        for original in originals:
+            if original.transaction_type != CreditTransactionType.SMS_NOTIFICATION:
+                results[original.id] = (False, "Nije SMS transakcija")
+            elif f"refund:{original.id}" in already:
+                results[original.id] = (True, "Već refund-ovano")
+            else:
+                to_refund.append(original)
+
+        balance_ids = {
+            balance_id for (balance_id,) in db.session.query(CreditBalance.id).filter(
+                CreditBalance.id.in_({t.credit_balance_id for t in to_refund})
+            )
+        } if to_refund else set()
+
+        by_balance = {}
+        for original in to_refund:
+            if original.credit_balance_id not in balance_ids:
+                results[original.id] = (False, "Kredit račun nije pronađen")
+            else:
+                by_balance.setdefault(original.credit_balance_id, []).append(original)
+
+        # Jedan atomski UPDATE po računu (ukupan iznos), bez FOR UPDATE
+        for balance_id, originals_for_balance in sorted(by_balance.items()):
+            total = sum(abs(t.amount) for t in originals_for_balance)
+            balance_after = apply_credit(balance_id, total, spent_delta=total) - total
+
+            for original in originals_for_balance:
+                # Izračunaj refund amount (apsolutna vrednost originalnog iznosa)
+                refund_amount = abs(original.amount)
+                balance_before, balance_after = balance_after, balance_after + refund_amount
+
+                db.session.add(CreditTransaction(
+                    credit_balance_id=balance_id,
+                    transaction_type=CreditTransactionType.REFUND,
+                    amount=refund_amount,  # Pozitivno jer vraćamo
+                    balance_before=balance_before,
+                    balance_after=balance_after,
+                    description=f"Refund: {reasons[original.id]}",
+                    reference_type='sms_refund',
+                    reference_id=original.id,
+                    idempotency_key=f"refund:{original.id}"
+                ))
+                results[original.id] = (True, "Refund uspešan")
+
+        if commit:
+            db.session.commit()
+        return results
 
     @staticmethod
     def get_tenant_sms_stats(tenant_id: int, month: str = None) -> dict:
@@ -0,0 +1,304 @@
+"""
+SMS Campaign Service - masovno slanje SMS-a za skup naloga.
+
+send_ticket_ready_sms / send_pickup_reminder_sms prolaze ceo lanac
+(opt-out, limit, rate limit, billing, naplata, D7 POST, log) za jedan
+nalog. Za stotine nepreuzetih uređaja to su stotine serijskih iteracija;
+kampanja isti posao radi za ceo skup:
+
+1. SQL prefilter - opt-out, bez telefona, već poslato (flag ili 'sent'
+   TenantSmsUsage za isti sms_type), preuzeto/otpisano, podsetnik pre roka
+2. Limiti tenanta (mesečna kvota, satni limit, dnevni po primaocu)
+   jednom za ceo skup
+3. Zauzimanje naloga - flag se postavlja uslovnim UPDATE-om i odmah
+   commit-uje; paralelna kampanja nad istim nalozima ih ne dobija
+4. Rezervacija kredita za sve poruke jednim uslovnim UPDATE-om
+5. Slanje preko D7 sa više poruka po zahtevu, ograničen broj paralelnih
+   zahteva (SMS_CAMPAIGN_CONCURRENCY)
+6. Poravnanje - neuspeli delovi se refund-uju jednim refund_sms_bulk i
+   oslobađaju flag, log i flag-ovi naloga u jednom commit-u
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+from flask import current_app
+from sqlalchemy import and_, exists, or_, update
+
+from ..extensions import db
+from ..models import ServiceTicket, TicketStatus, TenantSmsConfig, TenantSmsUsage
+from .sms_billing_service import SmsBillingService, get_sms_price
+from .sms_rate_limiter import rate_limiter
+from .sms_service import sms_service
+
+
+D7_BATCH_SIZE = 100              # poruka po jednom D7 zahtevu
+DEFAULT_CONCURRENCY = 4
+
+# sms_type -> (flag na nalogu, tip u TicketNotificationLog)
+CAMPAIGNS = {
+    'TICKET_READY': ('sms_notification_completed', 'SMS_READY'),
+    'PICKUP_REMINDER_10': ('sms_notification_10_days', 'SMS_REMINDER_10'),
+    'PICKUP_REMINDER_30': ('sms_notification_30_days', 'SMS_REMINDER_30'),
+}
+
+
+def _message(ticket, sms_type):
+    """Isti tekst kao pojedinačna slanja u sms_service."""
+    tenant_name = ticket.tenant.name if ticket.tenant else "Servis"
+    if sms_type == 'TICKET_READY':
+        return (
+            f"{tenant_name}: Vas uredjaj {ticket.brand} {ticket.model} "
+            f"je spreman za preuzimanje. "
+            f"Nalog: SRV-{ticket.ticket_number:04d}"
+        )
+    days = sms_type.rsplit('_', 1)[1]
+    return (
+        f"{tenant_name}: Podsetnik - Vas uredjaj {ticket.brand} {ticket.model} "
+        f"ceka preuzimanje vec {days} dana. "
+        f"Nalog: SRV-{ticket.ticket_number:04d}"
+    )
+
+
+class SmsCampaignService:
+    """Batch slanje SMS notifikacija za naloge."""
+
+    # ============================================
+    # JAVNI API
+    # ============================================
+
+    def send_ticket_ready(self, tenant_id: int, ticket_ids, location_ids=None, user_id: int = None) -> dict:
+        """SMS 'spreman za preuzimanje' za skup naloga."""
+        return self._run(tenant_id, ticket_ids, 'TICKET_READY', location_ids, user_id)
+
+    def send_pickup_reminders(self, tenant_id: int, ticket_ids, days: int,
+                              location_ids=None, user_id: int = None) -> dict:
+        """Podsetnik za preuzimanje (10 ili 30 dana) za skup naloga."""
+        if days not in (10, 30):
+            raise ValueError("days mora biti 10 ili 30")
+        return self._run(tenant_id, ticket_ids, f'PICKUP_REMINDER_{days}', location_ids, user_id)
+
+    def due_pickup_reminders(self, tenant_id: int, days: int, location_ids=None) -> list:
+        """ID-evi READY naloga koji čekaju preuzimanje bar `days` dana bez podsetnika."""
+        query = self._eligible_query(tenant_id, f'PICKUP_REMINDER_{days}', location_ids)
+        return [ticket_id for (ticket_id,) in query.with_entities(ServiceTicket.id)]
+
+    # ============================================
+    # KORACI
+    # ============================================
+
+    @staticmethod
+    def _eligible_query(tenant_id, sms_type, location_ids=None):
+        """Nalozi kojima sme da ide sms_type - sve provere po nalogu u SQL-u."""
+        flag = getattr(ServiceTicket, CAMPAIGNS[sms_type][0])
+        already_sent = exists().where(and_(
+            TenantSmsUsage.tenant_id == tenant_id,
+            TenantSmsUsage.sms_type == sms_type,
+            TenantSmsUsage.reference_type == 'ticket',
+            TenantSmsUsage.reference_id == ServiceTicket.id,
+            TenantSmsUsage.status == 'sent',
+        ))
+        query = ServiceTicket.query.filter(
+            ServiceTicket.tenant_id == tenant_id,
+            ServiceTicket.status == TicketStatus.READY,
+            ServiceTicket.sms_opt_out.is_(False),
+            ServiceTicket.customer_phone.isnot(None),
+            ServiceTicket.customer_phone != '',
+            ServiceTicket.owner_collect.is_(None),
+            or_(ServiceTicket.is_written_off.is_(False), ServiceTicket.is_written_off.is_(None)),
+            or_(flag.is_(False), flag.is_(None)),
+            ~already_sent,
+        )
+        if sms_type.startswith('PICKUP_REMINDER_'):
+            days = int(sms_type.rsplit('_', 1)[1])
+            query = query.filter(ServiceTicket.ready_at <= datetime.utcnow() - timedelta(days=days))
+        if location_ids is not None:
+            query = query.filter(ServiceTicket.location_id.in_(location_ids))
+        return query
+
+    @staticmethod
+    def _claim(sms_type, ticket_ids) -> set:
+        """
+        Postavi flag kampanje nalozima koji ga još nemaju i commit-uj.
+
+        Prefilter ne zaključava naloge - dve kampanje nad istim nalozima
+        mogu obe da ga prođu, ali uslovni UPDATE svaki nalog vraća samo
+        jednoj od njih.
+
+        Returns:
+            Set ID-eva naloga koje je ova kampanja zauzela
+        """
+        if not ticket_ids:
+            return set()
+        flag_name = CAMPAIGNS[sms_type][0]
+        flag = getattr(ServiceTicket, flag_name)
+        claimed = db.session.execute(
+            update(ServiceTicket)
+            .where(ServiceTicket.id.in_(ticket_ids), or_(flag.is_(False), flag.is_(None)))
+            .values({flag_name: True})
+            .returning(ServiceTicket.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        db.session.commit()
+        return set(claimed)
+
+    def _run(self, tenant_id, ticket_ids, sms_type, location_ids, user_id):
+        requested = set(ticket_ids)
+        result = {'requested': len(requested), 'sent': 0, 'failed': 0, 'refunded': 0, 'skipped': {}}
+
+        def skip(reason, count):
+            if count:
+                result['skipped'][reason] = result['skipped'].get(reason, 0) + count
+
+        if not requested:
+            return result
+
+        # 1. SQL prefilter
+        tickets = self._eligible_query(tenant_id, sms_type, location_ids).filter(
+            ServiceTicket.id.in_(requested)
+        ).order_by(ServiceTicket.ready_at, ServiceTicket.id).all()
+        skip('not_eligible', len(requested) - len(tickets))
+        if not tickets:
+            return result
+
+        # 2. Limiti tenanta - jednom za ceo skup
+        config = TenantSmsConfig.get_or_create(tenant_id)
+        if not config.sms_enabled:
+            skip('sms_disabled', len(tickets))
+            return result
+        billing_ok, billing_reason = SmsBillingService.can_send_sms(tenant_id)
+        if not billing_ok:
+            skip(billing_reason, len(tickets))
+            return result
+
+        hour_left, blocked = rate_limiter.check_batch(tenant_id, {t.customer_phone for t in tickets})
+        allowed = [t for t in tickets if t.customer_phone not in blocked]
+        skip('rate_limit:recipient_day', len(tickets) - len(allowed))
+
+        caps = [c for c in (config.get_remaining(), hour_left) if c >= 0]
+        if caps and len(allowed) > min(caps):
+            skip('limit', len(allowed) - min(caps))
+            allowed = allowed[:min(caps)]
+
+        # 3. Zauzimanje naloga
+        claimed = self._claim(sms_type, [t.id for t in allowed])
+        skip('in_progress', len(allowed) - len(claimed))
+        allowed = [t for t in allowed if t.id in claimed]
+
+        # Poruke (GSM-7, max 160) - preduge se loguju bez naplate
+        outgoing, usage_rows = [], []
+        for ticket in allowed:
+            phone = sms_service._format_phone(ticket.customer_phone)
+            is_valid, message, error = sms_service.validate_and_prepare_message(_message(ticket, sms_type))
+            if is_valid:
+                outgoing.append({'ticket': ticket, 'phone': phone, 'message': message})
+            else:
+                usage_rows.append((ticket, phone, 'failed', f"message_too_long: {error}"))
+                result['failed'] += 1
+
+        # 4. Rezervacija kredita - jedan blok za sve poruke
+        transaction_ids, charge_msg = SmsBillingService.charge_for_sms_batch(tenant_id, [
+            (sms_type, item['ticket'].id,
+             f"SMS {sms_type} - SRV-{item['ticket'].ticket_number:04d} (kampanja)")
+            for item in outgoing
+        ])
+        for item, transaction_id in zip(outgoing, transaction_ids):
+            item['transaction_id'] = transaction_id
+        uncharged = [item for item in outgoing if item['transaction_id'] is None]
+        outgoing = [item for item in outgoing if item['transaction_id'] is not None]
+        for item in uncharged:
+            usage_rows.append((item['ticket'], item['phone'], 'failed', charge_msg))
+        skip('insufficient_credits', len(uncharged))
+
+        # 5. Slanje
+        self._send(outgoing)
+
+        # 6. Poravnanje - jedan commit; neuspeli nalozi oslobađaju flag
+        price = float(get_sms_price())
+        flag, notification_type = CAMPAIGNS[sms_type]
+        refunds, sent_phones = [], []
+        for item in outgoing:
+            ticket = item['ticket']
+            if item['error'] is None:
+                usage_rows.append((ticket, item['phone'], 'sent', None))
+                sms_service._log_ticket_notification(ticket, notification_type, item['message'])
+                sent_phones.append(ticket.customer_phone)
+                result['sent'] += 1
+            else:
+                usage_rows.append((ticket, item['phone'], 'failed', item['error']))
+                refunds.append((item['transaction_id'], f"SMS slanje neuspešno: {item['error']}"))
+                result['failed'] += 1
+
+        for ticket, phone, status, error in usage_rows:
+            if status != 'sent':
+                setattr(ticket, flag, False)
+            TenantSmsUsage.log_sms(
+                tenant_id=tenant_id, sms_type=sms_type, recipient=phone, status=status,
+                reference_type='ticket', reference_id=ticket.id, error_message=error,
+                user_id=user_id, cost=price if status == 'sent' else None
+            )
+        refunded = SmsBillingService.refund_sms_bulk(refunds, commit=False)
+        result['refunded'] = sum(1 for ok, _ in refunded.values() if ok)
+        db.session.commit()
+
+        rate_limiter.record_batch(tenant_id, sent_phones)
+        return result
+
+    def _send(self, outgoing):
+        """D7 slanje u delovima od D7_BATCH_SIZE, paralelno do SMS_CAMPAIGN_CONCURRENCY."""
+        if not outgoing:
+            return
+
+        # Dev mode - ne šalje stvarno ali naplaćuje (kao pojedinačna slanja)
+        if not sms_service.api_token or os.environ.get('FLASK_ENV') == 'development':
+            print(f"[DEV SMS CAMPAIGN] {len(outgoing)} poruka")
+            for item in outgoing:
+                item['error'] = None
+            return
+
+        chunks = [outgoing[i:i + D7_BATCH_SIZE] for i in range(0, len(outgoing), D7_BATCH_SIZE)]
+        workers = min(current_app.config.get('SMS_CAMPAIGN_CONCURRENCY', DEFAULT_CONCURRENCY), len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            errors = list(pool.map(self._post_chunk, chunks))
+        for chunk, error in zip(chunks, errors):
+            for item in chunk:
+                item['error'] = error
+
+    @staticmethod
+    def _post_chunk(chunk):
+        """Jedan D7 zahtev sa više poruka. Returns: None ili opis greške."""
+        payload = {
+            "messages": [
+                {
+                    "channel": "sms",
+                    "recipients": [item['phone'].lstrip('+')],
+                    "content": item['message'],
+                    "msg_type": "text",
+                    "data_coding": "text"
+                }
+                for item in chunk
+            ],
+            "message_globals": {
+                "originator": sms_service.sender_id
+            }
+        }
+        headers = {
+            "Authorization": f"Bearer {sms_service.api_token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        try:
+            response = requests.post(sms_service.API_URL, json=payload, headers=headers, timeout=30)
+        except requests.RequestException as e:
+            return str(e)
+
+        print(f"[SMS CAMPAIGN] D7 {len(chunk)} poruka: {response.status_code}")
+        if response.status_code in [200, 201, 202]:
+            return None
+        return f"D7 returned {response.status_code}: {response.text[:200]}"
+
+
+# Singleton instanca servisa
+sms_campaigns = SmsCampaignService()
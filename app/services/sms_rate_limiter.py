@@ -12,20 +12,22 @@ Limiti:
 - 3 SMS/dan po primaocu (per tenant)
 
 Zahtevi:
-- Redis (Heroku Redis addon)
-- REDIS_URL environment varijabla
+- Redis (Heroku Redis addon), deljeni pool iz redis_manager-a
+- REDIS_URL environment varijabla (bez nje je limiter isključen)
+
+Greške Redis-a ne blokiraju slanje (fail-open); posle nekoliko uzastopnih
+circuit breaker preskače Redis umesto da svako slanje čeka timeout.
 """
 
 import os
 import hashlib
+import logging
 from datetime import datetime
 from typing import Tuple
 
-try:
-    import redis
-    REDIS_AVAILABLE = True
-except ImportError:
-    REDIS_AVAILABLE = False
+from .redis_service import redis_manager
+
+logger = logging.getLogger(__name__)
 
 
 class SmsRateLimiter:
@@ -41,42 +43,16 @@ class SmsRateLimiter:
     TENANT_PER_HOUR = 100     # Max 100 SMS/sat po tenantu
     RECIPIENT_PER_DAY = 3     # Max 3 SMS/dan po primaocu (per tenant)
 
-    def __init__(self):
-        """Inicijalizuje Redis konekciju."""
-        self.redis = None
-        self._connected = False
-
-        if not REDIS_AVAILABLE:
-            print("[SMS RATE LIMITER] Redis package not installed, rate limiting disabled")
-            return
-
-        redis_url = os.environ.get('REDIS_URL')
-        if not redis_url:
-            print("[SMS RATE LIMITER] REDIS_URL not set, rate limiting disabled")
-            return
-
-        try:
-            # Heroku Redis koristi self-signed certifikate
-            if redis_url.startswith('rediss://'):
-                self.redis = redis.from_url(
-                    redis_url,
-                    decode_responses=True,
-                    ssl_cert_reqs=None  # Disable SSL verification for Heroku
-                )
-            else:
-                self.redis = redis.from_url(redis_url, decode_responses=True)
-            # Test connection
-            self.redis.ping()
-            self._connected = True
-            print("[SMS RATE LIMITER] Connected to Redis")
-        except Exception as e:
-            print(f"[SMS RATE LIMITER] Failed to connect to Redis: {e}")
-            self.redis = None
+    def _client(self):
+        """Redis klijent ili None (limiter isključen ili Redis nedostupan)."""
+        if not os.environ.get('REDIS_URL'):
+            return None
+        return redis_manager.client()
 
     @property
     def is_enabled(self) -> bool:
         """Da li je rate limiting aktivan."""
-        return self._connected and self.redis is not None
+        return bool(os.environ.get('REDIS_URL')) and redis_manager.available
 
     def can_send(self, tenant_id: int, phone: str) -> Tuple[bool, str]:
         """
@@ -91,7 +67,8 @@ class SmsRateLimiter:
             - can_send: True ako je dozvoljeno slanje
             - reason: "ok" ili opis limita koji je prekoračen
         """
-        if not self.is_enabled:
+        client = self._client()
+        if client is None:
             return True, "ok"
 
         now = datetime.utcnow()
@@ -99,27 +76,28 @@ class SmsRateLimiter:
         try:
             # 1. Tenant per-minute limit
             minute_key = f"sms:tenant:{tenant_id}:minute:{now.strftime('%Y%m%d%H%M')}"
-            minute_count = int(self.redis.get(minute_key) or 0)
+            minute_count = int(client.get(minute_key) or 0)
             if minute_count >= self.TENANT_PER_MINUTE:
                 return False, f"rate_limit:tenant_minute:{self.TENANT_PER_MINUTE}"
 
             # 2. Tenant per-hour limit
             hour_key = f"sms:tenant:{tenant_id}:hour:{now.strftime('%Y%m%d%H')}"
-            hour_count = int(self.redis.get(hour_key) or 0)
+            hour_count = int(client.get(hour_key) or 0)
             if hour_count >= self.TENANT_PER_HOUR:
                 return False, f"rate_limit:tenant_hour:{self.TENANT_PER_HOUR}"
 
             # 3. Recipient per-day limit (hashed for privacy)
             phone_hash = hashlib.sha256(phone.encode()).hexdigest()[:16]
             day_key = f"sms:recipient:{tenant_id}:{phone_hash}:day:{now.strftime('%Y%m%d')}"
-            day_count = int(self.redis.get(day_key) or 0)
+            day_count = int(client.get(day_key) or 0)
             if day_count >= self.RECIPIENT_PER_DAY:
                 return False, f"rate_limit:recipient_day:{self.RECIPIENT_PER_DAY}"
 
             return True, "ok"
 
         except Exception as e:
-            print(f"[SMS RATE LIMITER] Error checking limits: {e}")
+            redis_manager.record_failure(e, 'sms_rate_limiter')
+            logger.warning(f"SMS rate limiter: error checking limits: {e}")
             # U slučaju greške, dozvoli slanje (fail-open)
             return True, "ok"
 
@@ -133,13 +111,14 @@ class SmsRateLimiter:
             tenant_id: ID tenanta
             phone: Broj telefona primaoca
         """
-        if not self.is_enabled:
+        client = self._client()
+        if client is None:
             return
 
         now = datetime.utcnow()
 
         try:
-            pipe = self.redis.pipeline()
+            pipe = client.pipeline()
 
             # Tenant minute counter (expire in 60s)
             minute_key = f"sms:tenant:{tenant_id}:minute:{now.strftime('%Y%m%d%H%M')}"
@@ -160,9 +139,82 @@ class SmsRateLimiter:
             pipe.execute()
 
         except Exception as e:
-            print(f"[SMS RATE LIMITER] Error recording send: {e}")
+            redis_manager.record_failure(e, 'sms_rate_limiter')
+            logger.warning(f"SMS rate limiter: error recording send: {e}")
             # Ne prekidaj ako logovanje ne uspe
 
+    def check_batch(self, tenant_id: int, phones) -> Tuple[int, set]:
+        """
+        Limiti za kampanju - jedan MGET umesto can_send po primaocu.
+
+        Kampanja ne podleže limitu po minuti (burst zaštita za pojedinačna
+        slanja), ali poštuje satni limit tenanta i dnevni limit po primaocu.
+
+        Args:
+            tenant_id: ID tenanta
+            phones: Brojevi telefona primalaca
+
+        Returns:
+            Tuple (preostalo u ovom satu ili -1 ako je limiter isključen,
+                   skup brojeva koji su dostigli dnevni limit)
+        """
+        phones = list(phones)
+        client = self._client() if phones else None
+        if client is None:
+            return -1, set()
+
+        now = datetime.utcnow()
+        hour_key = f"sms:tenant:{tenant_id}:hour:{now.strftime('%Y%m%d%H')}"
+        day_keys = [
+            f"sms:recipient:{tenant_id}:{hashlib.sha256(p.encode()).hexdigest()[:16]}:day:{now.strftime('%Y%m%d')}"
+            for p in phones
+        ]
+
+        try:
+            hour_count, *day_counts = client.mget([hour_key] + day_keys)
+        except Exception as e:
+            redis_manager.record_failure(e, 'sms_rate_limiter')
+            logger.warning(f"SMS rate limiter: error checking batch limits: {e}")
+            return -1, set()  # fail-open kao can_send
+
+        blocked = {
+            phone for phone, count in zip(phones, day_counts)
+            if int(count or 0) >= self.RECIPIENT_PER_DAY
+        }
+        return max(0, self.TENANT_PER_HOUR - int(hour_count or 0)), blocked
+
+    def record_batch(self, tenant_id: int, phones):
+        """record_send za više primalaca u jednom pipeline-u."""
+        phones = list(phones)
+        client = self._client() if phones else None
+        if client is None:
+            return
+
+        now = datetime.utcnow()
+
+        try:
+            pipe = client.pipeline()
+
+            minute_key = f"sms:tenant:{tenant_id}:minute:{now.strftime('%Y%m%d%H%M')}"
+            pipe.incrby(minute_key, len(phones))
+            pipe.expire(minute_key, 60)
+
+            hour_key = f"sms:tenant:{tenant_id}:hour:{now.strftime('%Y%m%d%H')}"
+            pipe.incrby(hour_key, len(phones))
+            pipe.expire(hour_key, 3600)
+
+            for phone in phones:
+                phone_hash = hashlib.sha256(phone.encode()).hexdigest()[:16]
+                day_key = f"sms:recipient:{tenant_id}:{phone_hash}:day:{now.strftime('%Y%m%d')}"
+                pipe.incr(day_key)
+                pipe.expire(day_key, 86400)
+
+            pipe.execute()
+
+        except Exception as e:
+            redis_manager.record_failure(e, 'sms_rate_limiter')
+            logger.warning(f"SMS rate limiter: error recording batch: {e}")
+
     def get_tenant_usage(self, tenant_id: int) -> dict:
         """
         Vraća trenutnu upotrebu limita za tenanta.
@@ -175,7 +227,8 @@ class SmsRateLimiter:
         Returns:
             Dict sa trenutnom upotrebom i limitima
         """
-        if not self.is_enabled:
+        client = self._client()
+        if client is None:
             return {
                 'enabled': False,
                 'minute': {'used': 0, 'limit': self.TENANT_PER_MINUTE},
@@ -188,8 +241,8 @@ class SmsRateLimiter:
             minute_key = f"sms:tenant:{tenant_id}:minute:{now.strftime('%Y%m%d%H%M')}"
             hour_key = f"sms:tenant:{tenant_id}:hour:{now.strftime('%Y%m%d%H')}"
 
-            minute_count = int(self.redis.get(minute_key) or 0)
-            hour_count = int(self.redis.get(hour_key) or 0)
+            minute_count = int(client.get(minute_key) or 0)
+            hour_count = int(client.get(hour_key) or 0)
 
             return {
                 'enabled': True,
@@ -198,7 +251,8 @@ class SmsRateLimiter:
             }
 
         except Exception as e:
-            print(f"[SMS RATE LIMITER] Error getting usage: {e}")
+            redis_manager.record_failure(e, 'sms_rate_limiter')
+            logger.warning(f"SMS rate limiter: error getting usage: {e}")
             return {
                 'enabled': False,
                 'error': str(e)
@@ -213,18 +267,20 @@ class SmsRateLimiter:
         Args:
             tenant_id: ID tenanta
         """
-        if not self.is_enabled:
+        client = self._client()
+        if client is None:
             return
 
         try:
             # Pronađi sve ključeve za tenanta
             pattern = f"sms:tenant:{tenant_id}:*"
-            keys = self.redis.keys(pattern)
+            keys = client.keys(pattern)
             if keys:
-                self.redis.delete(*keys)
-                print(f"[SMS RATE LIMITER] Reset {len(keys)} keys for tenant {tenant_id}")
+                client.delete(*keys)
+                logger.info(f"SMS rate limiter: reset {len(keys)} keys for tenant {tenant_id}")
         except Exception as e:
-            print(f"[SMS RATE LIMITER] Error resetting limits: {e}")
+            redis_manager.record_failure(e, 'sms_rate_limiter')
+            logger.warning(f"SMS rate limiter: error resetting limits: {e}")
 
 
 # Singleton instance
@@ -751,13 +751,12 @@ class SMSService:
         from ..models.ticket import TicketNotificationLog
 
         try:
-            log = TicketNotificationLog(
+            TicketNotificationLog.log(
                 ticket_id=ticket.id,
                 notification_type='SMS',
                 comment=f"[{notification_type}] {message[:100]}",
                 contact_successful=True
             )
-            db.session.add(log)
         except Exception as e:
             print(f"[SMS LOG ERROR] {e}")
 
@@ -0,0 +1,245 @@
+"""
+SQL Profiler Service - SQL metrike po request-u i izveštaj sporih endpointa.
+
+Per-row petlje upita (serijalizacija naloga, stavke porudžbina, brojači
+po tenantu) vidimo tek kad se korisnik požali. Profiler meri svaki
+request:
+
+- before/after_cursor_execute (SQLAlchemy): broj upita, ukupno vreme u
+  bazi i fingerprint svake naredbe (literali i IN liste svedeni na ?)
+- isti SELECT fingerprint >= SQL_N_PLUS_ONE_THRESHOLD puta u jednom
+  request-u je verovatan N+1 - upozorenje u logu i u izveštaju
+- Server-Timing header (db;dur, app;dur) - vidljivo u DevTools-u
+
+Po endpointu se čuva poslednjih SAMPLES_PER_ENDPOINT merenja (ring u
+memoriji procesa, bez I/O po request-u); stats() računa p50/p95 trajanja
+i broja upita. Izveštaj je po worker procesu.
+"""
+
+import hashlib
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+SAMPLES_PER_ENDPOINT = 200
+MAX_ENDPOINTS = 500
+MAX_SUSPECTS_PER_ENDPOINT = 10
+DEFAULT_N_PLUS_ONE_THRESHOLD = 10
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PARAM = re.compile(r'%\([^)]+\)s|%s|:\w+|\$\d+|\?')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_SPACE = re.compile(r'\s+')
+_SELECT_LIST = re.compile(r'^SELECT .*? FROM ', re.IGNORECASE)
+
+
+def fingerprint(statement: str) -> str:
+    """SQL bez vrednosti - isti upit sa drugim parametrima ima isti fingerprint."""
+    sql = _STRING.sub('?', statement)
+    sql = _PARAM.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('(?)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+def _display(sql: str) -> str:
+    """Fingerprint za izveštaj - ORM lista kolona skraćena na '...'."""
+    return _SELECT_LIST.sub('SELECT ... FROM ', sql, count=1)[:500]
+
+
+def _percentile(values, percent):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+class _RequestProfile:
+    """Merenje jednog request-a (na flask.g)."""
+
+    __slots__ = ('started', 'queries', 'db_time', 'statements')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+
+    def suspects(self, threshold):
+        """Ponovljeni SELECT-i - verovatni N+1."""
+        return [
+            (sql, count) for sql, count in self.statements.most_common()
+            if count >= threshold and sql.upper().startswith('SELECT')
+        ]
+
+
+class SqlProfiler:
+    """Sakuplja metrike request-a i čuva ring merenja po endpointu."""
+
+    def __init__(self):
+        self._samples = {}      # endpoint -> deque[(ms, db_ms, queries)]
+        self._suspects = {}     # endpoint -> Counter[fingerprint]
+        self._sql = {}          # hash fingerprint-a -> tekst
+        self._lock = threading.Lock()
+
+    # ============================================
+    # MERENJE
+    # ============================================
+
+    @staticmethod
+    def current():
+        """Profil aktivnog request-a ili None (van request-a, profiler isključen)."""
+        if not has_request_context():
+            return None
+        return g.get('_sql_profile')
+
+    def record(self, endpoint, duration_ms, profile, threshold):
+        """Dodaj merenje završenog request-a u ring endpointa."""
+        suspects = profile.suspects(threshold)
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                if len(self._samples) >= MAX_ENDPOINTS:
+                    return suspects
+                samples = self._samples[endpoint] = deque(maxlen=SAMPLES_PER_ENDPOINT)
+            samples.append((duration_ms, profile.db_time * 1000, profile.queries))
+
+            if suspects:
+                counter = self._suspects.setdefault(endpoint, Counter())
+                for sql, _ in suspects:
+                    key = hashlib.md5(sql.encode()).hexdigest()[:12]
+                    self._sql[key] = _display(sql)
+                    counter[key] += 1
+                # Zadrži samo najčešće
+                if len(counter) > MAX_SUSPECTS_PER_ENDPOINT:
+                    self._suspects[endpoint] = Counter(dict(counter.most_common(MAX_SUSPECTS_PER_ENDPOINT)))
+        return suspects
+
+    # ============================================
+    # IZVEŠTAJ
+    # ============================================
+
+    def stats(self, sort='p95_ms', limit=50) -> list:
+        """
+        Metrike po endpointu, najgori prvi.
+
+        Returns:
+            [{'endpoint', 'samples', 'p50_ms', 'p95_ms', 'max_ms', 'db_p95_ms',
+              'queries_p50', 'queries_p95', 'queries_max', 'n_plus_one': [...]}, ...]
+        """
+        with self._lock:
+            snapshot = {endpoint: list(samples) for endpoint, samples in self._samples.items()}
+            suspects = {endpoint: counter.most_common() for endpoint, counter in self._suspects.items()}
+            sql = dict(self._sql)
+
+        result = []
+        for endpoint, samples in snapshot.items():
+            durations = [s[0] for s in samples]
+            db_times = [s[1] for s in samples]
+            queries = [s[2] for s in samples]
+            result.append({
+                'endpoint': endpoint,
+                'samples': len(samples),
+                'p50_ms': round(_percentile(durations, 50), 1),
+                'p95_ms': round(_percentile(durations, 95), 1),
+                'max_ms': round(max(durations), 1),
+                'db_p95_ms': round(_percentile(db_times, 95), 1),
+                'queries_p50': _percentile(queries, 50),
+                'queries_p95': _percentile(queries, 95),
+                'queries_max': max(queries),
+                'n_plus_one': [
+                    {'sql': sql.get(key), 'requests': count}
+                    for key, count in suspects.get(endpoint, [])
+                ],
+            })
+
+        result.sort(key=lambda row: row.get(sort) or 0, reverse=True)
+        return result[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._suspects.clear()
+            self._sql.clear()
+
+
+# Singleton instance
+sql_profiler = SqlProfiler()
+
+
+# ============================================
+# HOOKS
+# ============================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if sql_profiler.current() is not None:
+        conn.info.setdefault('_sql_profiler_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = sql_profiler.current()
+    stack = conn.info.get('_sql_profiler_start')
+    if profile is None or not stack:
+        return
+    profile.db_time += time.perf_counter() - stack.pop()
+    profile.queries += 1
+    profile.statements[fingerprint(statement)] += 1
+
+
+def register_sql_profiler(app):
+    """
+    Uključi profiler (SQL_PROFILER_ENABLED). Registrovati pre ostalih
+    before_request hook-ova da bi i njihovi upiti bili izmereni.
+    """
+    if not app.config.get('SQL_PROFILER_ENABLED', True):
+        return
+
+    threshold = app.config.get('SQL_N_PLUS_ONE_THRESHOLD', DEFAULT_N_PLUS_ONE_THRESHOLD)
+    server_timing = app.config.get('SQL_PROFILER_SERVER_TIMING', True)
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def _start_sql_profile():
+        g._sql_profile = _RequestProfile()
+
+    @app.after_request
+    def _finish_sql_profile(response):
+        profile = g.pop('_sql_profile', None)
+        if profile is None:
+            return response
+
+        duration_ms = (time.perf_counter() - profile.started) * 1000
+        endpoint = f'{request.method} {request.endpoint or "<404>"}'
+        try:
+            suspects = sql_profiler.record(endpoint, duration_ms, profile, threshold)
+        except Exception as e:
+            logger.error(f"SQL profiler: merenje nije upisano: {e}")
+            return response
+
+        if suspects:
+            sql, count = suspects[0]
+            logger.warning(
+                f"SQL profiler: moguć N+1 na {endpoint} - {count}x {_display(sql)[:200]} "
+                f"({profile.queries} upita ukupno)"
+            )
+        if server_timing:
+            response.headers.add(
+                'Server-Timing',
+                f'db;dur={profile.db_time * 1000:.1f};desc="{profile.queries} queries", '
+                f'app;dur={duration_ms:.1f}'
+            )
+        return response
@@ -0,0 +1,312 @@
+"""
+Stock Ledger Service - checkpoint-i stanja, istorijski upiti i provera cache-a.
+
+StockMovement je ledger - stanje artikla na datum je balance_after
+poslednjeg pokreta pre tog datuma. Da upiti ne bi prolazili kroz celu
+istoriju, noćni job piše StockBalanceSnapshot za svaki (lokacija, artikal)
+par koji je imao pokrete od prethodnog checkpoint-a.
+
+Invarijanta: svaki pokret sa created_at <= max(snapshot_at) je uračunat
+u neki checkpoint. Stanje na datum T = najnoviji checkpoint <= T po paru +
+poslednji pokret iz repa (max(snapshot_at) <= T, T].
+
+Redosled pokreta u okviru para je po id-u - create_stock_movement zaključava
+LocationStock red, pa id prati lanac balance_before -> balance_after.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import func, select, insert
+
+from ..extensions import db
+from ..models.stock_movement import (
+    StockMovement, LocationStock, StockBalanceSnapshot, MovementType
+)
+
+
+# Tipovi pokreta koji nose nabavnu cenu (za vrednovanje zaliha)
+COST_MOVEMENT_TYPES = (MovementType.INITIAL_BALANCE, MovementType.RECEIVE, MovementType.TRANSFER_IN)
+
+_MOVEMENT_KEY = (
+    StockMovement.tenant_id, StockMovement.location_id,
+    StockMovement.goods_item_id, StockMovement.spare_part_id,
+)
+_SNAPSHOT_KEY = (
+    StockBalanceSnapshot.tenant_id, StockBalanceSnapshot.location_id,
+    StockBalanceSnapshot.goods_item_id, StockBalanceSnapshot.spare_part_id,
+)
+
+
+class StockLedgerService:
+    """Checkpoint-i ledger-a i upiti nad njima."""
+
+    @staticmethod
+    def last_checkpoint(before=None):
+        """Granica poslednjeg checkpoint run-a (opciono <= before)."""
+        query = db.session.query(func.max(StockBalanceSnapshot.snapshot_at))
+        if before is not None:
+            query = query.filter(StockBalanceSnapshot.snapshot_at <= before)
+        return query.scalar()
+
+    @staticmethod
+    def _last_movements(filters, cost_only=False):
+        """Poslednji pokret po (tenant, lokacija, artikal) za zadate filtere - jedan upit."""
+        if cost_only:
+            filters = list(filters) + [
+                StockMovement.unit_cost.isnot(None),
+                StockMovement.movement_type.in_(COST_MOVEMENT_TYPES),
+            ]
+        last_ids = select(func.max(StockMovement.id).label('id')).where(*filters).group_by(*_MOVEMENT_KEY)
+        rows = db.session.execute(
+            select(*_MOVEMENT_KEY, StockMovement.id, StockMovement.balance_after, StockMovement.unit_cost)
+            .where(StockMovement.id.in_(last_ids))
+        ).all()
+        return {tuple(r[:4]): r for r in rows}
+
+    @staticmethod
+    def _latest_snapshots(filters):
+        """Najnoviji checkpoint po (tenant, lokacija, artikal) za zadate filtere."""
+        last_ids = select(func.max(StockBalanceSnapshot.id)).where(*filters).group_by(*_SNAPSHOT_KEY)
+        rows = db.session.execute(
+            select(*_SNAPSHOT_KEY, StockBalanceSnapshot.quantity, StockBalanceSnapshot.unit_cost)
+            .where(StockBalanceSnapshot.id.in_(last_ids))
+        ).all()
+        return {tuple(r[:4]): r for r in rows}
+
+    # ============================================
+    # CHECKPOINT-I
+    # ============================================
+
+    @staticmethod
+    def write_checkpoints(cutoff=None):
+        """
+        Upiši checkpoint za sve parove sa pokretima u (prethodni checkpoint, cutoff].
+
+        Idempotentno - ponovni poziv sa istim cutoff-om ne radi ništa.
+
+        Args:
+            cutoff: Granica (default: današnja ponoć UTC)
+
+        Returns:
+            {'cutoff', 'written'}
+        """
+        cutoff = cutoff or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        previous = StockLedgerService.last_checkpoint()
+        if previous is not None and cutoff <= previous:
+            return {'cutoff': cutoff, 'written': 0}
+
+        window = [StockMovement.created_at <= cutoff]
+        if previous is not None:
+            window.append(StockMovement.created_at > previous)
+
+        last = StockLedgerService._last_movements(window)
+        if not last:
+            return {'cutoff': cutoff, 'written': 0}
+
+        costs = StockLedgerService._last_movements(window, cost_only=True)
+
+        # Cena iz prethodnog checkpoint-a za parove bez nabavke u prozoru
+        carried = {}
+        if len(costs) < len(last):
+            tenant_ids = {key[0] for key in last}
+            carried = StockLedgerService._latest_snapshots([StockBalanceSnapshot.tenant_id.in_(tenant_ids)])
+
+        rows = []
+        for key, movement in last.items():
+            unit_cost = costs[key].unit_cost if key in costs else (
+                carried[key].unit_cost if key in carried else None
+            )
+            rows.append({
+                'tenant_id': key[0],
+                'location_id': key[1],
+                'goods_item_id': key[2],
+                'spare_part_id': key[3],
+                'snapshot_at': cutoff,
+                'quantity': movement.balance_after,
+                'unit_cost': unit_cost,
+                'last_movement_id': movement.id,
+            })
+
+        db.session.execute(insert(StockBalanceSnapshot), rows)
+        db.session.flush()
+        return {'cutoff': cutoff, 'written': len(rows)}
+
+    # ============================================
+    # ISTORIJSKI UPITI
+    # ============================================
+
+    @staticmethod
+    def _positions_at(at, filters_snapshot, filters_movement):
+        """Stanje i poslednja nabavna cena po paru na trenutak `at`."""
+        boundary = StockLedgerService.last_checkpoint(before=at)
+
+        positions = {}
+        if boundary is not None:
+            snapshots = StockLedgerService._latest_snapshots(
+                filters_snapshot + [StockBalanceSnapshot.snapshot_at <= at]
+            )
+            for key, snap in snapshots.items():
+                positions[key] = {'quantity': snap.quantity, 'unit_cost': snap.unit_cost}
+
+        tail = filters_movement + [StockMovement.created_at <= at]
+        if boundary is not None:
+            tail.append(StockMovement.created_at > boundary)
+
+        for key, movement in StockLedgerService._last_movements(tail).items():
+            positions.setdefault(key, {'unit_cost': None})['quantity'] = movement.balance_after
+        for key, movement in StockLedgerService._last_movements(tail, cost_only=True).items():
+            positions[key]['unit_cost'] = movement.unit_cost
+
+        return positions
+
+    @staticmethod
+    def stock_at(at, goods_item_id=None, spare_part_id=None, location_id=None):
+        """
+        Stanje artikla na trenutak `at` (najbliži checkpoint + rep pokreta).
+
+        Returns:
+            {'quantity': ukupno, 'by_location': {location_id: quantity}}
+        """
+        if goods_item_id:
+            snap_filters = [StockBalanceSnapshot.goods_item_id == goods_item_id]
+            move_filters = [StockMovement.goods_item_id == goods_item_id]
+        elif spare_part_id:
+            snap_filters = [StockBalanceSnapshot.spare_part_id == spare_part_id]
+            move_filters = [StockMovement.spare_part_id == spare_part_id]
+        else:
+            raise ValueError("Mora biti goods_item_id ili spare_part_id")
+
+        if location_id:
+            snap_filters.append(StockBalanceSnapshot.location_id == location_id)
+            move_filters.append(StockMovement.location_id == location_id)
+
+        positions = StockLedgerService._positions_at(at, snap_filters, move_filters)
+        by_location = {key[1]: pos['quantity'] for key, pos in positions.items()}
+        return {'quantity': sum(by_location.values()), 'by_location': by_location}
+
+    @staticmethod
+    def valuation_at(tenant_id, at, location_id=None, include_items=False):
+        """
+        Vrednost zaliha tenanta na trenutak `at`.
+
+        Vrednovanje po poslednjoj nabavnoj ceni iz ledger-a; ako je nema,
+        koristi se trenutna purchase_price artikla.
+
+        Returns:
+            {'at', 'total_quantity', 'total_value', 'by_location', ['items']}
+        """
+        from ..models.goods import GoodsItem
+        from ..models.inventory import SparePart
+
+        snap_filters = [StockBalanceSnapshot.tenant_id == tenant_id]
+        move_filters = [StockMovement.tenant_id == tenant_id]
+        if location_id:
+            snap_filters.append(StockBalanceSnapshot.location_id == location_id)
+            move_filters.append(StockMovement.location_id == location_id)
+
+        positions = StockLedgerService._positions_at(at, snap_filters, move_filters)
+
+        # Fallback cene - jedan upit po tipu artikla
+        goods_ids = {k[2] for k, p in positions.items() if k[2] and p['unit_cost'] is None}
+        part_ids = {k[3] for k, p in positions.items() if k[3] and p['unit_cost'] is None}
+        goods_prices = dict(db.session.query(GoodsItem.id, GoodsItem.purchase_price).filter(
+            GoodsItem.id.in_(goods_ids)).all()) if goods_ids else {}
+        part_prices = dict(db.session.query(SparePart.id, SparePart.purchase_price).filter(
+            SparePart.id.in_(part_ids)).all()) if part_ids else {}
+
+        total_quantity = 0
+        total_value = Decimal('0')
+        by_location = {}
+        items = []
+        for (_, loc_id, goods_id, part_id), pos in positions.items():
+            if not pos['quantity']:
+                continue
+            unit_cost = pos['unit_cost']
+            if unit_cost is None:
+                unit_cost = goods_prices.get(goods_id) if goods_id else part_prices.get(part_id)
+            value = Decimal(pos['quantity']) * Decimal(str(unit_cost or 0))
+
+            total_quantity += pos['quantity']
+            total_value += value
+            loc = by_location.setdefault(loc_id, {'quantity': 0, 'value': Decimal('0')})
+            loc['quantity'] += pos['quantity']
+            loc['value'] += value
+            if include_items:
+                items.append({
+                    'location_id': loc_id,
+                    'goods_item_id': goods_id,
+                    'spare_part_id': part_id,
+                    'quantity': pos['quantity'],
+                    'unit_cost': float(unit_cost) if unit_cost is not None else None,
+                    'value': float(value),
+                })
+
+        result = {
+            'at': at.isoformat(),
+            'total_quantity': total_quantity,
+            'total_value': float(total_value),
+            'by_location': {
+                loc_id: {'quantity': v['quantity'], 'value': float(v['value'])}
+                for loc_id, v in by_location.items()
+            },
+        }
+        if include_items:
+            result['items'] = items
+        return result
+
+    # ============================================
+    # PROVERA CACHE-A
+    # ============================================
+
+    @staticmethod
+    def verify_cache(tenant_id=None, location_id=None):
+        """
+        Uporedi LocationStock cache sa ledger-om za sve parove odjednom.
+
+        Zamena za pojedinačne validate_stock_balance pozive - dva upita
+        umesto dva po artiklu.
+
+        Returns:
+            Lista razlika: {location_id, goods_item_id, spare_part_id, cached, ledger}
+        """
+        from ..models.tenant import ServiceLocation
+
+        move_filters = []
+        if tenant_id:
+            move_filters.append(StockMovement.tenant_id == tenant_id)
+        if location_id:
+            move_filters.append(StockMovement.location_id == location_id)
+        ledger = {
+            key[1:]: movement.balance_after
+            for key, movement in StockLedgerService._last_movements(move_filters).items()
+        }
+
+        cache_query = db.session.query(
+            LocationStock.location_id, LocationStock.goods_item_id,
+            LocationStock.spare_part_id, LocationStock.quantity
+        )
+        if tenant_id:
+            cache_query = cache_query.join(
+                ServiceLocation, ServiceLocation.id == LocationStock.location_id
+            ).filter(ServiceLocation.tenant_id == tenant_id)
+        if location_id:
+            cache_query = cache_query.filter(LocationStock.location_id == location_id)
+        cache = {(r[0], r[1], r[2]): r[3] for r in cache_query.all()}
+
+        mismatches = []
+        for key in sorted(set(cache) | set(ledger), key=lambda k: (k[0], k[1] or 0, k[2] or 0)):
+            cached = cache.get(key)
+            expected = ledger.get(key, 0)
+            if (cached or 0) != expected:
+                mismatches.append({
+                    'location_id': key[0],
+                    'goods_item_id': key[1],
+                    'spare_part_id': key[2],
+                    'cached': cached,
+                    'ledger': expected,
+                })
+        return mismatches
+
+
+# Singleton instance
+stock_ledger = StockLedgerService()
@@ -0,0 +1,150 @@
+"""
+Ticket Search Service - jedinstvena pretraga naloga.
+
+Recepcija traži nalog po čemu god kupac kaže: ime, telefon u bilo kom
+formatu, marka/model, IMEI ili broj naloga. Umesto ILIKE '%x%' preko
+pet kolona (full scan po koloni) pretraga ide preko jedne normalizovane
+kolone search_text (app.utils.search) koju model održava pri upisu:
+
+- PostgreSQL: GIN trigram index (pg_trgm) - LIKE po terminu koristi
+  index, rang je similarity()
+- SQLite: FTS5 trigram shadow tabela service_ticket_fts - MATCH, rang
+  je bm25
+- ostalo: LIKE na search_text
+
+Termini kraći od 3 karaktera trigram ne pokriva; za njih ostaje LIKE
+uz ostale uslove. Tačan broj naloga uvek ide prvi. Highlight se radi
+u Python-u samo za vraćenu stranicu.
+"""
+
+import logging
+
+from sqlalchemy import Float, Integer, case, func, text
+
+from ..extensions import db
+from ..models import ServiceTicket
+from ..utils.search import (
+    search_terms, ticket_number_from, ticket_search_text, highlight, normalize_phone
+)
+
+logger = logging.getLogger(__name__)
+
+
+TRIGRAM_MIN = 3
+REINDEX_BATCH_SIZE = 1000
+
+# Polja za highlight: (ključ u odgovoru, atribut, normalizator)
+HIGHLIGHT_FIELDS = (
+    ('customer_name', 'customer_name', None),
+    ('customer_company_name', 'customer_company_name', None),
+    ('customer_phone', 'customer_phone', normalize_phone),
+    ('brand', 'brand', None),
+    ('model', 'model', None),
+    ('imei', 'imei', None),
+    ('ticket_number', 'ticket_number_formatted', None),
+)
+
+
+def _like(term):
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return ServiceTicket.search_text.like(f'%{escaped}%', escape='\\')
+
+
+def _fts_phrase(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+class TicketSearchService:
+    """Filtriranje, rangiranje i highlight naloga po upitu."""
+
+    def apply(self, query, q: str, rank: bool = True):
+        """
+        Filtriraj upit naloga po pretrazi.
+
+        Args:
+            query: Upit nad ServiceTicket (tenant/status filteri već primenjeni)
+            q: Tekst pretrage
+            rank: Sortiraj po relevantnosti (tačan broj naloga, pa rang,
+                pa najnoviji); False ostavlja postojeći redosled
+
+        Returns:
+            Filtriran (i sortiran) upit
+        """
+        terms = search_terms(q)
+        if not terms:
+            return query
+
+        dialect = db.session.get_bind().dialect.name
+        long_terms = [t for t in terms if len(t) >= TRIGRAM_MIN]
+        short_terms = [t for t in terms if len(t) < TRIGRAM_MIN]
+        score = None
+
+        if dialect == 'sqlite' and long_terms:
+            match = ' AND '.join(_fts_phrase(t) for t in long_terms)
+            fts = text(
+                "SELECT rowid AS ticket_id, rank AS score FROM service_ticket_fts "
+                "WHERE service_ticket_fts MATCH :match"
+            ).bindparams(match=match).columns(ticket_id=Integer, score=Float).subquery('fts')
+            query = query.join(fts, fts.c.ticket_id == ServiceTicket.id)
+            score = fts.c.score                       # bm25: manji je bolji
+        else:
+            short_terms = terms
+            if dialect == 'postgresql':
+                score = -func.similarity(ServiceTicket.search_text, ' '.join(terms))
+
+        for term in short_terms:
+            query = query.filter(_like(term))
+
+        if not rank:
+            return query
+
+        order = []
+        number = ticket_number_from(q)
+        if number is not None:
+            order.append(case((ServiceTicket.ticket_number == number, 0), else_=1))
+        if score is not None:
+            order.append(score)
+        order += [ServiceTicket.created_at.desc(), ServiceTicket.id.desc()]
+        return query.order_by(None).order_by(*order)
+
+    def highlight(self, ticket, q: str) -> dict:
+        """Polja naloga koja odgovaraju upitu, sa <mark> oko pogotka."""
+        terms = search_terms(q)
+        result = {}
+        for key, attribute, normalizer in HIGHLIGHT_FIELDS:
+            kwargs = {'normalizer': normalizer} if normalizer else {}
+            marked = highlight(getattr(ticket, attribute), terms, **kwargs)
+            if marked is not None:
+                result[key] = marked
+        return result
+
+    def reindex(self, tenant_id: int = None) -> int:
+        """
+        Ponovo izračunaj search_text (npr. posle izmene normalizacije).
+
+        Returns:
+            Broj izmenjenih naloga
+        """
+        changed, last_id = 0, 0
+        while True:
+            query = ServiceTicket.query.filter(ServiceTicket.id > last_id)
+            if tenant_id is not None:
+                query = query.filter(ServiceTicket.tenant_id == tenant_id)
+            tickets = query.order_by(ServiceTicket.id).limit(REINDEX_BATCH_SIZE).all()
+            if not tickets:
+                break
+            for ticket in tickets:
+                value = ticket_search_text(ticket)
+                if ticket.search_text != value:
+                    ticket.search_text = value
+                    changed += 1
+            db.session.commit()
+            last_id = tickets[-1].id
+
+        if changed:
+            logger.info(f"Ticket search: reindeksirano {changed} naloga")
+        return changed
+
+
+# Singleton instanca servisa
+ticket_search = TicketSearchService()
@@ -25,6 +25,8 @@ from typing import Optional
 
 from flask import current_app
 
+from .redis_service import redis_manager
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,14 +34,10 @@ class TokenBlacklistService:
     """
     Redis-based token blacklist sa fail-closed politikom.
 
-    VAZNO: Ova klasa je singleton i koristi lazy initialization
-    za Redis konekciju jer current_app nije dostupan pri importu.
+    Redis konekcija i dostupnost dolaze iz redis_manager-a (deljeni pool,
+    circuit breaker) - provera tokena ne šalje PING pre svakog upita.
     """
 
-    def __init__(self):
-        self._redis = None
-        self._redis_available = None
-
     def _is_enabled(self) -> bool:
         """Proveri da li je blacklist ukljucen."""
         try:
@@ -55,43 +53,6 @@ class TokenBlacklistService:
         except RuntimeError:
             return False
 
-    @property
-    def redis(self):
-        """Lazy Redis connection."""
-        if self._redis is None:
-            try:
-                import redis
-                import ssl
-                redis_url = current_app.config.get('REDIS_URL', 'redis://localhost:6379/0')
-
-                # Heroku Redis koristi self-signed sertifikat
-                # Za rediss:// URL treba ssl_cert_reqs=None
-                if redis_url.startswith('rediss://'):
-                    self._redis = redis.from_url(
-                        redis_url,
-                        decode_responses=True,
-                        ssl_cert_reqs=None  # Prihvati self-signed cert
-                    )
-                else:
-                    self._redis = redis.from_url(redis_url, decode_responses=True)
-            except Exception as e:
-                logger.error(f"Failed to connect to Redis: {e}")
-                self._redis = None
-        return self._redis
-
-    def _check_redis_health(self) -> bool:
-        """Proveri da li je Redis dostupan."""
-        try:
-            if self.redis is None:
-                return False
-            self.redis.ping()
-            self._redis_available = True
-            return True
-        except Exception as e:
-            logger.error(f"Redis health check failed: {e}")
-            self._redis_available = False
-            return False
-
     def _get_jti(self, token_payload: dict) -> str:
         """
         Dohvati JTI (JWT ID) iz tokena.
@@ -122,7 +83,8 @@ class TokenBlacklistService:
         if not self._is_enabled():
             return True
 
-        if not self._check_redis_health():
+        client = redis_manager.client()
+        if client is None:
             logger.error("Cannot blacklist token: Redis unavailable")
             return False
 
@@ -138,13 +100,14 @@ class TokenBlacklistService:
 
             if ttl > 0:
                 key = f"blacklist:jti:{jti}"
-                self.redis.setex(key, ttl, "1")
+                client.setex(key, ttl, "1")
                 logger.info(f"Token blacklisted: {jti[:8]}... TTL={ttl}s")
                 return True
 
             return True  # Token vec istekao, nema potrebe za blacklist
 
         except Exception as e:
+            redis_manager.record_failure(e, 'blacklist')
             logger.error(f"Failed to blacklist token: {e}")
             return False
 
@@ -167,7 +130,8 @@ class TokenBlacklistService:
         if not self._is_enabled():
             return True
 
-        if not self._check_redis_health():
+        client = redis_manager.client()
+        if client is None:
             logger.error("Cannot blacklist user tokens: Redis unavailable")
             return False
 
@@ -179,12 +143,13 @@ class TokenBlacklistService:
             # Svi tokeni izdati PRE ovog vremena su nevazeci
             # TTL = max token lifetime (30 dana za refresh token)
             now = datetime.now(timezone.utc).timestamp()
-            self.redis.setex(key, 2592000, str(now))  # 30 dana
+            client.setex(key, 2592000, str(now))  # 30 dana
 
             logger.info(f"All tokens blacklisted for {user_type}:{user_id}")
             return True
 
         except Exception as e:
+            redis_manager.record_failure(e, 'blacklist')
             logger.error(f"Failed to blacklist user tokens: {e}")
             return False
 
@@ -197,7 +162,7 @@ class TokenBlacklistService:
         - Ako Redis nije dostupan I SECURITY_STRICT=False → vrati False (dozvoli, dev mode)
 
         Proverava:
-        1. Redis dostupnost (fail-closed ako nije)
+        1. Redis dostupnost (fail-closed ako je prekidač otvoren ili upit padne)
         2. Individual token blacklist (po jti)
         3. User-wide blacklist (token izdat pre invalidacije)
 
@@ -212,7 +177,8 @@ class TokenBlacklistService:
             return False
 
         # FAIL-CLOSED check
-        if not self._check_redis_health():
+        client = redis_manager.client()
+        if client is None:
             if self._is_strict_mode():
                 logger.error("Redis unavailable, FAIL-CLOSED: rejecting token")
                 return True  # FAIL-CLOSED u produkciji
@@ -223,8 +189,9 @@ class TokenBlacklistService:
         try:
             # 1. Proveri individual blacklist po JTI
             jti = self._get_jti(token_payload)
-            if self.redis.exists(f"blacklist:jti:{jti}"):
+            if client.exists(f"blacklist:jti:{jti}"):
                 logger.debug(f"Token {jti[:8]}... is blacklisted (individual)")
+                redis_manager.record_success()
                 return True
 
             # 2. Proveri user-wide blacklist
@@ -233,7 +200,8 @@ class TokenBlacklistService:
             user_type = 'admin' if is_admin else 'tenant'
             key = f"blacklist:user:{user_id}:{user_type}"
 
-            blacklist_time = self.redis.get(key)
+            blacklist_time = client.get(key)
+            redis_manager.record_success()
             if blacklist_time:
                 token_iat = token_payload.get('iat', 0)
                 if isinstance(token_iat, datetime):
@@ -246,6 +214,7 @@ class TokenBlacklistService:
             return False
 
         except Exception as e:
+            redis_manager.record_failure(e, 'blacklist')
             logger.error(f"Error checking blacklist: {e}")
             # Fail-closed na gresku ako smo u strict mode
             return self._is_strict_mode()
@@ -255,15 +224,17 @@ class TokenBlacklistService:
         Obrisi user-wide blacklist.
         Obicno nije potrebno - TTL se brine za ciscenje.
         """
-        if not self._check_redis_health():
+        client = redis_manager.client()
+        if client is None:
             return False
 
         try:
             user_type = 'admin' if is_admin else 'tenant'
             key = f"blacklist:user:{user_id}:{user_type}"
-            self.redis.delete(key)
+            client.delete(key)
             return True
         except Exception as e:
+            redis_manager.record_failure(e, 'blacklist')
             logger.error(f"Failed to clear user blacklist: {e}")
             return False
 
@@ -271,13 +242,14 @@ class TokenBlacklistService:
         """
         Vrati statistiku blacklist-a (za admin dashboard).
         """
-        if not self._check_redis_health():
+        client = redis_manager.client()
+        if client is None:
             return {'error': 'Redis unavailable'}
 
         try:
             # Prebroj kljuceve
-            jti_keys = len(self.redis.keys("blacklist:jti:*"))
-            user_keys = len(self.redis.keys("blacklist:user:*"))
+            jti_keys = len(client.keys("blacklist:jti:*"))
+            user_keys = len(client.keys("blacklist:user:*"))
 
             return {
                 'individual_tokens': jti_keys,
@@ -285,6 +257,7 @@ class TokenBlacklistService:
                 'redis_available': True
             }
         except Exception as e:
+            redis_manager.record_failure(e, 'blacklist')
             return {'error': str(e)}
 
 
@@ -0,0 +1,1425 @@
+function settingsPage() {
+    return {
+        // State
+        loading: true,
+        saving: false,
+        savingPublic: false,
+        changingPassword: false,
+        uploadingLogo: false,
+        uploadingIdFront: false,
+        uploadingIdBack: false,
+        activeTab: new URLSearchParams(window.location.search).get('tab') || 'settings',
+        currentTheme: localStorage.getItem('shub-theme') || 'light',
+
+        // Current user info
+        currentUser: { id: null, ime: '', prezime: '', email: '', role: '' },
+        passwordForm: { current_password: '', new_password: '', confirm_password: '' },
+
+        // Modals
+        userModal: false,
+        locationModal: false,
+        editingUser: null,
+        editingLocation: null,
+
+        // Data
+        profile: {},
+        settings: {},
+        subscription: {},
+        users: [],
+        locations: [],
+        kyc: {},
+        loginInfo: { login_url: '', login_secret: '' },
+
+        // Public Profile
+        publicProfile: {
+            is_public: false,
+            display_name: '',
+            tagline: '',
+            description: '',
+            phone: '',
+            phone_secondary: '',
+            email: '',
+            address: '',
+            city: '',
+            postal_code: '',
+            maps_url: '',
+            maps_embed_url: '',
+            working_hours: {
+                mon_open: '09:00', mon_close: '17:00', mon_closed: false,
+                tue_open: '09:00', tue_close: '17:00', tue_closed: false,
+                wed_open: '09:00', wed_close: '17:00', wed_closed: false,
+                thu_open: '09:00', thu_close: '17:00', thu_closed: false,
+                fri_open: '09:00', fri_close: '17:00', fri_closed: false,
+                sat_open: '09:00', sat_close: '14:00', sat_closed: false,
+                sun_open: '', sun_close: '', sun_closed: true
+            },
+            logo_url: '',
+            cover_image_url: '',
+            primary_color: '#3b82f6',
+            secondary_color: '#1e40af',
+            facebook_url: '',
+            instagram_url: '',
+            youtube_url: '',
+            tiktok_url: '',
+            linkedin_url: '',
+            website_url: '',
+            show_prices: true,
+            price_disclaimer: '',
+            meta_title: '',
+            meta_description: '',
+            meta_keywords: '',
+            about_title: '',
+            about_content: '',
+            // New v2 fields
+            faq_title: 'Često postavljana pitanja',
+            faq_items: [],
+            show_brands_section: true,
+            supported_brands: [],
+            show_process_section: true,
+            process_title: 'Kako funkcioniše',
+            process_steps: [],
+            show_whatsapp_button: false,
+            whatsapp_number: '',
+            whatsapp_message: 'Zdravo! Imam pitanje u vezi servisa.',
+            show_tracking_widget: true,
+            tracking_widget_title: 'Pratite status popravke',
+            hero_style: 'centered'
+        },
+        publicSubTab: 'basic',
+        tenantSlug: '',
+        publicPageUrls: { subdomain: '', custom_domain: null },
+        customDomain: { domain: null, verified: false, verification_instructions: null },
+        qrCode: null,
+        newDomainInput: '',
+        settingUpDomain: false,
+        verifyingDomain: false,
+
+        // Google Integration
+        googleIntegration: { is_connected: false, integration: null },
+        googleSearchQuery: '',
+        googleSearchResults: [],
+        googleSelectedPlace: null,
+        googleSearching: false,
+        googleConnecting: false,
+        googleSyncing: false,
+
+        // SMS Billing
+        smsSettings: {
+            sms_enabled: false,
+            consent_given: false,
+            credit_balance: 0,
+            sms_cost_credits: 0.20,
+            can_send_sms: false,
+            activated_at: null
+        },
+        smsModal: false,
+        smsEnabling: false,
+        smsDisabling: false,
+
+        // Forms
+        userForm: {},
+        locationForm: {},
+        kycForm: {},
+
+        async init() {
+            // Apply saved theme on init
+            this.applyTheme(this.currentTheme);
+            await this.loadCurrentUser();
+            await this.loadAll();
+
+            // Watch for tab changes to initialize Google autocomplete when public_page tab is shown
+            this.$watch('activeTab', (value) => {
+                if (value === 'public_page') {
+                    // Small delay to ensure DOM is updated
+                    setTimeout(() => {
+                        if (typeof initGoogleMapsAutocomplete === 'function' && !window._googleAutocompleteInitialized) {
+                            initGoogleMapsAutocomplete();
+                        }
+                    }, 100);
+                }
+            });
+
+            // Also check if we're already on public_page tab
+            if (this.activeTab === 'public_page') {
+                setTimeout(() => {
+                    if (typeof initGoogleMapsAutocomplete === 'function' && !window._googleAutocompleteInitialized) {
+                        initGoogleMapsAutocomplete();
+                    }
+                }, 100);
+            }
+        },
+
+        // Check if current user is admin (OWNER, ADMIN, MANAGER)
+        isAdmin() {
+            const adminRoles = ['OWNER', 'ADMIN', 'MANAGER'];
+            return adminRoles.includes(this.currentUser.role);
+        },
+
+        async loadCurrentUser() {
+            try {
+                const response = await api('/auth/me');
+                if (response.ok) {
+                    const data = await response.json();
+                    this.currentUser = data.user;
+                }
+            } catch (e) {
+                console.error('Failed to load current user:', e);
+            }
+        },
+
+        async changeMyPassword() {
+            if (this.passwordForm.new_password !== this.passwordForm.confirm_password) {
+                showToast('Šifre se ne poklapaju', 'error');
+                return;
+            }
+
+            this.changingPassword = true;
+            try {
+                const response = await api('/auth/change-password', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({
+                        current_password: this.passwordForm.current_password,
+                        new_password: this.passwordForm.new_password
+                    })
+                });
+
+                if (response.ok) {
+                    showToast('Šifra uspešno promenjena', 'success');
+                    this.passwordForm = { current_password: '', new_password: '', confirm_password: '' };
+                } else {
+                    const error = await response.json();
+                    showToast(error.error || 'Greška pri promeni šifre', 'error');
+                }
+            } catch (e) {
+                console.error('Failed to change password:', e);
+                showToast('Greška pri promeni šifre', 'error');
+            } finally {
+                this.changingPassword = false;
+            }
+        },
+
+        setTheme(theme) {
+            this.currentTheme = theme;
+            localStorage.setItem('shub-theme', theme);
+            this.applyTheme(theme);
+            showToast(theme === 'glass' ? 'Glassmorphism tema aktivirana' : 'Svetla tema aktivirana', 'success');
+        },
+
+        applyTheme(theme) {
+            if (theme === 'glass') {
+                document.documentElement.classList.add('glass-theme');
+            } else {
+                document.documentElement.classList.remove('glass-theme');
+            }
+        },
+
+        async loadAll() {
+            this.loading = true;
+            try {
+                const [profileRes, settingsRes, subscriptionRes, usersRes, locationsRes, kycRes, publicRes, loginInfoRes] = await Promise.all([
+                    api('/tenant/profile'),
+                    api('/tenant/settings'),
+                    api('/tenant/subscription'),
+                    api('/users'),
+                    api('/locations'),
+                    api('/tenant/kyc'),
+                    api('/tenant/public-profile'),
+                    api('/tenant/login-info')
+                ]);
+
+                if (profileRes.ok) this.profile = await profileRes.json();
+                if (settingsRes.ok) this.settings = await settingsRes.json();
+                if (subscriptionRes.ok) this.subscription = await subscriptionRes.json();
+                if (usersRes.ok) {
+                    const usersData = await usersRes.json();
+                    this.users = usersData.users || [];
+                }
+                if (locationsRes.ok) {
+                    const locationsData = await locationsRes.json();
+                    this.locations = locationsData.locations || [];
+                }
+                if (kycRes.ok) {
+                    const kycData = await kycRes.json();
+                    this.kyc = kycData;
+                    // Init KYC form
+                    if (kycData.representative) {
+                        this.kycForm = { ...kycData.representative };
+                    }
+                }
+                if (loginInfoRes.ok) {
+                    this.loginInfo = await loginInfoRes.json();
+                }
+
+                // Load SMS settings separately (not critical for page load)
+                this.loadSmsSettings();
+
+                if (publicRes.ok) {
+                    const publicData = await publicRes.json();
+                    this.tenantSlug = publicData.tenant_slug || '';
+                    this.publicPageUrls.subdomain = publicData.subdomain_url || `https://${this.tenantSlug}.shub.rs`;
+                    this.publicPageUrls.custom_domain = publicData.custom_domain_url || null;
+
+                    // Use tenant profile data as defaults for empty fields
+                    const tenantDefaults = {
+                        display_name: this.profile.name || '',
+                        phone: this.profile.telefon || '',
+                        email: this.profile.email || '',
+                        address: this.profile.adresa_sedista || ''
+                    };
+
+                    if (publicData.exists && publicData.profile) {
+                        const p = publicData.profile;
+                        // Flatten profile data for form binding, using tenant data as fallback
+                        this.publicProfile = {
+                            is_public: p.is_public || false,
+                            display_name: p.display_name || tenantDefaults.display_name,
+                            tagline: p.tagline || '',
+                            description: p.description || '',
+                            phone: p.contact?.phone || tenantDefaults.phone,
+                            phone_secondary: p.contact?.phone_secondary || '',
+                            email: p.contact?.email || tenantDefaults.email,
+                            address: p.contact?.address || tenantDefaults.address,
+                            city: p.contact?.city || '',
+                            postal_code: p.contact?.postal_code || '',
+                            maps_url: p.contact?.maps_url || '',
+                            maps_embed_url: p.contact?.maps_embed_url || '',
+                            working_hours: this.parseWorkingHours(p.working_hours),
+                            logo_url: p.branding?.logo_url || '',
+                            cover_image_url: p.branding?.cover_image_url || '',
+                            primary_color: p.branding?.primary_color || '#3b82f6',
+                            secondary_color: p.branding?.secondary_color || '#1e40af',
+                            facebook_url: p.social?.facebook || '',
+                            instagram_url: p.social?.instagram || '',
+                            youtube_url: p.social?.youtube || '',
+                            tiktok_url: p.social?.tiktok || '',
+                            linkedin_url: p.social?.linkedin || '',
+                            website_url: p.social?.website || '',
+                            show_prices: p.pricing?.show_prices !== false,
+                            price_disclaimer: p.pricing?.disclaimer || '',
+                            meta_title: p.seo?.meta_title || '',
+                            meta_description: p.seo?.meta_description || '',
+                            meta_keywords: p.seo?.meta_keywords || '',
+                            about_title: p.sections?.about_title || '',
+                            about_content: p.sections?.about_content || '',
+                            // New v2 fields - these come from separate groups in API response
+                            faq_title: p.faq?.title || 'Često postavljana pitanja',
+                            faq_items: p.faq?.items || [],
+                            show_brands_section: p.brands?.show_section !== false,
+                            supported_brands: p.brands?.supported || [],
+                            show_process_section: p.process?.show_section !== false,
+                            process_title: p.process?.title || 'Kako funkcioniše',
+                            process_steps: p.process?.steps || [],
+                            show_whatsapp_button: p.whatsapp?.show_button || false,
+                            whatsapp_number: p.whatsapp?.number || '',
+                            whatsapp_message: p.whatsapp?.message || 'Zdravo! Imam pitanje u vezi servisa.',
+                            show_tracking_widget: p.tracking?.show_widget !== false,
+                            tracking_widget_title: p.tracking?.title || 'Pratite status popravke',
+                            hero_style: p.hero_style || 'centered',
+                            theme: p.theme || 'premium'
+                        };
+                        // Custom domain data
+                        if (p.custom_domain) {
+                            this.customDomain = {
+                                domain: p.custom_domain.domain || null,
+                                verified: p.custom_domain.verified || false,
+                                verification_instructions: p.custom_domain.verification_instructions || null
+                            };
+                            if (p.custom_domain.verified && p.custom_domain.domain) {
+                                this.publicPageUrls.custom_domain = `https://${p.custom_domain.domain}`;
+                            }
+                        }
+                    } else {
+                        // Public profile doesn't exist yet - use tenant profile data as defaults
+                        this.publicProfile = {
+                            ...this.publicProfile,
+                            display_name: tenantDefaults.display_name,
+                            phone: tenantDefaults.phone,
+                            email: tenantDefaults.email,
+                            address: tenantDefaults.address
+                        };
+                    }
+                }
+
+                // Load Google integration status
+                await this.loadGoogleIntegration();
+            } catch (e) {
+                console.error('Failed to load data:', e);
+                showToast('Greska pri ucitavanju', 'error');
+            } finally {
+                this.loading = false;
+            }
+        },
+
+        async saveProfile() {
+            this.saving = true;
+            try {
+                const response = await api('/tenant/profile', 'PUT', {
+                    name: this.profile.name,
+                    email: this.profile.email,
+                    telefon: this.profile.telefon,
+                    adresa_sedista: this.profile.adresa_sedista
+                });
+                if (response.ok) {
+                    showToast('Profil sacuvan', 'success');
+                } else {
+                    const err = await response.json();
+                    showToast(err.error || 'Greska pri cuvanju', 'error');
+                }
+            } catch (e) {
+                showToast('Greska pri cuvanju', 'error');
+            } finally {
+                this.saving = false;
+            }
+        },
+
+        // ============ SMS Billing Functions ============
+
+        async loadSmsSettings() {
+            try {
+                const response = await api('/tenant/sms/settings');
+                if (response.ok) {
+                    this.smsSettings = await response.json();
+                }
+            } catch (e) {
+                console.error('Failed to load SMS settings:', e);
+            }
+        },
+
+        openSmsEnableModal() {
+            if (this.smsSettings.credit_balance < this.smsSettings.sms_cost_credits) {
+                showToast('Nemate dovoljno kredita. Dopunite kredit račun pre aktivacije.', 'error');
+                return;
+            }
+            this.smsModal = true;
+        },
+
+        closeSmsModal() {
+            this.smsModal = false;
+        },
+
+        async enableSms() {
+            this.smsEnabling = true;
+            try {
+                const response = await api('/tenant/sms/enable', 'POST', { consent: true });
+                const data = await response.json();
+
+                if (response.ok) {
+                    this.smsSettings.sms_enabled = true;
+                    this.smsSettings.consent_given = true;
+                    this.smsSettings.can_send_sms = true;
+                    this.smsSettings.credit_balance = data.credit_balance;
+                    this.smsModal = false;
+                    showToast('SMS notifikacije aktivirane', 'success');
+                } else {
+                    showToast(data.error || 'Greška pri aktivaciji SMS', 'error');
+                }
+            } catch (e) {
+                console.error('Enable SMS error:', e);
+                showToast('Greška pri aktivaciji SMS', 'error');
+            } finally {
+                this.smsEnabling = false;
+            }
+        },
+
+        async disableSms() {
+            if (!confirm('Da li ste sigurni da želite da isključite SMS notifikacije?')) return;
+
+            this.smsDisabling = true;
+            try {
+                const response = await api('/tenant/sms/disable', 'POST');
+                const data = await response.json();
+
+                if (response.ok) {
+                    this.smsSettings.sms_enabled = false;
+                    this.smsSettings.can_send_sms = false;
+                    showToast('SMS notifikacije isključene', 'success');
+                } else {
+                    showToast(data.error || 'Greška pri isključivanju SMS', 'error');
+                }
+            } catch (e) {
+                console.error('Disable SMS error:', e);
+                showToast('Greška pri isključivanju SMS', 'error');
+            } finally {
+                this.smsDisabling = false;
+            }
+        },
+
+        // ============ Logo Upload Functions ============
+
+        async uploadLogo(event) {
+            const file = event.target.files[0];
+            if (!file) return;
+
+            // Client-side validation
+            const allowedTypes = ['image/jpeg', 'image/png', 'image/gif', 'image/webp'];
+            if (!allowedTypes.includes(file.type)) {
+                showToast('Dozvoljeni formati: JPG, PNG, GIF, WebP', 'error');
+                return;
+            }
+
+            const maxSize = 5 * 1024 * 1024; // 5MB
+            if (file.size > maxSize) {
+                showToast('Fajl je prevelik (max 5MB)', 'error');
+                return;
+            }
+
+            this.uploadingLogo = true;
+            try {
+                const formData = new FormData();
+                formData.append('logo', file);
+
+                const response = await fetch('/api/v1/tenant/upload/logo', {
+                    method: 'POST',
+                    headers: {
+                        'Authorization': 'Bearer ' + sessionStorage.getItem('access_token')
+                    },
+                    body: formData
+                });
+
+                const data = await response.json();
+
+                if (response.ok) {
+                    this.profile.logo_url = data.url;
+                    showToast('Logo uspesno uploadovan', 'success');
+                } else {
+                    showToast(data.error || 'Greska pri uploadu', 'error');
+                }
+            } catch (e) {
+                console.error('Upload error:', e);
+                showToast('Greska pri uploadu loga', 'error');
+            } finally {
+                this.uploadingLogo = false;
+                // Reset file input
+                event.target.value = '';
+            }
+        },
+
+        async deleteLogo() {
+            if (!confirm('Da li ste sigurni da želite da obrišete logo?')) return;
+
+            this.uploadingLogo = true;
+            try {
+                const response = await api('/tenant/upload/logo', 'DELETE');
+
+                if (response.ok) {
+                    this.profile.logo_url = null;
+                    showToast('Logo obrisan', 'success');
+                } else {
+                    const data = await response.json();
+                    showToast(data.error || 'Greška pri brisanju', 'error');
+                }
+            } catch (e) {
+                console.error('Delete error:', e);
+                showToast('Greška pri brisanju loga', 'error');
+            } finally {
+                this.uploadingLogo = false;
+            }
+        },
+
+        // ============ ID Card Upload Functions ============
+
+        async uploadIdCard(event, side) {
+            const file = event.target.files[0];
+            if (!file) return;
+
+            // Validate file type
+            if (!file.type.startsWith('image/')) {
+                showToast('Molimo izaberite sliku', 'error');
+                return;
+            }
+
+            // Validate file size (5MB)
+            if (file.size > 5 * 1024 * 1024) {
+                showToast('Maksimalna veličina je 5MB', 'error');
+                return;
+            }
+
+            if (side === 'front') {
+                this.uploadingIdFront = true;
+            } else {
+                this.uploadingIdBack = true;
+            }
+
+            try {
+                const formData = new FormData();
+                formData.append('image', file);
+
+                const response = await fetch(`/api/v1/tenant/upload/id-card/${side}`, {
+                    method: 'POST',
+                    headers: {
+                        'Authorization': `Bearer ${getAccessToken()}`
+                    },
+                    body: formData
+                });
+
+                const data = await response.json();
+
+                if (response.ok) {
+                    // Update KYC data
+                    if (!this.kyc.representative) {
+                        this.kyc.representative = {};
+                    }
+                    if (side === 'front') {
+                        this.kyc.representative.lk_front_url = data.url;
+                    } else {
+                        this.kyc.representative.lk_back_url = data.url;
+                    }
+                    showToast('Slika uploadovana', 'success');
+                } else {
+                    showToast(data.error || 'Greška pri uploadu', 'error');
+                }
+            } catch (e) {
+                console.error('Upload error:', e);
+                showToast('Greška pri uploadu', 'error');
+            } finally {
+                if (side === 'front') {
+                    this.uploadingIdFront = false;
+                } else {
+                    this.uploadingIdBack = false;
+                }
+                event.target.value = '';
+            }
+        },
+
+        async deleteIdCard(side) {
+            if (!confirm('Da li ste sigurni da želite da obrišete sliku?')) return;
+
+            if (side === 'front') {
+                this.uploadingIdFront = true;
+            } else {
+                this.uploadingIdBack = true;
+            }
+
+            try {
+                const response = await api(`/tenant/upload/id-card/${side}`, 'DELETE');
+
+                if (response.ok) {
+                    if (side === 'front') {
+                        this.kyc.representative.lk_front_url = null;
+                    } else {
+                        this.kyc.representative.lk_back_url = null;
+                    }
+                    showToast('Slika obrisana', 'success');
+                } else {
+                    const data = await response.json();
+                    showToast(data.error || 'Greška pri brisanju', 'error');
+                }
+            } catch (e) {
+                console.error('Delete error:', e);
+                showToast('Greška pri brisanju', 'error');
+            } finally {
+                if (side === 'front') {
+                    this.uploadingIdFront = false;
+                } else {
+                    this.uploadingIdBack = false;
+                }
+            }
+        },
+
+        // ============ Login Link Functions ============
+
+        async copyLoginUrl() {
+            try {
+                await navigator.clipboard.writeText(this.loginInfo.login_url);
+                showToast('Link kopiran u clipboard', 'success');
+            } catch (e) {
+                // Fallback za starije browsere
+                const input = document.createElement('input');
+                input.value = this.loginInfo.login_url;
+                document.body.appendChild(input);
+                input.select();
+                document.execCommand('copy');
+                document.body.removeChild(input);
+                showToast('Link kopiran u clipboard', 'success');
+            }
+        },
+
+        async regenerateLoginSecret() {
+            if (!confirm('Da li ste sigurni? Stari link za prijavu ce prestati da vazi i svi zaposleni ce morati da koriste novi link.')) {
+                return;
+            }
+
+            try {
+                const response = await api('/tenant/login-info/regenerate', 'POST');
+                if (response.ok) {
+                    const data = await response.json();
+                    this.loginInfo.login_url = data.login_url;
+                    this.loginInfo.login_secret = data.login_secret;
+                    showToast('Novi link generisan', 'success');
+                } else {
+                    const err = await response.json();
+                    showToast(err.error || 'Greska pri generisanju', 'error');
+                }
+            } catch (e) {
+                showToast('Greska pri generisanju', 'error');
+            }
+        },
+
+        // ============ Google Integration Functions ============
+
+        async loadGoogleIntegration() {
+            try {
+                const response = await api('/tenant/google/status');
+                if (response.ok) {
+                    this.googleIntegration = await response.json();
+                }
+            } catch (e) {
+                console.error('Failed to load Google integration:', e);
+            }
+        },
+
+        async searchGooglePlace() {
+            const query = this.googleSearchQuery.trim() || this.profile.name;
+            if (!query) {
+                showToast('Unesite naziv biznisa', 'error');
+                return;
+            }
+
+            this.googleSearching = true;
+            this.googleSearchResults = [];
+            this.googleSelectedPlace = null;
+
+            try {
+                const response = await api(`/tenant/google/search?q=${encodeURIComponent(query)}`);
+                if (response.ok) {
+                    const data = await response.json();
+                    this.googleSearchResults = data.results || [];
+                    if (this.googleSearchResults.length === 0) {
+                        showToast('Nema rezultata pretrage', 'info');
+                    }
+                } else {
+                    const err = await response.json();
+                    showToast(err.error || 'Greska pri pretrazi', 'error');
+                }
+            } catch (e) {
+                console.error('Failed to search Google place:', e);
+                showToast('Greska pri pretrazi', 'error');
+            } finally {
+                this.googleSearching = false;
+            }
+        },
+
+        selectGooglePlace(place) {
+            this.googleSelectedPlace = place;
+        },
+
+        async connectGooglePlace() {
+            if (!this.googleSelectedPlace) {
+                showToast('Izaberite biznis iz rezultata pretrage', 'error');
+                return;
+            }
+
+            this.googleConnecting = true;
+            try {
+                const response = await api('/tenant/google/place', 'POST', {
+                    place_id: this.googleSelectedPlace.place_id
+                });
+                if (response.ok) {
+                    showToast('Google biznis uspesno povezan!', 'success');
+                    await this.loadGoogleIntegration();
+                    // Reset search state
+                    this.googleSearchQuery = '';
+                    this.googleSearchResults = [];
+                    this.googleSelectedPlace = null;
+                } else {
+                    const err = await response.json();
+                    showToast(err.error || 'Greska pri povezivanju', 'error');
+                }
+            } catch (e) {
+                console.error('Failed to connect Google place:', e);
+                showToast('Greska pri povezivanju', 'error');
+            } finally {
+                this.googleConnecting = false;
+            }
+        },
+
+        async syncGoogleReviews() {
+            this.googleSyncing = true;
+            try {
+                const response = await api('/tenant/google/sync', 'POST');
+                if (response.ok) {
+                    const data = await response.json();
+                    showToast(`Sinhronizovano ${data.reviews_synced || 0} recenzija`, 'success');
+                    await this.loadGoogleIntegration();
+                } else {
+                    const err = await response.json();
+                    showToast(err.error || 'Greska pri sinhronizaciji', 'error');
+                }
+            } catch (e) {
+                console.error('Failed to sync Google reviews:', e);
+                showToast('Greska pri sinhronizaciji', 'error');
+            } finally {
+                this.googleSyncing = false;
+            }
+        },
+
+        async disconnectGoogle() {
+            if (!confirm('Da li ste sigurni da zelite da prekinete vezu sa Google nalogom?')) {
+                return;
+            }
+
+            try {
+                const response = await api('/tenant/google/disconnect', 'DELETE');
+                if (response.ok) {
+                    showToast('Veza sa Google prekinuta', 'success');
+                    this.googleIntegration = { is_connected: false, integration: null };
+                } else {
+                    const err = await response.json();
+                    showToast(err.error || 'Greska pri prekidanju veze', 'error');
+                }
+            } catch (e) {
+                console.error('Failed to disconnect Google:', e);
+                showToast('Greska pri prekidanju veze', 'error');
+            }
+        },
+
+        async saveSettings() {
+            this.saving = true;
+            try {
+                const response = await api('/tenant/settings', 'PUT', this.settings);
+                if (response.ok) {
+                    showToast('Podesavanja sacuvana', 'success');
+                } else {
+                    const err = await response.json();
+                    showToast(err.error || 'Greska pri cuvanju', 'error');
+                }
+            } catch (e) {
+                showToast('Greska pri cuvanju', 'error');
+            } finally {
+                this.saving = false;
+            }
+        },
+
+        async submitKyc() {
+            this.saving = true;
+            try {
+                const response = await api('/tenant/kyc', 'POST', this.kycForm);
+                if (response.ok) {
+                    showToast('Podaci poslati na verifikaciju', 'success');
+                    const kycRes = await api('/tenant/kyc');
+                    if (kycRes.ok) {
+                        this.kyc = await kycRes.json();
+                    }
+                } else {
+                    const err = await response.json();
+                    showToast(err.error || 'Greska pri slanju', 'error');
+                }
+            } catch (e) {
+                showToast('Greska pri slanju', 'error');
+            } finally {
+                this.saving = false;
+            }
+        },
+
+        // Users
+        openUserModal() {
+            this.editingUser = null;
+            this.userForm = {
+                ime: '',
+                prezime: '',
+                email: '',
+                password: '',
+                phone: '',
+                role: 'TECHNICIAN'
+            };
+            this.userModal = true;
+        },
+
+        editUser(user) {
+            this.editingUser = user;
+            this.userForm = {
+                ime: user.ime,
+                prezime: user.prezime,
+                email: user.email,
+                phone: user.phone,
+                role: user.role
+            };
+            this.userModal = true;
+        },
+
+        async saveUser() {
+            this.saving = true;
+            try {
+                let response;
+                if (this.editingUser) {
+                    response = await api(`/users/${this.editingUser.id}`, 'PUT', this.userForm);
+                } else {
+                    response = await api('/users', 'POST', this.userForm);
+                }
+                if (!response.ok) {
+                    const err = await response.json();
+                    throw new Error(err.error || 'Greska pri cuvanju');
+                }
+                showToast('Korisnik sacuvan', 'success');
+                this.userModal = false;
+                const usersRes = await api('/users');
+                if (usersRes.ok) {
+                    const data = await usersRes.json();
+                    this.users = data.users || [];
+                }
+            } catch (e) {
+                showToast(e.message || 'Greska pri cuvanju', 'error');
+            } finally {
+                this.saving = false;
+            }
+        },
+
+        // Locations
+        openLocationModal() {
+            this.editingLocation = null;
+            this.locationForm = {
+                name: '',
+                address: '',
+                city: '',
+                postal_code: '',
+                phone: '',
+                email: ''
+            };
+            this.locationModal = true;
+        },
+
+        editLocation(location) {
+            this.editingLocation = location;
+            this.locationForm = {
+                name: location.name,
+                address: location.address,
+                city: location.city,
+                postal_code: location.postal_code,
+                phone: location.phone,
+                email: location.email
+            };
+            this.locationModal = true;
+        },
+
+        async saveLocation() {
+            this.saving = true;
+            try {
+                let response;
+                if (this.editingLocation) {
+                    response = await api(`/locations/${this.editingLocation.id}`, 'PUT', this.locationForm);
+                } else {
+                    response = await api('/locations', 'POST', this.locationForm);
+                }
+                if (!response.ok) {
+                    const err = await response.json();
+                    throw new Error(err.error || 'Greska pri cuvanju');
+                }
+                showToast('Lokacija sacuvana', 'success');
+                this.locationModal = false;
+                const locationsRes = await api('/locations');
+                if (locationsRes.ok) {
+                    const data = await locationsRes.json();
+                    this.locations = data.locations || [];
+                }
+            } catch (e) {
+                showToast(e.message || 'Greska pri cuvanju', 'error');
+            } finally {
+                this.saving = false;
+            }
+        },
+
+        // Helpers
+        getRoleLabel(role) {
+            const labels = {
+                'OWNER': 'Vlasnik',
+                'ADMIN': 'Admin',
+                'MANAGER': 'Menadzer',
+                'TECHNICIAN': 'Serviser',
+                'RECEPTIONIST': 'Recepcionar'
+            };
+            return labels[role] || role;
+        },
+
+        getRoleClass(role) {
+            const classes = {
+                'OWNER': 'bg-purple-100 text-purple-700',
+                'ADMIN': 'bg-red-100 text-red-700',
+                'MANAGER': 'bg-blue-100 text-blue-700',
+                'TECHNICIAN': 'bg-green-100 text-green-700',
+                'RECEPTIONIST': 'bg-gray-100 text-gray-700'
+            };
+            return classes[role] || 'bg-gray-100 text-gray-700';
+        },
+
+        getSubscriptionStatusLabel(status) {
+            const labels = {
+                'PENDING': 'Cekanje',
+                'TRIAL': 'Trial',
+                'ACTIVE': 'Aktivan',
+                'EXPIRED': 'Istekao',
+                'SUSPENDED': 'Suspendovan'
+            };
+            return labels[status] || status;
+        },
+
+        getSubscriptionStatusClass(status) {
+            const classes = {
+                'PENDING': 'bg-yellow-100 text-yellow-700',
+                'TRIAL': 'bg-blue-100 text-blue-700',
+                'ACTIVE': 'bg-green-100 text-green-700',
+                'EXPIRED': 'bg-red-100 text-red-700',
+                'SUSPENDED': 'bg-gray-100 text-gray-700'
+            };
+            return classes[status] || 'bg-gray-100 text-gray-700';
+        },
+
+        formatPrice(price) {
+            if (!price) return '0';
+            return new Intl.NumberFormat('sr-RS').format(price);
+        },
+
+        formatDate(dateStr) {
+            if (!dateStr) return '-';
+            return new Date(dateStr).toLocaleDateString('sr-RS');
+        },
+
+        // Format working hours object to readable string for locations
+        // Smart grouping: "Radnim danima: 09-17, Sub: 09-14, Ned: ne radi"
+        formatLocationWorkingHours(wh) {
+            // Handle null, undefined, empty string
+            if (!wh) return '';
+
+            // Handle string (might be JSON string)
+            if (typeof wh === 'string') {
+                try {
+                    wh = JSON.parse(wh);
+                } catch (e) {
+                    return wh; // Return as-is if not valid JSON
+                }
+            }
+
+            // Must be object
+            if (typeof wh !== 'object' || wh === null) return '';
+            if (Object.keys(wh).length === 0) return '';
+
+            // Map various day formats to standard abbreviations
+            const dayAliases = {
+                mon: 'mon', monday: 'mon', ponedeljak: 'mon', pon: 'mon',
+                tue: 'tue', tuesday: 'tue', utorak: 'tue', uto: 'tue',
+                wed: 'wed', wednesday: 'wed', sreda: 'wed', sre: 'wed',
+                thu: 'thu', thursday: 'thu', cetvrtak: 'thu', cet: 'thu',
+                fri: 'fri', friday: 'fri', petak: 'fri', pet: 'fri',
+                sat: 'sat', saturday: 'sat', subota: 'sat', sub: 'sat',
+                sun: 'sun', sunday: 'sun', nedelja: 'sun', ned: 'sun'
+            };
+
+            const dayNames = {
+                mon: 'Pon', tue: 'Uto', wed: 'Sre', thu: 'Čet', fri: 'Pet', sat: 'Sub', sun: 'Ned'
+            };
+            const weekdays = ['mon', 'tue', 'wed', 'thu', 'fri'];
+
+            // Normalize the working hours object to standard format
+            const normalized = {};
+            for (const [key, value] of Object.entries(wh)) {
+                const lowerKey = key.toLowerCase();
+                const stdDay = dayAliases[lowerKey];
+                if (stdDay && typeof value === 'string') {
+                    normalized[stdDay] = value;
+                } else if (lowerKey.includes('_open') || lowerKey.includes('_close') || lowerKey.includes('_closed')) {
+                    // Complex format keys (mon_open, etc.)
+                    normalized[lowerKey] = value;
+                } else if (typeof value === 'object' && value !== null) {
+                    // Nested format: { mon: { open: "09:00", close: "17:00" } }
+                    if (stdDay && value.open && value.close) {
+                        normalized[stdDay] = `${value.open}-${value.close}`;
+                    }
+                }
+            }
+
+            // Helper to get hours for a day
+            const getHours = (day) => {
+                // Simple format: { mon: "09:00-17:00" }
+                if (normalized[day] && typeof normalized[day] === 'string') {
+                    return normalized[day];
+                }
+                // Complex format: { mon_open: "09:00", mon_close: "17:00" }
+                if (normalized[`${day}_closed`] === true) {
+                    return 'closed';
+                }
+                if (normalized[`${day}_open`] && normalized[`${day}_close`]) {
+                    return `${normalized[`${day}_open`]}-${normalized[`${day}_close`]}`;
+                }
+                return null;
+            };
+
+            // Get hours for all days
+            const hours = {};
+            for (const day of [...weekdays, 'sat', 'sun']) {
+                hours[day] = getHours(day);
+            }
+
+            // Check if any day has hours
+            const anyHours = Object.values(hours).some(h => h && h !== 'closed');
+            if (!anyHours) {
+                // Fallback: just show first few key-value pairs
+                const entries = Object.entries(wh).slice(0, 3);
+                if (entries.length > 0) {
+                    return entries.map(([k, v]) => `${k}: ${v}`).join(', ');
+                }
+                return '';
+            }
+
+            // Check if all weekdays have the same hours
+            const weekdayHours = weekdays.map(d => hours[d]).filter(h => h && h !== 'closed');
+            const uniqueWeekdayHours = [...new Set(weekdayHours)];
+            const allWeekdaysSame = uniqueWeekdayHours.length === 1 && weekdayHours.length === 5;
+
+            const parts = [];
+
+            if (allWeekdaysSame) {
+                // All weekdays same: "Radnim danima: 09-17"
+                parts.push(`Radnim danima: ${uniqueWeekdayHours[0]}`);
+            } else {
+                // Show weekdays that differ or all individually
+                const commonHours = uniqueWeekdayHours.length === 1 ? uniqueWeekdayHours[0] : null;
+
+                if (commonHours && weekdayHours.length >= 3) {
+                    // Most weekdays same, show exceptions
+                    parts.push(`Radnim danima: ${commonHours}`);
+                    for (const day of weekdays) {
+                        if (hours[day] && hours[day] !== commonHours && hours[day] !== 'closed') {
+                            parts.push(`${dayNames[day]}: ${hours[day]}`);
+                        }
+                    }
+                } else {
+                    // Show each weekday
+                    for (const day of weekdays) {
+                        if (hours[day] && hours[day] !== 'closed') {
+                            parts.push(`${dayNames[day]}: ${hours[day]}`);
+                        }
+                    }
+                }
+            }
+
+            // Saturday
+            if (hours.sat && hours.sat !== 'closed') {
+                parts.push(`Sub: ${hours.sat}`);
+            }
+
+            // Sunday
+            if (hours.sun === 'closed' || !hours.sun) {
+                parts.push('Ned: ne radi');
+            } else {
+                parts.push(`Ned: ${hours.sun}`);
+            }
+
+            return parts.join(', ');
+        },
+
+        // ==================== PUBLIC PROFILE ====================
+
+        parseWorkingHours(wh) {
+            // Parse working hours from API into the new format
+            const defaults = {
+                mon_open: '09:00', mon_close: '17:00', mon_closed: false,
+                tue_open: '09:00', tue_close: '17:00', tue_closed: false,
+                wed_open: '09:00', wed_close: '17:00', wed_closed: false,
+                thu_open: '09:00', thu_close: '17:00', thu_closed: false,
+                fri_open: '09:00', fri_close: '17:00', fri_closed: false,
+                sat_open: '09:00', sat_close: '14:00', sat_closed: false,
+                sun_open: '', sun_close: '', sun_closed: true
+            };
+
+            if (!wh || typeof wh !== 'object') return defaults;
+
+            // Check if it's the new format (has mon_open, etc.)
+            if ('mon_open' in wh || 'mon_closed' in wh) {
+                return { ...defaults, ...wh };
+            }
+
+            // Convert old format (e.g., {mon: "09:00-17:00"}) to new format
+            const result = { ...defaults };
+            const days = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun'];
+            for (const day of days) {
+                if (wh[day]) {
+                    const val = wh[day].toLowerCase();
+                    if (val === 'zatvoreno' || val === 'closed' || val === '-') {
+                        result[`${day}_closed`] = true;
+                        result[`${day}_open`] = '';
+                        result[`${day}_close`] = '';
+                    } else if (val.includes('-')) {
+                        const [open, close] = val.split('-').map(t => t.trim());
+                        result[`${day}_open`] = open || '';
+                        result[`${day}_close`] = close || '';
+                        result[`${day}_closed`] = false;
+                    }
+                }
+            }
+            return result;
+        },
+
+        fillDefaultWorkingHours() {
+            this.publicProfile.working_hours = {
+                mon_open: '09:00', mon_close: '17:00', mon_closed: false,
+                tue_open: '09:00', tue_close: '17:00', tue_closed: false,
+                wed_open: '09:00', wed_close: '17:00', wed_closed: false,
+                thu_open: '09:00', thu_close: '17:00', thu_closed: false,
+                fri_open: '09:00', fri_close: '17:00', fri_closed: false,
+                sat_open: '09:00', sat_close: '14:00', sat_closed: false,
+                sun_open: '', sun_close: '', sun_closed: true
+            };
+            showToast('Standardno radno vreme popunjeno', 'success');
+        },
+
+        // ==================== SECTIONS HELPERS (v2) ====================
+
+        toggleBrand(brand) {
+            if (!Array.isArray(this.publicProfile.supported_brands)) {
+                this.publicProfile.supported_brands = [];
+            }
+            const index = this.publicProfile.supported_brands.indexOf(brand);
+            if (index > -1) {
+                this.publicProfile.supported_brands.splice(index, 1);
+            } else {
+                this.publicProfile.supported_brands.push(brand);
+            }
+        },
+
+        addFaqItem() {
+            if (!Array.isArray(this.publicProfile.faq_items)) {
+                this.publicProfile.faq_items = [];
+            }
+            this.publicProfile.faq_items.push({ question: '', answer: '' });
+        },
+
+        removeFaqItem(index) {
+            if (Array.isArray(this.publicProfile.faq_items) && index >= 0 && index < this.publicProfile.faq_items.length) {
+                this.publicProfile.faq_items.splice(index, 1);
+            }
+        },
+
+        addSuggestedFaq(question, answer) {
+            if (!Array.isArray(this.publicProfile.faq_items)) {
+                this.publicProfile.faq_items = [];
+            }
+            // Check if this FAQ already exists
+            const exists = this.publicProfile.faq_items.some(item => item.question === question);
+            if (!exists) {
+                this.publicProfile.faq_items.push({ question, answer });
+                showToast('FAQ dodato', 'success');
+            } else {
+                showToast('Ovo pitanje vec postoji', 'warning');
+            }
+        },
+
+        async savePublicProfile() {
+            this.savingPublic = true;
+            try {
+                // Create a copy with converted working_hours
+                const profileToSave = {...this.publicProfile};
+
+                // Explicitly convert working_hours from form format to API format
+                if (profileToSave.working_hours && typeof profileToSave.working_hours === 'object') {
+                    profileToSave.working_hours = this.formatWorkingHoursForApi(profileToSave.working_hours);
+                }
+
+                // Sanitize URLs to prevent XSS
+                const sanitizedProfile = this.sanitizePublicProfile(profileToSave);
+
+                const response = await api('/tenant/public-profile', 'PUT', sanitizedProfile);
+                if (!response.ok) {
+                    const err = await response.json();
+                    throw new Error(err.error || 'Greska pri cuvanju');
+                }
+                const data = await response.json();
+                showToast('Javna stranica sacuvana', 'success');
+
+                // Reload to get updated data
+                if (data.profile) {
+                    // Update URLs in case custom domain changed
+                    const publicRes = await api('/tenant/public-profile');
+                    if (publicRes.ok) {
+                        const publicData = await publicRes.json();
+                        this.publicPageUrls.custom_domain = publicData.custom_domain_url || null;
+                    }
+                }
+            } catch (e) {
+                showToast(e.message || 'Greska pri cuvanju', 'error');
+            } finally {
+                this.savingPublic = false;
+            }
+        },
+
+        // Konvertuje novi format radnog vremena u stari format za API/template
+        formatWorkingHoursForApi(wh) {
+            if (!wh || typeof wh !== 'object') return {};
+
+            const days = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun'];
+            const result = {};
+
+            for (const day of days) {
+                const closedKey = `${day}_closed`;
+                const openKey = `${day}_open`;
+                const closeKey = `${day}_close`;
+
+                if (wh[closedKey] === true) {
+                    result[day] = 'Zatvoreno';
+                } else if (wh[openKey] && wh[closeKey]) {
+                    result[day] = `${wh[openKey]}-${wh[closeKey]}`;
+                } else if (wh[openKey]) {
+                    result[day] = wh[openKey];
+                }
+                // Ako nema podataka za dan, ne dodajemo ga
+            }
+
+            return result;
+        },
+
+        sanitizePublicProfile(profile) {
+            // Create a clean copy with sanitized values
+            const sanitized = {};
+            const urlFields = ['logo_url', 'cover_image_url', 'maps_url', 'maps_embed_url',
+                               'facebook_url', 'instagram_url', 'youtube_url', 'tiktok_url',
+                               'linkedin_url', 'website_url'];
+
+            for (const [key, value] of Object.entries(profile)) {
+                if (value === null || value === undefined) {
+                    sanitized[key] = value;
+                } else if (key === 'working_hours' && typeof value === 'object') {
+                    // Check if already in API format (no _closed keys) or needs conversion
+                    if ('mon_closed' in value || 'tue_closed' in value) {
+                        // Form format, needs conversion
+                        sanitized[key] = this.formatWorkingHoursForApi(value);
+                    } else {
+                        // Already in API format, pass through
+                        sanitized[key] = value;
+                    }
+                } else if (typeof value === 'string') {
+                    // Sanitize string values
+                    let sanitizedValue = value.trim();
+                    // For URL fields, validate URL format
+                    if (urlFields.includes(key) && sanitizedValue) {
+                        try {
+                            const url = new URL(sanitizedValue);
+                            // Only allow http/https
+                            if (!['http:', 'https:'].includes(url.protocol)) {
+                                sanitizedValue = '';
+                            }
+                        } catch {
+                            // Invalid URL, keep as is (server will validate)
+                        }
+                    }
+                    sanitized[key] = sanitizedValue;
+                } else if (typeof value === 'object') {
+                    // Recursively sanitize objects
+                    sanitized[key] = this.sanitizePublicProfile(value);
+                } else {
+                    sanitized[key] = value;
+                }
+            }
+            return sanitized;
+        },
+
+        async loadQRCode() {
+            if (this.qrCode) {
+                this.qrCode = null;
+                return;
+            }
+            try {
+                const response = await api('/tenant/public-profile/qrcode');
+                if (response.ok) {
+                    const data = await response.json();
+                    this.qrCode = data.qrcode;
+                }
+            } catch (e) {
+                showToast('Greska pri generisanju QR koda', 'error');
+            }
+        },
+
+        copyToClipboard(text) {
+            if (navigator.clipboard) {
+                navigator.clipboard.writeText(text).then(() => {
+                    showToast('Kopirano u clipboard', 'success');
+                });
+            } else {
+                // Fallback for older browsers
+                const textarea = document.createElement('textarea');
+                textarea.value = text;
+                document.body.appendChild(textarea);
+                textarea.select();
+                document.execCommand('copy');
+                document.body.removeChild(textarea);
+                showToast('Kopirano u clipboard', 'success');
+            }
+        },
+
+        async setupDomain() {
+            if (!this.newDomainInput) return;
+
+            // Validate domain format
+            const domain = this.newDomainInput.toLowerCase().trim();
+            const domainRegex = /^[a-z0-9]([a-z0-9-]*[a-z0-9])?(\.[a-z]{2,})+$/;
+            if (!domainRegex.test(domain)) {
+                showToast('Neispravan format domena', 'error');
+                return;
+            }
+
+            this.settingUpDomain = true;
+            try {
+                const response = await api('/tenant/public-profile/custom-domain', 'POST', {
+                    domain: domain
+                });
+                const data = await response.json();
+                if (!response.ok) {
+                    throw new Error(data.error || 'Greska pri dodavanju domena');
+                }
+
+                showToast('Domen dodat. Proverite DNS instrukcije.', 'success');
+                this.customDomain = {
+                    domain: data.domain,
+                    verified: false,
+                    verification_instructions: data.verification_instructions
+                };
+                this.newDomainInput = '';
+            } catch (e) {
+                showToast(e.message || 'Greska pri dodavanju domena', 'error');
+            } finally {
+                this.settingUpDomain = false;
+            }
+        },
+
+        async verifyDomain() {
+            this.verifyingDomain = true;
+            try {
+                const response = await api('/tenant/public-profile/custom-domain/verify', 'POST');
+                const data = await response.json();
+
+                if (data.verified) {
+                    showToast('Domen uspesno verifikovan!', 'success');
+                    this.customDomain.verified = true;
+                    this.publicPageUrls.custom_domain = data.url;
+                } else {
+                    const errors = data.errors?.join(', ') || 'DNS zapisi nisu ispravno podeseni';
+                    showToast(errors, 'error');
+                }
+            } catch (e) {
+                showToast('Greska pri verifikaciji domena', 'error');
+            } finally {
+                this.verifyingDomain = false;
+            }
+        },
+
+        async removeDomain() {
+            if (!confirm('Da li ste sigurni da zelite da uklonite custom domen?')) {
+                return;
+            }
+            try {
+                const response = await api('/tenant/public-profile/custom-domain', 'DELETE');
+                if (!response.ok) {
+                    const err = await response.json();
+                    throw new Error(err.error || 'Greska pri uklanjanju domena');
+                }
+                showToast('Domen uklonjen', 'success');
+                this.customDomain = { domain: null, verified: false, verification_instructions: null };
+                this.publicPageUrls.custom_domain = null;
+            } catch (e) {
+                showToast(e.message || 'Greska pri uklanjanju domena', 'error');
+            }
+        },
+
+    }
+}
+
+// Store reference to settings page Alpine instance
+var settingsPageInstance = null;
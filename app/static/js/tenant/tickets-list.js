@@ -0,0 +1,1347 @@
+// Category configuration per device type
+const CATEGORY_CONFIG = {
+    phone: {
+        label: 'Telefon',
+        identifierLabel: 'IMEI',
+        identifierPlaceholder: '356938035643809',
+        showColors: true,
+        showPartOffers: true,
+        brands: ['Apple', 'Samsung', 'Xiaomi', 'Huawei', 'OnePlus', 'Google', 'Motorola', 'LG', 'Sony', 'Nokia', 'Realme', 'Oppo', 'Vivo', 'Nothing'],
+    },
+    tablet: {
+        label: 'Tablet',
+        identifierLabel: 'IMEI / Serijski broj',
+        identifierPlaceholder: 'IMEI ili serijski broj',
+        showColors: true,
+        showPartOffers: true,
+        brands: ['Apple', 'Samsung', 'Huawei', 'Lenovo', 'Xiaomi', 'Amazon'],
+    },
+    laptop: {
+        label: 'Laptop',
+        identifierLabel: 'Serijski broj',
+        identifierPlaceholder: 'S/N sa nalepnice',
+        showColors: false,
+        showPartOffers: false,
+        brands: ['Lenovo', 'HP', 'Dell', 'Asus', 'Acer', 'Apple', 'MSI', 'Toshiba', 'Huawei'],
+    },
+    console: {
+        label: 'Konzola',
+        identifierLabel: 'Serijski broj',
+        identifierPlaceholder: 'Serijski broj konzole',
+        showColors: false,
+        showPartOffers: false,
+        brands: ['PlayStation', 'Xbox', 'Nintendo', 'Steam Deck'],
+    },
+    scooter: {
+        label: 'Trotinet',
+        identifierLabel: 'Serijski broj',
+        identifierPlaceholder: 'Serijski broj sa nalepnice',
+        showColors: false,
+        showPartOffers: false,
+        brands: ['Xiaomi', 'Segway-Ninebot', 'Kugoo', 'E-Twow', 'Razor', 'Vsett', 'Dualtron', 'Kaabo', 'Ring', 'Windgoo', 'Denver', 'MS Energy'],
+    },
+    other: {
+        label: 'Drugo',
+        identifierLabel: 'Serijski broj',
+        identifierPlaceholder: 'Serijski ili identifikacioni broj',
+        showColors: false,
+        showPartOffers: false,
+        brands: [],
+    },
+};
+
+// Problem categories by device type
+const PROBLEM_CATEGORIES = {
+    phone: [
+        { id: "dijagnostika", label: "Dijagnostika" },
+        { id: "zamena_ekrana", label: "Zamena ekrana" },
+        { id: "zamena_baterije", label: "Zamena baterije" },
+        { id: "zamena_punjenja", label: "Zamena punjenja" },
+        { id: "zamena_kamere", label: "Zamena kamere" },
+        { id: "zamena_zvucnika", label: "Zamena zvučnika" },
+        { id: "zamena_mikrofona", label: "Zamena mikrofona" },
+        { id: "zamena_poklopca", label: "Zamena poklopca" },
+        { id: "signal_wifi", label: "Signal/WiFi" },
+        { id: "softver", label: "Softver/OS" },
+        { id: "voda_tecnost", label: "Voda/tečnost" },
+        { id: "ostalo", label: "Ostalo" }
+    ],
+    tablet: [
+        { id: "dijagnostika", label: "Dijagnostika" },
+        { id: "zamena_ekrana", label: "Zamena ekrana" },
+        { id: "zamena_baterije", label: "Zamena baterije" },
+        { id: "zamena_punjenja", label: "Zamena punjenja" },
+        { id: "softver", label: "Softver/OS" },
+        { id: "ostalo", label: "Ostalo" }
+    ],
+    laptop: [
+        { id: "dijagnostika", label: "Dijagnostika" },
+        { id: "zamena_ekrana", label: "Zamena ekrana" },
+        { id: "zamena_baterije", label: "Zamena baterije" },
+        { id: "zamena_tastature", label: "Zamena tastature" },
+        { id: "zamena_punjaca", label: "Zamena punjača" },
+        { id: "zamena_hdd_ssd", label: "Zamena HDD/SSD" },
+        { id: "zamena_rama", label: "Zamena RAM-a" },
+        { id: "ciscenje_hladjenje", label: "Čišćenje/hlađenje" },
+        { id: "zamena_termalne_paste", label: "Zamena termalne paste" },
+        { id: "softver", label: "Reinstalacija OS" },
+        { id: "ostalo", label: "Ostalo" }
+    ],
+    console: [
+        { id: "dijagnostika", label: "Dijagnostika" },
+        { id: "hdmi_port", label: "HDMI port" },
+        { id: "blu_ray", label: "Blu-ray drive" },
+        { id: "hdd_zamena", label: "HDD zamena" },
+        { id: "ciscenje", label: "Čišćenje" },
+        { id: "napajanje", label: "Napajanje" },
+        { id: "kontroler", label: "Kontroler" },
+        { id: "zamena_termalne_paste", label: "Zamena termalne paste" },
+        { id: "ostalo", label: "Ostalo" }
+    ],
+    scooter: [
+        { id: "dijagnostika", label: "Dijagnostika" },
+        { id: "motor", label: "Motor" },
+        { id: "baterija", label: "Baterija" },
+        { id: "kontroler", label: "Kontroler" },
+        { id: "displej", label: "Displej/Dashboard" },
+        { id: "kocnice", label: "Kočnice" },
+        { id: "gume", label: "Gume" },
+        { id: "punjac", label: "Punjač" },
+        { id: "svetla", label: "Svetla" },
+        { id: "sajle_kablovi", label: "Sajle/Kablovi" },
+        { id: "preklopni_mehanizam", label: "Preklopni mehanizam" },
+        { id: "trap", label: "Trap/Postolje" },
+        { id: "blatobrani", label: "Blatobrani" },
+        { id: "voda_vlaga", label: "Voda/vlaga" },
+        { id: "ostalo", label: "Ostalo" }
+    ],
+    other: [
+        { id: "dijagnostika", label: "Dijagnostika" },
+        { id: "popravka", label: "Popravka" },
+        { id: "ostalo", label: "Ostalo" }
+    ]
+};
+
+function ticketsPage() {
+    return {
+        loading: true,
+        saving: false,
+        showAddModal: false,
+        validationErrors: {},
+        openTickets: [],
+        pendingTickets: [],
+        stats: {},
+        locations: [],
+        currentUserName: '',
+        canViewRevenue: false,
+        filters: {
+            search: '',
+            location_id: ''
+        },
+        // ========== COUNTRY SELECTOR ==========
+        exYuCountries: [
+            { code: '+381', dial: '381', flag: '🇷🇸', name: 'Srbija' },
+            { code: '+385', dial: '385', flag: '🇭🇷', name: 'Hrvatska' },
+            { code: '+387', dial: '387', flag: '🇧🇦', name: 'BiH' },
+            { code: '+382', dial: '382', flag: '🇲🇪', name: 'Crna Gora' },
+            { code: '+386', dial: '386', flag: '🇸🇮', name: 'Slovenija' },
+            { code: '+383', dial: '383', flag: '🇽🇰', name: 'Kosovo' },
+            { code: '+389', dial: '389', flag: '🇲🇰', name: 'S. Makedonija' },
+        ],
+        otherCountries: [
+            { code: '+43', dial: '43', flag: '🇦🇹', name: 'Austrija' },
+            { code: '+49', dial: '49', flag: '🇩🇪', name: 'Nemačka' },
+            { code: '+41', dial: '41', flag: '🇨🇭', name: 'Švajcarska' },
+            { code: '+39', dial: '39', flag: '🇮🇹', name: 'Italija' },
+            { code: '+33', dial: '33', flag: '🇫🇷', name: 'Francuska' },
+            { code: '+44', dial: '44', flag: '🇬🇧', name: 'UK' },
+        ],
+        selectedCountry: { code: '+381', dial: '381', flag: '🇷🇸', name: 'Srbija' },
+        phoneNumber: '',
+        // ======================================
+        newTicket: {
+            customer_name: '',
+            customer_phone: '',
+            customer_email: '',
+            customer_company_name: '',
+            customer_pib: '',
+            sms_opt_out: false,
+            device_type: 'phone',
+            brand: '',
+            model: '',
+            device_color: '',
+            imei: '',
+            device_condition_grade: '',
+            device_condition_notes: '',
+            device_not_working: false,
+            problem_description: '',
+            problem_areas: [],
+            estimated_price: '',
+            currency: 'RSD',
+            priority: 'NORMAL',
+            location_id: ''
+        },
+        selectedProblems: [],
+        currentProblems: PROBLEM_CATEGORIES['phone'] || [],
+        categoryConfig: CATEGORY_CONFIG['phone'],
+
+        // Part offers state
+        partOffers: {
+            loading: false, loaded: false, summary: [], brand: '', model: '',
+            expandedKey: null, offers: [], offersLoading: false,
+        },
+        selectedListing: null,
+        selectedOffer: null,
+        _partSearchTimer: null,
+        _lastPartSearchKey: '',
+
+        // Notification modal state
+        showNotifyModal: false,
+        notifyTicket: null,
+        notifyComment: '',
+        notificationHistory: [],
+
+        // Collect modal state
+        showCollectModal: false,
+        collectTicketData: null,
+        collectPrice: 0,
+        collectOriginalPrice: 0,
+        collectCurrency: 'RSD',
+        collectExchangeRate: 117,
+        collectOwner: '',
+        collectPaymentMethod: 'CASH',
+        collectCashReceived: 0,
+        collecting: false,
+        // Parts entry in collect modal
+        collectShowParts: false,
+        collectParts: [],
+        collectNewPart: {
+            name: '',
+            supplier: '',
+            price: 0,
+            currency: 'RSD',
+            priceRsd: 0
+        },
+        collectPartsExchangeRate: 117,
+
+        // Reject modal state
+        showRejectModal: false,
+        rejectTicket: null,
+        rejectComment: '',
+
+        // Finish modal state
+        showFinishModal: false,
+        finishTicket: null,
+        finishResolution: '',
+
+        // Detail modal state
+        showDetailModal: false,
+        detailTicket: null,
+
+        // Edit confirmation modal state
+        showEditConfirmModal: false,
+        editConfirmField: null,
+        editConfirmOldValue: null,
+        editConfirmNewValue: null,
+
+        // History state
+        showHistory: false,
+        loadingHistory: false,
+        ticketHistory: [],
+
+        // Inline edit state
+        editingField: null,
+        inlineEditValue: '',
+        savingInline: false,
+
+        async init() {
+            await this.loadCurrentUser();
+            await this.loadLocations();
+            await this.loadAllTickets();
+
+            // Check if we should open the add modal (from dashboard link)
+            const urlParams = new URLSearchParams(window.location.search);
+            if (urlParams.get('openModal') === 'true') {
+                this.showAddModal = true;
+                window.history.replaceState({}, '', window.location.pathname);
+            }
+
+            // Check if we should open a specific ticket (from orders page link)
+            const openTicketId = urlParams.get('openTicket');
+            if (openTicketId) {
+                window.history.replaceState({}, '', window.location.pathname);
+                try {
+                    const r = await api('/api/v1/tickets/' + openTicketId);
+                    if (r.ok) {
+                        const ticket = await r.json();
+                        this.viewTicket(ticket);
+                    }
+                } catch (e) {
+                    console.error('Failed to open ticket:', e);
+                }
+            }
+        },
+
+        async loadCurrentUser() {
+            try {
+                const r = await api('/api/v1/auth/me');
+                if (r.ok) {
+                    const data = await r.json();
+                    this.currentUserName = data.user?.full_name || data.user?.email || '';
+                    this.canViewRevenue = data.user?.can_view_revenue || false;
+                }
+            } catch (e) {
+                console.error('Failed to load user info:', e);
+            }
+        },
+
+        async loadLocations() {
+            try {
+                const r = await api('/api/v1/locations');
+                if (r.ok) {
+                    const data = await r.json();
+                    this.locations = data.locations || [];
+                    // Set default location to primary location
+                    const primary = this.locations.find(l => l.is_primary);
+                    if (primary) {
+                        this.newTicket.location_id = primary.id;
+                    } else if (this.locations.length > 0) {
+                        // Fallback to first location if no primary
+                        this.newTicket.location_id = this.locations[0].id;
+                    }
+                }
+            } catch (e) {
+                console.error('Failed to load locations:', e);
+            }
+        },
+
+        async loadAllTickets() {
+            this.loading = true;
+            try {
+                let url = '/api/v1/tickets?per_page=100';
+                if (this.filters.search) url += '&search=' + encodeURIComponent(this.filters.search);
+                if (this.filters.location_id) url += '&location_id=' + this.filters.location_id;
+
+                const r = await api(url);
+                if (r.ok) {
+                    const data = await r.json();
+                    const tickets = data.items || [];  // API returns 'items' not 'tickets'
+
+                    this.openTickets = tickets.filter(t => t.status === 'RECEIVED' || t.status === 'IN_PROGRESS' || t.status === 'DIAGNOSED');
+                    this.pendingTickets = tickets.filter(t => t.status === 'READY');
+
+                    // Calculate totals by currency for open tickets
+                    const openRSD = this.openTickets.filter(t => (t.currency || 'RSD') === 'RSD')
+                        .reduce((sum, t) => sum + (t.final_price || t.estimated_price || 0), 0);
+                    const openEUR = this.openTickets.filter(t => t.currency === 'EUR')
+                        .reduce((sum, t) => sum + (t.final_price || t.estimated_price || 0), 0);
+
+                    // Calculate totals by currency for ready/pending tickets
+                    const readyRSD = this.pendingTickets.filter(t => (t.currency || 'RSD') === 'RSD')
+                        .reduce((sum, t) => sum + (t.final_price || t.estimated_price || 0), 0);
+                    const readyEUR = this.pendingTickets.filter(t => t.currency === 'EUR')
+                        .reduce((sum, t) => sum + (t.final_price || t.estimated_price || 0), 0);
+
+                    this.stats = {
+                        open_tickets: this.openTickets.length,
+                        closed_tickets: tickets.filter(t => t.status === 'DELIVERED').length,
+                        ready_tickets: this.pendingTickets.length,
+                        active_warranties: data.active_warranties || 0,
+                        today_tickets: tickets.filter(t => {
+                            const today = new Date().toDateString();
+                            return new Date(t.created_at).toDateString() === today;
+                        }).length,
+                        open_rsd: openRSD,
+                        open_eur: openEUR,
+                        ready_rsd: readyRSD,
+                        ready_eur: readyEUR
+                    };
+                }
+            } catch (e) {
+                console.error('Failed to load tickets:', e);
+            } finally {
+                this.loading = false;
+            }
+        },
+
+        setFilter(filter) {
+            // Handle filter clicks
+            console.log('Filter:', filter);
+        },
+
+        async viewTicket(ticket) {
+            this.detailTicket = ticket;
+            this.showHistory = false;
+            this.ticketHistory = [];
+            this.editingField = null;
+            this.showDetailModal = true;
+            // Fetch full detail (includes part_orders)
+            try {
+                const r = await api('/api/v1/tickets/' + ticket.id);
+                if (r.ok) {
+                    const full = await r.json();
+                    this.detailTicket = full;
+                }
+            } catch (e) {}
+        },
+
+        startEdit(field) {
+            if (this.editingField === field) return;
+            if (this.savingInline) return;
+
+            this.editingField = field;
+            this.inlineEditValue = this.detailTicket?.[field] || '';
+
+            // Focus input after Alpine updates DOM
+            this.$nextTick(() => {
+                const input = this.$el.querySelector('.inline-input, .inline-textarea');
+                if (input) input.focus();
+            });
+        },
+
+        cancelEdit() {
+            this.editingField = null;
+            this.inlineEditValue = '';
+        },
+
+        async saveInlineEdit(field) {
+            if (!this.detailTicket || this.savingInline) return;
+
+            // For price field, use final_price || estimated_price as old value
+            let oldValue = this.detailTicket[field];
+            if (field === 'final_price' && !oldValue) {
+                oldValue = this.detailTicket.estimated_price;
+            }
+            const newValue = this.inlineEditValue;
+
+            // If value hasn't changed, just cancel
+            if (oldValue == newValue || (!oldValue && !newValue)) {
+                this.cancelEdit();
+                return;
+            }
+
+            // Show confirmation modal
+            this.editConfirmField = field;
+            this.editConfirmOldValue = oldValue;
+            this.editConfirmNewValue = newValue;
+            this.showEditConfirmModal = true;
+        },
+
+        formatEditValue(field, value) {
+            if (value === null || value === undefined || value === '') return '-';
+
+            // Format price fields
+            if (field === 'final_price' || field === 'estimated_price') {
+                return this.formatPrice(value) + ' ' + (this.detailTicket?.currency || 'RSD');
+            }
+
+            return String(value);
+        },
+
+        cancelEditConfirm() {
+            this.showEditConfirmModal = false;
+            this.editConfirmField = null;
+            this.editConfirmOldValue = null;
+            this.editConfirmNewValue = null;
+            this.cancelEdit();
+        },
+
+        async confirmEditSave() {
+            if (!this.detailTicket || this.savingInline) return;
+
+            const field = this.editConfirmField;
+            const newValue = this.editConfirmNewValue;
+
+            this.showEditConfirmModal = false;
+            this.savingInline = true;
+            try {
+                const r = await api('/api/v1/tickets/' + this.detailTicket.id, {
+                    method: 'PUT',
+                    body: JSON.stringify({ [field]: newValue })
+                });
+
+                if (r.ok) {
+                    // Update local ticket data
+                    this.detailTicket[field] = newValue;
+
+                    // Also update in the tickets lists
+                    const updateInList = (list) => {
+                        const idx = list.findIndex(t => t.id === this.detailTicket.id);
+                        if (idx !== -1) list[idx][field] = newValue;
+                    };
+                    updateInList(this.openTickets);
+                    updateInList(this.pendingTickets);
+
+                    showToast('Sačuvano', 'success');
+                } else {
+                    const err = await r.json();
+                    showToast(err.message || 'Greška pri čuvanju', 'error');
+                }
+            } catch (e) {
+                console.error('Failed to save:', e);
+                showToast('Greška pri čuvanju', 'error');
+            } finally {
+                this.savingInline = false;
+                this.editingField = null;
+                this.inlineEditValue = '';
+            }
+        },
+
+        async toggleHistory(ticketId) {
+            if (this.showHistory) {
+                this.showHistory = false;
+                return;
+            }
+
+            this.loadingHistory = true;
+            try {
+                const r = await api('/api/v1/tickets/' + ticketId + '/history');
+                if (r.ok) {
+                    const data = await r.json();
+                    this.ticketHistory = data.items || [];
+                }
+            } catch (e) {
+                console.error('Failed to load history:', e);
+            } finally {
+                this.loadingHistory = false;
+                this.showHistory = true;
+            }
+        },
+
+        getFieldLabel(field) {
+            const labels = {
+                'customer_name': 'Ime',
+                'customer_phone': 'Telefon',
+                'customer_email': 'Email',
+                'brand': 'Marka',
+                'model': 'Model',
+                'imei': 'IMEI',
+                'device_type': 'Tip uređaja',
+                'device_condition_grade': 'Ocena stanja',
+                'device_condition_notes': 'Napomena o stanju',
+                'device_not_working': 'Ne radi',
+                'problem_description': 'Opis problema',
+                'ticket_notes': 'Napomene',
+                'estimated_price': 'Procenjena cena',
+                'final_price': 'Konačna cena',
+                'currency': 'Valuta',
+                'warranty_days': 'Garancija',
+                'status': 'Status',
+                'priority': 'Prioritet'
+            };
+            return labels[field] || field;
+        },
+
+        getGradeLabel(grade) {
+            const labels = {
+                'A': 'A - Odlično',
+                'B': 'B - Dobro',
+                'C': 'C - Loše'
+            };
+            return labels[grade] || grade || '-';
+        },
+
+        getStatusClass(status) {
+            const classes = {
+                'RECEIVED': 'received',
+                'DIAGNOSED': 'in_progress',
+                'IN_PROGRESS': 'in_progress',
+                'WAITING_PARTS': 'in_progress',
+                'READY': 'ready',
+                'DELIVERED': 'delivered',
+                'REJECTED': 'rejected',
+                'CANCELLED': 'rejected'
+            };
+            return classes[status] || 'received';
+        },
+
+        getStatusLabel(status) {
+            const labels = {
+                'RECEIVED': 'Primljeno',
+                'DIAGNOSED': 'Dijagnostifikovano',
+                'IN_PROGRESS': 'U obradi',
+                'WAITING_PARTS': 'Čeka delove',
+                'READY': 'Spremno',
+                'DELIVERED': 'Preuzeto',
+                'REJECTED': 'Odbijeno',
+                'CANCELLED': 'Otkazano'
+            };
+            return labels[status] || status || '-';
+        },
+
+        formatPriceDisplay(price, currency) {
+            if (!price) return '-';
+            return parseFloat(price).toLocaleString('sr-RS') + ' ' + (currency || 'RSD');
+        },
+
+        formatDateTime(dateStr) {
+            if (!dateStr) return '-';
+            const d = new Date(dateStr);
+            return d.toLocaleDateString('sr-RS') + ' ' + d.toLocaleTimeString('sr-RS', {hour: '2-digit', minute: '2-digit'});
+        },
+
+        getWarrantyRemaining(ticket) {
+            if (!ticket?.closed_at || !ticket?.warranty_days) return '-';
+            const closedDate = new Date(ticket.closed_at);
+            const expiryDate = new Date(closedDate);
+            expiryDate.setDate(expiryDate.getDate() + ticket.warranty_days);
+            const now = new Date();
+            const daysRemaining = Math.ceil((expiryDate - now) / (1000 * 60 * 60 * 24));
+            if (daysRemaining <= 0) return 'Istekla';
+            return daysRemaining + ' dana';
+        },
+
+        getOrderStatusLabel(s) {
+            const m = { 'SENT': 'Poslato', 'OFFERED': 'Ponudjeno', 'CONFIRMED': 'Potvrdjena', 'SHIPPED': 'Na putu', 'COMPLETED': 'Zavrsena', 'CANCELLED': 'Otkazana', 'REJECTED': 'Odbijena' };
+            return m[s] || s;
+        },
+
+        getOrderStatusClass(s) {
+            const m = { 'SENT': 'os-sent', 'OFFERED': 'os-offered', 'CONFIRMED': 'os-confirmed', 'SHIPPED': 'os-shipped', 'COMPLETED': 'os-completed', 'CANCELLED': 'os-cancelled', 'REJECTED': 'os-cancelled' };
+            return m[s] || '';
+        },
+
+        // =============================================
+        // FINISH MODAL SYSTEM
+        // =============================================
+        openFinishModal(ticket) {
+            this.finishTicket = ticket;
+            this.finishResolution = ticket.resolution || '';
+            this.showFinishModal = true;
+        },
+
+        async confirmFinish() {
+            if (!this.finishTicket) return;
+
+            try {
+                // First update resolution if provided
+                if (this.finishResolution.trim()) {
+                    await api('/api/v1/tickets/' + this.finishTicket.id, {
+                        method: 'PATCH',
+                        body: JSON.stringify({ resolution: this.finishResolution.trim() })
+                    });
+                }
+
+                // Then change status to READY
+                const r = await api('/api/v1/tickets/' + this.finishTicket.id + '/status', {
+                    method: 'PATCH',
+                    body: JSON.stringify({ status: 'READY' })
+                });
+                if (r.ok) {
+                    this.showFinishModal = false;
+                    await this.loadAllTickets();
+                } else {
+                    const err = await r.json();
+                    alert(err.message || 'Greška pri završavanju naloga');
+                }
+            } catch (e) {
+                console.error('Failed to finish ticket:', e);
+                alert('Greška pri završavanju naloga');
+            }
+        },
+
+        // =============================================
+        // COLLECT MODAL SYSTEM (POS Integrated)
+        // =============================================
+        collectTicket(ticket) {
+            // Initialize collect data from ticket
+            const price = ticket.final_price || ticket.estimated_price || 0;
+            const currency = ticket.currency || 'RSD';
+
+            this.collectTicketData = ticket;
+            this.collectOriginalPrice = price;
+            this.collectCurrency = currency;
+            this.collectExchangeRate = 117; // Default EUR→RSD
+            this.collectOwner = ticket.customer_name || '';
+            this.collectPaymentMethod = 'CASH';
+            this.collectCashReceived = 0;
+
+            // Reset parts entry
+            this.collectShowParts = false;
+            this.collectParts = [];
+            this.collectNewPart = { name: '', supplier: '', price: 0, currency: 'RSD', priceRsd: 0 };
+            this.collectPartsExchangeRate = 117;
+
+            // If currency is not RSD, convert to RSD
+            if (currency !== 'RSD') {
+                this.collectPrice = Math.round(price * this.collectExchangeRate);
+            } else {
+                this.collectPrice = price;
+            }
+
+            this.showCollectModal = true;
+        },
+
+        // Parts helper methods
+        get collectTotalPartsCost() {
+            const existingCost = this.collectTicketData?.parts_cost || 0;
+            const newCost = this.collectParts.reduce((sum, p) => sum + (p.priceRsd || 0), 0);
+            return existingCost + newCost;
+        },
+
+        get collectProfit() {
+            return this.collectPrice - this.collectTotalPartsCost;
+        },
+
+        addCollectPart() {
+            if (!this.collectNewPart.name || this.collectNewPart.price <= 0) return;
+
+            // Calculate RSD price if in EUR
+            const priceRsd = this.collectNewPart.currency === 'EUR'
+                ? Math.round(this.collectNewPart.price * this.collectPartsExchangeRate)
+                : this.collectNewPart.price;
+
+            this.collectParts.push({
+                name: this.collectNewPart.name,
+                supplier: this.collectNewPart.supplier,
+                price: this.collectNewPart.price,
+                currency: this.collectNewPart.currency,
+                priceRsd: priceRsd
+            });
+
+            // Reset form
+            this.collectNewPart = { name: '', supplier: '', price: 0, currency: 'RSD', priceRsd: 0 };
+        },
+
+        async confirmCollect() {
+            if (!this.collectTicketData) return;
+            if (!this.collectPaymentMethod) {
+                showToast('Izaberite način plaćanja', 'error');
+                return;
+            }
+            if (this.collectPrice <= 0) {
+                showToast('Unesite cenu', 'error');
+                return;
+            }
+
+            this.collecting = true;
+            try {
+                const payload = {
+                    final_price: parseFloat(this.collectPrice),
+                    currency: 'RSD',  // Always RSD - price in modal is already converted
+                    owner_collect: this.collectOwner || this.collectTicketData.customer_name,
+                    payment_method: this.collectPaymentMethod
+                };
+
+                // Add cash_received only for cash payments
+                if (this.collectPaymentMethod === 'CASH' && this.collectCashReceived > 0) {
+                    payload.cash_received = parseFloat(this.collectCashReceived);
+                }
+
+                // Add parts/costs if any were entered
+                if (this.collectParts.length > 0) {
+                    payload.parts = this.collectParts.map(p => ({
+                        name: p.name,
+                        supplier: p.supplier,
+                        purchase_price: p.priceRsd,  // Always in RSD
+                        original_price: p.price,
+                        original_currency: p.currency
+                    }));
+                }
+
+                const r = await api('/api/v1/tickets/' + this.collectTicketData.id + '/collect', {
+                    method: 'POST',
+                    body: JSON.stringify(payload)
+                });
+
+                if (r.ok) {
+                    const data = await r.json();
+                    this.showCollectModal = false;
+
+                    // Show success message with receipt number if available
+                    if (data.receipt?.receipt_number) {
+                        showToast(`Naplaćeno! Račun #${data.receipt.receipt_number}`, 'success');
+                    } else {
+                        showToast('Uređaj uspešno preuzet i naplaćen', 'success');
+                    }
+
+                    await this.loadAllTickets();
+                } else {
+                    const err = await r.json();
+                    showToast(err.message || err.error || 'Greška pri naplati', 'error');
+                }
+            } catch (e) {
+                console.error('Failed to collect ticket:', e);
+                showToast('Greška pri naplati: ' + e.message, 'error');
+            } finally {
+                this.collecting = false;
+            }
+        },
+
+        // =============================================
+        // NOTIFICATION SYSTEM
+        // =============================================
+        async openNotifyModal(ticket) {
+            this.notifyTicket = ticket;
+            this.notifyComment = '';
+            this.notificationHistory = [];
+
+            // Load notification history
+            try {
+                const r = await api('/api/v1/tickets/' + ticket.id + '/notifications');
+                if (r.ok) {
+                    const data = await r.json();
+                    this.notificationHistory = data.notifications || [];
+                }
+            } catch (e) {
+                console.error('Failed to load notifications:', e);
+            }
+
+            this.showNotifyModal = true;
+        },
+
+        async confirmNotify() {
+            if (!this.notifyTicket) return;
+
+            try {
+                const r = await api('/api/v1/tickets/' + this.notifyTicket.id + '/notify', {
+                    method: 'POST',
+                    body: JSON.stringify({ comment: this.notifyComment })
+                });
+                if (r.ok) {
+                    this.showNotifyModal = false;
+                    await this.loadAllTickets();
+                } else {
+                    const err = await r.json();
+                    alert(err.message || 'Greška pri slanju obaveštenja');
+                }
+            } catch (e) {
+                console.error('Failed to send notification:', e);
+                alert('Greška pri slanju obaveštenja');
+            }
+        },
+
+        async writeOffTicket() {
+            if (!this.notifyTicket) return;
+            if (!confirm('Da li ste sigurni da želite da otpišete ovaj nalog? Ova akcija se ne može poništiti.')) return;
+
+            try {
+                const r = await api('/api/v1/tickets/' + this.notifyTicket.id + '/write-off', {
+                    method: 'POST'
+                });
+                if (r.ok) {
+                    this.showNotifyModal = false;
+                    await this.loadAllTickets();
+                } else {
+                    const err = await r.json();
+                    alert(err.message || 'Greška pri otpisu naloga');
+                }
+            } catch (e) {
+                console.error('Failed to write off ticket:', e);
+                alert('Greška pri otpisu naloga');
+            }
+        },
+
+        // =============================================
+        // REJECT SYSTEM
+        // =============================================
+        openRejectModal(ticket) {
+            this.rejectTicket = ticket;
+            this.rejectComment = '';
+            this.showRejectModal = true;
+        },
+
+        async confirmReject() {
+            if (!this.rejectTicket || !this.rejectComment.trim()) return;
+
+            try {
+                const r = await api('/api/v1/tickets/' + this.rejectTicket.id + '/status', {
+                    method: 'PATCH',
+                    body: JSON.stringify({
+                        status: 'REJECTED',
+                        rejection_reason: this.rejectComment.trim()
+                    })
+                });
+                if (r.ok) {
+                    this.showRejectModal = false;
+                    await this.loadAllTickets();
+                } else {
+                    const err = await r.json();
+                    alert(err.message || 'Greška pri odbijanju naloga');
+                }
+            } catch (e) {
+                console.error('Failed to reject ticket:', e);
+                alert('Greška pri odbijanju naloga');
+            }
+        },
+
+        printTicket(ticket) {
+            window.open('/tickets/' + ticket.id + '/print', '_blank');
+        },
+
+        async saveTicket() {
+            // Clear previous validation errors
+            this.validationErrors = {};
+
+            // Validate required fields
+            const errors = [];
+
+            if (!this.newTicket.customer_name?.trim()) {
+                errors.push('Ime i prezime');
+                this.validationErrors.customer_name = true;
+            }
+            if (!this.phoneNumber?.trim()) {
+                errors.push('Telefon');
+                this.validationErrors.customer_phone = true;
+            }
+            if (!this.newTicket.brand?.trim()) {
+                errors.push('Marka');
+                this.validationErrors.brand = true;
+            }
+            if (!this.newTicket.model?.trim()) {
+                errors.push('Model');
+                this.validationErrors.model = true;
+            }
+
+            const hasProblem = this.newTicket.problem_description?.trim() || this.selectedProblems.length > 0;
+            if (!hasProblem) {
+                errors.push('Opis problema');
+                this.validationErrors.problem_description = true;
+            }
+
+            if (!this.newTicket.estimated_price || parseFloat(this.newTicket.estimated_price) <= 0) {
+                errors.push('Okvirna cena');
+                this.validationErrors.estimated_price = true;
+            }
+
+            if (!this.newTicket.location_id) {
+                errors.push('Lokacija');
+                this.validationErrors.location_id = true;
+            }
+
+            if (errors.length > 0) {
+                alert('Popunite obavezna polja: ' + errors.join(', '));
+                return;
+            }
+
+            this.saving = true;
+            try {
+                // Set formatted phone before sending
+                this.newTicket.customer_phone = this.getPhoneForStorage();
+
+                const r = await api('/api/v1/tickets', {
+                    method: 'POST',
+                    body: JSON.stringify(this.newTicket)
+                });
+                if (r.ok) {
+                    const ticketData = await r.json();
+                    // Auto-narucivanje dela ako je izabran
+                    if (this.selectedListing && ticketData.id) {
+                        try {
+                            await api('/api/v1/part-offers/order', {
+                                method: 'POST',
+                                body: JSON.stringify({
+                                    listing_id: this.selectedListing,
+                                    quantity: 1,
+                                    service_ticket_id: ticketData.id
+                                })
+                            });
+                        } catch (e) {
+                            console.error('Auto-order failed:', e);
+                        }
+                    }
+                    this.showAddModal = false;
+                    this.resetNewTicket();
+                    await this.loadAllTickets();
+                } else {
+                    const err = await r.json();
+                    alert(err.message || 'Greška pri čuvanju');
+                }
+            } catch (e) {
+                console.error(e);
+                alert('Greška pri čuvanju');
+            } finally {
+                this.saving = false;
+            }
+        },
+
+        resetNewTicket() {
+            this.newTicket = {
+                customer_name: '',
+                customer_phone: '',
+                customer_email: '',
+                customer_company_name: '',
+                customer_pib: '',
+                sms_opt_out: false,
+                device_type: 'phone',
+                brand: '',
+                model: '',
+                imei: '',
+                device_condition_grade: '',
+                device_condition_notes: '',
+                device_not_working: false,
+                problem_description: '',
+                problem_areas: [],
+                estimated_price: '',
+                currency: 'RSD',
+                priority: 'NORMAL',
+                location_id: ''
+            };
+            this.selectedProblems = [];
+            this.currentProblems = PROBLEM_CATEGORIES['phone'] || [];
+            this.categoryConfig = CATEGORY_CONFIG['phone'];
+            this.validationErrors = {};
+            // Reset phone
+            this.phoneNumber = '';
+            this.selectedCountry = { code: '+381', dial: '381', flag: '🇷🇸', name: 'Srbija' };
+            // Reset part offers
+            this.partOffers = { loading: false, loaded: false, summary: [], brand: '', model: '', expandedKey: null, offers: [], offersLoading: false };
+            this.selectedListing = null;
+            this.selectedOffer = null;
+            this._lastPartSearchKey = '';
+        },
+
+        // ========== PART OFFERS METHODS ==========
+        _categoryKeywords: [
+            ['display', ['ekran', 'display', 'lcd', 'oled', 'staklo', 'touchscreen', 'touch screen', 'crn ekran', 'razbijen']],
+            ['battery', ['baterija', 'battery', 'ne puni', 'brzo trosi', 'gasi se']],
+            ['charging_port', ['konektor', 'punjac', 'charging', 'port za punjenje', 'usb-c', 'usb c', 'ne puni se']],
+            ['camera', ['kamera', 'camera', 'foto', 'slika', 'ne slika']],
+            ['back_cover', ['maska', 'poklopac', 'zadnja maska', 'back cover', 'zadnji poklopac']],
+            ['speaker', ['zvucnik', 'speaker', 'mikrofon', 'zvuk', 'ne cuje se']],
+        ],
+        _catLabels: {
+            'display': 'Ekran / Display', 'battery': 'Baterija', 'charging_port': 'Port za punjenje',
+            'charging': 'Port za punjenje', 'camera': 'Kamera', 'back_cover': 'Zadnja maska',
+            'frame': 'Okvir', 'speaker': 'Zvucnik', 'motherboard': 'Maticna ploca', 'other': 'Ostalo',
+        },
+        _gradeLabels: {
+            'service_pack': 'Service Pack', 'original': 'Original', 'oled_hard': 'OLED Hard',
+            'oled_soft': 'OLED Soft', 'oem': 'OEM', 'tft_incell': 'TFT InCell', 'aaa': 'AAA', 'copy': 'Kopija',
+        },
+
+        detectPartCategories(desc) {
+            if (!desc) return [];
+            const lower = desc.toLowerCase();
+            const found = [];
+            for (const [cat, keywords] of this._categoryKeywords) {
+                for (const kw of keywords) {
+                    if (lower.includes(kw)) { found.push(cat); break; }
+                }
+            }
+            return found;
+        },
+
+        getCatLabel(cat) { return this._catLabels[cat] || (cat ? cat.charAt(0).toUpperCase() + cat.slice(1) : ''); },
+        getGrLabel(grade) { return (grade && this._gradeLabels[grade.toLowerCase()]) || grade || ''; },
+
+        formatPriceRange(g) {
+            if (g.min_eur != null && g.max_eur != null) {
+                const mn = Math.round(g.min_eur);
+                const mx = Math.round(g.max_eur);
+                return mn === mx ? (mn + ' EUR') : (mn + ' - ' + mx + ' EUR');
+            }
+            if (g.min_rsd != null && g.max_rsd != null) {
+                const mn = Math.round(g.min_rsd);
+                const mx = Math.round(g.max_rsd);
+                return mn === mx ? (mn + ' RSD') : (mn + ' - ' + mx + ' RSD');
+            }
+            return 'N/A';
+        },
+
+        // Device color options per brand (from LCD ponuda analysis)
+        _brandColors: {
+            'Apple':    [{name:'Black',hex:'#1f2937'},{name:'White',hex:'#f9fafb'}],
+            'Samsung':  [{name:'Black',hex:'#1f2937'},{name:'White',hex:'#f9fafb'},{name:'Green',hex:'#22c55e'},{name:'Blue',hex:'#3b82f6'},{name:'Violet',hex:'#8b5cf6'},{name:'Gray',hex:'#6b7280'},{name:'Pink',hex:'#ec4899'},{name:'Yellow',hex:'#eab308'},{name:'Silver',hex:'#9ca3af'},{name:'Cream',hex:'#fef3c7'},{name:'Lavander',hex:'#c4b5fd'},{name:'Gold',hex:'#d4a017'},{name:'Graphite',hex:'#4b5563'}],
+            'Xiaomi':   [{name:'Black',hex:'#1f2937'},{name:'Blue',hex:'#3b82f6'},{name:'Green',hex:'#22c55e'},{name:'Purple',hex:'#a855f7'},{name:'White',hex:'#f9fafb'},{name:'Silver',hex:'#9ca3af'},{name:'Gold',hex:'#d4a017'},{name:'Gray',hex:'#6b7280'}],
+            'Huawei':   [{name:'Black',hex:'#1f2937'},{name:'Blue',hex:'#3b82f6'},{name:'Green',hex:'#22c55e'},{name:'White',hex:'#f9fafb'},{name:'Silver',hex:'#9ca3af'},{name:'Gold',hex:'#d4a017'},{name:'Purple',hex:'#a855f7'}],
+            'Google':   [{name:'Black',hex:'#1f2937'},{name:'White',hex:'#f9fafb'},{name:'Green',hex:'#22c55e'},{name:'Blue',hex:'#3b82f6'}],
+            'OnePlus':  [{name:'Black',hex:'#1f2937'},{name:'Green',hex:'#22c55e'},{name:'Silver',hex:'#9ca3af'}],
+            'Motorola': [{name:'Black',hex:'#1f2937'},{name:'Blue',hex:'#3b82f6'}],
+            'Realme':   [{name:'Black',hex:'#1f2937'},{name:'Blue',hex:'#3b82f6'},{name:'Gray',hex:'#6b7280'}],
+            'Oppo':     [{name:'Black',hex:'#1f2937'},{name:'Blue',hex:'#3b82f6'}],
+            'Sony':     [{name:'Black',hex:'#1f2937'},{name:'White',hex:'#f9fafb'},{name:'Blue',hex:'#3b82f6'}],
+            'Nokia':    [{name:'Black',hex:'#1f2937'},{name:'Blue',hex:'#3b82f6'},{name:'Green',hex:'#22c55e'}],
+        },
+
+        getDeviceColors() {
+            const brand = this.newTicket.brand?.trim();
+            if (!brand) return [];
+            // Check exact match first, then case-insensitive
+            if (this._brandColors[brand]) return this._brandColors[brand];
+            const lower = brand.toLowerCase();
+            for (const [k, v] of Object.entries(this._brandColors)) {
+                if (k.toLowerCase() === lower) return v;
+            }
+            // Fallback: basic colors for unknown brands
+            return [{name:'Black',hex:'#1f2937'},{name:'White',hex:'#f9fafb'},{name:'Blue',hex:'#3b82f6'},{name:'Gray',hex:'#6b7280'}];
+        },
+
+        getColorHex(color) {
+            if (!color) return '#9ca3af';
+            const map = {
+                'BLACK': '#1f2937', 'WHITE': '#f9fafb', 'BLUE': '#3b82f6', 'GREEN': '#22c55e',
+                'RED': '#ef4444', 'PINK': '#ec4899', 'PURPLE': '#a855f7', 'VIOLET': '#8b5cf6',
+                'GOLD': '#d4a017', 'SILVER': '#9ca3af', 'GRAY': '#6b7280', 'GREY': '#6b7280',
+                'YELLOW': '#eab308', 'ORANGE': '#f97316', 'CREAM': '#fef3c7', 'LAVANDER': '#c4b5fd',
+                'BRONZE': '#cd7f32', 'NAVY': '#1e3a5f', 'MINT': '#34d399', 'LILAC': '#c084fc',
+                'GRAPHITE': '#4b5563', 'PEACH': '#fdba74', 'LIME': '#84cc16', 'BURGUNDY': '#881337',
+            };
+            const upper = color.toUpperCase();
+            if (map[upper]) return map[upper];
+            for (const [k, v] of Object.entries(map)) {
+                if (upper.includes(k)) return v;
+            }
+            return '#9ca3af';
+        },
+
+        getOfferVariant(offer) {
+            // Extract variant from part_name parentheses, e.g. "Display Apple iPhone 11 (JK Soft OLED)" → "JK Soft OLED"
+            if (offer.part_name) {
+                const m = offer.part_name.match(/\(([^)]+)\)\s*$/);
+                if (m) return m[1];
+            }
+            // Fallback to description field (raw quality text like "JK soft oled")
+            if (offer.description) return offer.description;
+            return null;
+        },
+
+        debouncedPartSearch() {
+            clearTimeout(this._partSearchTimer);
+            const brand = this.newTicket.brand?.trim();
+            const model = this.newTicket.model?.trim();
+            const categories = this.detectPartCategories(this.newTicket.problem_description);
+            const color = (this.newTicket.device_color || '').trim();
+
+            const hasEnoughInfo = brand && brand.length >= 2 && model && model.length >= 1 && categories.length > 0;
+
+            if (hasEnoughInfo) {
+                const searchKey = brand + '|' + (model || '') + '|' + categories.join(',') + '|' + color;
+                if (searchKey === this._lastPartSearchKey) return;
+                this._partSearchTimer = setTimeout(() => this.checkPartOffers(), 800);
+            } else {
+                this.partOffers.loaded = false;
+                this.partOffers.summary = [];
+                this.partOffers.expandedKey = null;
+                this.partOffers.offers = [];
+                this.selectedListing = null;
+                this.selectedOffer = null;
+                this._lastPartSearchKey = null;
+            }
+        },
+
+        async checkPartOffers() {
+            const brand = this.newTicket.brand?.trim();
+            const model = this.newTicket.model?.trim();
+            const categories = this.detectPartCategories(this.newTicket.problem_description);
+            const color = (this.newTicket.device_color || '').trim();
+            if (!brand || categories.length === 0) return;
+
+            const catStr = categories.join(',');
+            this._lastPartSearchKey = brand + '|' + (model || '') + '|' + catStr + '|' + color;
+            this.partOffers.loading = true;
+            this.partOffers.loaded = false;
+            this.partOffers.expandedKey = null;
+            this.partOffers.offers = [];
+            this.selectedListing = null;
+            this.selectedOffer = null;
+
+            try {
+                let url = '/api/v1/part-offers/search?brand=' + encodeURIComponent(brand);
+                if (model) url += '&model=' + encodeURIComponent(model);
+                url += '&category=' + encodeURIComponent(catStr);
+                if (color) url += '&color=' + encodeURIComponent(color);
+                console.log('[PartOffers] Searching:', url);
+                const resp = await api(url);
+                if (resp.ok) {
+                    const data = await resp.json();
+                    console.log('[PartOffers] Results:', data);
+                    this.partOffers.summary = data.categories || [];
+                    this.partOffers.brand = data.brand || brand;
+                    this.partOffers.model = data.model || model || '';
+                    this.partOffers.loaded = true;
+                }
+            } catch (e) {
+                console.error('Part offers search failed:', e);
+            } finally {
+                this.partOffers.loading = false;
+            }
+        },
+
+        async loadPartOffers(category, quality) {
+            const key = category + '_' + quality;
+            if (this.partOffers.expandedKey === key) {
+                this.partOffers.expandedKey = null;
+                this.partOffers.offers = [];
+                return;
+            }
+            this.partOffers.expandedKey = key;
+            this.partOffers.offersLoading = true;
+            this.partOffers.offers = [];
+            try {
+                const brand = this.newTicket.brand?.trim();
+                const model = this.newTicket.model?.trim();
+                let url = '/api/v1/part-offers/search/offers?brand=' + encodeURIComponent(brand) +
+                    '&category=' + encodeURIComponent(category) +
+                    '&quality=' + encodeURIComponent(quality);
+                if (model) url += '&model=' + encodeURIComponent(model);
+                const deviceColor = (this.newTicket.device_color || '').trim();
+                if (deviceColor) url += '&color=' + encodeURIComponent(deviceColor);
+                const resp = await api(url);
+                if (resp.ok) {
+                    const data = await resp.json();
+                    this.partOffers.offers = data.offers || [];
+                }
+            } catch (e) {
+                console.error('Part offers load failed:', e);
+            } finally {
+                this.partOffers.offersLoading = false;
+            }
+        },
+
+        refreshPartOffersForColor() {
+            // Kad se promeni boja, refreshuj summary i expandovane ponude
+            this._lastPartSearchKey = null;  // Force refetch
+            this.debouncedPartSearch();
+        },
+
+        selectPartOffer(offer) {
+            if (this.selectedListing === offer.listing_id) {
+                this.selectedListing = null;
+                this.selectedOffer = null;
+            } else {
+                this.selectedListing = offer.listing_id;
+                this.selectedOffer = offer;
+            }
+        },
+        // =========================================
+
+        // ========== PHONE HELPERS ==========
+        selectCountry(country) {
+            this.selectedCountry = country;
+        },
+
+        formatPhoneInput() {
+            // Dozvoli samo cifre
+            this.phoneNumber = this.phoneNumber.replace(/[^\d]/g, '');
+        },
+
+        get displayPhoneFormat() {
+            // Format za prikaz/čuvanje: 0641234567 (sa vodećom nulom za Srbiju)
+            if (!this.phoneNumber) return '0XX...';
+            const digits = this.phoneNumber.replace(/\D/g, '');
+            // Ukloni vodecu nulu ako je korisnik uneo
+            const cleanDigits = digits.startsWith('0') ? digits.slice(1) : digits;
+            // Za srpske brojeve, dodaj vodecu nulu
+            if (this.selectedCountry.dial === '381') {
+                return '0' + cleanDigits;
+            }
+            // Za ostale zemlje, prikazi sa country kodom
+            return this.selectedCountry.code + cleanDigits;
+        },
+
+        getPhoneForStorage() {
+            // Telefon za čuvanje u bazi - SA vodećom nulom za srpske brojeve
+            const digits = this.phoneNumber.replace(/\D/g, '');
+            const cleanDigits = digits.startsWith('0') ? digits.slice(1) : digits;
+            if (this.selectedCountry.dial === '381') {
+                return '0' + cleanDigits;  // 0641234567
+            }
+            // Za ostale zemlje, čuvaj pun međunarodni format
+            return '+' + this.selectedCountry.dial + cleanDigits;
+        },
+        // ===================================
+
+        setDeviceType(type) {
+            this.newTicket.device_type = type;
+            this.categoryConfig = CATEGORY_CONFIG[type] || CATEGORY_CONFIG['other'];
+            this.currentProblems = PROBLEM_CATEGORIES[type] || [];
+            this.selectedProblems = [];
+            this.newTicket.problem_areas = [];
+            if (!this.categoryConfig.showColors) {
+                this.newTicket.device_color = '';
+            }
+            // Don't clear problem_description, user might have typed custom text
+        },
+
+        toggleProblem(id) {
+            const idx = this.selectedProblems.indexOf(id);
+            if (idx > -1) {
+                this.selectedProblems.splice(idx, 1);
+            } else {
+                this.selectedProblems.push(id);
+            }
+            this.updateProblemDescription();
+        },
+
+        updateProblemDescription() {
+            const labels = this.selectedProblems.map(id => {
+                const prob = this.currentProblems.find(p => p.id === id);
+                return prob ? prob.label : '';
+            }).filter(Boolean);
+            this.newTicket.problem_description = labels.join(', ');
+            this.newTicket.problem_areas = [...this.selectedProblems];
+            this.debouncedPartSearch();
+        },
+
+        syncSelectedProblems() {
+            // Bidirectional sync: select chips matching text, deselect chips not in text
+            const desc = (this.newTicket.problem_description || '').toLowerCase();
+
+            // Build new selection based on what's in the description
+            const newSelection = [];
+            for (const prob of this.currentProblems) {
+                if (desc.includes(prob.label.toLowerCase())) {
+                    newSelection.push(prob.id);
+                }
+            }
+
+            this.selectedProblems = newSelection;
+            this.newTicket.problem_areas = [...this.selectedProblems];
+        },
+
+        getDaysOpen(ticket) {
+            if (!ticket.created_at) return 0;
+            const created = new Date(ticket.created_at);
+            const now = new Date();
+            return Math.floor((now - created) / (1000 * 60 * 60 * 24));
+        },
+
+        getDurationClass(ticket) {
+            const days = this.getDaysOpen(ticket);
+            if (days <= 10) return 'green';
+            if (days <= 18) return 'yellow';
+            return 'red';
+        },
+
+        getDurationPercent(ticket) {
+            const days = this.getDaysOpen(ticket);
+            // Min 10% to always show animated bar (like Dolce Vita)
+            return Math.max(10, Math.min(100, (days / 30) * 100));
+        },
+
+        // Pending tickets - days waiting for pickup
+        getDaysWaiting(ticket) {
+            // Use ready_at (when status changed to READY)
+            // Fallback to created_at for old tickets without ready_at
+            const waitingSince = ticket.ready_at || ticket.created_at;
+            if (!waitingSince) return 0;
+            const startDate = new Date(waitingSince);
+            const now = new Date();
+            return Math.floor((now - startDate) / (1000 * 60 * 60 * 24));
+        },
+
+        getWaitingDurationClass(ticket) {
+            const days = this.getDaysWaiting(ticket);
+            if (days <= 7) return 'green';
+            if (days <= 15) return 'yellow';
+            return 'red';
+        },
+
+        getWaitingDurationPercent(ticket) {
+            const days = this.getDaysWaiting(ticket);
+            // Min 10% to always show animated bar (like Dolce Vita)
+            return Math.max(10, Math.min(100, (days / 30) * 100));
+        },
+
+        formatDate(dateStr) {
+            if (!dateStr) return '-';
+            return new Date(dateStr).toLocaleDateString('sr-Latn-RS');
+        },
+
+        formatPrice(price) {
+            if (!price) return '0';
+            return new Intl.NumberFormat('sr-RS').format(price);
+        }
+    }
+}
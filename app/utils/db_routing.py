@@ -0,0 +1,55 @@
+"""
+Rutiranje upita sesije - SELECT-ovi na read repliku.
+
+db.session je RoutingSession. Dok je u kontekstu postavljen engine
+replike (route_reads_to, koristi ga @read_replica iz replica_service),
+SELECT-ovi idu na repliku, a sve ostalo na primarnu bazu:
+
+- INSERT/UPDATE/DELETE, flush i sirovi text() upiti
+- svi upiti posle prvog upisa u transakciji (sesija vidi svoje izmene)
+- session.connection() bez iskaza
+
+Van konteksta sesija radi kao obična Flask-SQLAlchemy sesija.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask_sqlalchemy.session import Session
+
+
+# Engine replike za tekući kontekst (nit / request) ili None
+_replica_engine = ContextVar('replica_engine', default=None)
+
+# session.info ključ - transakcija je pisala, čitanja ostaju na primarnoj
+WRITES_KEY = 'replica_writes'
+
+
+def current_replica():
+    """Engine replike aktivan u ovom kontekstu ili None."""
+    return _replica_engine.get()
+
+
+@contextmanager
+def route_reads_to(engine):
+    """SELECT-ovi db.session-a u bloku idu na `engine`."""
+    token = _replica_engine.set(engine)
+    try:
+        yield engine
+    finally:
+        _replica_engine.reset(token)
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy sesija koja SELECT-ove šalje na aktivnu repliku."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing:
+            if getattr(clause, 'is_select', False):
+                replica = _replica_engine.get()
+                if replica is not None and not self.info.get(WRITES_KEY):
+                    return replica
+            elif getattr(clause, 'is_dml', False):
+                # session.execute(update(...)) ne ide kroz flush
+                self.info[WRITES_KEY] = True
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -0,0 +1,139 @@
+"""
+Geo utilities - geohash, haversine i bounding box za pretragu po blizini.
+
+Bez PostGIS-a: svaki red sa koordinatama nosi geohash (String, btree index).
+Pretraga "najbližih N u krugu R km" ide u tri koraka:
+
+1. Ćelije geohash-a koje pokrivaju bounding box kruga -> range uslovi
+   `geohash >= prefix AND geohash < sledeći_prefix` (btree, radi i na SQLite-u)
+2. Bounding box na latitude/longitude (odbacuje uglove ćelija)
+3. Tačna haversine distanca u Pythonu, sortiranje, limit
+"""
+
+import math
+
+
+EARTH_RADIUS_KM = 6371.0
+GEOHASH_PRECISION = 9           # ~5m ćelija, dovoljno za sve upite
+MAX_COVER_CELLS = 16            # gornja granica ćelija po upitu
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Geohash za tačku (standardni base32 alfabet)."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # prvi bit je longitude
+
+    while len(chars) < precision:
+        rng, coord = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if coord >= mid:
+            value = (value << 1) | 1
+            rng[0] = mid
+        else:
+            value <<= 1
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = 0
+            value = 0
+
+    return ''.join(chars)
+
+
+def geohash_for(latitude, longitude):
+    """Geohash ili None ako koordinate nisu zadate."""
+    if latitude is None or longitude is None:
+        return None
+    return encode_geohash(float(latitude), float(longitude))
+
+
+def sync_geohash(mapper, connection, target):
+    """before_insert/before_update listener - geohash prati latitude/longitude."""
+    target.geohash = geohash_for(target.latitude, target.longitude)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Udaljenost dve tačke u km."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> tuple:
+    """(min_lat, max_lat, min_lon, max_lon) kruga poluprečnika radius_km."""
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    d_lon = min(math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)), 180.0)
+    return (
+        max(latitude - d_lat, -90.0), min(latitude + d_lat, 90.0),
+        max(longitude - d_lon, -180.0), min(longitude + d_lon, 180.0),
+    )
+
+
+def _cell_size(precision: int) -> tuple:
+    """(visina, širina) geohash ćelije u stepenima."""
+    lat_bits = (5 * precision) // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def covering_prefixes(latitude: float, longitude: float, radius_km: float) -> list:
+    """
+    Geohash prefiksi koji zajedno pokrivaju krug.
+
+    Bira najveću preciznost sa <= MAX_COVER_CELLS ćelija, pa je broj
+    range uslova u upitu ograničen bez obzira na radijus.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = _cell_size(precision)
+        lat_from, lat_to = int((min_lat + 90) // height), int((max_lat + 90) // height)
+        lon_from, lon_to = int((min_lon + 180) // width), int((max_lon + 180) // width)
+        if (lat_to - lat_from + 1) * (lon_to - lon_from + 1) > MAX_COVER_CELLS:
+            continue
+
+        prefixes = set()
+        for i in range(lat_from, lat_to + 1):
+            for j in range(lon_from, lon_to + 1):
+                center_lat = min(-90 + (i + 0.5) * height, 90.0)
+                center_lon = min(-180 + (j + 0.5) * width, 180.0)
+                prefixes.add(encode_geohash(center_lat, center_lon, precision))
+        return sorted(prefixes)
+
+    return ['']  # ceo svet
+
+
+def _prefix_upper_bound(prefix: str):
+    """Najmanji geohash veći od svih sa datim prefiksom (None = nema granice)."""
+    while prefix:
+        index = _BASE32.index(prefix[-1])
+        if index + 1 < len(_BASE32):
+            return prefix[:-1] + _BASE32[index + 1]
+        prefix = prefix[:-1]
+    return None
+
+
+def geohash_filter(column, latitude: float, longitude: float, radius_km: float):
+    """SQLAlchemy uslov: kolona geohash pada u neku od ćelija koje pokrivaju krug."""
+    from sqlalchemy import or_, and_
+
+    prefixes = covering_prefixes(latitude, longitude, radius_km)
+    if prefixes == ['']:
+        return column.isnot(None)
+    # [prefix, sledeći prefix) - samo alfanumerički znaci, isti redosled u svakoj collation
+    conditions = []
+    for prefix in prefixes:
+        upper = _prefix_upper_bound(prefix)
+        conditions.append(and_(column >= prefix, column < upper) if upper else column >= prefix)
+    return or_(*conditions)
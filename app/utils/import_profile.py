@@ -0,0 +1,78 @@
+"""
+Import profil - koliko boot košta po modulu i po paketu.
+
+Pokreće `python -X importtime` u novom procesu (bez već učitanih
+modula) i parsira izveštaj sa stderr-a:
+
+    import time: self [us] | cumulative | imported package
+    import time:       412 |        930 |   reportlab.lib.colors
+
+Koristi ga `flask import-profile`.
+"""
+
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+
+BOOT_CODE = 'from app import create_app; create_app()'
+
+
+def parse_importtime(output: str) -> list:
+    """
+    Parsira -X importtime izlaz.
+
+    Returns:
+        Lista (modul, self_us, cumulative_us) redom importa
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # zaglavlje
+        entries.append((parts[2].strip(), self_us, cumulative_us))
+    return entries
+
+
+def summarize(entries: list, top: int = 20) -> dict:
+    """
+    Ukupno vreme, najsporiji moduli (po cumulative) i zbir po paketu.
+
+    Zbir po paketu je po self vremenu - cumulative bi dvaput brojao
+    podmodule.
+    """
+    packages = defaultdict(int)
+    for module, self_us, _ in entries:
+        packages[module.split('.', 1)[0]] += self_us
+
+    return {
+        'total_ms': round(sum(e[1] for e in entries) / 1000, 1),
+        'modules': len(entries),
+        'slowest': [
+            (module, round(cumulative_us / 1000, 1))
+            for module, _, cumulative_us in sorted(entries, key=lambda e: -e[2])[:top]
+        ],
+        'packages': [
+            (package, round(self_us / 1000, 1))
+            for package, self_us in sorted(packages.items(), key=lambda p: -p[1])[:top]
+        ],
+    }
+
+
+def profile_imports(code: str = BOOT_CODE, cwd: str = None, env: dict = None) -> list:
+    """Pokreće `code` sa -X importtime u novom procesu i vraća parsirane unose."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=cwd, env=dict(os.environ, **(env or {})),
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed')
+    return parse_importtime(result.stderr)
@@ -0,0 +1,119 @@
+"""
+JSON provider - orjson serijalizacija odgovora (stdlib json kao fallback).
+
+Flask-ov DefaultJSONProvider ide kroz json.dumps sa sort_keys i
+ensure_ascii; velike liste (nalozi, marketplace, kartice artikala) na
+tome troše primetan deo vremena. OrjsonProvider:
+
+- orjson kada je instaliran (C implementacija, direktno u bytes);
+  inače stdlib json sa istim pravilima konverzije
+- nativno: Decimal -> float, datetime/date/time -> ISO 8601,
+  Enum -> value, SQLAlchemy Row -> dict, UUID -> str, set -> list
+  (isto što to_dict() radi ručno - novi kod može vratiti sirove vrednosti)
+- ne-string ključevi (int) se pretvaraju u string kao u stdlib-u
+
+compact_jsonify() je za list endpointe: bez sortiranja ključeva i bez
+uvlačenja ni u debug modu.
+"""
+
+import dataclasses
+import json
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.engine import Row
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj):
+    """Tipovi koje ni orjson ni json ne serijalizuju sami."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Row):
+        return dict(obj._mapping)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    # Samo stdlib putanja - orjson ove tipove serijalizuje nativno
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """app.json - orjson sa fallback-om na stdlib json."""
+
+    def _dumps_bytes(self, obj, sort_keys, indent):
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        sort_keys = kwargs.pop('sort_keys', self.sort_keys)
+        indent = kwargs.pop('indent', None)
+        if ORJSON_AVAILABLE and not kwargs:
+            try:
+                return self._dumps_bytes(obj, sort_keys, indent).decode('utf-8')
+            except TypeError:
+                pass  # npr. int van 64 bita, mešoviti tipovi ključeva - stdlib
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        if indent is None:
+            kwargs.setdefault('separators', (',', ':'))  # kao orjson
+        return json.dumps(obj, sort_keys=sort_keys, indent=indent, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if ORJSON_AVAILABLE and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        return self.build_response(obj, sort_keys=self.sort_keys, indent=2 if pretty else None)
+
+    def build_response(self, obj, sort_keys, indent=None):
+        """Response sa JSON telom - orjson piše bytes bez međukoraka kroz str."""
+        if ORJSON_AVAILABLE:
+            try:
+                body = self._dumps_bytes(obj, sort_keys, indent)
+                return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+            except TypeError:
+                pass
+        return self._app.response_class(
+            f'{self.dumps(obj, sort_keys=sort_keys, indent=indent)}\n', mimetype=self.mimetype
+        )
+
+
+def compact_jsonify(*args, **kwargs):
+    """
+    jsonify za velike liste - bez sortiranja ključeva i uvlačenja.
+
+    Sa DefaultJSONProvider-om (npr. app bez OrjsonProvider-a) ponaša se
+    kao obični jsonify.
+    """
+    provider = current_app.json
+    if not isinstance(provider, OrjsonProvider):
+        return provider.response(*args, **kwargs)
+
+    return provider.build_response(provider._prepare_response_obj(args, kwargs), sort_keys=False)
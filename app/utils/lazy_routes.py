@@ -0,0 +1,172 @@
+"""
+Lazy route registracija - brži cold start bez importa svih API modula.
+
+create_app() u običnom modu importuje sve v1/admin/supplier/public/
+frontend module (a kroz njih servise, reportlab, openpyxl...) pre prvog
+request-a. Sa LAZY_ROUTES=true rute se čitaju iz manifesta:
+
+    app/route_manifest.json  - rule, endpoint, metode, modul i ime view-a
+
+URL mapa je odmah kompletna (url_for, 404/405 rade isto), a view
+funkcija je LazyView koji importuje svoj modul na prvi poziv.
+
+Manifest nosi otisak izvornog koda ruta - ako se bilo koji fajl u
+app/api ili app/frontend promeni, manifest je zastareo i rute se
+registruju normalno (i manifest se ponovo zapisuje ako je moguće).
+Pravi se sa `flask routes-manifest` (u build-u, bin/post_compile).
+"""
+
+import hashlib
+import json
+import os
+from importlib import import_module
+
+from flask import Flask
+
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFEST_PATH = os.path.join(APP_DIR, 'route_manifest.json')
+
+# Izvori čija izmena menja rute
+FINGERPRINT_SOURCES = ('api', 'frontend', '__init__.py')
+
+# Endpointi koje create_app uvek registruje sam
+EAGER_ENDPOINTS = {'static', 'health_check'}
+
+
+def source_fingerprint() -> str:
+    """sha1 putanja i sadržaja svih .py fajlova koji definišu rute."""
+    digest = hashlib.sha1()
+    for source in FINGERPRINT_SOURCES:
+        path = os.path.join(APP_DIR, source)
+        if os.path.isfile(path):
+            files = [path]
+        else:
+            files = sorted(
+                os.path.join(root, name)
+                for root, dirs, names in os.walk(path)
+                if '__pycache__' not in root
+                for name in names if name.endswith('.py')
+            )
+        for filename in files:
+            digest.update(os.path.relpath(filename, APP_DIR).encode())
+            with open(filename, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _resolve(module: str, qualname: str):
+    obj = import_module(module)
+    for part in qualname.split('.'):
+        obj = getattr(obj, part)
+    return obj
+
+
+def is_lazy(app: Flask) -> bool:
+    """Da li su rute aplikacije registrovane iz manifesta."""
+    return any(isinstance(view, LazyView) for view in app.view_functions.values())
+
+
+class LazyView:
+    """View funkcija koja importuje svoj modul na prvi poziv."""
+
+    def __init__(self, module: str, qualname: str):
+        self.module = module
+        self.qualname = qualname
+        self.__name__ = qualname.rsplit('.', 1)[-1]
+        self.__module__ = module
+        self._view = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._view is not None
+
+    def resolve(self):
+        if self._view is None:
+            self._view = _resolve(self.module, self.qualname)
+        return self._view
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+
+def build_manifest(app: Flask) -> dict:
+    """
+    Manifest ruta eagerly registrovane aplikacije.
+
+    Raises:
+        ValueError: Ako view neke rute nije dostupan po modulu i imenu
+                    (npr. lokalna funkcija) - lazy mod tada nije moguć
+    """
+    routes = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: (r.rule, r.endpoint)):
+        if rule.endpoint in EAGER_ENDPOINTS:
+            continue
+        view = app.view_functions[rule.endpoint]
+        module, qualname = view.__module__, view.__qualname__
+        try:
+            resolved = _resolve(module, qualname)
+        except (ImportError, AttributeError):
+            resolved = None
+        if resolved is not view:
+            raise ValueError(f'View {module}.{qualname} ({rule.endpoint}) nije dostupan za lazy import')
+
+        routes.append({
+            'rule': rule.rule,
+            'endpoint': rule.endpoint,
+            'methods': sorted(rule.methods or ()),
+            'defaults': rule.defaults,
+            'strict_slashes': rule.strict_slashes,
+            'automatic_options': getattr(rule, 'provide_automatic_options', False),
+            'module': module,
+            'qualname': qualname,
+        })
+    return {'fingerprint': source_fingerprint(), 'routes': routes}
+
+
+def write_manifest(app: Flask, path: str = None) -> dict:
+    """Zapisuje manifest eagerly registrovane aplikacije."""
+    path = path or MANIFEST_PATH
+    manifest = build_manifest(app)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def load_manifest(path: str = None):
+    """Manifest ili None ako ne postoji, nije validan ili je zastareo."""
+    try:
+        with open(path or MANIFEST_PATH) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get('fingerprint') != source_fingerprint():
+        return None
+    return manifest
+
+
+def register_lazy_routes(app: Flask, path: str = None) -> bool:
+    """
+    Registruje rute iz manifesta bez importa view modula.
+
+    Returns:
+        False ako manifest ne postoji ili je zastareo (treba eager registracija)
+    """
+    manifest = load_manifest(path)
+    if manifest is None:
+        return False
+
+    for entry in manifest['routes']:
+        rule = app.url_rule_class(
+            entry['rule'],
+            endpoint=entry['endpoint'],
+            methods=entry['methods'],
+            defaults=entry['defaults'],
+            strict_slashes=entry['strict_slashes'],
+        )
+        rule.provide_automatic_options = entry['automatic_options']
+        app.url_map.add(rule)
+        app.view_functions[entry['endpoint']] = LazyView(entry['module'], entry['qualname'])
+    return True
@@ -0,0 +1,260 @@
+"""
+Pagination - keyset (cursor) paginacija za velike liste.
+
+OFFSET paginacija sa COUNT(*) je sporija što je stranica dublja: baza
+pročita i odbaci sve prethodne redove, a COUNT još jednom prođe ceo skup.
+Keyset paginacija nastavlja od ključa poslednjeg vraćenog reda:
+
+    WHERE (created_at, id) < (:created_at, :id)
+    ORDER BY created_at DESC, id DESC LIMIT :per_page + 1
+
+pa je svaka stranica jedan index range scan, na bilo kojoj dubini.
+
+Endpoint:
+
+    pagination = paginate(query, (Receipt.created_at.desc(), Receipt.id.desc()),
+                          page=page, per_page=per_page)
+
+- bez `cursor` parametra: klasična stranica (page/total/pages) kao do
+  sada, uz next_cursor za prelazak na keyset
+- `?cursor=` (prazan = prva stranica) ili `?cursor=<token>`: keyset bez
+  COUNT-a; total samo na zahtev - `?total=approx` (procena planera na
+  PostgreSQL-u) ili `?total=exact`
+
+Ključ sortiranja mora biti jedinstven i NOT NULL - poslednja kolona je
+po pravilu id. Cursor je base64url JSON vrednosti ključa poslednjeg reda.
+"""
+
+import base64
+import binascii
+import json
+import math
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+
+from flask import request, abort, has_request_context
+from sqlalchemy import literal, or_, and_, tuple_
+from sqlalchemy.sql import operators
+
+from ..extensions import db
+
+
+class Pagination:
+    """Rezultat paginate() - isti atributi kao Flask-SQLAlchemy Pagination, plus next_cursor."""
+
+    def __init__(self, items, per_page, next_cursor=None, total=None, page=None, cursor=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.total = total
+        self.page = page
+        self.cursor = cursor
+
+    @property
+    def pages(self):
+        if self.total is None:
+            return None
+        return math.ceil(self.total / self.per_page) if self.per_page else 0
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        if self.page is not None:
+            return self.page > 1
+        return bool(self.cursor)
+
+    def meta(self) -> dict:
+        """Standardni pagination blok odgovora."""
+        return {
+            'page': self.page,
+            'per_page': self.per_page,
+            'total': self.total,
+            'pages': self.pages,
+            'has_next': self.has_next,
+            'has_prev': self.has_prev,
+            'next_cursor': self.next_cursor,
+        }
+
+
+# ============================================
+# CURSOR
+# ============================================
+
+def _sort_keys(order_by):
+    """(kolona, desc) za svaki ORDER BY izraz."""
+    keys = []
+    for clause in order_by:
+        modifier = getattr(clause, 'modifier', None)
+        if modifier in (operators.desc_op, operators.asc_op):
+            keys.append((clause.element, modifier is operators.desc_op))
+        else:
+            keys.append((clause, False))
+    return keys
+
+
+def _value(item, column):
+    """Vrednost kolone ključa iz reda (ORM objekat ili Row više entiteta)."""
+    entity = column._annotations.get('parententity')
+    if entity is not None and not isinstance(item, entity.class_) and isinstance(item, tuple):
+        item = next((part for part in item if isinstance(part, entity.class_)), item)
+    return getattr(item, column.key)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'dec': str(value)}
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _decode_value(value, column):
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+        if 'dec' in value:
+            return Decimal(value['dec'])
+        raise ValueError(value)
+    enum_class = getattr(column.type, 'enum_class', None)
+    if enum_class is not None and value is not None:
+        return enum_class(value)
+    return value
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, keys) -> list:
+    """Vrednosti ključa iz cursor-a. Raises ValueError za neispravan cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Neispravan cursor: {e}")
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("Neispravan cursor")
+    return [_decode_value(value, column) for value, (column, _) in zip(values, keys)]
+
+
+def _after(keys, values):
+    """Uslov 'posle cursor-a' za dati redosled."""
+    params = [literal(value, column.type) for value, (column, _) in zip(values, keys)]
+    directions = {desc for _, desc in keys}
+    if len(directions) == 1:
+        # Row-value poređenje - jedan index range scan (PostgreSQL, SQLite 3.15+)
+        left, right = tuple_(*[c for c, _ in keys]), tuple_(*params)
+        return left < right if directions.pop() else left > right
+
+    # Mešoviti smerovi: (a > x) OR (a = x AND b < y) ...
+    conditions = []
+    for i, (column, desc) in enumerate(keys):
+        equal = [c == p for (c, _), p in zip(keys[:i], params[:i])]
+        conditions.append(and_(*equal, column < params[i] if desc else column > params[i]))
+    return or_(*conditions)
+
+
+# ============================================
+# TOTAL
+# ============================================
+
+def approximate_count(query) -> int:
+    """
+    Broj redova upita - na PostgreSQL-u procena planera (EXPLAIN, bez
+    izvršavanja), inače tačan COUNT.
+    """
+    query = query.order_by(None)
+    bind = db.session.get_bind()
+    if bind.dialect.name == 'postgresql':
+        compiled = query.statement.compile(dialect=bind.dialect)
+        try:
+            plan = db.session.connection().exec_driver_sql(
+                f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params
+            ).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        except Exception:
+            pass
+    return query.count()
+
+
+# ============================================
+# PAGINATE
+# ============================================
+
+def paginate(query, order_by, page=1, per_page=20, offset=None, cursor=None, total=None) -> Pagination:
+    """
+    Paginacija upita po jedinstvenom ključu sortiranja.
+
+    Args:
+        query: Filtriran upit (postojeći ORDER BY se zamenjuje sa order_by)
+        order_by: ORDER BY izrazi ključa, npr. (Model.created_at.desc(), Model.id.desc())
+        page: Stranica za klasični režim
+        per_page: Broj stavki po stranici
+        offset: Klasični režim po offset-u umesto po stranici (limit/offset API)
+        cursor: Token sa prethodne stranice; podrazumevano `cursor` iz
+            request.args - prisustvo parametra uključuje keyset režim
+        total: None, 'approx' ili 'exact' (keyset režim); podrazumevano
+            `total` iz request.args
+
+    Returns:
+        Pagination
+    """
+    keys = _sort_keys(order_by)
+    query = query.order_by(None).order_by(*order_by)
+
+    if has_request_context():
+        if cursor is None:
+            cursor = request.args.get('cursor')
+        if total is None:
+            total = request.args.get('total')
+
+    def _next_cursor(items, more):
+        if not more or not items:
+            return None
+        return encode_cursor([_value(items[-1], column) for column, _ in keys])
+
+    if cursor is None and offset is not None:
+        # Klasični limit/offset režim - OFFSET + COUNT
+        rows = query.offset(offset).limit(per_page + 1).all()
+        items = rows[:per_page]
+        return Pagination(
+            items, per_page, _next_cursor(items, len(rows) > per_page), total=query.order_by(None).count()
+        )
+
+    if cursor is None:
+        # Klasični režim - OFFSET + COUNT
+        legacy = query.paginate(page=page, per_page=per_page, error_out=False)
+        return Pagination(
+            legacy.items, per_page, _next_cursor(legacy.items, legacy.has_next),
+            total=legacy.total, page=page
+        )
+
+    count = None
+    if total == 'exact':
+        count = query.order_by(None).count()
+    elif total == 'approx':
+        count = approximate_count(query)
+
+    if cursor:
+        try:
+            values = decode_cursor(cursor, keys)
+        except ValueError as e:
+            abort(400, description=str(e))
+        query = query.filter(_after(keys, values))
+
+    rows = query.limit(per_page + 1).all()
+    items = rows[:per_page]
+    return Pagination(items, per_page, _next_cursor(items, len(rows) > per_page), total=count, cursor=cursor)
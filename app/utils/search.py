@@ -0,0 +1,139 @@
+"""
+Search utilities - normalizacija teksta i telefona za pretragu naloga.
+
+Nalog nosi search_text: jedan normalizovan string (mala slova, bez
+dijakritika) sa imenom kupca, firmom, telefonom, uređajem, IMEI i
+brojem naloga. Telefon se čuva u nacionalnom obliku (0641234567), pa
+'+381 64 123 4567', '00381641234567' i '064/123-4567' nalaze isti nalog.
+
+Isti normalizator se primenjuje na upit; highlight mapira pogodak u
+normalizovanom tekstu nazad na originalne karaktere polja.
+"""
+
+import re
+import unicodedata
+
+from markupsafe import escape
+
+
+COUNTRY_CODE = '381'
+MIN_PHONE_DIGITS = 3
+
+# Slova koja NFKD ne rastavlja
+_TRANSLIT = {'đ': 'dj', 'Đ': 'dj', 'ß': 'ss', 'æ': 'ae', 'ø': 'o'}
+_PHONE_QUERY = re.compile(r'\+?[\d\s\-/().]+')
+
+
+def _normalize_char(char: str) -> str:
+    if char in _TRANSLIT:
+        return _TRANSLIT[char]
+    decomposed = unicodedata.normalize('NFKD', char)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def normalize_text(value) -> str:
+    """Mala slova, bez dijakritika (č->c, đ->dj), jedan razmak između reči."""
+    if not value:
+        return ''
+    return ' '.join(''.join(_normalize_char(c) for c in str(value)).split())
+
+
+def normalize_phone(value) -> str:
+    """
+    Cifre telefona u nacionalnom obliku.
+
+    +381 / 00381 prefiks postaje 0; broj od 11+ cifara koji počinje sa 381
+    se tretira kao međunarodni i bez '+'.
+    """
+    if not value:
+        return ''
+    raw = str(value).strip()
+    digits = re.sub(r'\D', '', raw)
+    international = raw.startswith('+') or digits.startswith('00')
+    digits = digits[2:] if digits.startswith('00') else digits
+    if digits.startswith(COUNTRY_CODE) and (international or len(digits) >= 11):
+        digits = '0' + digits[len(COUNTRY_CODE):]
+    return digits
+
+
+def ticket_search_text(ticket) -> str:
+    """search_text naloga - sve po čemu recepcija traži nalog."""
+    parts = [
+        normalize_text(ticket.customer_name),
+        normalize_text(ticket.customer_company_name),
+        normalize_phone(ticket.customer_phone),
+        normalize_text(ticket.brand),
+        normalize_text(ticket.model),
+        normalize_text(ticket.imei),
+        f'srv-{ticket.ticket_number:04d}' if ticket.ticket_number is not None else '',
+    ]
+    return ' '.join(p for p in parts if p)
+
+
+def sync_search_text(mapper, connection, target):
+    """before_insert/before_update listener - search_text prati polja naloga."""
+    target.search_text = ticket_search_text(target)
+
+
+def search_terms(query: str) -> list:
+    """
+    Termini upita, normalizovani kao search_text.
+
+    Upit koji je ceo broj telefona (sa razmacima, crticama, +) je jedan
+    termin u nacionalnom obliku; ostalo se deli na reči.
+    """
+    query = (query or '').strip()
+    if not query:
+        return []
+    if _PHONE_QUERY.fullmatch(query):
+        digits = normalize_phone(query)
+        if len(digits) >= MIN_PHONE_DIGITS:
+            return [digits]
+    return [term for term in normalize_text(query).split() if term]
+
+
+def ticket_number_from(query: str):
+    """Broj naloga ako je upit '42', '0042' ili 'SRV-0042', inače None."""
+    match = re.fullmatch(r'(?:srv-?)?0*(\d{1,9})', (query or '').strip().lower())
+    return int(match.group(1)) if match else None
+
+
+def highlight(value, terms, normalizer=normalize_text, mark='mark') -> str:
+    """
+    HTML-escaped value sa <mark> oko delova koji odgovaraju terminima.
+
+    Returns:
+        Označen tekst ili None ako nijedan termin nije u polju
+    """
+    if not value or not terms:
+        return None
+    value = str(value)
+
+    # Normalizovan tekst + mapa normalizovan karakter -> indeks originala
+    if normalizer is normalize_phone:
+        value = normalize_phone(value)
+        normalized, origin = value, list(range(len(value)))
+    else:
+        pieces = [(_normalize_char(c), i) for i, c in enumerate(value)]
+        normalized = ''.join(p for p, _ in pieces)
+        origin = [i for p, i in pieces for _ in p]
+
+    covered = [False] * len(value)
+    for term in terms:
+        start = normalized.find(term)
+        while start != -1:
+            for j in range(start, start + len(term)):
+                covered[origin[j]] = True
+            start = normalized.find(term, start + 1)
+    if not any(covered):
+        return None
+
+    result, i = [], 0
+    while i < len(value):
+        j = i
+        while j < len(value) and covered[j] == covered[i]:
+            j += 1
+        chunk = str(escape(value[i:j]))
+        result.append(f'<{mark}>{chunk}</{mark}>' if covered[i] else chunk)
+        i = j
+    return ''.join(result)
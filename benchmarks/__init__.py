@@ -0,0 +1,21 @@
+"""
+Benchmark suite - latencija i broj SQL upita ključnih endpointa na
+sintetičkim podacima više tenanta.
+
+    python -m benchmarks                         # SQLite u memoriji, poređenje sa baseline-om
+    python -m benchmarks --tenants 5 --scale 2   # veći skup podataka
+    python -m benchmarks --update-baseline       # upiši nove referentne vrednosti
+    python -m benchmarks --database-url postgresql://localhost/servishub_bench
+
+- data.py: deterministički generator (seed) - tenanti, lokacije,
+  korisnici, nalozi sa notifikacijama, računi, kretanja zaliha, delovi,
+  dobavljači sa listinzima, thread-ovi, fakture i bankovni izvod
+- scenarios.py: endpointi (Flask test client) i servisni pozivi koji se mere
+- harness.py: merenje (p50/p95, broj upita) i poređenje sa baseline.json
+- boot.py: cold start (import + create_app + prvi request) u novom
+  procesu, budžet BOOT_BUDGET_MS i broj učitanih modula
+
+Broj upita je deterministički i prenosiv između mašina - regresija je
+svaki rast preko tolerancije. Latencija zavisi od mašine; --no-latency
+proverava samo upite. Baseline se čuva po profilu (baza, tenanti, scale).
+"""
@@ -0,0 +1,81 @@
+"""python -m benchmarks - vidi benchmarks/__init__.py."""
+
+import argparse
+import logging
+import sys
+import time
+
+from benchmarks.harness import (
+    create_benchmark_app, setup_database, measure, compare, profile_key, load_baseline, save_baseline,
+)
+from benchmarks.boot import compare_boot, measure_boot
+from benchmarks.scenarios import Context, build
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='ServisHub benchmark')
+    parser.add_argument('--tenants', type=int, default=3)
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--database-url', help='PostgreSQL baza (ime mora sadržati "bench")')
+    parser.add_argument('--only', help='Samo scenariji čije ime počinje ovim prefiksom')
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--no-latency', action='store_true', help='Poredi samo broj upita')
+    parser.add_argument('--no-boot', action='store_true', help='Bez merenja cold start-a')
+    args = parser.parse_args(argv)
+
+    # Cold start se meri u zasebnim procesima, pre nego što ovaj učita app
+    boot = None if args.no_boot or args.only else measure_boot()
+
+    logging.disable(logging.ERROR)
+    app = create_benchmark_app(args.database_url)
+
+    started = time.perf_counter()
+    dataset = setup_database(app, args.tenants, args.scale, args.seed)
+    counts = ', '.join(f'{k}={v}' for k, v in dataset.counts.items())
+    print(f'Podaci: {args.tenants} tenanta ({counts}) za {time.perf_counter() - started:.1f}s')
+
+    ctx = Context(app, dataset)
+    scenarios = [s for s in build(ctx) if not args.only or s.name.startswith(args.only)]
+    results = measure(ctx, scenarios, repeat=args.repeat)
+
+    with app.app_context():
+        from app.extensions import db
+        dialect = db.engine.dialect.name
+        if args.database_url:
+            db.drop_all()
+    profile = profile_key(dialect, args.tenants, args.scale)
+    baseline = load_baseline().get(profile, {})
+
+    print(f'\n{"scenario":<28}{"status":>7}{"upita":>8}{"base":>7}{"p50 ms":>10}{"p95 ms":>10}{"base p50":>10}')
+    for name, r in results.items():
+        ref = baseline.get(name, {})
+        print(f'{name:<28}{r["status"]:>7}{r["queries"]:>8}{ref.get("queries", "-"):>7}'
+              f'{r["p50_ms"]:>10.2f}{r["p95_ms"]:>10.2f}{ref.get("p50_ms", "-"):>10}')
+
+    boot_ref = load_baseline().get('boot', {}).get('cold_start')
+    if boot:
+        print(f'\nBoot: {boot["total_ms"]} ms (import {boot["import_ms"]}, create_app {boot["create_ms"]}, '
+              f'prvi request {boot["first_request_ms"]}), {boot["modules"]} modula'
+              + (f' - baseline {boot_ref["total_ms"]} ms, {boot_ref["modules"]} modula' if boot_ref else ''))
+
+    if args.update_baseline:
+        save_baseline(profile, results)
+        if boot:
+            save_baseline('boot', {'cold_start': boot}, fields=('total_ms', 'modules'))
+        print(f'\nBaseline za {profile} upisan')
+        return 0
+
+    if not baseline:
+        print(f'\nNema baseline-a za {profile} - pokreni sa --update-baseline')
+    problems = compare(results, baseline, check_latency=not args.no_latency)
+    if boot:
+        problems += compare_boot(boot, boot_ref, check_latency=not args.no_latency)
+    for name, message in problems:
+        print(f'REGRESIJA {name}: {message}')
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Cold start - vreme od praznog interpretera do prvog odgovora.
+
+Svako merenje je novi Python proces (bez keša modula iz prethodnog
+merenja): import app, create_app() i prvi GET /health. Rezultat je
+medijana, poredi se sa BOOT_BUDGET_MS i sa baseline-om ('boot' ključ u
+baseline.json). Detalji po modulu: `flask import-profile`.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+
+# Ukupan budžet: import + create_app + prvi request
+BOOT_BUDGET_MS = 3000
+# Novi moduli pri boot-u: više od baseline + max(MODULE_TOLERANCE_ABS, 10%)
+MODULE_TOLERANCE_ABS = 20
+
+_PROBE = r'''
+import json, sys, time, logging, warnings
+warnings.simplefilter('ignore')
+logging.disable(logging.ERROR)
+started = time.perf_counter()
+from app import create_app
+from benchmarks.harness import BenchmarkConfig
+imported = time.perf_counter()
+app = create_app(BenchmarkConfig)
+created = time.perf_counter()
+status = app.test_client().get('/health').status_code
+done = time.perf_counter()
+print(json.dumps({
+    'import_ms': round((imported - started) * 1000, 1),
+    'create_ms': round((created - imported) * 1000, 1),
+    'first_request_ms': round((done - created) * 1000, 1),
+    'total_ms': round((done - started) * 1000, 1),
+    'modules': len(sys.modules),
+    'status': status,
+}))
+'''
+
+
+def _probe(env):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, '-c', _PROBE], cwd=root, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_boot(runs=3, env_overrides=None) -> dict:
+    """
+    Medijana `runs` hladnih startova.
+
+    Returns:
+        {'status', 'import_ms', 'create_ms', 'first_request_ms', 'total_ms', 'modules'}
+    """
+    env = dict(os.environ, **(env_overrides or {}))
+    env.setdefault('PYTHONDONTWRITEBYTECODE', '0')
+    samples = sorted((_probe(env) for _ in range(runs)), key=lambda s: s['total_ms'])
+    return samples[len(samples) // 2]
+
+
+def compare_boot(sample, reference, check_latency=True) -> list:
+    """
+    Regresije cold start-a.
+
+    Broj učitanih modula je prenosiv između mašina (kao broj upita) i
+    uvek se proverava; vreme (budžet i baseline) samo uz check_latency.
+
+    Returns:
+        [('boot', poruka), ...] - prazno ako nema regresija
+    """
+    from benchmarks.harness import LATENCY_FACTOR, QUERY_TOLERANCE_PCT
+
+    problems = []
+    if sample['status'] != 200:
+        problems.append(('boot', f"GET /health HTTP {sample['status']}"))
+    if reference:
+        allowed = reference['modules'] + max(MODULE_TOLERANCE_ABS, int(reference['modules'] * QUERY_TOLERANCE_PCT))
+        if sample['modules'] > allowed:
+            problems.append(('boot', f"modula {sample['modules']} (baseline {reference['modules']})"))
+    if check_latency:
+        if sample['total_ms'] > BOOT_BUDGET_MS:
+            problems.append(('boot', f"{sample['total_ms']} ms > budžet {BOOT_BUDGET_MS} ms"))
+        elif reference and sample['total_ms'] > reference['total_ms'] * LATENCY_FACTOR:
+            problems.append(('boot', f"{sample['total_ms']} ms (baseline {reference['total_ms']} ms)"))
+    return problems
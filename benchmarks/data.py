@@ -0,0 +1,370 @@
+"""
+Sintetički podaci za benchmark - N tenanta sa realnim obimom.
+
+Isti seed daje isti skup podataka (i isti broj upita po scenariju).
+Veliki skupovi idu ORM bulk INSERT-om; search_text i sažetak
+notifikacija naloga se računaju ovde jer bulk insert ne pokreće
+mapper event-e.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models import (
+    Tenant, TenantStatus, ServiceLocation, LocationStatus, TenantUser, UserLocation, UserRole,
+    ServiceTicket, TicketStatus, TicketNotificationLog,
+    Receipt, ReceiptItem, ReceiptStatus, ReceiptType, PaymentMethod, SaleItemType, CashRegisterSession,
+    GoodsItem, StockMovement, MovementType, SparePart, PartCategory, PartVisibility, PhoneListing,
+    Supplier, SupplierStatus, SupplierListing,
+    MessageThread, ThreadParticipant, Message, ThreadType, ThreadStatus,
+    PlatformAdmin, AdminRole, BankStatementImport, BankTransaction, SubscriptionPayment, FeatureFlag,
+)
+from app.utils.search import ticket_search_text
+
+
+# Obim po tenantu za scale=1
+VOLUMES = {
+    'tickets': 2000,
+    'goods_items': 300,
+    'receipts': 1500,
+    'stock_movements': 3000,
+    'spare_parts': 200,
+    'phones': 50,
+    'threads': 100,
+    'messages_per_thread': 10,
+    'invoices': 12,
+}
+SUPPLIERS = 10
+LISTINGS_PER_SUPPLIER = 500
+BANK_TRANSACTIONS = 200
+
+FIRST_NAMES = ['Petar', 'Marko', 'Jovana', 'Milica', 'Đorđe', 'Ana', 'Nikola', 'Stefan', 'Ivana', 'Miloš']
+LAST_NAMES = ['Petrović', 'Jovanović', 'Nikolić', 'Marković', 'Đorđević', 'Stojanović', 'Ilić', 'Pavlović']
+DEVICES = [
+    ('Apple', 'iPhone 13'), ('Apple', 'iPhone 14 Pro'), ('Samsung', 'Galaxy S23'),
+    ('Samsung', 'Galaxy A54'), ('Xiaomi', 'Redmi Note 12'), ('Huawei', 'P30 Lite'),
+]
+GOODS = ['Maska', 'Zaštitno staklo', 'Punjač', 'Kabl USB-C', 'Slušalice', 'Držač za auto']
+LISTING_CATEGORIES = ['display', 'battery', 'charging_port', 'camera', 'back_cover']
+TICKET_STATUSES = [
+    (TicketStatus.RECEIVED, 10), (TicketStatus.IN_PROGRESS, 15), (TicketStatus.READY, 15),
+    (TicketStatus.DELIVERED, 55), (TicketStatus.REJECTED, 5),
+]
+
+
+@dataclass
+class Dataset:
+    """Šta je generisano - scenariji odavde biraju tenante, tokene i ID-eve."""
+    tenants: list = field(default_factory=list)          # [{'id', 'location_id', 'owner_id'}]
+    admin_id: int = None
+    unmatched_transaction_id: int = None
+    counts: dict = field(default_factory=dict)
+
+
+def _bulk(model, rows, returning=False):
+    if not rows:
+        return []
+    statement = insert(model)
+    if returning:
+        statement = statement.returning(model.id, sort_by_parameter_order=True)
+        return list(db.session.scalars(statement, rows))
+    db.session.execute(statement, rows)
+    return []
+
+
+def _weighted(rng, choices):
+    return rng.choices([c for c, _ in choices], weights=[w for _, w in choices])[0]
+
+
+def generate(tenants=3, scale=1.0, seed=42) -> Dataset:
+    """
+    Popuni praznu bazu (tabele već kreirane).
+
+    Args:
+        tenants: Broj tenanta
+        scale: Množilac VOLUMES (0.05 za smoke test, 2+ za stres)
+        seed: Seed generatora
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    volumes = {key: max(1, int(value * scale)) for key, value in VOLUMES.items()}
+    volumes['messages_per_thread'] = VOLUMES['messages_per_thread']
+    volumes['invoices'] = VOLUMES['invoices']
+    dataset = Dataset(counts={key: 0 for key in ('tickets', 'notifications', 'receipts', 'stock_movements',
+                                                  'listings', 'messages', 'invoices', 'bank_transactions')})
+
+    admin = PlatformAdmin(email='bench@servishub.rs', password_hash='x', ime='Bench', prezime='Admin',
+                          role=AdminRole.SUPER_ADMIN, is_active=True)
+    db.session.add(admin)
+    db.session.flush()
+    dataset.admin_id = admin.id
+
+    for index in range(tenants):
+        dataset.tenants.append(_generate_tenant(rng, index, volumes, now, dataset))
+
+    _generate_marketplace(rng, scale, now, dataset)
+    _generate_bank_import(rng, now, dataset)
+    db.session.commit()
+    return dataset
+
+
+def _generate_tenant(rng, index, volumes, now, dataset):
+    tenant = Tenant(
+        name=f'Bench Servis {index + 1}', slug=f'bench-servis-{index + 1}',
+        email=f'servis{index + 1}@bench.rs', login_secret=f'bench-secret-{index + 1:04d}',
+        status=TenantStatus.ACTIVE,
+    )
+    db.session.add(tenant)
+    db.session.flush()
+
+    locations = []
+    for n in range(2):
+        location = ServiceLocation(
+            tenant_id=tenant.id, name=f'Lokacija {n + 1}', city='Beograd',
+            is_primary=n == 0, is_active=True, status=LocationStatus.ACTIVE,
+        )
+        db.session.add(location)
+        locations.append(location)
+    db.session.flush()
+
+    users = []
+    for n, role in enumerate([UserRole.OWNER, UserRole.TECHNICIAN, UserRole.TECHNICIAN, UserRole.TECHNICIAN]):
+        user = TenantUser(
+            tenant_id=tenant.id, username=f'bench{index + 1}_{n}', email=f'user{n}@servis{index + 1}.bench.rs',
+            ime=rng.choice(FIRST_NAMES), prezime=rng.choice(LAST_NAMES), role=role, is_active=True,
+            current_location_id=locations[0].id,
+        )
+        db.session.add(user)
+        users.append(user)
+    db.session.flush()
+    for user in users:
+        for location in locations:
+            db.session.add(UserLocation(user_id=user.id, location_id=location.id, is_active=True,
+                                        is_primary=location is locations[0]))
+    db.session.add(FeatureFlag(feature_key='pos_enabled', tenant_id=tenant.id, enabled=True))
+    db.session.flush()
+
+    owner = users[0]
+    location_ids = [location.id for location in locations]
+    user_ids = [user.id for user in users]
+
+    _generate_tickets(rng, tenant.id, location_ids, user_ids, volumes['tickets'], now, dataset)
+    goods_ids = _generate_stock(rng, tenant.id, location_ids, owner.id, volumes, now, dataset)
+    _generate_receipts(rng, tenant.id, location_ids[0], owner.id, goods_ids, volumes['receipts'], now, dataset)
+    _generate_threads(rng, tenant.id, owner.id, volumes, now, dataset)
+    _generate_invoices(rng, tenant.id, volumes['invoices'], now, dataset)
+
+    return {'id': tenant.id, 'location_id': location_ids[0], 'owner_id': owner.id}
+
+
+def _generate_tickets(rng, tenant_id, location_ids, user_ids, count, now, dataset):
+    rows = []
+    for number in range(1, count + 1):
+        brand, model = rng.choice(DEVICES)
+        status = _weighted(rng, TICKET_STATUSES)
+        created_at = now - timedelta(days=rng.uniform(0, 180))
+        closed = status in (TicketStatus.DELIVERED, TicketStatus.REJECTED)
+        row = {
+            'tenant_id': tenant_id,
+            'location_id': rng.choice(location_ids),
+            'ticket_number': number,
+            'customer_name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            'customer_phone': f'06{rng.randint(0, 9)}{rng.randint(1000000, 9999999)}',
+            'device_type': 'PHONE',
+            'brand': brand,
+            'model': model,
+            'imei': str(rng.randint(10 ** 14, 10 ** 15 - 1)),
+            'problem_description': 'Ne radi ekran',
+            'status': status,
+            'assigned_technician_id': rng.choice(user_ids[1:]),
+            'created_by_id': user_ids[0],
+            'created_at': created_at,
+            'updated_at': created_at,
+            'final_price': Decimal(rng.randint(20, 200) * 100) if closed else None,
+            'is_paid': status == TicketStatus.DELIVERED,
+            'warranty_days': 45,
+            'closed_at': created_at + timedelta(days=rng.randint(1, 10)) if closed else None,
+            'ready_at': created_at + timedelta(days=rng.randint(1, 5)) if status == TicketStatus.READY else None,
+            'notification_count': 0,
+            'last_notified_at': None,
+        }
+        row['search_text'] = ticket_search_text(SimpleNamespace(customer_company_name=None, **{
+            k: row[k] for k in ('customer_name', 'customer_phone', 'brand', 'model', 'imei', 'ticket_number')
+        }))
+        rows.append(row)
+
+    # READY nalozi koji čekaju: 1-6 poziva kupcu
+    notified = {}
+    for i, row in enumerate(rows):
+        if row['status'] == TicketStatus.READY:
+            calls = rng.randint(1, 6)
+            row['notification_count'] = calls
+            row['last_notified_at'] = (row['ready_at'] + timedelta(days=15 * calls)).replace(tzinfo=timezone.utc)
+            notified[i] = calls
+
+    ids = _bulk(ServiceTicket, rows, returning=True)
+    logs = []
+    for i, calls in notified.items():
+        for call in range(calls):
+            logs.append({
+                'ticket_id': ids[i],
+                'timestamp': (rows[i]['ready_at'] + timedelta(days=15 * (call + 1))).replace(tzinfo=timezone.utc),
+                'notification_type': 'CALL',
+                'comment': 'Ne javlja se',
+                'contact_successful': False,
+            })
+    _bulk(TicketNotificationLog, logs)
+    dataset.counts['tickets'] += len(rows)
+    dataset.counts['notifications'] += len(logs)
+
+
+def _generate_stock(rng, tenant_id, location_ids, user_id, volumes, now, dataset):
+    goods = []
+    for n in range(volumes['goods_items']):
+        price = rng.randint(5, 60) * 100
+        goods.append({
+            'tenant_id': tenant_id, 'location_id': location_ids[0],
+            'name': f'{rng.choice(GOODS)} {rng.choice(DEVICES)[1]} #{n}',
+            'barcode': f'860{rng.randint(10 ** 9, 10 ** 10 - 1)}', 'sku': f'SKU-{n:05d}',
+            'purchase_price': Decimal(price // 2), 'selling_price': Decimal(price),
+            'current_stock': rng.randint(20, 200), 'tax_label': 'A',
+        })
+    goods_ids = _bulk(GoodsItem, goods, returning=True)
+
+    movements, balances = [], {}
+    for _ in range(volumes['stock_movements']):
+        goods_id = rng.choice(goods_ids)
+        before = balances.get(goods_id, 0)
+        movement_type, quantity = (MovementType.RECEIVE, rng.randint(5, 50)) if before < 10 else \
+            (MovementType.SALE, -rng.randint(1, min(5, before)))
+        balances[goods_id] = before + quantity
+        movements.append({
+            'tenant_id': tenant_id, 'location_id': location_ids[0], 'goods_item_id': goods_id,
+            'movement_type': movement_type, 'quantity': quantity, 'balance_before': before,
+            'balance_after': before + quantity, 'user_id': user_id,
+            'created_at': now - timedelta(days=rng.uniform(0, 180)),
+        })
+    _bulk(StockMovement, movements)
+    dataset.counts['stock_movements'] += len(movements)
+
+    _bulk(SparePart, [{
+        'tenant_id': tenant_id, 'location_id': location_ids[0],
+        'part_name': f'Ekran {rng.choice(DEVICES)[1]} #{n}', 'part_category': PartCategory.DISPLAY,
+        'quantity': rng.randint(0, 10), 'visibility': PartVisibility.PRIVATE,
+        'purchase_price': Decimal(3000), 'selling_price': Decimal(6000),
+    } for n in range(volumes['spare_parts'])])
+    _bulk(PhoneListing, [{
+        'tenant_id': tenant_id, 'location_id': location_ids[0],
+        'brand': brand, 'model': model, 'imei': str(rng.randint(10 ** 14, 10 ** 15 - 1)),
+        'purchase_price': Decimal(30000), 'sales_price': Decimal(45000), 'sold': False,
+    } for brand, model in (rng.choice(DEVICES) for _ in range(volumes['phones']))])
+    return goods_ids
+
+
+def _generate_receipts(rng, tenant_id, location_id, user_id, goods_ids, count, now, dataset):
+    session = CashRegisterSession(tenant_id=tenant_id, location_id=location_id, date=date.today(),
+                                  opened_by_id=user_id)
+    db.session.add(session)
+    db.session.flush()
+
+    receipts = []
+    for n in range(count):
+        total = Decimal(rng.randint(5, 100) * 100)
+        created_at = now - timedelta(days=rng.uniform(1, 180))
+        receipts.append({
+            'tenant_id': tenant_id, 'session_id': session.id,
+            'receipt_number': f'{created_at:%Y%m%d}-B{n:05d}', 'receipt_type': ReceiptType.SALE,
+            'status': ReceiptStatus.ISSUED, 'subtotal': total, 'total_amount': total,
+            'total_cost': total / 2, 'profit': total / 2, 'payment_method': PaymentMethod.CASH,
+            'issued_by_id': user_id, 'issued_at': created_at, 'created_at': created_at,
+        })
+    receipt_ids = _bulk(Receipt, receipts, returning=True)
+    _bulk(ReceiptItem, [{
+        'receipt_id': receipt_id, 'item_type': SaleItemType.GOODS, 'goods_item_id': rng.choice(goods_ids),
+        'item_name': 'Artikal', 'quantity': 1, 'unit_price': receipt['total_amount'] / 2,
+        'line_total': receipt['total_amount'] / 2,
+    } for receipt_id, receipt in zip(receipt_ids, receipts) for _ in range(2)])
+    dataset.counts['receipts'] += len(receipts)
+
+
+def _generate_threads(rng, tenant_id, user_id, volumes, now, dataset):
+    threads = [{
+        'tenant_id': tenant_id, 'thread_type': ThreadType.SUPPORT, 'status': ThreadStatus.OPEN,
+        'subject': f'Pitanje #{n}', 'created_at': now - timedelta(days=rng.uniform(1, 90)),
+        'last_reply_at': now - timedelta(hours=rng.uniform(1, 500)),
+    } for n in range(volumes['threads'])]
+    thread_ids = _bulk(MessageThread, threads, returning=True)
+    _bulk(ThreadParticipant, [{
+        'thread_id': thread_id, 'tenant_id': tenant_id, 'user_id': user_id, 'role': 'OWNER',
+        'last_read_at': (now - timedelta(days=rng.uniform(0, 30))).replace(tzinfo=timezone.utc),
+    } for thread_id in thread_ids])
+    messages = [{
+        'thread_id': thread_id, 'sender_tenant_id': tenant_id, 'sender_user_id': user_id,
+        'body': 'Poruka', 'created_at': thread['created_at'] + timedelta(hours=m),
+    } for thread_id, thread in zip(thread_ids, threads) for m in range(volumes['messages_per_thread'])]
+    _bulk(Message, messages)
+    dataset.counts['messages'] += len(messages)
+
+
+def _generate_invoices(rng, tenant_id, count, now, dataset):
+    rows = []
+    for month in range(1, count + 1):
+        period_start = (now.replace(day=1) - timedelta(days=31 * month)).replace(day=1).date()
+        unpaid = month <= 2
+        rows.append({
+            'tenant_id': tenant_id, 'invoice_number': f'SH-B{tenant_id:03d}-{month:04d}',
+            'period_start': period_start, 'period_end': period_start + timedelta(days=27),
+            'subtotal': Decimal(3600), 'total_amount': Decimal(3600), 'currency': 'RSD',
+            'status': 'PENDING' if unpaid else 'PAID', 'due_date': period_start + timedelta(days=15),
+            'payment_reference': f'{tenant_id:05d}-{month:04d}',
+            'paid_at': None if unpaid else datetime.combine(period_start + timedelta(days=10), datetime.min.time()),
+        })
+    _bulk(SubscriptionPayment, rows)
+    dataset.counts['invoices'] += len(rows)
+
+
+def _generate_marketplace(rng, scale, now, dataset):
+    listings = []
+    for n in range(SUPPLIERS):
+        supplier = Supplier(name=f'Bench Dobavljač {n + 1}', slug=f'bench-dobavljac-{n + 1}',
+                            email=f'dobavljac{n + 1}@bench.rs', status=SupplierStatus.ACTIVE)
+        db.session.add(supplier)
+        db.session.flush()
+        for i in range(max(1, int(LISTINGS_PER_SUPPLIER * scale))):
+            brand, model = rng.choice(DEVICES)
+            category = rng.choice(LISTING_CATEGORIES)
+            price = Decimal(rng.randint(10, 150))
+            listings.append({
+                'supplier_id': supplier.id, 'name': f'{category.title()} {brand} {model}',
+                'brand': brand.upper(), 'model_compatibility': model, 'part_category': category,
+                'part_number': f'P{n:02d}-{i:05d}', 'quality_grade': rng.choice(['ORIGINAL', 'OEM', 'COPY']),
+                'is_original': rng.random() < 0.3, 'price': price, 'currency': 'EUR', 'price_eur': price,
+                'price_rsd': price * 117, 'stock_quantity': rng.randint(0, 30), 'is_active': True,
+            })
+    _bulk(SupplierListing, listings)
+    dataset.counts['listings'] += len(listings)
+
+
+def _generate_bank_import(rng, now, dataset):
+    bank_import = BankStatementImport(filename='bench.xml', bank_code='ALTA', statement_date=now.date())
+    db.session.add(bank_import)
+    db.session.flush()
+
+    rows = []
+    for n in range(BANK_TRANSACTIONS):
+        tenant = rng.choice(dataset.tenants)
+        rows.append({
+            'import_id': bank_import.id, 'transaction_hash': f'bench-{n:06d}', 'transaction_type': 'CREDIT',
+            'transaction_date': (now - timedelta(days=rng.randint(0, 60))).date(),
+            'amount': Decimal(3600), 'currency': 'RSD', 'payer_name': f'Bench Servis {tenant["id"]}',
+            'payment_reference': f'97 {rng.randint(10 ** 9, 10 ** 10 - 1)}', 'match_status': 'UNMATCHED',
+        })
+    ids = _bulk(BankTransaction, rows, returning=True)
+    dataset.unmatched_transaction_id = ids[0]
+    dataset.counts['bank_transactions'] += len(rows)
@@ -0,0 +1,206 @@
+"""
+Merenje scenarija i poređenje sa baseline.json.
+
+Za svaki scenario: zagrevanje, pa N ponavljanja - latencija
+(perf_counter) i broj SQL upita (before_cursor_execute na engine-u).
+Broj upita uzima medijanu ponavljanja, latencija p50/p95.
+"""
+
+import contextlib
+import io
+import json
+import math
+import os
+import time
+from datetime import timedelta
+
+from sqlalchemy import event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.types import BigInteger
+
+from app.config import TestingConfig
+from app.extensions import db
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Regresija upita: više od baseline + max(QUERY_TOLERANCE_ABS, QUERY_TOLERANCE_PCT)
+QUERY_TOLERANCE_ABS = 2
+QUERY_TOLERANCE_PCT = 0.10
+# Regresija latencije: p50 > baseline * LATENCY_FACTOR i bar LATENCY_MIN_MS sporije
+LATENCY_FACTOR = 1.5
+LATENCY_MIN_MS = 5.0
+
+
+@compiles(BigInteger, 'sqlite')
+def _bigint_sqlite(type_, compiler, **kw):
+    # SQLite autoincrement radi samo za INTEGER PRIMARY KEY
+    return 'INTEGER'
+
+
+class BenchmarkConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=4)
+    SCHEDULER_ENABLED = False
+    SQL_PROFILER_ENABLED = False
+    RATELIMIT_ENABLED = False
+    # Greška u endpointu je HTTP 500 u rezultatu, ne prekid celog run-a
+    PROPAGATE_EXCEPTIONS = False
+
+
+def create_benchmark_app(database_url=None):
+    """Flask app nad benchmark bazom (podrazumevano SQLite u memoriji)."""
+    from app import create_app
+
+    config = type('BenchmarkRunConfig', (BenchmarkConfig,), {})
+    if database_url:
+        if 'bench' not in database_url.rsplit('/', 1)[-1]:
+            raise SystemExit('Benchmark briše tabele - ime baze mora sadržati "bench"')
+        config.SQLALCHEMY_DATABASE_URI = database_url
+    else:
+        from sqlalchemy.pool import StaticPool
+        # Jedna konekcija - ista baza u memoriji za sve sesije
+        config.SQLALCHEMY_ENGINE_OPTIONS = {
+            'poolclass': StaticPool, 'connect_args': {'check_same_thread': False},
+        }
+    return create_app(config)
+
+
+def _register_sqlite_now(engine):
+    if engine.dialect.name != 'sqlite':
+        return
+
+    from datetime import datetime
+
+    @event.listens_for(engine, 'connect')
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.create_function('NOW', 0, lambda: datetime.utcnow().isoformat())
+
+    # StaticPool konekcija je možda već otvorena
+    with engine.connect() as conn:
+        conn.connection.driver_connection.create_function(
+            'NOW', 0, lambda: datetime.utcnow().isoformat())
+
+
+class QueryCounter:
+    """Broji SQL naredbe na engine-u dok je aktivan."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _before(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._before)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._before)
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def measure(ctx, scenarios, repeat=10, warmup=2):
+    """
+    Izmeri scenarije.
+
+    Returns:
+        {name: {'status', 'queries', 'p50_ms', 'p95_ms'}}
+    """
+    results = {}
+    for scenario in scenarios:
+        durations, queries, status = [], [], None
+        for iteration in range(warmup + repeat):
+            with ctx.app.app_context():
+                if scenario.reset:
+                    scenario.reset(ctx)
+                with QueryCounter(db.engine) as counter:
+                    started = time.perf_counter()
+                    # print() dijagnostika u endpointima ne ide u izveštaj
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        status = scenario.run(ctx)
+                    elapsed = (time.perf_counter() - started) * 1000
+                db.session.remove()
+            if iteration >= warmup:
+                durations.append(elapsed)
+                queries.append(counter.count)
+        results[scenario.name] = {
+            'status': status,
+            'queries': _percentile(queries, 50),
+            'p50_ms': round(_percentile(durations, 50), 2),
+            'p95_ms': round(_percentile(durations, 95), 2),
+        }
+    return results
+
+
+# ============================================
+# BASELINE
+# ============================================
+
+def profile_key(dialect, tenants, scale):
+    return f'{dialect}/tenants={tenants}/scale={scale:g}'
+
+
+def load_baseline(path=BASELINE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(profile, results, path=BASELINE_PATH, fields=('queries', 'p50_ms')):
+    baseline = load_baseline(path)
+    baseline[profile] = {
+        name: {field: r[field] for field in fields} for name, r in sorted(results.items())
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(results, baseline, check_latency=True) -> list:
+    """
+    Regresije u odnosu na baseline profila.
+
+    Returns:
+        [(scenario, poruka), ...] - prazno ako nema regresija
+    """
+    problems = []
+    for name, result in results.items():
+        if result['status'] >= 400:
+            problems.append((name, f"HTTP {result['status']}"))
+            continue
+        reference = baseline.get(name)
+        if not reference:
+            continue
+
+        allowed = reference['queries'] + max(
+            QUERY_TOLERANCE_ABS, math.ceil(reference['queries'] * QUERY_TOLERANCE_PCT))
+        if result['queries'] > allowed:
+            problems.append((name, f"upita {result['queries']} (baseline {reference['queries']})"))
+
+        if check_latency:
+            limit = max(reference['p50_ms'] * LATENCY_FACTOR, reference['p50_ms'] + LATENCY_MIN_MS)
+            if result['p50_ms'] > limit:
+                problems.append((name, f"p50 {result['p50_ms']} ms (baseline {reference['p50_ms']} ms)"))
+    return problems
+
+
+def setup_database(app, tenants, scale, seed):
+    """Kreiraj tabele i generiši podatke; vraća Dataset."""
+    from benchmarks.data import generate
+
+    with app.app_context():
+        _register_sqlite_now(db.engine)
+        db.drop_all()
+        db.create_all()
+        dataset = generate(tenants=tenants, scale=scale, seed=seed)
+        db.session.remove()
+    return dataset
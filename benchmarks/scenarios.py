@@ -0,0 +1,121 @@
+"""
+Scenariji koji se mere - ključni endpointi (Flask test client) i servisni
+pozivi nad podacima iz data.generate().
+
+Scenario.run(ctx) vraća HTTP status (ili 200 za servisni poziv);
+Scenario.reset(ctx) vraća bazu u stanje pre poziva kada scenario piše,
+da bi svako ponavljanje radilo isti posao.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from app.extensions import db
+from app.models import SubscriptionPayment, TenantMessage, Receipt, ReceiptItem, GoodsItem, StockMovement
+from app.api.middleware.jwt_utils import create_access_token, create_admin_access_token
+
+
+@dataclass
+class Scenario:
+    name: str
+    run: Callable
+    reset: Optional[Callable] = None
+
+
+class Context:
+    """Klijent, tokeni i ID-evi za scenarije (prvi tenant je 'aktivni' korisnik)."""
+
+    def __init__(self, app, dataset):
+        self.app = app
+        self.dataset = dataset
+        self.client = app.test_client()
+        self.started = datetime.utcnow()
+        tenant = dataset.tenants[0]
+        self.tenant_id = tenant['id']
+        self.location_id = tenant['location_id']
+        with app.app_context():
+            self.user_headers = {'Authorization': 'Bearer ' + create_access_token(
+                tenant['owner_id'], tenant['id'], 'OWNER')}
+            self.admin_headers = {'Authorization': 'Bearer ' + create_admin_access_token(
+                dataset.admin_id, 'SUPER_ADMIN')}
+            self.goods_id = db.session.query(GoodsItem.id).filter(
+                GoodsItem.tenant_id == self.tenant_id).order_by(GoodsItem.id).limit(1).scalar()
+
+    def get(self, url, admin=False):
+        return self.client.get(url, headers=self.admin_headers if admin else self.user_headers).status_code
+
+    def post(self, url, json=None, admin=False):
+        return self.client.post(url, json=json or {},
+                                headers=self.admin_headers if admin else self.user_headers).status_code
+
+
+# ============================================
+# SCENARIJI SA UPISOM
+# ============================================
+
+def _quick_issue(ctx):
+    return ctx.post('/api/v1/pos/receipts/quick', {
+        'items': [{'type': 'GOODS', 'id': ctx.goods_id, 'quantity': 1}],
+        'payment_method': 'CASH',
+        'location_id': ctx.location_id,
+    })
+
+
+def _reset_quick_issue(ctx):
+    """Obriši račune izdate tokom benchmarka i vrati zalihu."""
+    receipt_ids = [r for (r,) in db.session.query(Receipt.id).filter(
+        Receipt.tenant_id == ctx.tenant_id, Receipt.created_at >= ctx.started)]
+    if receipt_ids:
+        db.session.query(ReceiptItem).filter(ReceiptItem.receipt_id.in_(receipt_ids)).delete(
+            synchronize_session=False)
+        db.session.query(Receipt).filter(Receipt.id.in_(receipt_ids)).delete(synchronize_session=False)
+    sold = db.session.query(StockMovement).filter(
+        StockMovement.goods_item_id == ctx.goods_id, StockMovement.created_at >= ctx.started)
+    returned = sum(-m.quantity for m in sold)
+    sold.delete(synchronize_session=False)
+    if returned:
+        db.session.query(GoodsItem).filter(GoodsItem.id == ctx.goods_id).update(
+            {GoodsItem.current_stock: GoodsItem.current_stock + returned}, synchronize_session=False)
+    db.session.commit()
+
+
+def _monthly_invoices(ctx):
+    from app.services.billing_tasks import BillingTasksService
+    BillingTasksService.generate_monthly_invoices()
+    return 200
+
+
+def _reset_monthly_invoices(ctx):
+    """Obriši fakture tekućeg perioda i poruke koje je generisanje poslalo."""
+    period_start = datetime.utcnow().replace(day=1).date()
+    db.session.query(SubscriptionPayment).filter(
+        SubscriptionPayment.period_start >= period_start).delete(synchronize_session=False)
+    db.session.query(TenantMessage).filter(TenantMessage.created_at >= ctx.started).delete(
+        synchronize_session=False)
+    db.session.commit()
+
+
+# ============================================
+# LISTA
+# ============================================
+
+def build(ctx) -> list:
+    """Svi scenariji, redom kojim se mere."""
+    return [
+        Scenario('tickets.list', lambda c: c.get('/api/v1/tickets?per_page=50')),
+        Scenario('tickets.search', lambda c: c.get('/api/v1/tickets?search=petrovic%20iphone')),
+        Scenario('tickets.search_phone', lambda c: c.get('/api/v1/tickets?search=%2B381%2060')),
+        Scenario('tickets.warranties', lambda c: c.get('/api/v1/tickets/warranties')),
+        Scenario('tickets.trend', lambda c: c.get('/api/v1/tickets/stats/trend')),
+        Scenario('pos.search_items', lambda c: c.get('/api/v1/pos/search-items?q=maska')),
+        Scenario('pos.quick_issue', _quick_issue, _reset_quick_issue),
+        Scenario('marketplace.parts', lambda c: c.get('/api/v1/marketplace/parts?q=iphone')),
+        Scenario('part_offers.search',
+                 lambda c: c.get('/api/v1/part-offers/search?brand=Apple&model=iPhone%2013')),
+        Scenario('threads.list', lambda c: c.get('/api/v1/threads')),
+        Scenario('admin.dashboard_stats', lambda c: c.get('/api/admin/dashboard/stats', admin=True)),
+        Scenario('admin.bank_suggestions', lambda c: c.get(
+            f'/api/admin/bank-transactions/{c.dataset.unmatched_transaction_id}/suggestions', admin=True)),
+        Scenario('billing.monthly_invoices', _monthly_invoices, _reset_monthly_invoices),
+    ]
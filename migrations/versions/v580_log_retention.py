@@ -0,0 +1,78 @@
+"""Log retention: arhivske tabele (mesecne particije) i dnevni agregati
+
+Revision ID: v580_log_retention
+Revises: v579_add_heroku_cname_target
+Create Date: 2026-10-18
+
+Append-only logovi (audit_log, security_event, pos_audit_log,
+spare_part_log, tenant_sms_usage) dobijaju <tabela>_archive.
+Na PostgreSQL-u je arhiva PARTITION BY RANGE (created_at);
+mesecne particije kreira LogRetentionService po potrebi.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'v580_log_retention'
+down_revision = 'v579_add_heroku_cname_target'
+branch_labels = None
+depends_on = None
+
+
+LOG_TABLES = ['audit_log', 'security_event', 'pos_audit_log', 'spare_part_log', 'tenant_sms_usage']
+
+
+def upgrade():
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == 'postgresql'
+
+    for table in LOG_TABLES:
+        archive = f'{table}_archive'
+        if is_postgres:
+            # LIKE kopira kolone i NOT NULL, bez default-a i FK-ova
+            op.execute(f'CREATE TABLE {archive} (LIKE {table}) PARTITION BY RANGE (created_at)')
+            op.execute(f'ALTER TABLE {archive} ADD PRIMARY KEY (id, created_at)')
+        else:
+            op.execute(f'CREATE TABLE {archive} AS SELECT * FROM {table} WHERE 1 = 0')
+        op.create_index(f'ix_{archive}_tenant_created', archive, ['tenant_id', 'created_at'])
+
+    # Dnevni agregati
+    op.create_table(
+        'log_daily_rollup',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('source', sa.String(40), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=True),
+        sa.Column('bucket', sa.String(100), nullable=False),
+        sa.Column('event_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('amount', sa.Numeric(14, 4), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_log_rollup_source_day', 'log_daily_rollup', ['source', 'day'])
+    op.create_index('ix_log_rollup_tenant_source_day', 'log_daily_rollup', ['tenant_id', 'source', 'day'])
+
+    # Rotacija trazi MIN(created_at) po tabeli
+    op.create_index('ix_spare_part_log_created_at', 'spare_part_log', ['created_at'])
+
+    # Istorija naloga: ORDER BY created_at DESC LIMIT 50 direktno iz indeksa
+    op.create_index(
+        'ix_audit_tenant_entity_created', 'audit_log',
+        ['tenant_id', 'entity_type', 'entity_id', 'created_at']
+    )
+    op.drop_index('ix_audit_tenant_entity', 'audit_log')
+
+
+def downgrade():
+    op.create_index('ix_audit_tenant_entity', 'audit_log', ['tenant_id', 'entity_type', 'entity_id'])
+    op.drop_index('ix_audit_tenant_entity_created', 'audit_log')
+    op.drop_index('ix_spare_part_log_created_at', 'spare_part_log')
+
+    op.drop_index('ix_log_rollup_tenant_source_day', 'log_daily_rollup')
+    op.drop_index('ix_log_rollup_source_day', 'log_daily_rollup')
+    op.drop_table('log_daily_rollup')
+
+    # Na PostgreSQL-u DROP parent tabele brise i sve particije
+    cascade = ' CASCADE' if op.get_bind().dialect.name == 'postgresql' else ''
+    for table in LOG_TABLES:
+        op.execute(f'DROP TABLE IF EXISTS {table}_archive{cascade}')
@@ -0,0 +1,87 @@
+"""POS: tekući brojači sesije kase (cash_register_totals)
+
+Revision ID: v581_pos_register_totals
+Revises: v580_log_retention
+Create Date: 2026-10-18
+
+Jedan red po (sesija, valuta) sa iznosima i brojevima računa/stavki.
+POSService ih ažurira atomično pri izdavanju/storniranju/refundu, pa
+X/Z izveštaj više ne skenira sve račune dana. Postojeće sesije se
+popunjavaju iz računa.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'v581_pos_register_totals'
+down_revision = 'v580_log_retention'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'cash_register_totals',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('session_id', sa.Integer(),
+                  sa.ForeignKey('cash_register_session.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('currency', sa.String(3), nullable=False, server_default='RSD'),
+        sa.Column('revenue', sa.Numeric(12, 2), nullable=False, server_default='0'),
+        sa.Column('cost', sa.Numeric(12, 2), nullable=False, server_default='0'),
+        sa.Column('profit', sa.Numeric(12, 2), nullable=False, server_default='0'),
+        sa.Column('cash', sa.Numeric(12, 2), nullable=False, server_default='0'),
+        sa.Column('card', sa.Numeric(12, 2), nullable=False, server_default='0'),
+        sa.Column('transfer', sa.Numeric(12, 2), nullable=False, server_default='0'),
+        sa.Column('receipt_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('voided_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('items_sold', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('phones_sold', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('parts_sold', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('services_sold', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('session_id', 'currency', name='uq_register_totals_session_currency'),
+    )
+
+    # Backfill iz postojećih računa (ista pravila kao POSService.recompute_session_totals)
+    op.execute("""
+        INSERT INTO cash_register_totals (
+            session_id, currency, revenue, cost, profit, cash, card, transfer,
+            receipt_count, voided_count, items_sold, phones_sold, parts_sold, services_sold,
+            updated_at
+        )
+        SELECT
+            r.session_id,
+            COALESCE(r.currency, 'RSD'),
+            SUM(CASE WHEN r.status = 'ISSUED' THEN COALESCE(r.total_amount, 0) ELSE 0 END),
+            SUM(CASE WHEN r.status = 'ISSUED' THEN COALESCE(r.total_cost, 0) ELSE 0 END),
+            SUM(CASE WHEN r.status = 'ISSUED' THEN COALESCE(r.profit, 0) ELSE 0 END),
+            SUM(CASE WHEN r.status = 'ISSUED' AND r.payment_method = 'CASH' AND r.cash_received IS NOT NULL
+                     THEN r.cash_received - COALESCE(r.cash_change, 0) ELSE 0 END),
+            SUM(CASE WHEN r.status = 'ISSUED' THEN COALESCE(r.card_amount, 0) ELSE 0 END),
+            SUM(CASE WHEN r.status = 'ISSUED' THEN COALESCE(r.transfer_amount, 0) ELSE 0 END),
+            SUM(CASE WHEN r.status = 'ISSUED' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN r.status = 'VOIDED' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN r.status = 'ISSUED' THEN COALESCE(i.qty, 0) ELSE 0 END),
+            SUM(CASE WHEN r.status = 'ISSUED' THEN COALESCE(i.phones, 0) ELSE 0 END),
+            SUM(CASE WHEN r.status = 'ISSUED' THEN COALESCE(i.parts, 0) ELSE 0 END),
+            SUM(CASE WHEN r.status = 'ISSUED' THEN COALESCE(i.services, 0) ELSE 0 END),
+            CURRENT_TIMESTAMP
+        FROM receipt r
+        LEFT JOIN (
+            SELECT
+                receipt_id,
+                SUM(quantity) AS qty,
+                SUM(CASE WHEN item_type = 'PHONE' THEN quantity ELSE 0 END) AS phones,
+                SUM(CASE WHEN item_type = 'SPARE_PART' THEN quantity ELSE 0 END) AS parts,
+                SUM(CASE WHEN item_type = 'SERVICE' THEN quantity ELSE 0 END) AS services
+            FROM receipt_item
+            GROUP BY receipt_id
+        ) i ON i.receipt_id = r.id
+        WHERE r.session_id IS NOT NULL
+        GROUP BY r.session_id, COALESCE(r.currency, 'RSD')
+    """)
+
+
+def downgrade():
+    op.drop_table('cash_register_totals')
@@ -0,0 +1,52 @@
+"""Ledger checkpoint-i stanja zaliha (stock_balance_snapshot)
+
+Revision ID: v582_stock_balance_snapshot
+Revises: v581_pos_register_totals
+Create Date: 2026-10-18
+
+Noćni job upisuje stanje po (lokacija, artikal) za parove sa pokretima
+od prethodnog checkpoint-a. Istorijsko stanje i vrednovanje zaliha se
+računaju iz najbližeg checkpoint-a i kratkog repa stock_movement-a.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'v582_stock_balance_snapshot'
+down_revision = 'v581_pos_register_totals'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'stock_balance_snapshot',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('tenant_id', sa.Integer(), sa.ForeignKey('tenant.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('location_id', sa.Integer(),
+                  sa.ForeignKey('service_location.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('goods_item_id', sa.Integer(), nullable=True),
+        sa.Column('spare_part_id', sa.BigInteger(), nullable=True),
+        sa.Column('snapshot_at', sa.DateTime(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('unit_cost', sa.Numeric(10, 2), nullable=True),
+        sa.Column('last_movement_id', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_stock_snapshot_tenant_at', 'stock_balance_snapshot', ['tenant_id', 'snapshot_at'])
+    op.create_index('ix_stock_snapshot_goods_at', 'stock_balance_snapshot',
+                    ['goods_item_id', 'location_id', 'snapshot_at'])
+    op.create_index('ix_stock_snapshot_spare_at', 'stock_balance_snapshot',
+                    ['spare_part_id', 'location_id', 'snapshot_at'])
+
+    # Rep upita: poslednji pokret po tenantu posle checkpoint-a
+    op.create_index('ix_movement_tenant_created', 'stock_movement', ['tenant_id', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_movement_tenant_created', table_name='stock_movement')
+    op.drop_index('ix_stock_snapshot_spare_at', table_name='stock_balance_snapshot')
+    op.drop_index('ix_stock_snapshot_goods_at', table_name='stock_balance_snapshot')
+    op.drop_index('ix_stock_snapshot_tenant_at', table_name='stock_balance_snapshot')
+    op.drop_table('stock_balance_snapshot')
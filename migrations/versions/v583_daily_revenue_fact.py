@@ -0,0 +1,50 @@
+"""Finansije: dnevni agregati prometa (daily_revenue_fact)
+
+Revision ID: v583_daily_revenue_fact
+Revises: v582_stock_balance_snapshot
+Create Date: 2026-10-18
+
+Jedan red po (tenant, lokacija, dan, izvor). Puni ga noćni rollup;
+pokrivene dane beleži revenue_rollup_day (v589), ostali se računaju iz
+izvornih tabela.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'v583_daily_revenue_fact'
+down_revision = 'v582_stock_balance_snapshot'
+branch_labels = None
+depends_on = None
+
+
+AMOUNT_COLUMNS = ['revenue', 'cost', 'profit', 'cash', 'card', 'transfer', 'revenue_eur', 'cash_eur', 'card_eur']
+
+
+def upgrade():
+    op.create_table(
+        'daily_revenue_fact',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('tenant_id', sa.Integer(), sa.ForeignKey('tenant.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('location_id', sa.Integer(), nullable=True),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('source', sa.String(20), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        *[sa.Column(name, sa.Numeric(14, 2), nullable=False, server_default='0') for name in AMOUNT_COLUMNS],
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_revenue_fact_tenant_source_day', 'daily_revenue_fact', ['tenant_id', 'source', 'day'])
+    op.create_index('ix_revenue_fact_day', 'daily_revenue_fact', ['day'])
+
+    # Rollup i paginirani detalji filtriraju po vremenu naplate/prodaje
+    op.create_index('ix_ticket_tenant_paid_at', 'service_ticket', ['tenant_id', 'paid_at'])
+    op.create_index('ix_phone_tenant_sold_at', 'phone_listing', ['tenant_id', 'sold_at'])
+
+
+def downgrade():
+    op.drop_index('ix_phone_tenant_sold_at', table_name='phone_listing')
+    op.drop_index('ix_ticket_tenant_paid_at', table_name='service_ticket')
+    op.drop_index('ix_revenue_fact_day', table_name='daily_revenue_fact')
+    op.drop_index('ix_revenue_fact_tenant_source_day', table_name='daily_revenue_fact')
+    op.drop_table('daily_revenue_fact')
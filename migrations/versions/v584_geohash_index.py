@@ -0,0 +1,75 @@
+"""B2C: geohash kolone za pretragu po blizini (service_location, service_request)
+
+Revision ID: v584_geohash_index
+Revises: v583_daily_revenue_fact
+Create Date: 2026-10-18
+
+Geohash (preciznost 9) se računa iz latitude/longitude; btree index
+omogućava range upite po ćelijama bez PostGIS-a. Postojeći redovi se
+popunjavaju u batch-evima.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'v584_geohash_index'
+down_revision = 'v583_daily_revenue_fact'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ['service_location', 'service_request']
+BATCH_SIZE = 1000
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def _encode(latitude, longitude, precision=9):
+    """Kopija app.utils.geo.encode_geohash (migracija ne zavisi od app koda)."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coord = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if coord >= mid:
+            value = (value << 1) | 1
+            rng[0] = mid
+        else:
+            value <<= 1
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def upgrade():
+    for table in TABLES:
+        op.add_column(table, sa.Column('geohash', sa.String(12), nullable=True))
+        op.create_index(f'ix_{table}_geohash', table, ['geohash'])
+
+    conn = op.get_bind()
+    for table in TABLES:
+        last_id = 0
+        while True:
+            rows = conn.execute(sa.text(
+                f"SELECT id, latitude, longitude FROM {table} "
+                f"WHERE id > :last_id AND latitude IS NOT NULL AND longitude IS NOT NULL "
+                f"ORDER BY id LIMIT {BATCH_SIZE}"
+            ), {'last_id': last_id}).fetchall()
+            if not rows:
+                break
+            conn.execute(
+                sa.text(f"UPDATE {table} SET geohash = :geohash WHERE id = :id"),
+                [{'id': r.id, 'geohash': _encode(r.latitude, r.longitude)} for r in rows]
+            )
+            last_id = rows[-1].id
+
+
+def downgrade():
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_geohash', table_name=table)
+        op.drop_column(table, 'geohash')
@@ -0,0 +1,30 @@
+"""SMS: processed_at na sms_dlr_log (batch obrada DLR callback-ova)
+
+Revision ID: v585_dlr_processed_at
+Revises: v584_geohash_index
+Create Date: 2026-10-18
+
+Webhook samo prima DLR, a status i refund primenjuje batch obrada;
+sms_dlr_log je trajni red čekanja (processed_at IS NULL). Postojeći
+redovi su već obrađeni sinhrono.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'v585_dlr_processed_at'
+down_revision = 'v584_geohash_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('sms_dlr_log', sa.Column('processed_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE sms_dlr_log SET processed_at = received_at")
+    op.create_index('ix_sms_dlr_log_processed_at', 'sms_dlr_log', ['processed_at'])
+
+
+def downgrade():
+    op.drop_index('ix_sms_dlr_log_processed_at', table_name='sms_dlr_log')
+    op.drop_column('sms_dlr_log', 'processed_at')
@@ -0,0 +1,47 @@
+"""Keyset paginacija: (vlasnik, created_at, id) indeksi za velike liste
+
+Revision ID: v586_keyset_indexes
+Revises: v585_dlr_processed_at
+Create Date: 2026-10-18
+
+Liste se čitaju sa WHERE (created_at, id) < (:c, :i) ORDER BY created_at
+DESC, id DESC; id na kraju indeksa čini to jednim range scan-om. Indeksi
+(tenant_id, created_at) naloga i SMS potrošnje su prefiks novih pa se
+zamenjuju.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'v586_keyset_indexes'
+down_revision = 'v585_dlr_processed_at'
+branch_labels = None
+depends_on = None
+
+
+NEW_INDEXES = [
+    ('ix_ticket_tenant_created_id', 'service_ticket', ['tenant_id', 'created_at', 'id']),
+    ('ix_sms_usage_tenant_created_id', 'tenant_sms_usage', ['tenant_id', 'created_at', 'id']),
+    ('ix_receipt_tenant_created_id', 'receipt', ['tenant_id', 'created_at', 'id']),
+    ('ix_credit_txn_balance_created_id', 'credit_transaction', ['credit_balance_id', 'created_at', 'id']),
+    ('ix_message_thread_id_id', 'message', ['thread_id', 'id']),
+]
+
+REPLACED_INDEXES = [
+    ('ix_ticket_tenant_created', 'service_ticket', ['tenant_id', 'created_at']),
+    ('ix_sms_usage_tenant_created', 'tenant_sms_usage', ['tenant_id', 'created_at']),
+]
+
+
+def upgrade():
+    for name, table, columns in NEW_INDEXES:
+        op.create_index(name, table, columns)
+    for name, table, _ in REPLACED_INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade():
+    for name, table, columns in REPLACED_INDEXES:
+        op.create_index(name, table, columns)
+    for name, table, _ in NEW_INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,121 @@
+"""Pretraga naloga: search_text + trigram index (PostgreSQL) / FTS5 (SQLite)
+
+Revision ID: v587_ticket_search
+Revises: v586_keyset_indexes
+Create Date: 2026-10-18
+
+search_text je normalizovan kupac/telefon/uređaj/IMEI/broj naloga
+(app.utils.search). Na PostgreSQL-u GIN trigram index (pg_trgm) pokriva
+LIKE '%...%' po terminu; na SQLite-u FTS5 trigram shadow tabela sa
+trigerima. Postojeći nalozi se popunjavaju u batch-evima.
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'v587_ticket_search'
+down_revision = 'v586_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+
+BATCH_SIZE = 1000
+
+SQLITE_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS service_ticket_fts "
+    "USING fts5(search_text, tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS service_ticket_fts_ai AFTER INSERT ON service_ticket BEGIN "
+    "INSERT INTO service_ticket_fts(rowid, search_text) VALUES (new.id, new.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS service_ticket_fts_au AFTER UPDATE OF search_text ON service_ticket BEGIN "
+    "DELETE FROM service_ticket_fts WHERE rowid = old.id; "
+    "INSERT INTO service_ticket_fts(rowid, search_text) VALUES (new.id, new.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS service_ticket_fts_ad AFTER DELETE ON service_ticket BEGIN "
+    "DELETE FROM service_ticket_fts WHERE rowid = old.id; END",
+)
+
+_TRANSLIT = {'đ': 'dj', 'Đ': 'dj', 'ß': 'ss', 'æ': 'ae', 'ø': 'o'}
+
+
+def _text(value):
+    """Kopija app.utils.search.normalize_text (migracija ne zavisi od app koda)."""
+    if not value:
+        return ''
+    chars = []
+    for char in str(value):
+        if char in _TRANSLIT:
+            chars.append(_TRANSLIT[char])
+            continue
+        decomposed = unicodedata.normalize('NFKD', char)
+        chars.append(''.join(c for c in decomposed if not unicodedata.combining(c)).lower())
+    return ' '.join(''.join(chars).split())
+
+
+def _phone(value):
+    """Kopija app.utils.search.normalize_phone."""
+    if not value:
+        return ''
+    raw = str(value).strip()
+    digits = re.sub(r'\D', '', raw)
+    international = raw.startswith('+') or digits.startswith('00')
+    digits = digits[2:] if digits.startswith('00') else digits
+    if digits.startswith('381') and (international or len(digits) >= 11):
+        digits = '0' + digits[3:]
+    return digits
+
+
+def _search_text(row):
+    parts = [
+        _text(row.customer_name), _text(row.customer_company_name), _phone(row.customer_phone),
+        _text(row.brand), _text(row.model), _text(row.imei),
+        f'srv-{row.ticket_number:04d}' if row.ticket_number is not None else '',
+    ]
+    return ' '.join(p for p in parts if p)
+
+
+def upgrade():
+    op.add_column('service_ticket', sa.Column('search_text', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(sa.text(
+            "SELECT id, customer_name, customer_company_name, customer_phone, brand, model, imei, "
+            "ticket_number FROM service_ticket WHERE id > :last_id "
+            f"ORDER BY id LIMIT {BATCH_SIZE}"
+        ), {'last_id': last_id}).fetchall()
+        if not rows:
+            break
+        conn.execute(
+            sa.text("UPDATE service_ticket SET search_text = :search_text WHERE id = :id"),
+            [{'id': r.id, 'search_text': _search_text(r)} for r in rows]
+        )
+        last_id = rows[-1].id
+
+    if conn.dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_ticket_search_text_trgm "
+            "ON service_ticket USING gin (search_text gin_trgm_ops)"
+        )
+    elif conn.dialect.name == 'sqlite':
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+        op.execute(
+            "INSERT INTO service_ticket_fts(rowid, search_text) "
+            "SELECT id, search_text FROM service_ticket"
+        )
+
+
+def downgrade():
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_ticket_search_text_trgm")
+    elif conn.dialect.name == 'sqlite':
+        for trigger in ('ai', 'au', 'ad'):
+            op.execute(f"DROP TRIGGER IF EXISTS service_ticket_fts_{trigger}")
+        op.execute("DROP TABLE IF EXISTS service_ticket_fts")
+    op.drop_column('service_ticket', 'search_text')
@@ -0,0 +1,48 @@
+"""Sažetak notifikacija na nalogu (notification_count, last_notified_at)
+
+Revision ID: v588_ticket_notification_summary
+Revises: v587_ticket_search
+Create Date: 2026-10-18
+
+Liste naloga su za can_notify / can_write_off / days_until_can_notify
+brojale i sortirale ticket_notification_log po nalogu. Kolone održava
+TicketNotificationLog.log; postojeći nalozi se popunjavaju iz loga.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'v588_ticket_notification_summary'
+down_revision = 'v587_ticket_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('service_ticket', sa.Column(
+        'notification_count', sa.Integer(), nullable=False, server_default='0'
+    ))
+    op.add_column('service_ticket', sa.Column(
+        'last_notified_at', sa.DateTime(timezone=True), nullable=True
+    ))
+
+    op.execute("""
+        UPDATE service_ticket SET
+            notification_count = (
+                SELECT COUNT(*) FROM ticket_notification_log l
+                WHERE l.ticket_id = service_ticket.id
+            ),
+            last_notified_at = (
+                SELECT MAX(l.timestamp) FROM ticket_notification_log l
+                WHERE l.ticket_id = service_ticket.id
+            )
+        WHERE EXISTS (
+            SELECT 1 FROM ticket_notification_log l WHERE l.ticket_id = service_ticket.id
+        )
+    """)
+
+
+def downgrade():
+    op.drop_column('service_ticket', 'last_notified_at')
+    op.drop_column('service_ticket', 'notification_count')
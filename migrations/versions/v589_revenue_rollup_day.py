@@ -0,0 +1,36 @@
+"""Finansije: dani pokriveni rollup-om (revenue_rollup_day)
+
+Revision ID: v589_revenue_rollup_day
+Revises: v588_ticket_notification_summary
+Create Date: 2026-10-18
+
+Finansijski pregledi su verovali daily_revenue_fact za sve dane do
+poslednjeg rollup-ovanog, pa je noćni rollup (juče + prekjuče) bez
+inicijalnog punjenja sakrivao starije dane. Sada se agregati čitaju
+samo za (dan, izvor) parove upisane ovde; postojeći redovi
+daily_revenue_fact se ne označavaju, pa se do sledećeg rollup-a ti
+dani računaju iz izvornih tabela. Starije periode puni
+flask finance-rollup --days 400 (opciono, samo ubrzava preglede).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'v589_revenue_rollup_day'
+down_revision = 'v588_ticket_notification_summary'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'revenue_rollup_day',
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('source', sa.String(20), primary_key=True),
+        sa.Column('rolled_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade():
+    op.drop_table('revenue_rollup_day')
@@ -5,6 +5,12 @@ ServisHub POS Print Agent
 Standalone HTTP server that receives receipt data from the web app
 and prints directly to a thermal POS printer via ESC/POS commands.
 
+Requests are handled on separate threads and never wait for the printer:
+POST /print writes the job to a spool directory (~/.servishub-agent/spool)
+and answers 202 with a job id. A single worker thread prints the spool in
+order and retries with back-off while the printer is offline, so receipts
+survive printer outages and agent restarts. GET /jobs shows the queue.
+
 Usage:
     # CUPS printer (macOS/Linux - RECOMMENDED, no extra deps):
     python pos_print_agent.py --cups "SPRT_POS891"
@@ -15,6 +21,9 @@ Usage:
     # Network printer:
     python pos_print_agent.py --network 192.168.1.100
 
+    # Logo above the header (PNG, rasterized once and cached):
+    python pos_print_agent.py --cups "SPRT_POS891" --logo logo.png
+
     # List available CUPS printers:
     python pos_print_agent.py --list-printers
 
@@ -32,14 +41,21 @@ Finding Vendor/Product ID (for USB mode):
 """
 
 import argparse
+import collections
+import functools
 import json
 import os
 import ssl
 import subprocess
 import sys
 import tempfile
+import threading
+import time
+import uuid
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+AGENT_VERSION = '1.2.0'
 
 # ---------------------------------------------------------------------------
 # Price formatting helper
@@ -72,7 +88,7 @@ def fmt(val):
 LINE_WIDTH = 42  # characters for 80mm paper
 
 def format_receipt(p, data):
-    """Format and print a receipt using ESC/POS commands."""
+    """Format a receipt as ESC/POS commands on printer object `p`."""
     tenant = data.get('tenant', {})
     receipt = data.get('receipt', {})
     items = receipt.get('items', [])
@@ -82,16 +98,8 @@ def format_receipt(p, data):
     sep = '=' * width
     dash = '-' * width
 
-    # --- Header ---
-    p.set(align='center', width=2, height=2)
-    p.text((tenant.get('name') or 'ServisHub') + '\n')
-    p.set(align='center', width=1, height=1)
-    if tenant.get('address'):
-        p.text(tenant['address'] + '\n')
-    if tenant.get('phone'):
-        p.text('Tel: ' + tenant['phone'] + '\n')
-    if tenant.get('pib'):
-        p.text('PIB: ' + tenant['pib'] + '\n')
+    # --- Header (same for every receipt of a tenant - rendered once) ---
+    p._raw(receipt_header(tenant, width))
 
     p.text(sep + '\n')
 
@@ -293,20 +301,339 @@ def print_test_page(p, data=None):
     p.cut()
 
 
+# ---------------------------------------------------------------------------
+# Rendering (ESC/POS bytes are built once per job, retries resend the bytes)
+# ---------------------------------------------------------------------------
+
+def new_buffer():
+    """Printer object that only collects ESC/POS bytes (p.output)."""
+    from escpos.printer import Dummy
+    return Dummy()
+
+
+@functools.lru_cache(maxsize=32)
+def _render_header(name, address, phone, pib, width, logo_path, logo_mtime):
+    """Rendered receipt header; the logo raster conversion (PIL) is the slow part."""
+    p = new_buffer()
+    if logo_path:
+        p.set(align='center')
+        try:
+            p.image(logo_path)
+        except Exception as e:
+            print(f"[WARN] Logo not printed: {e}", file=sys.stderr)
+    p.set(align='center', width=2, height=2)
+    p.text((name or 'ServisHub') + '\n')
+    p.set(align='center', width=1, height=1)
+    if address:
+        p.text(address + '\n')
+    if phone:
+        p.text('Tel: ' + phone + '\n')
+    if pib:
+        p.text('PIB: ' + pib + '\n')
+    return p.output
+
+
+def receipt_header(tenant, width):
+    """Cached header bytes for tenant + paper width (re-rendered if the logo file changes)."""
+    logo_path = printer_config.get('logo')
+    logo_mtime = None
+    if logo_path:
+        try:
+            logo_mtime = os.path.getmtime(logo_path)
+        except OSError:
+            logo_path = None
+    return _render_header(tenant.get('name'), tenant.get('address'), tenant.get('phone'),
+                          tenant.get('pib'), width, logo_path, logo_mtime)
+
+
+def render_job(job):
+    """ESC/POS bytes for a job."""
+    p = new_buffer()
+    if job.kind == 'test':
+        print_test_page(p, job.data)
+    else:
+        format_receipt(p, job.data)
+    return p.output
+
+
+# ---------------------------------------------------------------------------
+# Spool queue (jobs survive agent restarts and printer outages)
+# ---------------------------------------------------------------------------
+
+SPOOL_DIRNAME = 'spool'
+HISTORY_SIZE = 200          # finished jobs kept for GET /jobs
+RETRY_BASE_SECONDS = 2      # back-off: 2, 4, 8, ... seconds
+RETRY_MAX_SECONDS = 60
+TEST_WAIT_SECONDS = 4       # browser aborts /test after 5s
+
+QUEUED, PRINTING, RETRYING, DONE, FAILED, CANCELLED = (
+    'queued', 'printing', 'retrying', 'done', 'failed', 'cancelled')
+
+
+class RenderError(Exception):
+    """Job data cannot be formatted - retrying will not help."""
+
+
+class PrintJob:
+    """One receipt or test page waiting for the printer."""
+
+    def __init__(self, kind, data, job_id=None, created_at=None, attempts=0,
+                 persist=True, max_attempts=None):
+        self.id = job_id or f'{time.time_ns()}-{uuid.uuid4().hex[:8]}'
+        self.kind = kind
+        self.data = data
+        self.created_at = created_at or datetime.now().isoformat(timespec='seconds')
+        self.attempts = attempts
+        self.persist = persist
+        self.max_attempts = max_attempts
+        self.status = QUEUED
+        self.last_error = None
+        self.next_attempt_at = 0.0
+        self.printed_at = None
+        self.payload = None     # rendered ESC/POS bytes
+        self.finished = threading.Event()
+
+    def to_dict(self):
+        info = {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'attempts': self.attempts,
+            'created_at': self.created_at,
+            'printed_at': self.printed_at,
+            'error': self.last_error,
+        }
+        if self.status == RETRYING:
+            info['retry_in'] = round(max(0.0, self.next_attempt_at - time.monotonic()), 1)
+        if self.kind == 'receipt':
+            info['receipt_number'] = (self.data.get('receipt') or {}).get('receipt_number')
+        return info
+
+
+class SpoolQueue:
+    """
+    FIFO print queue backed by one JSON file per job in `spool_dir`.
+
+    A job is written (fsync + atomic rename) before /print answers and
+    removed only after the printer accepted it. The head job is retried
+    until it prints, so receipts come out in the order they were issued.
+    """
+
+    def __init__(self, spool_dir):
+        self.spool_dir = spool_dir
+        self.failed_dir = os.path.join(spool_dir, 'failed')
+        os.makedirs(self.failed_dir, exist_ok=True)
+        self._pending = collections.deque()
+        self._jobs = {}
+        self._history = collections.deque(maxlen=HISTORY_SIZE)
+        self._cond = threading.Condition()
+
+    def _path(self, job):
+        return os.path.join(self.spool_dir, job.id + '.json')
+
+    def _write(self, job):
+        tmp_path = self._path(job) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'id': job.id, 'kind': job.kind, 'data': job.data,
+                       'created_at': job.created_at, 'attempts': job.attempts}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path(job))
+
+    def _remove(self, job):
+        if job.persist:
+            try:
+                os.unlink(self._path(job))
+            except FileNotFoundError:
+                pass
+
+    def load(self):
+        """Re-queue jobs left in the spool by a previous run. Returns the count."""
+        count = 0
+        for name in sorted(os.listdir(self.spool_dir)):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.spool_dir, name)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    saved = json.load(f)
+                job = PrintJob(saved['kind'], saved['data'], job_id=saved['id'],
+                               created_at=saved.get('created_at'), attempts=saved.get('attempts', 0))
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[WARN] Unreadable spool file {name}: {e}", file=sys.stderr)
+                os.replace(path, os.path.join(self.failed_dir, name))
+                continue
+            with self._cond:
+                self._pending.append(job)
+                self._jobs[job.id] = job
+            count += 1
+        return count
+
+    def submit(self, kind, data, persist=True, max_attempts=None):
+        """Add a job; it is on disk before this returns."""
+        job = PrintJob(kind, data, persist=persist, max_attempts=max_attempts)
+        if persist:
+            self._write(job)
+        with self._cond:
+            self._pending.append(job)
+            self._jobs[job.id] = job
+            self._cond.notify_all()
+        return job
+
+    def next_job(self, timeout=None):
+        """Head job once it is due (marked PRINTING), or None after `timeout`."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = None if deadline is None else deadline - now
+                if self._pending:
+                    job = self._pending[0]
+                    if job.next_attempt_at <= now:
+                        job.status = PRINTING
+                        return job
+                    due_in = job.next_attempt_at - now
+                    wait = due_in if wait is None else min(wait, due_in)
+                if wait is not None and wait <= 0:
+                    return None
+                self._cond.wait(wait)
+
+    def complete(self, job):
+        with self._cond:
+            self._finish(job, DONE)
+            job.printed_at = datetime.now().isoformat(timespec='seconds')
+        self._remove(job)
+
+    def fail(self, job, error, retry=True):
+        """
+        Record a failed attempt. The job stays at the head of the queue with
+        exponential back-off unless it cannot succeed (render error, attempts
+        used up). Returns the back-off in seconds or None if the job failed.
+        """
+        with self._cond:
+            job.attempts += 1
+            job.last_error = str(error)
+            if not retry or (job.max_attempts and job.attempts >= job.max_attempts):
+                self._finish(job, FAILED)
+                delay = None
+            else:
+                delay = min(RETRY_BASE_SECONDS * 2 ** (job.attempts - 1), RETRY_MAX_SECONDS)
+                job.status = RETRYING
+                job.next_attempt_at = time.monotonic() + delay
+        if delay is None:
+            if job.persist:
+                try:
+                    os.replace(self._path(job), os.path.join(self.failed_dir, job.id + '.json'))
+                except FileNotFoundError:
+                    pass
+        elif job.persist:
+            self._write(job)  # attempts survive a restart
+        return delay
+
+    def cancel(self, job_id):
+        """Drop a job that is not being printed right now. Returns the job or None."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in (QUEUED, RETRYING):
+                return None
+            self._finish(job, CANCELLED)
+            self._cond.notify_all()
+        self._remove(job)
+        return job
+
+    def _finish(self, job, status):
+        job.status = status
+        try:
+            self._pending.remove(job)
+        except ValueError:
+            pass
+        if len(self._history) == self._history.maxlen:
+            self._jobs.pop(self._history[0].id, None)
+        self._history.append(job)
+        job.finished.set()
+
+    def get(self, job_id):
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def snapshot(self):
+        """Pending jobs in print order and recently finished ones (newest first)."""
+        with self._cond:
+            return {
+                'pending': [job.to_dict() for job in self._pending],
+                'recent': [job.to_dict() for job in reversed(self._history)],
+            }
+
+    def counts(self):
+        with self._cond:
+            pending = list(self._pending)
+        return {
+            'pending': len(pending),
+            'retrying': sum(1 for job in pending if job.status == RETRYING),
+            'oldest_pending': pending[0].created_at if pending else None,
+        }
+
+
+class PrintWorker(threading.Thread):
+    """Single thread that owns the printer: renders and sends spooled jobs."""
+
+    def __init__(self, spool, send=None):
+        super().__init__(name='print-worker', daemon=True)
+        self.spool = spool
+        self.send = send or send_raw
+        self._stopping = threading.Event()
+        self.last_error = None
+        self.printed = 0
+
+    def stop(self):
+        self._stopping.set()
+
+    def run(self):
+        while not self._stopping.is_set():
+            job = self.spool.next_job(timeout=1)
+            if job is not None:
+                self.process(job)
+
+    def process(self, job):
+        try:
+            if job.payload is None:
+                try:
+                    job.payload = render_job(job)
+                except Exception as e:
+                    raise RenderError(e) from e
+            self.send(job.payload)
+        except RenderError as e:
+            print(f"[ERROR] Job {job.id} cannot be rendered: {e}", file=sys.stderr)
+            self.spool.fail(job, e, retry=False)
+            return
+        except Exception as e:
+            self.last_error = str(e)
+            delay = self.spool.fail(job, e)
+            if delay is None:
+                print(f"[ERROR] Job {job.id} failed: {e}", file=sys.stderr)
+            else:
+                print(f"[WARN] Printer error ({e}), retrying job {job.id} in {delay}s", file=sys.stderr)
+            return
+        self.last_error = None
+        self.printed += 1
+        self.spool.complete(job)
+
+
 # ---------------------------------------------------------------------------
 # HTTP Server (no Flask dependency - stdlib only for simpler deployment)
 # ---------------------------------------------------------------------------
 
-printer_instance = None
 printer_config = {}
+spool = None
+worker = None
 
 
 class PrintAgentHandler(BaseHTTPRequestHandler):
-    """HTTP request handler for print agent."""
+    """HTTP request handler for print agent (one thread per request)."""
 
     def _cors_headers(self):
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, DELETE, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         # Chrome Private Network Access (HTTPS → localhost)
         self.send_header('Access-Control-Allow-Private-Network', 'true')
@@ -338,8 +665,18 @@ class PrintAgentHandler(BaseHTTPRequestHandler):
                 'vendor_id': printer_config.get('vendor', ''),
                 'product_id': printer_config.get('product', ''),
                 'network_host': printer_config.get('host', ''),
-                'agent_version': '1.1.0',
+                'agent_version': AGENT_VERSION,
+                'queue': spool.counts(),
+                'printer_error': worker.last_error if worker else None,
             })
+        elif path == '/jobs':
+            self._json_response(200, spool.snapshot())
+        elif path.startswith('/jobs/'):
+            job = spool.get(path[len('/jobs/'):])
+            if job is None:
+                self._json_response(404, {'error': 'Job not found'})
+            else:
+                self._json_response(200, job.to_dict())
         else:
             self._json_response(404, {'error': 'Not found', 'path': path})
 
@@ -361,25 +698,45 @@ class PrintAgentHandler(BaseHTTPRequestHandler):
         else:
             self._json_response(404, {'error': 'Not found', 'path': path})
 
+    def do_DELETE(self):
+        path = self._clean_path()
+        if not path.startswith('/jobs/'):
+            self._json_response(404, {'error': 'Not found', 'path': path})
+            return
+        job = spool.cancel(path[len('/jobs/'):])
+        if job is None:
+            self._json_response(409, {'success': False, 'error': 'Job is not pending'})
+        else:
+            self._json_response(200, {'success': True, 'job': job.to_dict()})
+
     def _handle_print(self, data):
         try:
-            p = get_printer()
-            format_receipt(p, data)
-            flush_printer(p)
-            self._json_response(200, {'success': True, 'message': 'Receipt printed'})
-        except Exception as e:
-            print(f"[ERROR] Print failed: {e}", file=sys.stderr)
+            job = spool.submit('receipt', data)
+        except OSError as e:
+            print(f"[ERROR] Cannot spool receipt: {e}", file=sys.stderr)
             self._json_response(500, {'success': False, 'error': str(e)})
+            return
+        self._json_response(202, {
+            'success': True,
+            'message': 'Receipt queued',
+            'job_id': job.id,
+            'queue': spool.counts(),
+        })
 
     def _handle_test(self, data):
-        try:
-            p = get_printer()
-            print_test_page(p, data)
-            flush_printer(p)
+        # A test page is only useful right now - not spooled, single attempt
+        job = spool.submit('test', data, persist=False, max_attempts=1)
+        if not job.finished.wait(TEST_WAIT_SECONDS) and spool.cancel(job.id) is not None:
+            self._json_response(500, {'success': False,
+                                      'error': worker.last_error or 'Printer queue is busy'})
+        elif job.status == DONE:
             self._json_response(200, {'success': True, 'message': 'Test page printed'})
-        except Exception as e:
-            print(f"[ERROR] Test print failed: {e}", file=sys.stderr)
-            self._json_response(500, {'success': False, 'error': str(e)})
+        elif job.status == PRINTING:
+            # Already sent to the printer - cannot be cancelled, may still print
+            self._json_response(202, {'success': True, 'job_id': job.id, 'status': job.status,
+                                      'message': 'Test page is printing'})
+        else:
+            self._json_response(500, {'success': False, 'error': job.last_error})
 
     def log_message(self, format, *args):
         """Custom log format."""
@@ -387,22 +744,12 @@ class PrintAgentHandler(BaseHTTPRequestHandler):
 
 
 def get_printer():
-    """Get or create printer connection.
-    For CUPS mode, returns a Dummy printer that buffers ESC/POS commands.
-    Call flush_printer(p) after formatting to send buffered data via lp.
-    """
-    global printer_instance
+    """Open a direct USB/Network printer connection (reconnect per job for reliability)."""
     ptype = printer_config.get('type')
 
-    if ptype == 'cups':
-        from escpos.printer import Dummy
-        return Dummy()
-    elif ptype == 'usb':
+    if ptype == 'usb':
         from escpos.printer import Usb
-        vendor = printer_config['vendor']
-        product = printer_config['product']
-        # Reconnect each time for reliability
-        return Usb(vendor, product)
+        return Usb(printer_config['vendor'], printer_config['product'])
     elif ptype == 'network':
         from escpos.printer import Network
         return Network(printer_config['host'], port=printer_config.get('port', 9100))
@@ -410,17 +757,26 @@ def get_printer():
         raise RuntimeError('No printer configured')
 
 
-def flush_printer(p):
-    """For CUPS mode: send accumulated ESC/POS bytes to printer via lp command.
-    For USB/Network: no-op (data is already sent directly).
-    """
-    if printer_config.get('type') != 'cups':
-        return
-
-    raw = p.output
+def send_raw(raw):
+    """Send rendered ESC/POS bytes: CUPS via `lp -o raw`, USB/Network directly."""
     if not raw:
         return
+    if printer_config.get('type') == 'cups':
+        send_cups(raw)
+        return
 
+    p = get_printer()
+    try:
+        p._raw(raw)
+    finally:
+        try:
+            p.close()
+        except Exception:
+            pass
+
+
+def send_cups(raw):
+    """Send ESC/POS bytes to the CUPS printer via lp command."""
     cups_name = printer_config['name']
 
     # Write raw bytes to temp file and send via lp
@@ -536,7 +892,7 @@ def ensure_ssl_cert():
 # ---------------------------------------------------------------------------
 
 def main():
-    global printer_config
+    global printer_config, spool, worker
 
     parser = argparse.ArgumentParser(
         description='ServisHub POS Print Agent - ESC/POS thermal printer bridge',
@@ -565,6 +921,10 @@ Examples:
                         help='Agent HTTP port (default: 9100)')
     parser.add_argument('--ssl', action='store_true',
                         help='Enable HTTPS (self-signed cert). Usually not needed.')
+    parser.add_argument('--logo', type=str, metavar='IMAGE',
+                        help='Logo printed above the receipt header (PNG/JPG)')
+    parser.add_argument('--spool-dir', type=str,
+                        help='Directory for queued jobs (default: ~/.servishub-agent/spool)')
 
     args = parser.parse_args()
 
@@ -616,6 +976,9 @@ Examples:
         print("Run with --help for usage examples")
         sys.exit(1)
 
+    if args.logo:
+        printer_config['logo'] = os.path.abspath(args.logo)
+
     # Test printer connection
     if printer_config['type'] == 'cups':
         # Verify CUPS printer exists
@@ -631,7 +994,7 @@ Examples:
             print("WARNING: lpstat not found - CUPS may not be installed")
     else:
         try:
-            p = get_printer()
+            get_printer().close()
             print("Printer connection: OK")
         except Exception as e:
             print(f"WARNING: Printer not available: {e}")
@@ -644,7 +1007,15 @@ Examples:
         port = 9101
         print(f"Agent port changed to {port} (avoiding conflict with printer port)")
 
-    server = HTTPServer(('127.0.0.1', port), PrintAgentHandler)
+    # Spool + print worker (jobs from a previous run are printed first)
+    spool = SpoolQueue(args.spool_dir or os.path.join(get_cert_dir(), SPOOL_DIRNAME))
+    recovered = spool.load()
+    if recovered:
+        print(f"Spool: {recovered} unprinted job(s) recovered from {spool.spool_dir}")
+    worker = PrintWorker(spool)
+    worker.start()
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), PrintAgentHandler)
 
     protocol = 'http'
     if args.ssl:
@@ -655,9 +1026,10 @@ Examples:
         protocol = 'https'
 
     print(f"\nServisHub POS Print Agent running on {protocol}://localhost:{port}")
-    print(f"  GET  /status  - Health check")
-    print(f"  POST /print   - Print receipt")
+    print("  GET  /status  - Health check + queue")
+    print("  POST /print   - Queue receipt")
     print(f"  POST /test    - Test print")
+    print("  GET  /jobs    - Queued and recent jobs")
     if protocol == 'https':
         print(f"\n*** IMPORTANT: Open {protocol}://localhost:{port} in your browser ***")
         print(f"*** and accept the certificate warning (one time only).    ***")
@@ -667,7 +1039,11 @@ Examples:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nStopping agent...")
+        worker.stop()
         server.server_close()
+        pending = spool.counts()['pending']
+        if pending:
+            print(f"{pending} job(s) left in spool - printed on next start")
 
 
 if __name__ == '__main__':
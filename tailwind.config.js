@@ -0,0 +1,26 @@
+// Tailwind build za `flask assets-build` (app/static/css/tailwind.css).
+// Tema mora ostati ista kao tailwind.config u layouts/base.html (CDN fallback).
+module.exports = {
+  content: [
+    './app/templates/**/*.html',
+    './app/static/js/**/*.js',
+  ],
+  theme: {
+    extend: {
+      colors: {
+        primary: {
+          50: '#eff6ff',
+          100: '#dbeafe',
+          200: '#bfdbfe',
+          300: '#93c5fd',
+          400: '#60a5fa',
+          500: '#3b82f6',
+          600: '#2563eb',
+          700: '#1d4ed8',
+          800: '#1e40af',
+          900: '#1e3a8a',
+        },
+      },
+    },
+  },
+};
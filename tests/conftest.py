@@ -6,6 +6,7 @@ Setup: 2 tenanta, svaki sa lokacijama i korisnicima.
 - Tenant B: location_b1 (primary), user_b (TECHNICIAN)
 """
 import pytest
+import fnmatch
 from datetime import datetime
 
 import sqlalchemy as sa
@@ -69,6 +70,166 @@ def app():
     yield app
 
 
+@pytest.fixture(autouse=True)
+def redis_breaker():
+    """Svaki test počinje sa zatvorenim Redis prekidačem."""
+    from app.services.redis_service import redis_manager
+    redis_manager.reset()
+    yield redis_manager
+
+
+class FakeRedis:
+    """In-memory Redis za testove (string, hash, set, stream i pipeline komande).
+
+    `fail=True` simulira pad konekcije na svakoj komandi, `pings` broji PING-ove.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.fail = False
+        self.pings = 0
+        self.on_ping = None
+        self._seq = 0
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError('refused')
+
+    def ping(self):
+        self.pings += 1
+        if self.on_ping:
+            self.on_ping()
+        self._check()
+        return True
+
+    # Stringovi i ključevi
+
+    def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    def mget(self, *keys):
+        self._check()
+        return [self.data.get(k) for k in keys]
+
+    def set(self, key, value, ex=None, nx=False):
+        self._check()
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def incr(self, key):
+        self._check()
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+    def exists(self, key):
+        self._check()
+        return int(key in self.data)
+
+    def delete(self, *keys):
+        self._check()
+        return sum(1 for k in keys if self.data.pop(k, None) is not None)
+
+    def expire(self, key, seconds):
+        self._check()
+        return key in self.data
+
+    def keys(self, pattern):
+        self._check()
+        return [k for k in self.data if fnmatch.fnmatch(k, pattern)]
+
+    def rename(self, src, dst):
+        self._check()
+        if src not in self.data:
+            raise Exception('ERR no such key')
+        self.data[dst] = self.data.pop(src)
+
+    # Hash
+
+    def hincrby(self, key, field, amount):
+        self._check()
+        h = self.data.setdefault(key, {})
+        h[field] = str(int(h.get(field, 0)) + amount)
+        return int(h[field])
+
+    def hmget(self, key, fields):
+        self._check()
+        h = self.data.get(key, {})
+        return [h.get(f) for f in fields]
+
+    def hgetall(self, key):
+        self._check()
+        return dict(self.data.get(key, {}))
+
+    # Set
+
+    def sadd(self, key, *members):
+        self._check()
+        self.data.setdefault(key, set()).update(members)
+
+    def smembers(self, key):
+        self._check()
+        return set(self.data.get(key, set()))
+
+    # Stream
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self._check()
+        self._seq += 1
+        entry_id = f'{self._seq}-0'
+        self.data.setdefault(key, []).append((entry_id, dict(fields)))
+        return entry_id
+
+    def xrange(self, key, count=None):
+        self._check()
+        return list(self.data.get(key, []))[:count]
+
+    def xdel(self, key, *ids):
+        self._check()
+        entries = self.data.get(key, [])
+        self.data[key] = [e for e in entries if e[0] not in ids]
+        return len(entries) - len(self.data[key])
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Pipeline koji pamti komande i izvršava ih na execute()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return _queue
+
+    def execute(self):
+        calls, self.calls = self.calls, []
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in calls]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """In-memory Redis umesto pravog klijenta."""
+    redis = FakeRedis()
+    monkeypatch.setattr('app.extensions.get_redis', lambda: redis)
+    return redis
+
+
+@pytest.fixture
+def redis_down(monkeypatch):
+    """Redis nedostupan - svaka konekcija odbijena."""
+    def _refused():
+        raise ConnectionError('refused')
+    monkeypatch.setattr('app.extensions.get_redis', _refused)
+
+
 @pytest.fixture(scope='function')
 def db(app):
     """Kreira čistu bazu za svaki test."""
@@ -0,0 +1,81 @@
+"""
+API cache testovi — keširanje tenant endpointa, generacije po tenantu,
+invalidacija na commit, metrike.
+"""
+import pytest
+import json
+
+from app.models import ServiceItem
+from app.models.feature_flag import FeatureFlag
+from app.services.api_cache_service import api_cache
+
+
+@pytest.fixture
+def services(db, tenant_a, tenant_b):
+    db.session.add(ServiceItem(tenant_id=tenant_a.id, name='Zamena ekrana', category='Ekrani', price=5000))
+    db.session.add(ServiceItem(tenant_id=tenant_b.id, name='Baterija', category='Baterije', price=2000))
+    db.session.commit()
+
+
+class TestCachedViews:
+    """Keširanje i izolacija po tenantu."""
+
+    def test_miss_then_hit(self, fake_redis, client_a, services):
+        first = client_a.get('/api/v1/services/categories')
+        second = client_a.get('/api/v1/services/categories')
+
+        assert first.headers['X-Cache'] == 'MISS'
+        assert second.headers['X-Cache'] == 'HIT'
+        assert json.loads(second.data) == json.loads(first.data)
+        # Privatni odgovor ostaje no-store i kad je iz keša
+        assert 'no-store' in second.headers['Cache-Control']
+
+    def test_tenants_are_isolated(self, fake_redis, client_a, client_b, services):
+        res_a = json.loads(client_a.get('/api/v1/services').data)
+        res_b = json.loads(client_b.get('/api/v1/services').data)
+
+        assert [s['name'] for s in res_a['services']] == ['Zamena ekrana']
+        assert [s['name'] for s in res_b['services']] == ['Baterija']
+
+    def test_args_are_normalized(self, fake_redis, client_a, services):
+        client_a.get('/api/v1/services?category=Ekrani&include_inactive=true')
+        res = client_a.get('/api/v1/services?include_inactive=true&category=Ekrani')
+        assert res.headers['X-Cache'] == 'HIT'
+
+    def test_users_list_varies_on_user(self, fake_redis, client_a, client_tech_a, services):
+        assert client_a.get('/api/v1/users').status_code == 200
+        # Tehničar ne sme dobiti admin-ov keširani odgovor
+        assert client_tech_a.get('/api/v1/users').status_code == 403
+
+
+class TestInvalidation:
+    """Generacije se povećavaju na commit."""
+
+    def test_commit_bumps_tenant_generation(self, db, fake_redis, client_a, client_b, tenant_a, services):
+        client_a.get('/api/v1/services/stats')
+        client_b.get('/api/v1/services/stats')
+
+        db.session.add(ServiceItem(tenant_id=tenant_a.id, name='Punjac', category='Ostalo', price=1000))
+        db.session.commit()
+
+        res_a = client_a.get('/api/v1/services/stats')
+        assert res_a.headers['X-Cache'] == 'MISS'
+        assert json.loads(res_a.data)['total'] == 2
+        assert client_b.get('/api/v1/services/stats').headers['X-Cache'] == 'HIT'
+
+    def test_global_feature_flag_bumps_everyone(self, db, fake_redis, client_a, services):
+        client_a.get('/api/v1/tenant/features')
+
+        db.session.add(FeatureFlag(feature_key='pos_enabled', enabled=True))
+        db.session.commit()
+
+        res = client_a.get('/api/v1/tenant/features')
+        assert res.headers['X-Cache'] == 'MISS'
+        assert json.loads(res.data)['pos_enabled'] is True
+
+    def test_stats(self, fake_redis, client_a, services):
+        for _ in range(3):
+            client_a.get('/api/v1/services/categories')
+
+        stats = api_cache.stats()['api_v1.services.get_categories']
+        assert stats == {'requests': 3, 'hits': 2, 'misses': 1, 'hit_ratio': 0.667}
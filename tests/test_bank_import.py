@@ -0,0 +1,202 @@
+"""
+Import bankovnih izvoda — parseri čitaju fajl-objekat transakciju po
+transakciju, encoding i banka iz početka fajla, upis u blokovima i
+preview samo prvih N transakcija.
+"""
+import hashlib
+import io
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.api.admin import bank_import as bank_import_api
+from app.models.admin import AdminRole, PlatformAdmin
+from app.models.bank_import import BankStatementImport, BankTransaction
+from app.services.bank_parsers import SNIFF_BYTES, HashingReader, detect_bank_and_parse, get_parser
+from app.services.bank_parsers.alta import AltaBankParser
+
+
+def _statement(count, offset=0):
+    """Alta XML izvod sa `count` uplata (svaka sa drugim pozivom na broj)."""
+    rows = ''.join(
+        f'''<stmttrn><fitid>{n}</fitid><benefit>{'debit' if n % 10 == 0 else 'credit'}</benefit>
+<payeeinfo><name>FIRMA {n} DOO</name><city>BEOGRAD</city></payeeinfo>
+<payeeaccountinfo><acctid>160-{n:06d}-78</acctid><bankname>ALTA BANKA</bankname></payeeaccountinfo>
+<dtposted>2026-01-22T00:00:00</dtposted><trnamt>{1000 + n}.50</trnamt><purpose>Pretplata</purpose>
+<curdef>RSD</curdef><refnumber>97 {n:06d} 000001</refnumber><refmodel>97</refmodel></stmttrn>'''
+        for n in range(offset + 1, offset + count + 1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<pmtnotification>'
+        '<acctid>190-0000000029120-24</acctid><stmtnumber>13</stmtnumber>'
+        '<ledgerbal><dtasof>2026-01-31T00:00:00</dtasof></ledgerbal>'
+        f'<trnlist count="{count}">{rows}</trnlist><rejected count="0"></rejected></pmtnotification>'
+    ).encode('utf-8')
+
+
+class TestStreamingParser:
+    """Alta parser nad fajl-objektom."""
+
+    def test_same_result_as_full_parse(self):
+        content = _statement(3)
+        parser = AltaBankParser()
+        streamed = list(parser.iter_transactions(io.BytesIO(content), 'izvod.xml'))
+
+        result = detect_bank_and_parse(content, 'izvod.xml')
+        assert [t.bank_id for t in streamed] == ['1', '2', '3']
+        assert len(result['transactions']) == 3
+        assert result['statement_number'] == '13' and result['statement_date'] == '2026-01-31'
+        assert streamed[0].reference_model == '97' and streamed[0].reference == '000001000001'
+
+    def test_first_transaction_reads_only_start(self):
+        content = _statement(2000)
+        reader = HashingReader(io.BytesIO(content))
+        first = next(AltaBankParser().iter_transactions(reader, 'izvod.xml'))
+
+        assert first.payer_name == 'FIRMA 1 DOO'
+        assert reader.size < len(content) / 10
+
+    def test_hash_covers_whole_file(self):
+        content = _statement(50)
+        reader = HashingReader(io.BytesIO(content))
+        list(AltaBankParser().iter_transactions(reader, 'izvod.xml'))
+        reader.drain()
+        assert reader.hexdigest() == hashlib.sha256(content).hexdigest()
+        assert reader.size == len(content)
+
+    def test_detect_from_truncated_head(self):
+        head = _statement(10)[:700]  # odsečeno usred transakcije
+        assert get_parser(head, 'izvod.xml').BANK_CODE == 'ALTA'
+        with pytest.raises(ValueError):
+            get_parser(b'<Statement><Header>', 'izvod.xml')
+
+    def test_encoding_sniffed_from_prefix(self):
+        parser = AltaBankParser()
+        # SNIFF_BYTES granica pada usred dvobajtnog 'ć'
+        content = b'a' * (SNIFF_BYTES - 1) + 'ć'.encode('utf-8') + b'\xff' * 10
+        assert parser.detect_encoding(content) == 'utf-8'
+        assert parser.detect_encoding('Plaćanje'.encode('cp1250')) == 'cp1250'
+        assert parser.detect_encoding(b'\xef\xbb\xbfDatum;Iznos') == 'utf-8-sig'
+
+    def test_open_text(self):
+        parser = AltaBankParser()
+        content = 'Datum;Svrha\n22.01.2026;Plaćanje\n'.encode('cp1250')
+        lines = parser.open_text(io.BytesIO(content), content).readlines()
+        assert parser.encoding == 'cp1250' and lines[1] == '22.01.2026;Plaćanje\n'
+
+
+@pytest.fixture
+def admin_client(app, db):
+    from app.api.middleware.jwt_utils import create_admin_access_token
+
+    admin = PlatformAdmin(email='admin@shub.rs', password_hash='x', ime='Pera', prezime='Perić',
+                          role=AdminRole.ADMIN, is_active=True)
+    db.session.add(admin)
+    db.session.commit()
+    token = create_admin_access_token(admin.id, admin.role.value)
+    headers = {'Authorization': f'Bearer {token}'}
+
+    class _Client:
+        def post(self, url, content, **form):
+            data = {**form, 'file': (io.BytesIO(content), 'izvod.xml')}
+            return app.test_client().post(url, data=data, headers=headers,
+                                          content_type='multipart/form-data')
+    return _Client()
+
+
+def _count(db, model):
+    return db.session.scalar(select(func.count()).select_from(model))
+
+
+class TestUpload:
+    """Upload upisuje u blokovima i računa hash usput."""
+
+    URL = '/api/admin/bank-import'
+
+    def test_chunked_insert(self, admin_client, db, monkeypatch):
+        monkeypatch.setattr(bank_import_api, 'IMPORT_CHUNK_SIZE', 100)
+        inserts = []
+
+        def _track(conn, cursor, statement, *args):
+            if statement.startswith('INSERT INTO bank_transaction'):
+                inserts.append(statement)
+
+        content = _statement(450)
+        event.listen(db.engine, 'before_cursor_execute', _track)
+        try:
+            res = admin_client.post(self.URL, content)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', _track)
+
+        assert res.status_code == 201, res.get_json()
+        body = res.get_json()
+        assert body['transactions_found'] == 450
+        assert body['debits'] == 45 and body['credits'] == 405
+        assert len(inserts) == 5
+
+        imp = db.session.get(BankStatementImport, body['import_id'])
+        assert imp.file_hash == hashlib.sha256(content).hexdigest()
+        assert imp.file_size == len(content)
+        assert imp.statement_date.isoformat() == '2026-01-31'
+        assert imp.statement_number == '13'
+        assert _count(db, BankTransaction) == 450
+
+    def test_duplicate_file_rejected(self, admin_client, db):
+        content = _statement(20)
+        assert admin_client.post(self.URL, content).status_code == 201
+
+        statements = []
+
+        def _track(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', _track)
+        try:
+            res = admin_client.post(self.URL, content)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', _track)
+
+        assert res.status_code == 409
+        # Duplikat se odbija pre upisa - ni import ni transakcije
+        assert not any(sql.startswith('INSERT') for sql in statements)
+        assert _count(db, BankStatementImport) == 1 and _count(db, BankTransaction) == 20
+
+    def test_overlapping_statement_skips_known(self, admin_client, db):
+        assert admin_client.post(self.URL, _statement(20)).status_code == 201
+
+        res = admin_client.post(self.URL, _statement(20, offset=10))
+        assert res.get_json()['skipped'] == 10
+        assert _count(db, BankTransaction) == 30
+
+    def test_hash_matches_previous_format(self):
+        txn = AltaBankParser().parse(_statement(1), 'izvod.xml').transactions[0]
+        legacy = detect_bank_and_parse(_statement(1), 'izvod.xml')['transactions'][0]
+        assert bank_import_api._transaction_hash(txn) == BankTransaction.generate_hash(
+            date=legacy['date'], amount=legacy['amount'],
+            payer_account=legacy['payer_account'], reference=legacy['reference'])
+
+
+class TestPreview:
+    """Preview parsira samo prvih N transakcija."""
+
+    def test_limit(self, admin_client, db):
+        content = _statement(300)
+        res = admin_client.post('/api/admin/bank-import/preview', content, limit='25')
+        body = res.get_json()
+
+        assert res.status_code == 200
+        assert len(body['transactions']) == 25 and body['truncated'] is True
+        assert body['summary']['total_count'] == 25
+        assert body['file_hash'] == hashlib.sha256(content).hexdigest()
+        assert body['statement_date'] == '2026-01-31'
+
+    def test_limit_clamped_to_one(self, admin_client, db):
+        res = admin_client.post('/api/admin/bank-import/preview', _statement(5), limit='-3')
+        body = res.get_json()
+
+        assert res.status_code == 200
+        assert len(body['transactions']) == 1 and body['truncated'] is True
+
+    def test_small_file_not_truncated(self, admin_client, db):
+        body = admin_client.post('/api/admin/bank-import/preview', _statement(5)).get_json()
+        assert len(body['transactions']) == 5 and body['truncated'] is False
@@ -0,0 +1,62 @@
+"""
+Benchmark suite — generator podataka i scenariji rade na malom skupu,
+poređenje sa baseline-om prepoznaje regresije.
+"""
+from benchmarks.data import generate
+from benchmarks.harness import measure, compare, profile_key
+from benchmarks.scenarios import Context, build
+
+
+class TestBenchmarkSmoke:
+    """Ceo tok na minimalnom obimu (scale 0.02)."""
+
+    def test_all_scenarios_succeed(self, app, db):
+        dataset = generate(tenants=2, scale=0.02, seed=1)
+        assert len(dataset.tenants) == 2
+        assert dataset.counts['tickets'] == 80
+        assert dataset.unmatched_transaction_id
+
+        ctx = Context(app, dataset)
+        results = measure(ctx, build(ctx), repeat=1, warmup=0)
+
+        failed = {name: r['status'] for name, r in results.items() if r['status'] >= 400}
+        assert failed == {}
+        assert all(r['queries'] > 0 for r in results.values())
+
+    def test_generator_is_deterministic(self, app, db):
+        from app.models import ServiceTicket
+
+        generate(tenants=1, scale=0.02, seed=7)
+        first = [t.customer_name for t in ServiceTicket.query.order_by(ServiceTicket.id)]
+        db.drop_all()
+        db.create_all()
+        generate(tenants=1, scale=0.02, seed=7)
+        second = [t.customer_name for t in ServiceTicket.query.order_by(ServiceTicket.id)]
+        assert first == second
+
+
+class TestCompare:
+    """Pravila regresije."""
+
+    BASELINE = {'tickets.list': {'queries': 10, 'p50_ms': 20.0}}
+
+    def _result(self, queries=10, p50=20.0, status=200):
+        return {'tickets.list': {'status': status, 'queries': queries, 'p50_ms': p50, 'p95_ms': p50}}
+
+    def test_within_tolerance(self):
+        assert compare(self._result(queries=12, p50=28.0), self.BASELINE) == []
+
+    def test_query_regression(self):
+        problems = compare(self._result(queries=13), self.BASELINE)
+        assert [name for name, _ in problems] == ['tickets.list']
+
+    def test_latency_regression_optional(self):
+        slow = self._result(p50=45.0)
+        assert len(compare(slow, self.BASELINE)) == 1
+        assert compare(slow, self.BASELINE, check_latency=False) == []
+
+    def test_http_error_is_regression(self):
+        assert compare(self._result(status=500), {}) == [('tickets.list', 'HTTP 500')]
+
+    def test_profile_key(self):
+        assert profile_key('sqlite', 3, 1.0) == 'sqlite/tenants=3/scale=1'
@@ -0,0 +1,89 @@
+"""
+Isporuka stranica — gzip kompresija, keš kompresovanih render-a,
+fingerprint statičkih fajlova i immutable Cache-Control.
+"""
+import gzip
+import json
+import re
+
+import pytest
+
+from app.middleware.compression import compression_cache, choose_encoding
+
+
+@pytest.fixture
+def client(app):
+    compression_cache.clear()
+    return app.test_client()
+
+
+class TestCompression:
+    """Accept-Encoding pregovaranje i prag veličine."""
+
+    def test_html_page_gzipped(self, client):
+        plain = client.get('/tickets')
+        res = client.get('/tickets', headers={'Accept-Encoding': 'gzip, deflate'})
+
+        assert res.status_code == 200
+        assert res.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in res.headers['Vary']
+        assert gzip.decompress(res.data) == plain.data
+        assert len(res.data) * 4 < len(plain.data)
+
+    def test_repeated_render_uses_cache(self, client):
+        client.get('/tickets', headers={'Accept-Encoding': 'gzip'})
+        client.get('/tickets', headers={'Accept-Encoding': 'gzip'})
+        assert compression_cache.misses == 1
+        assert compression_cache.hits == 1
+
+    def test_no_accept_encoding(self, client):
+        res = client.get('/tickets')
+        assert 'Content-Encoding' not in res.headers
+
+    def test_small_json_not_compressed(self, client):
+        res = client.get('/api/v1/nonexistent', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in res.headers
+
+    def test_large_json_compressed_without_cache(self, app, client):
+        from flask import jsonify
+        payload = {'items': [{'id': n, 'customer_name': f'Kupac {n}'} for n in range(200)]}
+        with app.test_request_context('/api/v1/tickets', headers={'Accept-Encoding': 'gzip'}):
+            res = app.process_response(jsonify(payload))
+
+        assert res.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(res.get_data())) == payload
+        assert compression_cache.misses == 0
+
+    def test_choose_encoding(self):
+        from werkzeug.datastructures import Accept
+        assert choose_encoding(Accept([('gzip', 1)])) == 'gzip'
+        assert choose_encoding(Accept([('gzip', 0)])) is None
+        assert choose_encoding(Accept([('identity', 1)])) is None
+
+
+class TestStaticAssets:
+    """?v=<hash> na static URL-ovima i immutable keš."""
+
+    def test_page_links_fingerprinted_bundle(self, client):
+        html = client.get('/tickets').get_data(as_text=True)
+        match = re.search(r'/static/js/tenant/tickets-list\.js\?v=([0-9a-f]{10})', html)
+        assert match
+
+        res = client.get(f'/static/js/tenant/tickets-list.js?v={match.group(1)}')
+        assert res.status_code == 200
+        assert res.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+        assert b'CATEGORY_CONFIG' in res.data
+
+    def test_stale_version_not_immutable(self, client):
+        res = client.get('/static/js/tenant/tickets-list.js?v=0000000000')
+        assert res.status_code == 200
+        assert 'immutable' not in res.headers['Cache-Control']
+
+    def test_static_gzip_keeps_weak_etag(self, client):
+        res = client.get('/static/js/tenant/tickets-list.js', headers={'Accept-Encoding': 'gzip'})
+        assert res.headers['Content-Encoding'] == 'gzip'
+        assert res.headers['ETag'].startswith('W/')
+
+    def test_tailwind_cdn_without_build(self, client):
+        html = client.get('/tickets').get_data(as_text=True)
+        assert 'cdn.tailwindcss.com' in html
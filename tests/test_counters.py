@@ -0,0 +1,139 @@
+"""
+Write-behind brojači — inkrement bez pristupa bazi, spajanje pending
+delti pri čitanju, batch flush (Redis i lokalni akumulator).
+"""
+import pytest
+import json
+
+from app.models.feature_flag import FeatureFlag
+from app.models.public_user import PublicUser
+from app.models.service_request import ServiceRequest, ServiceRequestCategory, ServiceRequestStatus
+from app.services.counter_service import CounterService
+
+
+@pytest.fixture
+def service(redis_down):
+    """Svež CounterService bez Redis-a (lokalni akumulator)."""
+    return CounterService()
+
+
+@pytest.fixture
+def redis_service(fake_redis):
+    return CounterService()
+
+
+FLUSHING_KEY = 'counters:flushing:service_request'
+
+
+@pytest.fixture
+def service_request(db):
+    user = PublicUser(email='kupac@test.com', ime='Pera', prezime='Peric')
+    db.session.add(user)
+    db.session.flush()
+    sr = ServiceRequest(
+        public_user_id=user.id, category=ServiceRequestCategory.SCREEN_REPAIR,
+        title='Ekran', bid_count=2, view_count=10
+    )
+    db.session.add(sr)
+    db.session.commit()
+    return sr
+
+
+class TestCounterService:
+    """Akumulacija i flush."""
+
+    def test_local_accumulator_merge_and_flush(self, db, service, service_request):
+        for _ in range(5):
+            service.incr('service_request', service_request.id, 'view_count')
+        service.incr('service_request', service_request.id, 'bid_count')
+
+        merged = service.merge_pending('service_request', [service_request], 'view_count', 'bid_count')
+        assert merged[service_request.id] == {'view_count': 15, 'bid_count': 3}
+        # Baza još nije dirnuta
+        db.session.refresh(service_request)
+        assert service_request.view_count == 10
+
+        assert service.flush() == 2
+        db.session.refresh(service_request)
+        assert (service_request.view_count, service_request.bid_count) == (15, 3)
+        assert service.pending('service_request', [service_request.id], 'view_count')[service_request.id] == 0
+
+    def test_redis_path_flushes_and_clears(self, db, redis_service, fake_redis, service_request):
+        redis_service.incr('service_request', service_request.id, 'view_count', 3)
+
+        assert redis_service.pending('service_request', [service_request.id], 'view_count')[service_request.id] == 3
+        redis_service.flush()
+
+        db.session.refresh(service_request)
+        assert service_request.view_count == 13
+        assert fake_redis.data == {}
+
+    def test_orphaned_flush_is_reapplied(self, db, redis_service, fake_redis, service_request):
+        """Proces je pao posle RENAME-a, pre commit-a - delte nisu izgubljene."""
+        fake_redis.data[FLUSHING_KEY] = {f'{service_request.id}:view_count': '4'}
+        redis_service.incr('service_request', service_request.id, 'view_count')
+
+        # Čitanje vidi i delte iz flushing hash-a
+        assert redis_service.pending('service_request', [service_request.id], 'view_count')[service_request.id] == 5
+
+        redis_service.flush()
+        db.session.refresh(service_request)
+        assert service_request.view_count == 14
+
+        redis_service.flush()
+        db.session.refresh(service_request)
+        assert service_request.view_count == 15
+        assert fake_redis.data == {}
+
+    def test_failed_write_keeps_flushing_hash(self, db, redis_service, fake_redis, service_request, monkeypatch):
+        redis_service.incr('service_request', service_request.id, 'view_count', 2)
+
+        def _fail(conn, deltas):
+            raise RuntimeError('db down')
+        monkeypatch.setattr(redis_service, '_apply', _fail)
+        with pytest.raises(RuntimeError):
+            redis_service.flush()
+        assert FLUSHING_KEY in fake_redis.data
+        assert 'counters:flush_lock' not in fake_redis.data
+
+        CounterService().flush()
+        db.session.refresh(service_request)
+        assert service_request.view_count == 12
+
+    def test_unknown_counter_rejected(self, service):
+        with pytest.raises(ValueError):
+            service.incr('service_request', 1, 'price')
+
+    def test_local_flush_waits_until_due(self, db, service, service_request):
+        service.incr('service_request', service_request.id, 'view_count')
+        assert service.flush_local_if_due() == 0
+
+        service._local_since -= 120
+        assert service.flush_local_if_due() == 1
+        db.session.refresh(service_request)
+        assert service_request.view_count == 11
+
+
+class TestServiceRequestApi:
+    """API koristi brojače umesto read-modify-write."""
+
+    def test_view_is_counted_and_bid_moves_status(self, db, client_a, tenant_a, service_request, monkeypatch):
+        from app.services import counter_service
+        svc = CounterService()
+        monkeypatch.setattr(counter_service, 'counters', svc)
+        monkeypatch.setattr('app.api.v1.service_requests.counters', svc)
+        monkeypatch.setattr('app.services.credit_service.deduct_credits', lambda **kw: type('T', (), {'id': None})())
+        db.session.add(FeatureFlag(feature_key='b2c_marketplace_enabled', enabled=True))
+        db.session.commit()
+
+        res = client_a.get(f'/api/v1/service-requests/{service_request.id}')
+        assert json.loads(res.data)['view_count'] == 11
+
+        res = client_a.post(f'/api/v1/service-requests/{service_request.id}/bid', json={'price': 3000})
+        assert res.status_code == 201
+
+        db.session.refresh(service_request)
+        assert service_request.status == ServiceRequestStatus.IN_BIDDING
+        assert service_request.bid_count == 2  # upis tek na flush
+        res = client_a.get(f'/api/v1/service-requests/{service_request.id}')
+        assert json.loads(res.data)['bid_count'] == 3
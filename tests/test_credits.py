@@ -5,11 +5,12 @@ import pytest
 import json
 from decimal import Decimal
 from app.models.feature_flag import FeatureFlag
-from app.models.credits import CreditBalance, OwnerType, CreditTransactionType
+from app.models.credits import CreditBalance, CreditTransaction, OwnerType, CreditTransactionType
 from app.services.credit_service import (
     get_or_create_balance, add_credits, deduct_credits,
-    refund_credits, CREDIT_PACKAGES
+    refund_credits, apply_debit, CREDIT_PACKAGES
 )
+from app.services.sms_billing_service import SmsBillingService, get_sms_price
 
 
 @pytest.fixture
@@ -69,6 +70,64 @@ class TestCreditOperations:
         assert balance_a.balance == Decimal('50')
 
 
+class TestConditionalUpdates:
+    """Uslovni UPDATE umesto FOR UPDATE, idempotentnost preko unique indeksa."""
+
+    def test_apply_debit_keeps_session_object_in_sync(self, db, tenant_a, balance_a):
+        balance_id, balance_after = apply_debit(Decimal('15'), balance_id=balance_a.id)
+        assert balance_id == balance_a.id
+        assert balance_after == Decimal('35')
+        assert balance_a.balance == Decimal('35')
+        assert balance_a.total_spent == Decimal('15')
+
+        assert apply_debit(Decimal('36'), owner_type=OwnerType.TENANT, owner_id=tenant_a.id) is None
+        db.session.commit()
+        db.session.refresh(balance_a)
+        assert balance_a.balance == Decimal('35')
+
+    def test_deduct_same_key_debits_once(self, db, tenant_a, balance_a):
+        first = deduct_credits(OwnerType.TENANT, tenant_a.id, Decimal('10'),
+                               CreditTransactionType.CONNECTION_FEE, 'Prvi', idempotency_key='fee-1')
+        db.session.commit()
+        second = deduct_credits(OwnerType.TENANT, tenant_a.id, Decimal('10'),
+                                CreditTransactionType.CONNECTION_FEE, 'Ponovo', idempotency_key='fee-1')
+        db.session.commit()
+
+        assert second.id == first.id
+        db.session.refresh(balance_a)
+        assert balance_a.balance == Decimal('40')
+        assert CreditTransaction.query.filter_by(idempotency_key='fee-1').count() == 1
+
+    def test_add_same_key_credits_once(self, db, tenant_a, balance_a):
+        for _ in range(2):
+            add_credits(OwnerType.TENANT, tenant_a.id, Decimal('25'),
+                        CreditTransactionType.PROMO, 'Promo', idempotency_key='promo-1')
+            db.session.commit()
+        db.session.refresh(balance_a)
+        assert balance_a.balance == Decimal('75')
+        assert balance_a.total_received_free == Decimal('75')
+
+    def test_sms_batch_charges_affordable_block(self, db, tenant_a):
+        tenant_a.sms_notifications_enabled = True
+        tenant_a.sms_notifications_consent_given = True
+        price = get_sms_price()
+        bal = get_or_create_balance(OwnerType.TENANT, tenant_a.id)
+        add_credits(OwnerType.TENANT, tenant_a.id, price * 2 + price / 2,
+                    CreditTransactionType.WELCOME, 'Test')
+        db.session.commit()
+
+        ids, msg = SmsBillingService.charge_for_sms_batch(
+            tenant_a.id, [('TICKET_READY', n, None) for n in (1, 2, 3)]
+        )
+        assert ids[2] is None and None not in ids[:2]
+
+        db.session.refresh(bal)
+        assert bal.balance == price / 2
+        charged = CreditTransaction.query.filter(CreditTransaction.id.in_(ids[:2])).order_by(
+            CreditTransaction.id).all()
+        assert [t.balance_after for t in charged] == [price + price / 2, price / 2]
+
+
 class TestCreditsAPI:
     """Credits API endpointi."""
 
@@ -0,0 +1,100 @@
+"""
+Finance testovi — dnevni agregati prometa, sumarni pregled iz rollup-a,
+paginirani detalji.
+"""
+import pytest
+import json
+from decimal import Decimal
+from datetime import date, datetime, timedelta
+
+from app.models.inventory import PhoneListing
+from app.models.revenue_fact import DailyRevenueFact
+from app.models.ticket import ServiceTicket, TicketStatus
+from app.services.finance_service import FinanceService
+
+
+def _days_ago(n, hour=12):
+    return datetime.combine(date.today() - timedelta(days=n), datetime.min.time()).replace(hour=hour)
+
+
+@pytest.fixture
+def sales(db, tenant_a, tenant_b, location_a1, location_b1, admin_a):
+    for n, (days_ago, price) in enumerate([(3, 1000), (3, 2000), (1, 1500), (0, 500)], start=1):
+        db.session.add(ServiceTicket(
+            tenant_id=tenant_a.id, location_id=location_a1.id, ticket_number=n,
+            customer_name='Kupac', brand='Apple', model='iPhone 12', problem_description='Ekran',
+            status=TicketStatus.DELIVERED, created_by_id=admin_a.id,
+            is_paid=True, paid_at=_days_ago(days_ago), final_price=Decimal(price),
+        ))
+    for tenant, location, days_ago in [(tenant_a, location_a1, 2), (tenant_a, location_a1, 0), (tenant_b, location_b1, 2)]:
+        db.session.add(PhoneListing(
+            tenant_id=tenant.id, location_id=location.id, brand='Samsung', model='S21',
+            purchase_price=Decimal('20000'), sales_price=Decimal('30000'),
+            sold=True, sold_at=_days_ago(days_ago),
+        ))
+    db.session.commit()
+
+
+class TestRollup:
+    """Noćni rollup."""
+
+    def test_rollup_is_idempotent(self, db, sales):
+        yesterday = date.today() - timedelta(days=1)
+        FinanceService.rollup_days(yesterday - timedelta(days=10), yesterday)
+        result = FinanceService.rollup_days(yesterday - timedelta(days=10), yesterday)
+        db.session.commit()
+
+        # tickets: 2 dana, phones: 2 tenanta
+        assert result['rows'] == 4
+        assert DailyRevenueFact.query.count() == 4
+        fact = DailyRevenueFact.query.filter_by(source='tickets', day=date.today() - timedelta(days=3)).one()
+        assert fact.count == 2
+        assert fact.revenue == Decimal('3000.00')
+
+    def test_summary_same_before_and_after_rollup(self, db, sales, tenant_a):
+        before = FinanceService.get_summary(tenant_a.id, days=30)
+
+        yesterday = date.today() - timedelta(days=1)
+        FinanceService.rollup_days(yesterday - timedelta(days=30), yesterday)
+        db.session.commit()
+        after = FinanceService.get_summary(tenant_a.id, days=30)
+
+        assert after == before
+        assert after['tickets'] == {'total': 5000.0, 'count': 4}
+        assert after['phones'] == {'total': 60000.0, 'profit': 20000.0, 'count': 2}
+        assert 'items' not in after['tickets']
+
+    def test_partial_rollup_keeps_older_days(self, db, sales, tenant_a, location_a1, admin_a):
+        """Noćni rollup (juče + prekjuče) bez inicijalnog punjenja ne gubi starije dane."""
+        db.session.add(ServiceTicket(
+            tenant_id=tenant_a.id, location_id=location_a1.id, ticket_number=50,
+            customer_name='Kupac', brand='Apple', model='iPhone 12', problem_description='Ekran',
+            status=TicketStatus.DELIVERED, created_by_id=admin_a.id,
+            is_paid=True, paid_at=_days_ago(20), final_price=Decimal('4000'),
+        ))
+        db.session.commit()
+        before = FinanceService.get_summary(tenant_a.id, days=30)
+        assert before['tickets'] == {'total': 9000.0, 'count': 5}
+
+        yesterday = date.today() - timedelta(days=1)
+        FinanceService.rollup_days(yesterday - timedelta(days=1), yesterday)
+        db.session.commit()
+        assert FinanceService.get_summary(tenant_a.id, days=30) == before
+
+        # Rupa između dva rollup-a se takođe računa iz izvornih tabela
+        FinanceService.rollup_days(date.today() - timedelta(days=25), date.today() - timedelta(days=15))
+        db.session.commit()
+        assert FinanceService.get_summary(tenant_a.id, days=30) == before
+
+
+class TestDetails:
+    """Paginirani detalji."""
+
+    def test_tickets_paginated(self, db, client_a, sales):
+        res = client_a.get('/api/v1/finance/tickets?days=30&per_page=3&page=2')
+        assert res.status_code == 200
+        data = json.loads(res.data)
+        assert data['total'] == 5000.0
+        assert data['count'] == 4
+        assert data['pages'] == 2
+        assert len(data['items']) == 1
@@ -0,0 +1,117 @@
+"""
+Geo testovi — geohash, pokrivanje kruga ćelijama, pretraga servisa
+i zahteva po blizini.
+"""
+import pytest
+import json
+
+from app.models.feature_flag import FeatureFlag
+from app.models.public_user import PublicUser
+from app.models.service_request import ServiceRequest, ServiceRequestCategory
+from app.utils.geo import encode_geohash, covering_prefixes, haversine_km
+
+
+BEOGRAD = (44.8125, 20.4612)
+ZEMUN = (44.8430, 20.4011)
+NOVI_SAD = (45.2671, 19.8335)
+NIS = (43.3209, 21.8958)
+
+
+@pytest.fixture
+def b2c(db):
+    db.session.add(FeatureFlag(feature_key='b2c_marketplace_enabled', enabled=True))
+    db.session.flush()
+
+
+@pytest.fixture
+def public_user(db):
+    user = PublicUser(email='kupac@test.com', ime='Pera', prezime='Peric')
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def _request(db, user, coords, title):
+    sr = ServiceRequest(
+        public_user_id=user.id, category=ServiceRequestCategory.SCREEN_REPAIR,
+        title=title, latitude=coords[0], longitude=coords[1]
+    )
+    db.session.add(sr)
+    return sr
+
+
+class TestGeohash:
+    """Geohash i pokrivanje kruga."""
+
+    def test_encode_known_value(self):
+        assert encode_geohash(57.64911, 10.40744, 11) == 'u4pruydqqvj'
+
+    def test_geohash_follows_coordinates(self, db, location_a1):
+        location_a1.latitude, location_a1.longitude = BEOGRAD
+        db.session.flush()
+        assert location_a1.geohash == encode_geohash(*BEOGRAD)
+
+        location_a1.latitude = None
+        db.session.flush()
+        assert location_a1.geohash is None
+
+    def test_cover_contains_points_in_radius(self):
+        prefixes = covering_prefixes(*BEOGRAD, 10)
+        assert len(prefixes) <= 16
+        assert any(encode_geohash(*ZEMUN).startswith(p) for p in prefixes)
+        assert not any(encode_geohash(*NIS).startswith(p) for p in prefixes)
+
+
+class TestNearbyServices:
+    """Korisnik traži servise."""
+
+    def test_nearest_tenants_ordered_by_distance(self, app, db, b2c, tenant_a, tenant_b,
+                                                 location_a1, location_a2, location_b1):
+        location_a1.latitude, location_a1.longitude = NOVI_SAD
+        location_a2.latitude, location_a2.longitude = ZEMUN
+        location_b1.latitude, location_b1.longitude = BEOGRAD
+        db.session.commit()
+
+        res = app.test_client().get(f'/api/public/services/nearby?lat={BEOGRAD[0]}&lon={BEOGRAD[1]}&radius_km=20')
+
+        assert res.status_code == 200
+        services = json.loads(res.data)['services']
+        # Tenant A se vraća jednom, po najbližoj lokaciji (Zemun)
+        assert [s['id'] for s in services] == [tenant_b.id, tenant_a.id]
+        assert services[1]['location']['id'] == location_a2.id
+        assert services[1]['distance_km'] == pytest.approx(haversine_km(*BEOGRAD, *ZEMUN), abs=0.01)
+
+    def test_missing_coordinates(self, app, db, b2c):
+        res = app.test_client().get('/api/public/services/nearby')
+        assert res.status_code == 400
+
+
+class TestNearbyRequests:
+    """Servis traži zahteve."""
+
+    def test_defaults_to_location_coverage(self, db, client_a, b2c, public_user, location_a1):
+        location_a1.latitude, location_a1.longitude = BEOGRAD
+        location_a1.coverage_radius_km = 100
+        near = _request(db, public_user, ZEMUN, 'Ekran Zemun')
+        mid = _request(db, public_user, NOVI_SAD, 'Ekran Novi Sad')
+        _request(db, public_user, NIS, 'Ekran Nis')
+        db.session.commit()
+
+        res = client_a.get('/api/v1/service-requests/nearby')
+
+        assert res.status_code == 200
+        data = json.loads(res.data)
+        assert [r['id'] for r in data['requests']] == [near.id, mid.id]
+        assert data['radius_km'] == 100
+
+    def test_explicit_radius_and_limit(self, db, client_a, b2c, public_user, location_a1):
+        _request(db, public_user, ZEMUN, 'Ekran Zemun')
+        _request(db, public_user, NOVI_SAD, 'Ekran Novi Sad')
+        db.session.commit()
+
+        res = client_a.get(f'/api/v1/service-requests/nearby?lat={NOVI_SAD[0]}&lon={NOVI_SAD[1]}'
+                           f'&radius_km=200&limit=1')
+
+        requests = json.loads(res.data)['requests']
+        assert len(requests) == 1
+        assert requests[0]['title'] == 'Ekran Novi Sad'
@@ -0,0 +1,88 @@
+"""
+JSON provider — orjson serijalizacija sa Decimal/datetime/Enum/Row
+tipovima, stdlib fallback i compact_jsonify za liste.
+"""
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+
+from app.models import TicketStatus
+from app.utils import json_provider
+from app.utils.json_provider import OrjsonProvider, compact_jsonify
+
+
+PAYLOAD = {
+    'price': Decimal('1234.50'),
+    'created_at': datetime(2025, 3, 1, 10, 30, 15, tzinfo=timezone.utc),
+    'naive': datetime(2025, 3, 1, 10, 30),
+    'day': date(2025, 3, 1),
+    'status': TicketStatus.READY,
+    'tags': {'a'},
+}
+
+EXPECTED = {
+    'price': 1234.5,
+    'created_at': '2025-03-01T10:30:15+00:00',
+    'naive': '2025-03-01T10:30:00',
+    'day': '2025-03-01',
+    'status': 'READY',
+    'tags': ['a'],
+}
+
+
+@pytest.fixture(params=[True, False], ids=['orjson', 'stdlib'])
+def backend(request, monkeypatch):
+    if request.param and not json_provider.ORJSON_AVAILABLE:
+        pytest.skip('orjson nije instaliran')
+    monkeypatch.setattr(json_provider, 'ORJSON_AVAILABLE', request.param)
+    return request.param
+
+
+class TestSerialization:
+    """Isti rezultat sa orjson-om i sa stdlib fallback-om."""
+
+    def test_native_types(self, app, backend):
+        with app.app_context():
+            assert isinstance(app.json, OrjsonProvider)
+            assert json.loads(app.json.dumps(PAYLOAD)) == EXPECTED
+
+    def test_row(self, app, db, backend):
+        row = db.session.execute(text("SELECT 1 AS id, 'Pera' AS name")).one()
+        assert json.loads(app.json.dumps({'row': row})) == {'row': {'id': 1, 'name': 'Pera'}}
+
+    def test_int_keys(self, app, backend):
+        assert json.loads(app.json.dumps({7: 'ključ'})) == {'7': 'ključ'}
+
+    def test_unsupported_type_raises(self, app, backend):
+        with pytest.raises(TypeError):
+            app.json.dumps({'x': object()})
+
+    def test_big_int_falls_back_to_stdlib(self, app):
+        assert app.json.dumps({'n': 2 ** 70}) == '{"n":1180591620717411303424}'
+
+    def test_loads(self, app, backend):
+        assert app.json.loads(b'{"ime": "\xc4\x90or\xc4\x91e"}') == {'ime': 'Đorđe'}
+
+
+class TestResponses:
+    """jsonify i compact_jsonify."""
+
+    def test_jsonify_sorts_keys(self, app, backend):
+        from flask import jsonify
+        with app.test_request_context():
+            res = jsonify({'b': 1, 'a': Decimal('2.5')})
+        assert res.mimetype == 'application/json'
+        assert res.get_data(as_text=True) == '{"a":2.5,"b":1}\n'
+
+    def test_compact_keeps_insertion_order(self, app, backend):
+        with app.test_request_context():
+            res = compact_jsonify({'b': 1, 'a': [1, 2]})
+        assert res.get_data(as_text=True) == '{"b":1,"a":[1,2]}\n'
+
+    def test_ticket_list_endpoint(self, client_a, db):
+        res = client_a.get('/api/v1/tickets')
+        assert res.status_code == 200
+        assert list(json.loads(res.data)) == ['items', 'total', 'page', 'per_page', 'pages', 'next_cursor']
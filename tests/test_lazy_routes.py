@@ -0,0 +1,115 @@
+"""
+Cold start — lazy registracija ruta iz manifesta, import profil i
+poređenje boot merenja sa budžetom.
+"""
+import pytest
+from flask import Flask
+
+from app import create_app
+from app.utils import lazy_routes
+from app.utils.import_profile import parse_importtime, summarize
+from app.utils.lazy_routes import LazyView, build_manifest, is_lazy, write_manifest
+from benchmarks.boot import BOOT_BUDGET_MS, compare_boot
+from tests.conftest import IDORTestConfig
+
+
+class LazyConfig(IDORTestConfig):
+    LAZY_ROUTES = True
+
+
+@pytest.fixture
+def manifest_path(app, tmp_path, monkeypatch):
+    path = str(tmp_path / 'route_manifest.json')
+    monkeypatch.setattr(lazy_routes, 'MANIFEST_PATH', path)
+    return path
+
+
+class TestLazyRoutes:
+    """Rute iz manifesta se ponašaju isto kao eager registrovane."""
+
+    def test_same_url_map(self, app, manifest_path):
+        write_manifest(app)
+        lazy_app = create_app(LazyConfig)
+
+        assert is_lazy(lazy_app) and not is_lazy(app)
+        eager_rules = {(r.rule, r.endpoint, frozenset(r.methods)) for r in app.url_map.iter_rules()}
+        lazy_rules = {(r.rule, r.endpoint, frozenset(r.methods)) for r in lazy_app.url_map.iter_rules()}
+        assert lazy_rules == eager_rules
+
+    def test_view_loaded_on_first_request(self, app, db, manifest_path):
+        write_manifest(app)
+        lazy_app = create_app(LazyConfig)
+
+        view = lazy_app.view_functions['api_v1.auth.login']
+        assert isinstance(view, LazyView) and not view.loaded
+
+        res = lazy_app.test_client().post('/api/v1/auth/login', json={})
+        assert res.status_code == app.test_client().post('/api/v1/auth/login', json={}).status_code
+        assert view.loaded
+        assert view.resolve() is app.view_functions['api_v1.auth.login']
+
+    def test_url_for_and_health(self, app, manifest_path):
+        from flask import url_for
+
+        write_manifest(app)
+        lazy_app = create_app(LazyConfig)
+        with lazy_app.test_request_context():
+            assert url_for('api_v1.tickets.list_tickets') == '/api/v1/tickets'
+        assert lazy_app.test_client().get('/health').status_code == 200
+
+    def test_stale_manifest_rejected(self, app, manifest_path, monkeypatch):
+        write_manifest(app)
+        monkeypatch.setattr(lazy_routes, 'source_fingerprint', lambda: 'drugi-kod')
+        assert lazy_routes.load_manifest() is None
+        assert lazy_routes.register_lazy_routes(Flask('app')) is False
+
+    def test_manifest_skips_eager_endpoints(self, app):
+        endpoints = {r['endpoint'] for r in build_manifest(app)['routes']}
+        assert 'health_check' not in endpoints and 'static' not in endpoints
+        assert 'api_v1.tickets.list_tickets' in endpoints
+
+
+class TestImportProfile:
+    """Parsiranje `python -X importtime` izlaza."""
+
+    OUTPUT = '\n'.join([
+        'import time: self [us] | cumulative | imported package',
+        'import time:       100 |        100 |   reportlab.lib.colors',
+        'import time:       300 |        400 | reportlab',
+        'import time:      1200 |       1200 | app.services.pdf_service',
+        'neki drugi red sa stderr-a',
+    ])
+
+    def test_parse(self):
+        entries = parse_importtime(self.OUTPUT)
+        assert entries[0] == ('reportlab.lib.colors', 100, 100)
+        assert len(entries) == 3
+
+    def test_summarize(self):
+        report = summarize(parse_importtime(self.OUTPUT), top=2)
+        assert report['total_ms'] == 1.6
+        assert report['slowest'] == [('app.services.pdf_service', 1.2), ('reportlab', 0.4)]
+        assert report['packages'] == [('app', 1.2), ('reportlab', 0.4)]
+
+
+class TestBootCompare:
+    """Budžet i baseline cold start-a."""
+
+    REFERENCE = {'total_ms': 1000.0, 'modules': 900}
+
+    def _sample(self, total_ms=1000.0, modules=900, status=200):
+        return {'total_ms': total_ms, 'modules': modules, 'status': status}
+
+    def test_within_baseline(self):
+        assert compare_boot(self._sample(total_ms=1400, modules=980), self.REFERENCE) == []
+
+    def test_new_modules_regression(self):
+        assert compare_boot(self._sample(modules=1000), self.REFERENCE, check_latency=False)
+
+    def test_budget(self):
+        problems = compare_boot(self._sample(total_ms=BOOT_BUDGET_MS + 1), None)
+        assert 'budžet' in problems[0][1]
+        assert compare_boot(self._sample(total_ms=BOOT_BUDGET_MS + 1), None, check_latency=False) == []
+
+    def test_failed_health(self):
+        assert compare_boot(self._sample(status=500), None, check_latency=False)
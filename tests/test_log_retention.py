@@ -0,0 +1,120 @@
+"""
+Log retention testovi — rotacija u arhivu, dnevni agregati, istek arhive,
+istorija naloga iz arhive.
+"""
+import json
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+from app.models.audit import AuditLog, AuditAction
+from app.models.security_event import SecurityEvent
+from app.models.sms_management import TenantSmsUsage
+from app.models.log_retention import LogDailyRollup, ARCHIVE_TABLES
+from app.models.ticket import ServiceTicket, TicketStatus
+from app.services.log_retention_service import log_retention
+
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+
+def _archive_count(db, source):
+    return len(db.session.execute(ARCHIVE_TABLES[source].select()).all())
+
+
+class TestRotation:
+    """Premestanje starih redova u arhivu."""
+
+    def test_old_rows_move_to_archive(self, db, tenant_a):
+        old = NOW - timedelta(days=40)
+        for i in range(3):
+            SecurityEvent.log('login_failed', tenant_id=tenant_a.id).created_at = old
+        SecurityEvent.log('login_success', tenant_id=tenant_a.id).created_at = old
+        SecurityEvent.log('login_failed', tenant_id=tenant_a.id).created_at = NOW - timedelta(days=1)
+        db.session.commit()
+
+        stats = log_retention.rotate('security_event', now=NOW)
+
+        assert stats == {'days': 1, 'archived': 4}
+        assert SecurityEvent.query.count() == 1
+        assert _archive_count(db, 'security_event') == 4
+
+        rollups = {r.bucket: r.event_count for r in LogDailyRollup.query.filter_by(source='security_event')}
+        assert rollups == {'login_failed': 3, 'login_success': 1}
+
+    def test_rotation_is_idempotent(self, db, tenant_a):
+        SecurityEvent.log('login_failed', tenant_id=tenant_a.id).created_at = NOW - timedelta(days=60)
+        db.session.commit()
+
+        log_retention.rotate('security_event', now=NOW)
+        stats = log_retention.rotate('security_event', now=NOW)
+
+        assert stats['archived'] == 0
+        assert LogDailyRollup.query.filter_by(source='security_event').one().event_count == 1
+
+    def test_rollup_sums_amount(self, db, tenant_a):
+        for cost in ('3.5000', '3.5000'):
+            db.session.add(TenantSmsUsage(
+                tenant_id=tenant_a.id, sms_type='TICKET_READY', status='sent',
+                cost=Decimal(cost), created_at=NOW - timedelta(days=120)
+            ))
+        db.session.commit()
+
+        log_retention.rotate('tenant_sms_usage', now=NOW)
+
+        rollup = LogDailyRollup.query.filter_by(source='tenant_sms_usage').one()
+        assert rollup.bucket == 'TICKET_READY:sent'
+        assert rollup.event_count == 2
+        assert rollup.amount == Decimal('7.0000')
+
+    def test_expire_deletes_old_archive(self, db, tenant_a):
+        SecurityEvent.log('login_failed', tenant_id=tenant_a.id).created_at = NOW - timedelta(days=500)
+        SecurityEvent.log('login_failed', tenant_id=tenant_a.id).created_at = NOW - timedelta(days=100)
+        db.session.commit()
+
+        log_retention.rotate('security_event', now=NOW)
+        expired = log_retention.expire('security_event', now=NOW)
+
+        assert expired == 1
+        assert _archive_count(db, 'security_event') == 1
+        # Agregati ostaju i posle brisanja arhive
+        assert LogDailyRollup.query.filter_by(source='security_event').count() == 2
+
+
+class TestQueries:
+    """Query helperi preko hot tabele i arhive."""
+
+    def test_daily_counts_merges_rollup_and_hot(self, db, tenant_a):
+        SecurityEvent.log('login_failed', tenant_id=tenant_a.id).created_at = NOW - timedelta(days=45)
+        SecurityEvent.log('login_failed', tenant_id=tenant_a.id).created_at = NOW - timedelta(days=2)
+        db.session.commit()
+        log_retention.rotate('security_event', now=NOW)
+
+        rows = log_retention.daily_counts(
+            'security_event', (NOW - timedelta(days=60)).date(), NOW.date(), tenant_id=tenant_a.id
+        )
+        assert [r['count'] for r in rows] == [1, 1]
+        assert all(r['bucket'] == 'login_failed' for r in rows)
+
+    def test_ticket_history_reads_archive(self, db, client_a, tenant_a, location_a1, admin_a):
+        created = datetime.utcnow() - timedelta(days=200)
+        ticket = ServiceTicket(
+            tenant_id=tenant_a.id, location_id=location_a1.id, ticket_number=1,
+            customer_name='Test', brand='Apple', model='iPhone 12',
+            problem_description='Ekran', status=TicketStatus.RECEIVED,
+            created_by_id=admin_a.id, created_at=created,
+        )
+        db.session.add(ticket)
+        db.session.flush()
+        AuditLog.log('ticket', ticket.id, AuditAction.CREATE, tenant_id=tenant_a.id,
+                     user_id=admin_a.id).created_at = created
+        AuditLog.log('ticket', ticket.id, AuditAction.UPDATE, tenant_id=tenant_a.id,
+                     user_id=admin_a.id)
+        db.session.commit()
+
+        log_retention.rotate('audit_log')
+        assert AuditLog.query.count() == 1
+
+        res = client_a.get(f'/api/v1/tickets/{ticket.id}/history')
+        assert res.status_code == 200
+        actions = [i['action'] for i in json.loads(res.data)['items']]
+        assert actions == ['UPDATE', 'CREATE']
@@ -0,0 +1,87 @@
+"""
+Keyset paginacija — cursor kroz ceo skup bez duplikata i preskakanja,
+isti created_at (id kao drugi ključ), klasični režim i neispravan cursor.
+"""
+import pytest
+import json
+from datetime import datetime, timedelta
+
+from app.models import ServiceTicket, TicketStatus
+from app.utils.pagination import paginate, encode_cursor, decode_cursor, _sort_keys
+
+
+@pytest.fixture
+def tickets(db, tenant_a, location_a1, admin_a):
+    """7 naloga; prva tri sa istim created_at."""
+    base = datetime(2026, 1, 10, 12, 0, 0)
+    result = []
+    for n in range(1, 8):
+        t = ServiceTicket(
+            tenant_id=tenant_a.id, location_id=location_a1.id, created_by_id=admin_a.id,
+            ticket_number=n, customer_name=f'Kupac {n}', customer_phone='0601234567',
+            device_type='PHONE', brand='Apple', model='iPhone', problem_description='Ekran',
+            status=TicketStatus.RECEIVED, created_at=base + timedelta(minutes=max(n - 3, 0)),
+        )
+        db.session.add(t)
+        result.append(t)
+    db.session.commit()
+    return result
+
+
+def _walk(client, url):
+    ids, cursor, pages = [], '', 0
+    while cursor is not None:
+        data = json.loads(client.get(f'{url}&cursor={cursor}').data)
+        ids += [item['id'] for item in data['items']]
+        cursor = data['next_cursor']
+        pages += 1
+    return ids, pages
+
+
+class TestKeysetApi:
+    """Cursor režim na listi naloga."""
+
+    def test_cursor_walks_all_rows_in_order(self, client_a, tickets):
+        ids, pages = _walk(client_a, '/api/v1/tickets?per_page=3')
+
+        expected = [t.id for t in sorted(tickets, key=lambda t: (t.created_at, t.id), reverse=True)]
+        assert ids == expected
+        assert pages == 3
+
+    def test_cursor_mode_skips_count_unless_requested(self, client_a, tickets):
+        data = json.loads(client_a.get('/api/v1/tickets?per_page=3&cursor=').data)
+        assert data['total'] is None and data['page'] is None
+
+        data = json.loads(client_a.get('/api/v1/tickets?per_page=3&cursor=&total=exact').data)
+        assert data['total'] == 7 and data['pages'] == 3
+
+    def test_page_mode_unchanged_and_links_to_cursor(self, client_a, tickets):
+        first = json.loads(client_a.get('/api/v1/tickets?per_page=3&page=1').data)
+        assert (first['total'], first['page'], first['pages']) == (7, 1, 3)
+
+        second = json.loads(client_a.get(f"/api/v1/tickets?per_page=3&cursor={first['next_cursor']}").data)
+        paged = json.loads(client_a.get('/api/v1/tickets?per_page=3&page=2').data)
+        assert [i['id'] for i in second['items']] == [i['id'] for i in paged['items']]
+
+    def test_invalid_cursor_is_400(self, client_a, tickets):
+        assert client_a.get('/api/v1/tickets?cursor=nije-cursor').status_code == 400
+
+
+class TestKeysetHelper:
+    """paginate() van endpointa."""
+
+    def test_mixed_directions(self, app, tickets):
+        order = (ServiceTicket.created_at.asc(), ServiceTicket.id.desc())
+        seen, cursor = [], ''
+        while cursor is not None:
+            page = paginate(ServiceTicket.query, order, per_page=2, cursor=cursor)
+            seen += [t.id for t in page.items]
+            cursor = page.next_cursor
+
+        expected = [t.id for t in sorted(tickets, key=lambda t: (t.created_at, -t.id))]
+        assert seen == expected
+
+    def test_cursor_roundtrip_keeps_types(self):
+        keys = _sort_keys((ServiceTicket.created_at.desc(), ServiceTicket.status, ServiceTicket.id.desc()))
+        values = [datetime(2026, 1, 10, 12, 0, 0, 123), TicketStatus.READY, 42]
+        assert decode_cursor(encode_cursor(values), keys) == values
@@ -0,0 +1,93 @@
+"""
+Password service — bcrypt van request thread-a, odbijanje kad je pool
+zasićen, preračunavanje hash-a posle promene BCRYPT_ROUNDS.
+"""
+import pytest
+import json
+
+from app.services import password_service
+from app.services.password_service import PasswordService, PasswordHasherBusy
+
+
+@pytest.fixture
+def hasher():
+    svc = PasswordService()
+    yield svc
+    if svc._pool is not None:
+        svc._pool.shutdown(wait=False)
+
+
+class TestPasswordService:
+    """Hash, verify i metrike."""
+
+    def test_hash_and_verify_inline(self, app, hasher):
+        with app.app_context():
+            hashed = hasher.hash('tajna123')
+            assert hashed.startswith('$2b$04$')
+            assert hasher.verify('tajna123', hashed)
+            assert not hasher.verify('pogresna', hashed)
+            assert not hasher.verify('tajna123', None)
+
+            stats = hasher.stats()
+        assert (stats['hash'], stats['verify']) == (1, 2)
+        assert stats['latency_ms']['samples'] == 3
+
+    def test_hash_and_verify_in_pool(self, app, hasher, monkeypatch):
+        monkeypatch.setitem(app.config, 'PASSWORD_POOL_WORKERS', 1)
+        # Spawn worker-a uvozi aplikaciju - prvi poziv traje duže
+        monkeypatch.setitem(app.config, 'PASSWORD_VERIFY_TIMEOUT', 60)
+        with app.app_context():
+            hashed = hasher.hash('tajna123')
+            assert hasher._pool is not None
+            assert hashed.startswith('$2b$04$')
+            assert hasher.verify('tajna123', hashed)
+            assert not hasher.verify('pogresna', hashed)
+
+            stats = hasher.stats()
+        assert (stats['hash'], stats['verify']) == (1, 2)
+
+    def test_needs_rehash_only_on_higher_cost(self, app, hasher, monkeypatch):
+        monkeypatch.setitem(app.config, 'BCRYPT_ROUNDS', 5)
+        with app.app_context():
+            assert hasher.needs_rehash('$2b$04$' + 'a' * 53)
+            assert not hasher.needs_rehash('$2b$05$' + 'a' * 53)
+            assert not hasher.needs_rehash('$2b$12$' + 'a' * 53)
+
+    def test_saturated_pool_rejects_without_waiting(self, app, hasher, monkeypatch):
+        monkeypatch.setitem(app.config, 'PASSWORD_POOL_WORKERS', 1)
+        monkeypatch.setitem(app.config, 'PASSWORD_POOL_MAX_PENDING', 1)
+        with app.app_context():
+            hasher._get_pool()
+            hasher._slots.acquire()  # jedini slot zauzet
+
+            with pytest.raises(PasswordHasherBusy):
+                hasher.verify('tajna123', '$2b$04$' + 'a' * 53)
+            assert hasher.stats()['rejected'] == 1
+
+
+class TestLogin:
+    """Integracija sa modelima i login endpointom."""
+
+    def test_login_rehashes_when_rounds_change(self, app, db, admin_a, monkeypatch):
+        assert admin_a.password_hash.startswith('$2b$04$')
+        monkeypatch.setitem(app.config, 'BCRYPT_ROUNDS', 5)
+
+        assert admin_a.check_password('test1234')
+        assert admin_a.password_hash.startswith('$2b$05$')
+        assert admin_a.check_password('test1234')
+        assert not admin_a.check_password('pogresna')
+
+    def test_busy_hasher_returns_503(self, app, db, admin_a, monkeypatch):
+        db.session.commit()
+
+        def _busy(*args, **kwargs):
+            raise PasswordHasherBusy()
+        monkeypatch.setattr(password_service.password_hasher, 'verify', _busy)
+
+        res = app.test_client().post('/api/v1/auth/login', json={
+            'email': 'admin_a@test.com', 'password': 'test1234'
+        })
+
+        assert res.status_code == 503
+        assert res.headers['Retry-After'] == '2'
+        assert 'message' in json.loads(res.data)
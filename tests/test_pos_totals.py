@@ -0,0 +1,109 @@
+"""
+POS tekući brojači — inkrementalno ažuriranje pri izdavanju/storniranju/refundu,
+provera naspram punog obračuna, X izveštaj iz brojača.
+"""
+import pytest
+import json
+from decimal import Decimal
+
+from app.models.feature_flag import FeatureFlag
+from app.models.pos import CashRegisterTotals
+from app.services.pos_service import POSService
+
+
+@pytest.fixture
+def pos_enabled(db, tenant_a):
+    """Aktiviraj POS feature flag za tenant A."""
+    ff = FeatureFlag(feature_key='pos_enabled', tenant_id=tenant_a.id, enabled=True)
+    db.session.add(ff)
+    db.session.commit()
+    return ff
+
+
+def _sell(tenant, location, user, price, qty=1, method='CASH', **kwargs):
+    return POSService.quick_issue(
+        tenant.id, location.id, user.id,
+        items=[{'type': 'CUSTOM', 'item_name': 'Maska', 'unit_price': price,
+                'purchase_price': price / 2, 'quantity': qty}],
+        payment_method=method,
+        **kwargs,
+    )
+
+
+class TestSessionTotals:
+    """Brojači prate skup ISSUED računa."""
+
+    def test_issue_increments(self, db, tenant_a, location_a1, admin_a):
+        _sell(tenant_a, location_a1, admin_a, 1000, qty=2, cash_received=2500)
+        receipt = _sell(tenant_a, location_a1, admin_a, 500, method='CARD', card_amount=500)
+        db.session.commit()
+
+        totals = POSService.get_session_totals(receipt.session_id)['RSD']
+        assert totals['revenue'] == Decimal('2500.00')
+        assert totals['cost'] == Decimal('1250.00')
+        assert totals['cash'] == Decimal('2000.00')
+        assert totals['card'] == Decimal('500.00')
+        assert totals['receipt_count'] == 2
+        assert totals['items_sold'] == 3
+        assert CashRegisterTotals.query.count() == 1
+
+    def test_void_and_refund_decrement(self, db, tenant_a, location_a1, admin_a):
+        voided = _sell(tenant_a, location_a1, admin_a, 1000, cash_received=1000)
+        refunded = _sell(tenant_a, location_a1, admin_a, 300, method='CARD', card_amount=300)
+        kept = _sell(tenant_a, location_a1, admin_a, 200, method='CARD', card_amount=200)
+        db.session.commit()
+
+        POSService.void_receipt(voided.id, admin_a.id, 'Greška')
+        POSService.refund_receipt(refunded.id, admin_a.id)
+        db.session.commit()
+
+        totals = POSService.get_session_totals(kept.session_id)['RSD']
+        # Refundiran original izlazi (-300), refund račun ulazi sa negativnim iznosom (-300)
+        assert totals['revenue'] == Decimal('-100.00')
+        assert totals['cash'] == Decimal('0.00')
+        assert totals['card'] == Decimal('200.00')
+        # kept + refund račun (ISSUED, negativan)
+        assert totals['receipt_count'] == 2
+        assert totals['voided_count'] == 1
+
+        assert POSService.reconcile_session_totals(kept.session_id)['ok'] is True
+
+    def test_reconcile_detects_and_fixes_drift(self, db, tenant_a, location_a1, admin_a):
+        receipt = _sell(tenant_a, location_a1, admin_a, 1000, cash_received=1000)
+        db.session.commit()
+
+        row = CashRegisterTotals.query.filter_by(session_id=receipt.session_id).one()
+        row.revenue = Decimal('1.00')
+        db.session.commit()
+
+        result = POSService.reconcile_session_totals(receipt.session_id, fix=True)
+        db.session.commit()
+
+        assert result['ok'] is False
+        assert result['differences']['RSD']['revenue'] == {'stored': 1.0, 'computed': 1000.0}
+        assert POSService.reconcile_session_totals(receipt.session_id)['ok'] is True
+
+
+class TestReportsFromTotals:
+    """X i Z izveštaji čitaju brojače."""
+
+    def test_x_report_and_daily_report(self, db, client_a, pos_enabled, tenant_a, location_a1, admin_a):
+        receipt = _sell(tenant_a, location_a1, admin_a, 1500, cash_received=2000)
+        db.session.commit()
+
+        res = client_a.get(f'/api/v1/pos/reports/x?location_id={location_a1.id}')
+        assert res.status_code == 200
+        data = json.loads(res.data)
+        assert data['total_revenue'] == 1500.0
+        assert data['total_cash'] == 1500.0
+        assert data['receipt_count'] == 1
+        assert data['by_currency']['RSD']['receipt_count'] == 1
+
+        report = POSService.generate_daily_report(receipt.session_id)
+        db.session.commit()
+        assert report.total_revenue == Decimal('1500.00')
+        assert report.receipt_count == 1
+        assert report.items_sold == 1
+
+        res = client_a.get(f'/api/v1/pos/reports/x/reconcile?location_id={location_a1.id}')
+        assert json.loads(res.data)['ok'] is True
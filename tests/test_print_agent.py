@@ -0,0 +1,203 @@
+"""
+POS print agent — spool na disku, worker sa retry/back-off, keš
+zaglavlja i HTTP server koji ne čeka štampač.
+"""
+import importlib.util
+import json
+import os
+import threading
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+AGENT_PATH = Path(__file__).resolve().parent.parent / 'scripts' / 'pos_print_agent.py'
+
+
+def _load_agent():
+    spec = importlib.util.spec_from_file_location('pos_print_agent', AGENT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeBuffer:
+    """Zamena za escpos Dummy - skuplja tekst kao bajtove."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def set(self, **kwargs):
+        pass
+
+    def text(self, value):
+        self.chunks.append(value.encode('utf-8'))
+
+    def _raw(self, value):
+        self.chunks.append(value)
+
+    def qr(self, *args, **kwargs):
+        pass
+
+    def cut(self):
+        self.chunks.append(b'<CUT>')
+
+    @property
+    def output(self):
+        return b''.join(self.chunks)
+
+
+RECEIPT = {
+    'tenant': {'name': 'Servis A', 'pib': '123456789'},
+    'receipt': {'receipt_number': 'R-1', 'total_amount': 700, 'payment_method': 'CASH',
+                'items': [{'item_name': 'USB kabal', 'quantity': 2, 'unit_price': 350, 'line_total': 700}]},
+}
+
+
+@pytest.fixture
+def agent(monkeypatch, tmp_path):
+    module = _load_agent()
+    buffers = []
+
+    def new_buffer():
+        buffers.append(FakeBuffer())
+        return buffers[-1]
+
+    monkeypatch.setattr(module, 'new_buffer', new_buffer)
+    module.buffers = buffers
+    module.spool = module.SpoolQueue(str(tmp_path / 'spool'))
+    return module
+
+
+def _spooled(agent):
+    return sorted(name for name in os.listdir(agent.spool.spool_dir) if name.endswith('.json'))
+
+
+class TestSpool:
+    """Poslovi su na disku dok ih štampač ne primi."""
+
+    def test_submit_writes_before_print(self, agent):
+        job = agent.spool.submit('receipt', RECEIPT)
+        assert _spooled(agent) == [job.id + '.json']
+        assert agent.spool.counts()['pending'] == 1
+
+    def test_recovered_in_order_after_restart(self, agent):
+        first = agent.spool.submit('receipt', RECEIPT)
+        second = agent.spool.submit('receipt', {**RECEIPT, 'paper_size': '58'})
+
+        restarted = agent.SpoolQueue(agent.spool.spool_dir)
+        assert restarted.load() == 2
+        assert [job['id'] for job in restarted.snapshot()['pending']] == [first.id, second.id]
+
+    def test_cancel_pending(self, agent):
+        job = agent.spool.submit('receipt', RECEIPT)
+        assert agent.spool.cancel(job.id) is job
+        assert _spooled(agent) == []
+        assert agent.spool.get(job.id).status == agent.CANCELLED
+
+
+class TestWorker:
+    """Redosled, retry sa back-off-om i poslovi koji ne mogu da se štampaju."""
+
+    def test_printer_offline_retries_then_prints(self, agent):
+        sent, offline = [], [True]
+
+        def send(raw):
+            if offline[0]:
+                raise OSError('printer offline')
+            sent.append(raw)
+
+        worker = agent.PrintWorker(agent.spool, send=send)
+        job = agent.spool.submit('receipt', RECEIPT)
+
+        worker.process(agent.spool.next_job(timeout=0))
+        assert job.status == agent.RETRYING and job.attempts == 1
+        assert 0 < job.to_dict()['retry_in'] <= agent.RETRY_BASE_SECONDS
+        assert agent.spool.next_job(timeout=0) is None  # back-off
+        assert _spooled(agent) == [job.id + '.json']
+
+        offline[0] = False
+        job.next_attempt_at = 0
+        worker.process(agent.spool.next_job(timeout=0))
+        assert job.status == agent.DONE and _spooled(agent) == []
+        assert len(sent) == 1 and b'USB kabal' in sent[0]
+        assert len(agent.buffers) == 2  # račun + zaglavlje, retry ne renderuje ponovo
+
+    def test_backoff_is_capped(self, agent):
+        job = agent.spool.submit('receipt', RECEIPT)
+        delays = [agent.spool.fail(job, OSError('offline')) for _ in range(8)]
+        assert delays[:3] == [2, 4, 8]
+        assert delays[-1] == agent.RETRY_MAX_SECONDS
+
+    def test_bad_job_does_not_block_queue(self, agent):
+        sent = []
+        worker = agent.PrintWorker(agent.spool, send=sent.append)
+        bad = agent.spool.submit('receipt', {'receipt': {'items': [None]}})
+        good = agent.spool.submit('receipt', RECEIPT)
+
+        worker.process(agent.spool.next_job(timeout=0))
+        worker.process(agent.spool.next_job(timeout=0))
+
+        assert bad.status == agent.FAILED and good.status == agent.DONE
+        assert os.listdir(agent.spool.failed_dir) == [bad.id + '.json']
+        assert len(sent) == 1
+
+    def test_header_rendered_once(self, agent):
+        worker = agent.PrintWorker(agent.spool, send=lambda raw: None)
+        for _ in range(3):
+            agent.spool.submit('receipt', RECEIPT)
+            worker.process(agent.spool.next_job(timeout=0))
+        # 3 računa + jedno zaglavlje
+        assert len(agent.buffers) == 4
+        assert agent._render_header.cache_info().hits == 2
+
+
+class TestServer:
+    """HTTP odgovara odmah, i dok je štampač zauzet."""
+
+    @pytest.fixture
+    def server(self, agent):
+        release = threading.Event()
+        agent.worker = agent.PrintWorker(agent.spool, send=lambda raw: release.wait(5))
+        agent.worker.start()
+        server = agent.ThreadingHTTPServer(('127.0.0.1', 0), agent.PrintAgentHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield f'http://127.0.0.1:{server.server_address[1]}', release, agent
+        release.set()
+        agent.worker.stop()
+        server.shutdown()
+        server.server_close()
+
+    def _post(self, url, data):
+        req = urllib.request.Request(url, data=json.dumps(data).encode(),
+                                     headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req, timeout=2) as res:
+            return res.status, json.loads(res.read())
+
+    def _get(self, url):
+        with urllib.request.urlopen(url, timeout=2) as res:
+            return json.loads(res.read())
+
+    def test_slow_test_page_reported_in_progress(self, server, monkeypatch):
+        url, release, agent = server
+        monkeypatch.setattr(agent, 'TEST_WAIT_SECONDS', 0.2)
+
+        status, body = self._post(url + '/test', {})
+
+        assert status == 202 and body['status'] == 'printing'
+        release.set()
+        assert agent.spool.get(body['job_id']).finished.wait(2)
+
+    def test_print_is_queued_while_printer_busy(self, server):
+        url, release, agent = server
+        first = self._post(url + '/print', RECEIPT)
+        status, second = self._post(url + '/print', RECEIPT)
+
+        assert first[0] == 202 and status == 202 and second['success']
+        assert self._get(url + '/status')['queue']['pending'] == 2
+        assert self._get(f"{url}/jobs/{second['job_id']}")['status'] == 'queued'
+
+        release.set()
+        job = agent.spool.get(second['job_id'])
+        assert job.finished.wait(2) and job.status == 'done'
+        assert [j['id'] for j in self._get(url + '/jobs')['recent']][0] == second['job_id']
@@ -0,0 +1,138 @@
+"""
+Public cache testovi — full-page keš javnih stranica, ETag/304,
+purge po tenantu na commit izmene usluga/profila.
+"""
+import pytest
+import time
+import json
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from app.models import TenantPublicProfile, ServiceItem
+from app.services import public_cache_service
+from app.services.public_cache_service import public_cache
+
+
+@pytest.fixture
+def fake_redis(fake_redis, app, monkeypatch):
+    # Test config vezuje rute za localhost - javne stranice rade na bilo kom hostu
+    monkeypatch.setitem(app.config, 'SERVER_NAME', None)
+    return fake_redis
+
+
+@pytest.fixture
+def public_site(db, tenant_a):
+    db.session.add(TenantPublicProfile(tenant_id=tenant_a.id, is_public=True, show_prices=True))
+    db.session.add(ServiceItem(
+        tenant_id=tenant_a.id, name='Zamena ekrana', category='Ekrani',
+        price=Decimal('5000'), is_active=True
+    ))
+    db.session.commit()
+    return tenant_a
+
+
+def _get(app, path, **headers):
+    return app.test_client().get(path, base_url='http://servis-a.shub.rs', headers=headers)
+
+
+class TestPageCache:
+    """Keširanje odgovora i HTTP keš headeri."""
+
+    def test_miss_then_hit(self, app, fake_redis, public_site):
+        first = _get(app, '/api/services')
+        second = _get(app, '/api/services')
+
+        assert first.status_code == 200
+        assert first.headers['X-Cache'] == 'MISS'
+        assert second.headers['X-Cache'] == 'HIT'
+        assert second.data == first.data
+        assert second.headers['ETag'] == first.headers['ETag']
+        assert 'stale-while-revalidate' in second.headers['Cache-Control']
+        assert second.headers['Surrogate-Key'] == f'tenant-{public_site.id}'
+
+    def test_hit_runs_no_queries(self, app, db, fake_redis, public_site):
+        """Lookup hosta i stranica iz Redis-a - bez upita u bazu."""
+        _get(app, '/api/services')
+        statements = []
+
+        def _track(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', _track)
+        try:
+            res = _get(app, '/cenovnik')
+            assert res.headers['X-Cache'] == 'MISS'
+            statements.clear()
+            res = _get(app, '/cenovnik')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', _track)
+
+        assert res.headers['X-Cache'] == 'HIT'
+        assert statements == []
+
+    def test_private_profile_not_served(self, app, db, fake_redis, public_site):
+        profile = TenantPublicProfile.query.filter_by(tenant_id=public_site.id).one()
+        profile.is_public = False
+        db.session.commit()
+
+        assert _get(app, '/api/services').status_code == 404
+
+    def test_etag_returns_304(self, app, fake_redis, public_site):
+        etag = _get(app, '/api/services').headers['ETag']
+
+        res = _get(app, '/api/services', **{'If-None-Match': etag})
+
+        assert res.status_code == 304
+        assert res.data == b''
+
+    def test_query_string_is_part_of_key(self, app, fake_redis, public_site):
+        _get(app, '/api/services')
+        res = _get(app, '/api/services?lang=en')
+        assert res.headers['X-Cache'] == 'MISS'
+
+    def test_stale_entry_served_while_revalidating(self, app, fake_redis, public_site, monkeypatch):
+        _get(app, '/api/services')
+        real_time = time.time
+        monkeypatch.setattr(public_cache_service.time, 'time', lambda: real_time() + 400)
+
+        # Prvi posle isteka osvežava, drugi dobija zastarelu verziju dok lock traje
+        refreshed = _get(app, '/api/services')
+        monkeypatch.setattr(public_cache_service.time, 'time', lambda: real_time() + 800)
+        stale = _get(app, '/api/services')
+
+        assert refreshed.headers['X-Cache'] == 'MISS'
+        assert stale.headers['X-Cache'] == 'STALE'
+
+    def test_redis_down_serves_uncached(self, app, db, public_site, redis_down, monkeypatch):
+        monkeypatch.setitem(app.config, 'SERVER_NAME', None)
+
+        res = _get(app, '/api/services')
+
+        assert res.status_code == 200
+        assert res.headers['X-Cache'] == 'MISS'
+
+
+class TestInvalidation:
+    """Purge po tenantu."""
+
+    def test_service_change_purges_tenant_pages(self, app, db, fake_redis, public_site):
+        _get(app, '/api/services')
+        assert _get(app, '/api/services').headers['X-Cache'] == 'HIT'
+
+        item = ServiceItem.query.filter_by(tenant_id=public_site.id).first()
+        item.price = Decimal('6000')
+        db.session.commit()
+
+        res = _get(app, '/api/services')
+        assert res.headers['X-Cache'] == 'MISS'
+        assert json.loads(res.data)['services'][0]['price'] == 6000
+
+    def test_purge_leaves_other_tenants(self, app, db, fake_redis, public_site, tenant_b):
+        _get(app, '/api/services')
+        public_cache.purge_tenant(tenant_b.id)
+        assert _get(app, '/api/services').headers['X-Cache'] == 'HIT'
+
+    def test_site_lookup_shared_in_redis(self, app, fake_redis, public_site):
+        _get(app, '/api/services')
+        assert fake_redis.keys('pubcache:v1:site:subdomain:servis-a')
@@ -0,0 +1,141 @@
+"""
+Deljeni Redis pool — circuit breaker (closed/open/half-open), health
+probe, metrike i servisi bez PING-a pre svake provere.
+"""
+import pytest
+
+from app.services import redis_service
+from app.services.redis_service import redis_manager
+from app.services.token_blacklist_service import token_blacklist
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Kontrolisano monotono vreme redis_service-a."""
+    now = [1000.0]
+    monkeypatch.setattr(redis_service.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def _fail(times, source='test'):
+    for _ in range(times):
+        redis_manager.record_failure(ConnectionError('refused'), source)
+
+
+class TestCircuitBreaker:
+    """Prekidač otvara posle uzastopnih grešaka, half-open posle pauze."""
+
+    def test_trips_after_consecutive_failures(self, fake_redis, clock):
+        _fail(2)
+        assert redis_manager.client() is fake_redis
+        _fail(1)
+
+        assert redis_manager.client() is None
+        stats = redis_manager.stats()
+        assert stats['state'] == 'open'
+        assert stats['trips'] == 1 and stats['short_circuited'] == 1
+        assert stats['failures'] == {'test': 3}
+
+    def test_spread_out_failures_do_not_trip(self, fake_redis, clock):
+        for _ in range(5):
+            _fail(1)
+            clock[0] += 60
+        assert redis_manager.client() is fake_redis
+
+    def test_half_open_success_closes(self, fake_redis, clock):
+        _fail(3)
+        clock[0] += 31
+        assert redis_manager.stats()['state'] == 'half_open'
+
+        assert redis_manager.call(lambda r: r.get('k'), 'test') is None
+        assert redis_manager.stats()['state'] == 'closed'
+        assert redis_manager.stats()['consecutive_failures'] == 0
+
+    def test_half_open_single_trial(self, fake_redis, clock):
+        """Jedan pozivalac client()-a šalje probni PING, ostali se preskaču."""
+        _fail(3)
+        clock[0] += 31
+        during_trial = []
+        fake_redis.on_ping = lambda: during_trial.append(redis_manager.client())
+
+        assert redis_manager.client() is fake_redis
+        assert during_trial == [None]
+        assert fake_redis.pings == 1
+        # Direktni pozivaoci ne prijavljuju uspeh - proba sama zatvara prekidač
+        assert redis_manager.stats()['state'] == 'closed'
+        assert redis_manager.client() is fake_redis
+        assert fake_redis.pings == 1
+
+    def test_half_open_failure_reopens(self, fake_redis, clock):
+        _fail(3)
+        clock[0] += 31
+        fake_redis.fail = True
+
+        assert redis_manager.call(lambda r: r.get('k'), 'test', default='x') == 'x'
+        assert redis_manager.client() is None
+        assert redis_manager.stats()['trips'] == 2
+
+    def test_command_errors_do_not_trip(self, fake_redis):
+        for _ in range(5):
+            redis_manager.record_failure(ValueError('WRONGTYPE'), 'test')
+        assert redis_manager.client() is fake_redis
+        assert redis_manager.stats()['failures'] == {'test': 5}
+
+    def test_connect_error_counts(self, redis_down):
+        for _ in range(3):
+            assert redis_manager.client() is None
+        assert not redis_manager.available
+        assert redis_manager.stats()['failures'] == {'connect': 3}
+
+
+class TestProbe:
+    """Health probe šalje PING van request-a."""
+
+    def test_probe_success(self, monkeypatch):
+        class Conn:
+            def ping(self):
+                return True
+        monkeypatch.setattr(redis_manager, 'connection', lambda: Conn())
+
+        assert redis_manager.probe() is True
+        stats = redis_manager.stats()
+        assert stats['healthy'] is True and stats['probes'] == 1
+        assert stats['last_probe_ms'] is not None
+
+    def test_probe_failure_recorded(self, monkeypatch):
+        class Conn:
+            def ping(self):
+                raise ConnectionError('refused')
+        monkeypatch.setattr(redis_manager, 'connection', lambda: Conn())
+
+        assert redis_manager.probe() is False
+        assert redis_manager.stats()['healthy'] is False
+        assert redis_manager.stats()['failures'] == {'probe': 1}
+
+
+class TestConsumers:
+    """Servisi koriste deljeni klijent i prijavljuju greške."""
+
+    def test_blacklist_check_without_ping(self, app, fake_redis):
+        fake_redis.data['blacklist:jti:abc'] = '1'
+        with app.app_context():
+            assert token_blacklist.is_blacklisted({'jti': 'abc', 'sub': '1'}) is True
+            assert token_blacklist.is_blacklisted({'jti': 'xyz', 'sub': '1'}) is False
+        assert fake_redis.pings == 0
+
+    def test_blacklist_breaker_open(self, app, fake_redis, monkeypatch):
+        _fail(3)
+        with app.app_context():
+            monkeypatch.setitem(app.config, 'SECURITY_STRICT', True)
+            assert token_blacklist.is_blacklisted({'jti': 'xyz', 'sub': '1'}) is True
+            monkeypatch.setitem(app.config, 'SECURITY_STRICT', False)
+            assert token_blacklist.is_blacklisted({'jti': 'xyz', 'sub': '1'}) is False
+
+    def test_blacklist_error_recorded(self, app, fake_redis):
+        fake_redis.fail = True
+        with app.app_context():
+            token_blacklist.is_blacklisted({'jti': 'xyz', 'sub': '1'})
+        assert redis_manager.stats()['failures'] == {'blacklist': 1}
+
+    def test_admin_endpoint_requires_platform_admin(self, client_a):
+        assert client_a.get('/api/admin/performance/redis').status_code == 403
@@ -0,0 +1,129 @@
+"""
+Read replika — @read_replica SELECT-ovi idu na drugu bazu (SQLite fajl),
+upisi i read-your-writes ostaju na primarnoj, fallback kad replika kasni
+ili nije dostupna.
+"""
+import pytest
+from flask import g
+from sqlalchemy import event, insert, select, text, update
+
+from app.extensions import db as _db
+from app.models.tenant import Tenant
+from app.services.redis_service import redis_manager
+from app.services.replica_service import read_replica, replica_service
+
+
+@pytest.fixture
+def replica(app, db, tenant_a, tmp_path):
+    """Replika sa istim tenantom pod drugim imenom."""
+    db.session.commit()
+    app.config['SQLALCHEMY_REPLICA_URL'] = f'sqlite:///{tmp_path / "replica.db"}'
+    replica_service.reset(app)
+    engine = replica_service.engine(app)
+    db.metadata.create_all(engine)
+
+    row = db.session.execute(select(Tenant.__table__).where(Tenant.id == tenant_a.id)).mappings().one()
+    with engine.begin() as conn:
+        conn.execute(insert(Tenant.__table__), [{**row, 'name': 'Sa replike'}])
+
+    yield engine
+    app.config['SQLALCHEMY_REPLICA_URL'] = None
+    replica_service.reset(app)
+
+
+def _name(tenant_id):
+    return _db.session.execute(select(Tenant.name).where(Tenant.id == tenant_id)).scalar()
+
+
+@read_replica
+def _report_name(tenant_id):
+    return _name(tenant_id)
+
+
+class TestRouting:
+    """Šta ide na repliku, a šta na primarnu bazu."""
+
+    def test_marked_read_uses_replica(self, replica, tenant_a):
+        assert _report_name(tenant_a.id) == 'Sa replike'
+        assert _name(tenant_a.id) == 'Servis A'
+
+    def test_without_replica_url(self, app, db, tenant_a):
+        assert app.config['SQLALCHEMY_REPLICA_URL'] is None
+        assert _report_name(tenant_a.id) == 'Servis A'
+
+    def test_write_pins_transaction_to_primary(self, replica, db, tenant_a):
+        @read_replica
+        def rename_and_read():
+            db.session.execute(update(Tenant).where(Tenant.id == tenant_a.id).values(name='Novo ime'))
+            return _name(tenant_a.id)
+
+        assert rename_and_read() == 'Novo ime'
+        db.session.rollback()
+        assert _report_name(tenant_a.id) == 'Sa replike'
+
+    def test_text_queries_stay_on_primary(self, replica, db, tenant_a):
+        @read_replica
+        def raw_name():
+            return db.session.execute(text('SELECT name FROM tenant WHERE id = :id'), {'id': tenant_a.id}).scalar()
+
+        assert raw_name() == 'Servis A'
+
+
+class TestReadYourWrites:
+    """Korisnik posle upisa čita sa primarne."""
+
+    def test_recent_writer_reads_primary(self, app, replica, db, tenant_a):
+        with app.test_request_context():
+            g.current_user_id = '7'
+            tenant_a.name = 'Promenjeno'
+            db.session.commit()
+            assert _report_name(tenant_a.id) == 'Promenjeno'
+
+        with app.test_request_context():
+            g.current_user_id = '8'
+            assert _report_name(tenant_a.id) == 'Sa replike'
+
+    def test_window_expires(self, app, replica, db, tenant_a, monkeypatch):
+        monkeypatch.setattr(redis_manager, 'client', lambda: None)
+        replica_service.note_write('user:7', window=0)
+        with app.test_request_context():
+            g.current_user_id = '7'
+            assert _report_name(tenant_a.id) == 'Sa replike'
+
+
+class TestFallback:
+    """Kašnjenje i nedostupna replika."""
+
+    def test_lagging_replica(self, app, replica, tenant_a, monkeypatch):
+        monkeypatch.setattr(replica_service, 'lag_seconds', lambda engine: 60.0)
+        assert _report_name(tenant_a.id) == 'Servis A'
+
+    def test_unreachable_replica(self, app, db, tenant_a, tmp_path):
+        db.session.commit()
+        app.config['SQLALCHEMY_REPLICA_URL'] = f'sqlite:///{tmp_path / "nema" / "replica.db"}'
+        replica_service.reset(app)
+        try:
+            assert _report_name(tenant_a.id) == 'Servis A'
+            assert replica_service.lag_seconds(replica_service.engine()) is None
+        finally:
+            app.config['SQLALCHEMY_REPLICA_URL'] = None
+            replica_service.reset(app)
+
+    def test_failed_query_retried_on_primary(self, replica, tenant_a):
+        with replica.begin() as conn:
+            conn.execute(text('DROP TABLE tenant'))
+
+        assert _report_name(tenant_a.id) == 'Servis A'
+        assert replica_service.choose_engine() is None
+
+
+class TestEndpoints:
+    """Izveštajni endpointi su označeni."""
+
+    def test_ticket_trend_reads_replica(self, replica, client_a):
+        statements = []
+        event.listen(replica, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+        res = client_a.get('/api/v1/tickets/stats/trend')
+        assert res.status_code == 200
+        assert any('service_ticket' in sql for sql in statements)
@@ -0,0 +1,160 @@
+"""
+SMS kampanje — SQL prefilter, rezervacija kredita za ceo skup,
+D7 slanje u delovima i jedan refund batch za neuspele delove.
+"""
+import pytest
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from app.models import ServiceTicket, TicketStatus, TenantSmsUsage
+from app.models.credits import CreditTransactionType, OwnerType
+from app.services import sms_campaign_service
+from app.services.credit_service import get_or_create_balance, add_credits
+from app.services.sms_billing_service import get_sms_price
+from app.services.sms_campaign_service import SmsCampaignService
+
+
+@pytest.fixture
+def sms_tenant(db, tenant_a):
+    tenant_a.sms_notifications_enabled = True
+    tenant_a.sms_notifications_consent_given = True
+    db.session.commit()
+    return tenant_a
+
+
+def _balance(db, tenant, credits):
+    bal = get_or_create_balance(OwnerType.TENANT, tenant.id)
+    add_credits(OwnerType.TENANT, tenant.id, Decimal(credits), CreditTransactionType.WELCOME, 'Test')
+    db.session.commit()
+    return bal
+
+
+def _ticket(db, tenant, location, user, number, **kwargs):
+    values = dict(
+        tenant_id=tenant.id, location_id=location.id, created_by_id=user.id,
+        ticket_number=number, customer_name='Kupac', customer_phone=f'06012{number:05d}',
+        device_type='PHONE', brand='Apple', model='iPhone 13', problem_description='Ekran',
+        status=TicketStatus.READY, ready_at=datetime.utcnow() - timedelta(days=15),
+    )
+    values.update(kwargs)
+    t = ServiceTicket(**values)
+    db.session.add(t)
+    db.session.flush()
+    return t
+
+
+@pytest.fixture
+def tickets(db, sms_tenant, location_a1, admin_a):
+    eligible = [_ticket(db, sms_tenant, location_a1, admin_a, n) for n in (1, 2, 3)]
+    others = [
+        _ticket(db, sms_tenant, location_a1, admin_a, 4, sms_opt_out=True),
+        _ticket(db, sms_tenant, location_a1, admin_a, 5, sms_notification_10_days=True),
+        _ticket(db, sms_tenant, location_a1, admin_a, 6, customer_phone=None),
+        _ticket(db, sms_tenant, location_a1, admin_a, 7, ready_at=datetime.utcnow()),
+    ]
+    db.session.commit()
+    return eligible, others
+
+
+class FakeD7:
+    """requests.post zamena - beleži zahteve, odbija poruke sa zadatim nalozima."""
+
+    def __init__(self, fail_numbers=()):
+        self.calls = []
+        self.fail_numbers = fail_numbers
+
+    def __call__(self, url, json=None, headers=None, timeout=None):
+        self.calls.append(json)
+        contents = ' '.join(m['content'] for m in json['messages'])
+        failed = any(f'SRV-{n:04d}' in contents for n in self.fail_numbers)
+        return type('Response', (), {'status_code': 500 if failed else 202, 'text': 'err'})()
+
+
+class TestCampaign:
+    """Batch slanje podsetnika."""
+
+    def test_prefilter_charge_and_mark(self, db, sms_tenant, tickets):
+        eligible, others = tickets
+        bal = _balance(db, sms_tenant, '10')
+
+        result = SmsCampaignService().send_pickup_reminders(
+            sms_tenant.id, [t.id for t in eligible + others] + [eligible[0].id], 10
+        )
+
+        assert result['sent'] == 3
+        assert result['skipped'] == {'not_eligible': 4}
+        for t in eligible:
+            db.session.refresh(t)
+            assert t.sms_notification_10_days
+        db.session.refresh(bal)
+        assert bal.balance == Decimal('10') - 3 * get_sms_price()
+        assert TenantSmsUsage.query.filter_by(sms_type='PICKUP_REMINDER_10', status='sent').count() == 3
+
+        # Ponovno pokretanje ne šalje duplikate
+        again = SmsCampaignService().send_pickup_reminders(sms_tenant.id, [t.id for t in eligible], 10)
+        assert again['sent'] == 0
+
+    def test_insufficient_credits_sends_what_fits(self, db, sms_tenant, tickets):
+        eligible, _ = tickets
+        _balance(db, sms_tenant, str(2 * get_sms_price()))
+
+        result = SmsCampaignService().send_pickup_reminders(sms_tenant.id, [t.id for t in eligible], 10)
+
+        assert result['sent'] == 2
+        assert result['skipped'] == {'insufficient_credits': 1}
+
+    def test_failed_chunk_refunded_in_one_batch(self, db, sms_tenant, tickets, monkeypatch):
+        eligible, _ = tickets
+        bal = _balance(db, sms_tenant, '10')
+        d7 = FakeD7(fail_numbers=(3,))
+        monkeypatch.setattr(sms_campaign_service.requests, 'post', d7)
+        monkeypatch.setattr(sms_campaign_service, 'D7_BATCH_SIZE', 2)
+        monkeypatch.setattr(sms_campaign_service.sms_service, 'api_token', 'token')
+        monkeypatch.delenv('FLASK_ENV', raising=False)
+
+        result = SmsCampaignService().send_pickup_reminders(sms_tenant.id, [t.id for t in eligible], 10)
+
+        assert len(d7.calls) == 2
+        assert sorted(len(c['messages']) for c in d7.calls) == [1, 2]
+        assert (result['sent'], result['failed'], result['refunded']) == (2, 1, 1)
+        db.session.refresh(bal)
+        assert bal.balance == Decimal('10') - 2 * get_sms_price()
+        db.session.refresh(eligible[2])
+        assert not eligible[2].sms_notification_10_days
+
+    def test_concurrent_campaign_does_not_double_send(self, db, sms_tenant, tickets, monkeypatch):
+        """Nalog koji je druga kampanja zauzela posle prefiltera se preskače."""
+        eligible, _ = tickets
+        bal = _balance(db, sms_tenant, '10')
+        check_batch = sms_campaign_service.rate_limiter.check_batch
+
+        def other_campaign_claims(tenant_id, phones):
+            SmsCampaignService._claim('PICKUP_REMINDER_10', [eligible[0].id])
+            return check_batch(tenant_id, phones)
+
+        monkeypatch.setattr(sms_campaign_service.rate_limiter, 'check_batch', other_campaign_claims)
+        result = SmsCampaignService().send_pickup_reminders(sms_tenant.id, [t.id for t in eligible], 10)
+
+        assert result['sent'] == 2
+        assert result['skipped'] == {'in_progress': 1}
+        db.session.refresh(bal)
+        assert bal.balance == Decimal('10') - 2 * get_sms_price()
+
+
+class TestCampaignApi:
+    """Endpoint bira naloge koji čekaju preuzimanje."""
+
+    def test_due_tickets_by_default(self, db, client_a, sms_tenant, tickets):
+        _balance(db, sms_tenant, '10')
+
+        res = client_a.post('/api/v1/tickets/sms/pickup-reminders', json={'days': 10})
+
+        assert res.status_code == 200
+        data = json.loads(res.data)
+        assert data['requested'] == 3
+        assert data['sent'] == 3
+
+    def test_invalid_days(self, db, client_a):
+        res = client_a.post('/api/v1/tickets/sms/pickup-reminders', json={'days': 7})
+        assert res.status_code == 400
@@ -0,0 +1,141 @@
+"""
+D7 DLR testovi — webhook samo prima u red, batch obrada primenjuje
+statuse i refund-ove (Redis stream i fallback na sms_dlr_log).
+"""
+import pytest
+import json
+from decimal import Decimal
+
+from app.models.credits import CreditTransaction, CreditTransactionType, OwnerType
+from app.models.sms_management import TenantSmsUsage, SmsDlrLog
+from app.services.credit_service import get_or_create_balance, add_credits
+from app.services.dlr_service import DlrService, STREAM_KEY
+from app.services.sms_billing_service import SmsBillingService
+
+
+@pytest.fixture
+def service(redis_down, monkeypatch):
+    """DlrService bez Redis-a - webhook upisuje direktno u sms_dlr_log."""
+    svc = DlrService()
+    monkeypatch.setattr('app.api.webhooks.d7.dlr_service', svc)
+    return svc
+
+
+@pytest.fixture
+def balance(db, tenant_a):
+    tenant_a.sms_notifications_enabled = True
+    tenant_a.sms_notifications_consent_given = True
+    bal = get_or_create_balance(OwnerType.TENANT, tenant_a.id)
+    add_credits(OwnerType.TENANT, tenant_a.id, Decimal('10'), CreditTransactionType.WELCOME, 'Test')
+    db.session.commit()
+    return bal
+
+
+def _sent_sms(db, tenant, ticket_id, message_id):
+    """Naplaćen i poslat SMS za nalog (kao sms_service)."""
+    ok, _, _ = SmsBillingService.charge_for_sms(tenant.id, 'TICKET_READY', reference_id=ticket_id)
+    assert ok
+    usage = TenantSmsUsage(
+        tenant_id=tenant.id, sms_type='TICKET_READY', status='sent',
+        reference_type='ticket', reference_id=ticket_id, provider_message_id=message_id
+    )
+    db.session.add(usage)
+    db.session.commit()
+    return usage
+
+
+def _post(app, message_id, status, **extra):
+    return app.test_client().post('/webhooks/d7/dlr', json={
+        'message_id': message_id, 'status': status, **extra
+    })
+
+
+class TestWebhook:
+    """Webhook samo prima u red."""
+
+    def test_webhook_defers_processing(self, app, db, service, tenant_a, balance):
+        usage = _sent_sms(db, tenant_a, 1, 'm-1')
+
+        res = _post(app, 'm-1', 'delivered')
+
+        assert res.status_code == 200
+        assert json.loads(res.data)['status'] == 'queued'
+        db.session.refresh(usage)
+        assert usage.delivery_status == 'pending'
+        assert SmsDlrLog.query.filter_by(message_id='m-1').one().processed_at is None
+
+        assert json.loads(_post(app, 'm-1', 'failed').data)['status'] == 'already_processed'
+
+    def test_missing_fields(self, app, db, service):
+        assert _post(app, '', 'delivered').status_code == 400
+
+
+class TestBatchProcessing:
+    """Batch UPDATE statusa i bulk refund."""
+
+    def test_statuses_and_refunds_applied_in_batch(self, app, db, service, tenant_a, balance):
+        delivered = _sent_sms(db, tenant_a, 1, 'm-1')
+        failed = _sent_sms(db, tenant_a, 2, 'm-2')
+        expired = _sent_sms(db, tenant_a, 3, 'm-3')
+        db.session.refresh(balance)
+        charged = balance.balance
+
+        _post(app, 'm-1', 'delivered')
+        _post(app, 'm-2', 'failed', error_code='31')
+        _post(app, 'm-3', 'expired')
+        _post(app, 'm-unknown', 'failed')
+
+        result = service.process()
+
+        assert result['processed'] == 4
+        assert result['updated'] == 3
+        assert result['refunded'] == 2
+        for usage, status in ((delivered, 'delivered'), (failed, 'failed'), (expired, 'expired')):
+            db.session.refresh(usage)
+            assert usage.delivery_status == status
+        assert failed.delivery_error_code == '31'
+
+        db.session.refresh(balance)
+        assert balance.balance == charged + 2 * Decimal('0.20')
+        assert SmsDlrLog.query.filter(SmsDlrLog.processed_at.is_(None)).count() == 0
+
+        # Ponovna obrada ne radi ništa
+        assert service.process()['processed'] == 0
+        assert CreditTransaction.query.filter_by(
+            transaction_type=CreditTransactionType.REFUND
+        ).count() == 2
+
+    def test_redis_stream_drained_with_dedupe(self, app, db, tenant_a, balance, fake_redis, monkeypatch):
+        svc = DlrService()
+        monkeypatch.setattr('app.api.webhooks.d7.dlr_service', svc)
+        usage = _sent_sms(db, tenant_a, 1, 'm-1')
+
+        _post(app, 'm-1', 'failed')
+        _post(app, 'm-1', 'delivered')  # kasniji DLR za istu poruku se ignoriše
+        assert SmsDlrLog.query.count() == 0
+        assert len(fake_redis.xrange(STREAM_KEY)) == 2
+
+        result = svc.process()
+
+        assert (result['received'], result['processed'], result['refunded']) == (1, 1, 1)
+        assert fake_redis.xrange(STREAM_KEY) == []
+        db.session.refresh(usage)
+        assert usage.delivery_status == 'failed'
+
+
+class TestRefundBulk:
+    """refund_sms_bulk zadržava semantiku refund_sms."""
+
+    def test_bulk_refund_idempotent(self, db, tenant_a, balance):
+        _sent_sms(db, tenant_a, 1, 'm-1')
+        original = CreditTransaction.query.filter_by(
+            transaction_type=CreditTransactionType.SMS_NOTIFICATION
+        ).one()
+
+        results = SmsBillingService.refund_sms_bulk([(original.id, 'test'), (999999, 'test')])
+
+        assert results[original.id] == (True, "Refund uspešan")
+        assert results[999999] == (False, "Transakcija nije pronađena")
+        assert SmsBillingService.refund_sms(original.id) == (True, "Već refund-ovano")
+        db.session.refresh(balance)
+        assert balance.balance == Decimal('10')
@@ -0,0 +1,69 @@
+"""
+SQL profiler — fingerprint upita, Server-Timing header, N+1 detekcija
+i p50/p95 po endpointu.
+"""
+import pytest
+
+from app.models import ServiceTicket
+from app.services.sql_profiler_service import sql_profiler, fingerprint, _percentile
+
+
+@pytest.fixture(autouse=True)
+def clean_profiler():
+    sql_profiler.reset()
+    yield
+    sql_profiler.reset()
+
+
+class TestFingerprint:
+    """Isti upit sa drugim vrednostima -> isti fingerprint."""
+
+    def test_params_and_literals(self):
+        a = fingerprint("SELECT * FROM t WHERE id = ? AND name = 'Pera'")
+        b = fingerprint("SELECT *  FROM t\nWHERE id = %(id_1)s AND name = 'Mika'")
+        assert a == b == 'SELECT * FROM t WHERE id = ? AND name = ?'
+
+    def test_in_lists_collapse(self):
+        assert fingerprint('SELECT 1 WHERE id IN (?, ?, ?)') == fingerprint('SELECT 1 WHERE id IN (?)')
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        assert _percentile(values, 50) == 50
+        assert _percentile(values, 95) == 95
+        assert _percentile([7], 95) == 7
+
+
+class TestRequestProfiling:
+    """Merenje kroz Flask hook-ove."""
+
+    def test_server_timing_header(self, client_a):
+        res = client_a.get('/api/v1/tickets')
+        assert res.status_code == 200
+        timing = res.headers['Server-Timing']
+        assert timing.startswith('db;dur=') and 'queries' in timing and 'app;dur=' in timing
+
+    def test_stats_per_endpoint(self, client_a):
+        for _ in range(3):
+            client_a.get('/api/v1/tickets')
+
+        row = next(r for r in sql_profiler.stats() if r['endpoint'] == 'GET api_v1.tickets.list_tickets')
+        assert row['samples'] == 3
+        assert row['queries_p50'] > 0
+        assert row['p95_ms'] >= row['p50_ms']
+        assert row['n_plus_one'] == []
+
+    def test_n_plus_one_flagged(self, app, db, tenant_a):
+        # Isti SELECT po redu u petlji, kroz before/after_request hook-ove
+        with app.test_request_context('/api/v1/tickets'):
+            app.preprocess_request()
+            for ticket_id in range(12):
+                db.session.get(ServiceTicket, ticket_id + 1000)
+            app.process_response(app.response_class('ok'))
+
+        row = next(r for r in sql_profiler.stats() if r['endpoint'] == 'GET api_v1.tickets.list_tickets')
+        assert row['queries_max'] >= 12
+        assert len(row['n_plus_one']) == 1
+        assert 'FROM service_ticket' in row['n_plus_one'][0]['sql']
+
+    def test_admin_endpoint_requires_platform_admin(self, client_a):
+        assert client_a.get('/api/admin/performance/endpoints').status_code == 403
@@ -0,0 +1,99 @@
+"""
+Stock ledger testovi — checkpoint-i, stanje na datum, vrednovanje zaliha,
+bulk provera LocationStock cache-a.
+"""
+import pytest
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+from app.models.goods import GoodsItem
+from app.models.stock_movement import (
+    StockBalanceSnapshot, LocationStock, MovementType, create_stock_movement,
+)
+from app.services.stock_ledger_service import stock_ledger
+
+
+DAY1 = datetime(2026, 9, 30, 10, 0)
+DAY2 = datetime(2026, 10, 5, 10, 0)
+MONTH_END = datetime(2026, 10, 1)
+
+
+@pytest.fixture
+def item(db, tenant_a, location_a1):
+    goods = GoodsItem(tenant_id=tenant_a.id, location_id=location_a1.id, name='Punjač',
+                      purchase_price=Decimal('150'), selling_price=Decimal('300'), current_stock=0)
+    db.session.add(goods)
+    db.session.flush()
+    return goods
+
+
+def _move(tenant, location, user, goods, qty, at, movement_type=MovementType.RECEIVE, unit_cost=None):
+    movement = create_stock_movement(tenant.id, location.id, user.id, movement_type, qty,
+                                     goods_item_id=goods.id, unit_cost=unit_cost)
+    movement.created_at = at
+    return movement
+
+
+@pytest.fixture
+def history(db, tenant_a, location_a1, location_a2, admin_a, item):
+    _move(tenant_a, location_a1, admin_a, item, 10, DAY1, unit_cost=Decimal('100'))
+    _move(tenant_a, location_a1, admin_a, item, -3, DAY1 + timedelta(hours=1), MovementType.SALE)
+    _move(tenant_a, location_a2, admin_a, item, 4, DAY1, unit_cost=Decimal('120'))
+    _move(tenant_a, location_a1, admin_a, item, 5, DAY2, unit_cost=Decimal('110'))
+    db.session.commit()
+
+
+class TestCheckpoints:
+    """Noćni checkpoint-i."""
+
+    def test_write_checkpoints_is_idempotent(self, db, history, item):
+        result = stock_ledger.write_checkpoints(cutoff=MONTH_END)
+        db.session.commit()
+        assert result['written'] == 2
+
+        assert stock_ledger.write_checkpoints(cutoff=MONTH_END)['written'] == 0
+        snaps = {s.location_id: s.quantity for s in StockBalanceSnapshot.query.all()}
+        assert sorted(snaps.values()) == [4, 7]
+
+    def test_stock_at_uses_checkpoint_and_tail(self, db, history, item, location_a1):
+        before = stock_ledger.stock_at(MONTH_END, goods_item_id=item.id)
+        stock_ledger.write_checkpoints(cutoff=MONTH_END)
+        db.session.commit()
+
+        assert stock_ledger.stock_at(MONTH_END, goods_item_id=item.id) == before
+        assert before['quantity'] == 11
+        now = stock_ledger.stock_at(DAY2 + timedelta(days=1), goods_item_id=item.id, location_id=location_a1.id)
+        assert now['quantity'] == 12
+
+
+class TestValuation:
+    """Vrednovanje zaliha na datum."""
+
+    def test_month_end_valuation(self, db, history, tenant_a):
+        stock_ledger.write_checkpoints(cutoff=MONTH_END)
+        db.session.commit()
+
+        result = stock_ledger.valuation_at(tenant_a.id, MONTH_END)
+        assert result['total_quantity'] == 11
+        assert result['total_value'] == 7 * 100 + 4 * 120
+
+        # Posle nove nabavke - poslednja nabavna cena
+        later = stock_ledger.valuation_at(tenant_a.id, DAY2 + timedelta(days=1))
+        assert later['total_value'] == 12 * 110 + 4 * 120
+
+
+class TestVerifyCache:
+    """Bulk provera cache-a."""
+
+    def test_detects_drift(self, db, history, tenant_a, location_a1, item):
+        assert stock_ledger.verify_cache(tenant_id=tenant_a.id) == []
+
+        stock = LocationStock.query.filter_by(location_id=location_a1.id, goods_item_id=item.id).one()
+        stock.quantity = 99
+        db.session.commit()
+
+        mismatches = stock_ledger.verify_cache(tenant_id=tenant_a.id)
+        assert mismatches == [{
+            'location_id': location_a1.id, 'goods_item_id': item.id,
+            'spare_part_id': None, 'cached': 99, 'ledger': 12,
+        }]
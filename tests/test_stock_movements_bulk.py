@@ -0,0 +1,96 @@
+"""
+StockMovement bulk testovi — batch kreiranje pokreta, balance semantika,
+atomičnost pri nedovoljnom stanju, prijem fakture kroz ledger.
+"""
+import pytest
+from decimal import Decimal
+from datetime import date
+
+from app.models.goods import GoodsItem, PurchaseInvoice, PurchaseInvoiceItem, InvoiceStatus
+from app.models.stock_movement import (
+    StockMovement, LocationStock, MovementType,
+    create_stock_movement, create_stock_movements_bulk, validate_stock_balance,
+)
+from app.services.goods_service import GoodsService
+
+
+@pytest.fixture
+def goods(db, tenant_a, location_a1):
+    items = [
+        GoodsItem(tenant_id=tenant_a.id, location_id=location_a1.id, name=f'Artikal {i}',
+                  purchase_price=Decimal('100'), selling_price=Decimal('200'), current_stock=0)
+        for i in range(3)
+    ]
+    db.session.add_all(items)
+    db.session.flush()
+    return items
+
+
+class TestBulkMovements:
+    """create_stock_movements_bulk."""
+
+    def test_balances_follow_line_order(self, db, tenant_a, location_a1, admin_a, goods):
+        create_stock_movement(tenant_a.id, location_a1.id, admin_a.id, MovementType.RECEIVE, 5,
+                              goods_item_id=goods[0].id)
+
+        movements = create_stock_movements_bulk(tenant_a.id, admin_a.id, [
+            {'location_id': location_a1.id, 'goods_item_id': goods[0].id,
+             'movement_type': MovementType.RECEIVE, 'quantity': 3},
+            {'location_id': location_a1.id, 'goods_item_id': goods[1].id,
+             'movement_type': MovementType.RECEIVE, 'quantity': 7},
+            {'location_id': location_a1.id, 'goods_item_id': goods[0].id,
+             'movement_type': MovementType.SALE, 'quantity': -2},
+        ], reference_type='test', reference_id=1)
+        db.session.commit()
+
+        assert [(m.balance_before, m.balance_after) for m in movements] == [(5, 8), (0, 7), (8, 6)]
+        assert all(m.reference_type == 'test' for m in movements)
+
+        stock = LocationStock.query.filter_by(location_id=location_a1.id, goods_item_id=goods[0].id).one()
+        assert stock.quantity == 6
+        assert stock.last_movement_id == movements[2].id
+        assert validate_stock_balance(goods_item_id=goods[1].id, location_id=location_a1.id)
+
+    def test_insufficient_stock_writes_nothing(self, db, tenant_a, location_a1, admin_a, goods):
+        with pytest.raises(ValueError, match='Nedovoljno stanja'):
+            create_stock_movements_bulk(tenant_a.id, admin_a.id, [
+                {'location_id': location_a1.id, 'goods_item_id': goods[0].id,
+                 'movement_type': MovementType.RECEIVE, 'quantity': 1},
+                {'location_id': location_a1.id, 'goods_item_id': goods[1].id,
+                 'movement_type': MovementType.SALE, 'quantity': -1},
+            ])
+        assert StockMovement.query.count() == 0
+
+    def test_adjust_requires_reason(self, db, tenant_a, location_a1, admin_a, goods):
+        with pytest.raises(ValueError, match='reason'):
+            create_stock_movements_bulk(tenant_a.id, admin_a.id, [
+                {'location_id': location_a1.id, 'goods_item_id': goods[0].id,
+                 'movement_type': MovementType.ADJUST, 'quantity': 1},
+            ])
+
+
+class TestReceiveInvoiceLedger:
+    """Prijem fakture upisuje RECEIVE pokrete jednim batch-om."""
+
+    def test_receive_invoice_creates_movements(self, db, tenant_a, location_a1, admin_a, goods):
+        invoice = PurchaseInvoice(
+            tenant_id=tenant_a.id, location_id=location_a1.id, supplier_name='Dobavljač',
+            invoice_number='F-1', invoice_date=date.today(), status=InvoiceStatus.DRAFT,
+        )
+        db.session.add(invoice)
+        db.session.flush()
+        for i, item in enumerate(goods):
+            db.session.add(PurchaseInvoiceItem(
+                invoice_id=invoice.id, goods_item_id=item.id, item_name=item.name,
+                quantity=i + 1, purchase_price=Decimal('90'), selling_price=Decimal('180'),
+                line_total=Decimal('90') * (i + 1),
+            ))
+        db.session.flush()
+
+        GoodsService.receive_invoice(invoice.id, tenant_a.id, admin_a.id)
+        db.session.commit()
+
+        movements = StockMovement.query.filter_by(reference_type='purchase_invoice').all()
+        assert sorted(m.quantity for m in movements) == [1, 2, 3]
+        assert all(m.reference_number == 'F-1' for m in movements)
+        assert GoodsItem.query.get(goods[2].id).current_stock == 3
@@ -0,0 +1,137 @@
+"""
+Liste naloga — sažetak notifikacija na nalogu, parts_cost jednim upitom
+i fiksan broj SQL upita po stranici bez obzira na broj naloga.
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from app.models import ServiceTicket, TicketStatus, TicketNotificationLog
+from app.models.inventory import SparePart, SparePartUsage, PartVisibility, PartCategory
+
+
+def _make_tickets(db, tenant, location, owner, tech, count, start=1):
+    part = SparePart(
+        tenant_id=tenant.id, location_id=location.id, part_name='Ekran', quantity=100,
+        purchase_price=1500, selling_price=3000,
+        visibility=PartVisibility.PRIVATE, part_category=PartCategory.DISPLAY,
+    )
+    db.session.add(part)
+    tickets = []
+    for n in range(start, start + count):
+        t = ServiceTicket(
+            tenant_id=tenant.id, location_id=location.id, created_by_id=owner.id,
+            assigned_technician_id=tech.id, ticket_number=n, customer_name=f'Kupac {n}',
+            customer_phone='0601234567', device_type='PHONE', brand='Apple', model='iPhone',
+            problem_description='Ekran', status=TicketStatus.READY,
+        )
+        db.session.add(t)
+        tickets.append(t)
+    db.session.flush()
+    for t in tickets:
+        TicketNotificationLog.log(ticket_id=t.id, notification_type='CALL')
+        db.session.add(SparePartUsage(
+            tenant_id=tenant.id, service_ticket_id=t.id, spare_part_id=part.id,
+            quantity_used=2, unit_price=1500
+        ))
+    db.session.commit()
+    return tickets
+
+
+def _count_queries(db, fn):
+    statements = []
+
+    def before(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before)
+    try:
+        result = fn()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before)
+    return result, len(statements)
+
+
+class TestNotificationSummary:
+    """notification_count / last_notified_at održava TicketNotificationLog.log."""
+
+    def test_log_updates_summary(self, db, tenant_a, location_a1, admin_a, user_tech_a):
+        ticket = _make_tickets(db, tenant_a, location_a1, admin_a, user_tech_a, 1)[0]
+
+        assert ticket.notification_count == 1
+        assert ticket.last_notified_at is not None
+        assert ticket.can_notify is False
+        assert ticket.days_until_can_notify == 15
+
+        for _ in range(4):
+            TicketNotificationLog.log(ticket_id=ticket.id, notification_type='CALL')
+        db.session.commit()
+        assert ticket.notification_count == 5
+        assert ticket.can_write_off is True
+
+    def test_fifteen_day_rule_from_last_notified(self, db, tenant_a, location_a1, admin_a, user_tech_a):
+        ticket = _make_tickets(db, tenant_a, location_a1, admin_a, user_tech_a, 1)[0]
+        ticket.last_notified_at = datetime.now(timezone.utc) - timedelta(days=16)
+        db.session.commit()
+        assert ticket.can_notify is True
+
+    def test_never_notified_closed_ticket(self, client_a, db, tenant_a, location_a1, admin_a):
+        ticket = ServiceTicket(
+            tenant_id=tenant_a.id, location_id=location_a1.id, created_by_id=admin_a.id,
+            ticket_number=400, customer_name='Kupac', customer_phone='0601234567',
+            device_type='PHONE', brand='Apple', model='iPhone', problem_description='Ekran',
+            status=TicketStatus.DELIVERED,
+        )
+        db.session.add(ticket)
+        db.session.commit()
+
+        assert ticket.can_notify is False
+        assert ticket.to_dict()['days_until_can_notify'] == 0
+        res = client_a.get('/api/v1/tickets?per_page=50')
+        assert res.status_code == 200
+
+    def test_notify_endpoint(self, client_a, db, tenant_a, location_a1, admin_a, user_tech_a):
+        ticket = ServiceTicket(
+            tenant_id=tenant_a.id, location_id=location_a1.id, created_by_id=admin_a.id,
+            ticket_number=500, customer_name='Kupac', customer_phone='0601234567',
+            device_type='PHONE', brand='Apple', model='iPhone', problem_description='Ekran',
+            status=TicketStatus.READY,
+        )
+        db.session.add(ticket)
+        db.session.commit()
+
+        res = client_a.post(f'/api/v1/tickets/{ticket.id}/notify', json={'comment': 'Nije se javio'})
+        assert res.status_code == 200
+        assert json.loads(res.data)['notification_count'] == 1
+
+        res = client_a.post(f'/api/v1/tickets/{ticket.id}/notify', json={})
+        assert res.status_code == 400
+
+
+class TestTicketListQueries:
+    """Glavna lista naloga iz fiksnog broja upita."""
+
+    def test_query_count_does_not_grow_with_page(self, client_a, db, tenant_a, location_a1,
+                                                 admin_a, user_tech_a):
+        _make_tickets(db, tenant_a, location_a1, admin_a, user_tech_a, 2)
+        _, small = _count_queries(db, lambda: client_a.get('/api/v1/tickets?per_page=50'))
+
+        _make_tickets(db, tenant_a, location_a1, admin_a, user_tech_a, 20, start=100)
+        res, large = _count_queries(db, lambda: client_a.get('/api/v1/tickets?per_page=50'))
+
+        items = json.loads(res.data)['items']
+        assert len(items) == 22
+        assert large == small
+        assert items[0]['assigned_technician_name'] == user_tech_a.full_name
+        assert items[0]['notification_count'] == 1
+        assert items[0]['parts_cost'] == 3000.0
+
+    def test_parts_cost_bulk_matches_single(self, db, tenant_a, location_a1, admin_a, user_tech_a):
+        tickets = _make_tickets(db, tenant_a, location_a1, admin_a, user_tech_a, 3)
+        single = [t.parts_cost for t in tickets]
+
+        ServiceTicket.preload_parts_cost(tickets)
+        _, queries = _count_queries(db, lambda: [t.parts_cost for t in tickets])
+        assert queries == 0
+        assert [t.parts_cost for t in tickets] == single
@@ -0,0 +1,87 @@
+"""
+Pretraga naloga — telefon u bilo kom formatu, IMEI, ime bez dijakritika,
+tačan broj naloga prvi, highlight i osvežavanje indeksa posle izmene.
+"""
+import pytest
+import json
+
+from app.models import ServiceTicket, TicketStatus
+from app.services.ticket_search_service import ticket_search
+from app.utils.search import normalize_phone, search_terms, highlight
+
+
+@pytest.fixture
+def tickets(db, tenant_a, location_a1, admin_a):
+    data = [
+        (7, 'Petar Petrović', '+381 64 123 4567', 'Apple', 'iPhone 13', '356938035643809'),
+        (12, 'Đorđe Jovanović', '0601112233', 'Samsung', 'Galaxy S24', '490154203237518'),
+        (70, 'Ana Anić', '063/555-777', 'Xiaomi', 'Redmi 12', None),
+    ]
+    result = []
+    for number, name, phone, brand, model, imei in data:
+        t = ServiceTicket(
+            tenant_id=tenant_a.id, location_id=location_a1.id, created_by_id=admin_a.id,
+            ticket_number=number, customer_name=name, customer_phone=phone,
+            device_type='PHONE', brand=brand, model=model, imei=imei,
+            problem_description='Ekran', status=TicketStatus.RECEIVED,
+        )
+        db.session.add(t)
+        result.append(t)
+    db.session.commit()
+    return result
+
+
+def _search(client, q):
+    response = client.get('/api/v1/tickets', query_string={'search': q})
+    assert response.status_code == 200
+    return json.loads(response.data)
+
+
+class TestNormalization:
+    """Isti oblik za upit i za sačuvan nalog."""
+
+    @pytest.mark.parametrize('raw', ['+381 64 123 4567', '00381641234567', '064/123-4567', '381641234567'])
+    def test_phone_formats(self, raw):
+        assert normalize_phone(raw) == '0641234567'
+
+    def test_short_number_is_not_country_code(self):
+        assert search_terms('381') == ['381']
+
+    def test_highlight_maps_back_to_original(self):
+        assert highlight('Đorđe', ['djor']) == '<mark>Đor</mark>đe'
+        assert highlight('<b>', ['b']) == '&lt;<mark>b</mark>&gt;'
+
+
+class TestTicketSearchApi:
+    """search parametar na listi naloga."""
+
+    @pytest.mark.parametrize('q', ['+381641234567', '064 123 45', '0641234'])
+    def test_phone_in_any_format(self, client_a, tickets, q):
+        data = _search(client_a, q)
+        assert [i['id'] for i in data['items']] == [tickets[0].id]
+
+    def test_imei_and_name_without_diacritics(self, client_a, tickets):
+        assert [i['id'] for i in _search(client_a, '4901542')['items']] == [tickets[1].id]
+        assert [i['id'] for i in _search(client_a, 'djordje galaxy')['items']] == [tickets[1].id]
+        assert [i['id'] for i in _search(client_a, 'petrovic')['items']] == [tickets[0].id]
+
+    def test_exact_ticket_number_first(self, client_a, tickets):
+        data = _search(client_a, '7')
+        assert data['items'][0]['id'] == tickets[0].id
+        assert tickets[2].id in [i['id'] for i in data['items']]
+
+    def test_highlight_in_response(self, client_a, tickets):
+        item = _search(client_a, 'redmi')['items'][0]
+        assert item['highlight'] == {'model': '<mark>Redmi</mark> 12'}
+
+    def test_edit_updates_index(self, db, client_a, tickets):
+        tickets[2].customer_phone = '+381 65 999 0000'
+        db.session.commit()
+
+        assert [i['id'] for i in _search(client_a, '0659990000')['items']] == [tickets[2].id]
+        assert _search(client_a, '063555777')['items'] == []
+
+    def test_filter_keeps_order(self, app, tickets):
+        query = ServiceTicket.query.order_by(ServiceTicket.id)
+        found = ticket_search.apply(query, 'a', rank=False).all()
+        assert [t.id for t in found] == sorted(t.id for t in tickets)